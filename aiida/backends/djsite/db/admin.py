@@ -12,12 +12,11 @@ from __future__ import print_function
 from __future__ import absolute_import
 from django.contrib import admin
 
-from .models import DbNode, DbLink, DbAttribute, DbGroup, DbComputer, DbAuthInfo, DbComment
+from .models import DbNode, DbLink, DbGroup, DbComputer, DbAuthInfo, DbComment
 
 
 admin.site.register(DbNode)
 admin.site.register(DbLink)
-admin.site.register(DbAttribute)
 admin.site.register(DbGroup)
 admin.site.register(DbComputer)
 admin.site.register(DbAuthInfo)
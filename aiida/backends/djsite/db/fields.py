@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Custom Django model fields."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import json
+
+import six
+from django.db import models
+
+from aiida.backends.utils import datetime_to_isoformat, isoformat_to_datetime
+
+
+class JsonbField(models.Field):
+    """
+    A field that stores a JSON-serializable dictionary in a PostgreSQL `jsonb` column.
+
+    Datetime objects are stored as strings in ISO format and converted back when the column is loaded, in the same way
+    as for the `attributes` and `extras` columns of the SQLAlchemy backend.
+    """
+    description = 'A JSON dictionary stored in a jsonb column'
+    empty_strings_allowed = False
+
+    def db_type(self, connection):
+        return 'jsonb'
+
+    def from_db_value(self, value, expression, connection, context):  # pylint: disable=unused-argument
+        return self.to_python(value)
+
+    def to_python(self, value):
+        if isinstance(value, six.string_types):
+            value = json.loads(value)
+        return isoformat_to_datetime(value)
+
+    def get_prep_value(self, value):
+        from psycopg2.extras import Json
+
+        if value is None:
+            return None
+
+        return Json(datetime_to_isoformat(value))
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from django.db import migrations
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+REVISION = '1.0.16'
+DOWN_REVISION = '1.0.15'
+
+# Currently valid hash key
+_HASH_EXTRA_KEY = '_aiida_hash'
+
+
+class Migration(migrations.Migration):
+    """Add a partial index on the value of the hash extra of the nodes, used for the caching lookups"""
+
+    dependencies = [
+        ('db', '0015_invalidating_node_hash'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """ CREATE INDEX db_dbextra_aiida_hash_tval ON db_dbextra (tval)
+                WHERE key='""" + _HASH_EXTRA_KEY + """';""",
+            reverse_sql=""" DROP INDEX db_dbextra_aiida_hash_tval;"""),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
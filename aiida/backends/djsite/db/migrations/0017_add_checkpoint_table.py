@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from django.db import migrations, models
+import django.db.models.deletion
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+REVISION = '1.0.17'
+DOWN_REVISION = '1.0.16'
+
+
+class Migration(migrations.Migration):
+    """Add the table that stores the checkpoints of the processes"""
+
+    dependencies = [
+        ('db', '0016_add_node_hash_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DbCheckpoint',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('key', models.CharField(max_length=255)),
+                ('codec', models.CharField(max_length=32)),
+                ('data', models.BinaryField()),
+                ('dbnode',
+                 models.ForeignKey(
+                     related_name='dbcheckpoints', to='db.DbNode', on_delete=django.db.models.deletion.CASCADE)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='dbcheckpoint',
+            unique_together=set([('dbnode', 'key')]),
+        ),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
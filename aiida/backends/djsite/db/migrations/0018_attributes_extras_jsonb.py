@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+from collections import defaultdict
+
+from django.db import migrations
+
+from aiida.backends.djsite.db.fields import JsonbField
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+REVISION = '1.0.18'
+DOWN_REVISION = '1.0.17'
+
+# Number of nodes whose attributes and extras are converted at once
+BATCH_SIZE = 1000
+
+# Currently valid hash key
+_HASH_EXTRA_KEY = '_aiida_hash'
+
+
+def load_eav_values(cursor, table, pks):
+    """
+    Load and deserialize the rows of the attribute or extra table of the given nodes.
+
+    :param cursor: a database cursor
+    :param table: the name of the table, either 'db_dbattribute' or 'db_dbextra'
+    :param pks: a list of node pks
+    :return: a dictionary with, for each node that has at least one row, the dictionary of its values
+    """
+    from aiida.backends.djsite.db.models import deserialize_attributes
+    from aiida.backends.utils import AIIDA_ATTRIBUTE_SEP
+
+    cursor.execute(
+        'SELECT dbnode_id, key, datatype, tval, fval, ival, bval, dval FROM {} WHERE dbnode_id = ANY(%s)'.format(table),
+        [list(pks)])
+
+    rows = defaultdict(dict)
+    for pk, key, datatype, tval, fval, ival, bval, dval in cursor.fetchall():
+        rows[pk][key] = {'datatype': datatype, 'tval': tval, 'fval': fval, 'ival': ival, 'bval': bval, 'dval': dval}
+
+    return {pk: deserialize_attributes(data, sep=AIIDA_ATTRIBUTE_SEP, original_pk=pk) for pk, data in rows.items()}
+
+
+def transition_attributes_extras(apps, schema_editor):  # pylint: disable=unused-argument
+    """Copy the attributes and extras of all nodes from the key-value tables into the new JSONB columns."""
+    field = JsonbField()
+
+    with schema_editor.connection.cursor() as cursor:
+        last_pk = 0
+        while True:
+            cursor.execute('SELECT id FROM db_dbnode WHERE id > %s ORDER BY id LIMIT %s', [last_pk, BATCH_SIZE])
+            pks = [row[0] for row in cursor.fetchall()]
+
+            if not pks:
+                break
+
+            attributes = load_eav_values(cursor, 'db_dbattribute', pks)
+            extras = load_eav_values(cursor, 'db_dbextra', pks)
+
+            rows = [(field.get_prep_value(attributes.get(pk, {})), field.get_prep_value(extras.get(pk, {})), pk)
+                    for pk in pks
+                    if pk in attributes or pk in extras]
+            cursor.executemany('UPDATE db_dbnode SET attributes = %s, extras = %s WHERE id = %s', rows)
+
+            last_pk = pks[-1]
+
+
+def reverse_code(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+    """
+    Store the attributes and extras of the nodes in JSONB columns of the node table, as for the SQLAlchemy backend.
+
+    The values are copied from the key-value tables DbAttribute and DbExtra, that are then dropped. The index on the
+    hash extra is recreated as an index on the corresponding key of the new extras column.
+    """
+
+    dependencies = [
+        ('db', '0017_add_checkpoint_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dbnode',
+            name='attributes',
+            field=JsonbField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='dbnode',
+            name='extras',
+            field=JsonbField(default=dict),
+        ),
+        migrations.RunPython(transition_attributes_extras, reverse_code=reverse_code),
+        migrations.RunSQL(
+            """ CREATE INDEX db_dbnode_extras_aiida_hash ON db_dbnode ((extras ->> '""" + _HASH_EXTRA_KEY + """'));""",
+            reverse_sql=""" DROP INDEX db_dbnode_extras_aiida_hash;"""),
+        migrations.RunSQL(
+            """ DROP INDEX db_dbextra_aiida_hash_tval;""",
+            reverse_sql=""" CREATE INDEX db_dbextra_aiida_hash_tval ON db_dbextra (tval)
+                WHERE key='""" + _HASH_EXTRA_KEY + """';"""),
+        migrations.AlterUniqueTogether(
+            name='dbattribute',
+            unique_together=set([]),
+        ),
+        migrations.RemoveField(
+            model_name='dbattribute',
+            name='dbnode',
+        ),
+        migrations.DeleteModel(name='DbAttribute'),
+        migrations.AlterUniqueTogether(
+            name='dbextra',
+            unique_together=set([]),
+        ),
+        migrations.RemoveField(
+            model_name='dbextra',
+            name='dbnode',
+        ),
+        migrations.DeleteModel(name='DbExtra'),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from __future__ import absolute_import
+
+from django.db import migrations
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+REVISION = '1.0.19'
+DOWN_REVISION = '1.0.18'
+
+
+class Migration(migrations.Migration):
+    """Add partial indexes on the job calculations matching the keyset pagination of the list of calculations"""
+
+    dependencies = [
+        ('db', '0018_attributes_extras_jsonb'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            """ CREATE INDEX db_dbnode_jobcalculation_user_ctime_id ON db_dbnode (user_id, ctime, id)
+                WHERE type LIKE 'calculation.job.%';
+                CREATE INDEX db_dbnode_jobcalculation_ctime_id ON db_dbnode (ctime, id)
+                WHERE type LIKE 'calculation.job.%';""",
+            reverse_sql=""" DROP INDEX db_dbnode_jobcalculation_user_ctime_id;
+                DROP INDEX db_dbnode_jobcalculation_ctime_id;"""),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
@@ -28,6 +28,7 @@ from aiida.common.exceptions import (
 
 from aiida.backends.settings import AIIDANODES_UUID_VERSION
 from aiida.backends.djsite.settings.settings import AUTH_USER_MODEL
+from aiida.backends.djsite.db.fields import JsonbField
 import aiida.backends.djsite.db.migrations as migrations
 from aiida.backends.utils import AIIDA_ATTRIBUTE_SEP
 
@@ -121,15 +122,19 @@ class DbNode(m.Model):
     * C is 'output' of A.
 
     Internal attributes, that define the node itself,
-    are stored in the DbAttribute table; further user-defined attributes,
-    called 'extra', are stored in the DbExtra table (same schema and methods
-    of the DbAttribute table, but the code does not rely on the content of the
-    table, therefore the user can use it at his will to tag or annotate nodes.
-
-    :note: Attributes in the DbAttribute table have to be thought as belonging
-       to the DbNode, (this is the reason for which there is no 'user' field
-       in the DbAttribute field). Moreover, Attributes define uniquely the
-       Node so should be immutable
+    are stored in the `attributes` JSONB column; further user-defined attributes,
+    called 'extra', are stored in the `extras` JSONB column (same format of the
+    attributes, but the code does not rely on their content, therefore the user
+    can use them at his will to tag or annotate nodes.
+
+    :note: Attributes have to be thought as belonging to the DbNode.
+       Moreover, Attributes define uniquely the Node so should be immutable
+
+    :note: Once a node is stored, its `attributes` and `extras` columns are
+       only changed with the partial updates of the ``set_attr``, ``set_extra``
+       and similar methods: a ``save()`` of a stored node does not write them,
+       such that it cannot overwrite the changes done, meanwhile, by another
+       process, or with a bulk update.
     """
     uuid = UUIDField(auto=True, version=AIIDANODES_UUID_VERSION, unique=True)
     # in the form data.upffile., data.structure., calculation., ...
@@ -165,6 +170,11 @@ class DbNode(m.Model):
     # For the API: whether this node
     public = m.BooleanField(default=False)
 
+    attributes = JsonbField(default=dict)
+    extras = JsonbField(default=dict)
+
+    _JSON_FIELDS = ('attributes', 'extras')
+
     objects = m.Manager()
     # Return aiida Node instances or their subclasses instead of DbNode instances
     aiidaobjects = AiidaObjectManager()
@@ -173,6 +183,17 @@ class DbNode(m.Model):
         """
         Return the corresponding aiida instance of class aiida.orm.Node or a
         appropriate subclass.
+
+        Within the scope of an :func:`~aiida.orm.utils.identity_map.identity_map`, the instance that was already
+        loaded for this node is returned, if any.
+        """
+        from aiida.orm.utils.identity_map import get_or_load_node
+
+        return get_or_load_node(self.pk, self._load_aiida_class)
+
+    def _load_aiida_class(self):
+        """
+        Return a new aiida instance of class aiida.orm.Node or an appropriate subclass for this node.
         """
         from aiida.common import aiidalogger
         from aiida.orm.node import Node
@@ -209,19 +230,155 @@ class DbNode(m.Model):
             thistype = thistype[:-1]  # Strip final dot
             return thistype.rpartition('.')[2]
 
-    @property
-    def attributes(self):
+    def save(self, *args, **kwargs):
+        """
+        Save the node, without writing the `attributes` and `extras` columns if it is already stored.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self._JSON_FIELDS
+            ]
+        super(DbNode, self).save(*args, **kwargs)
+
+    def set_attr(self, key, value):
         """
-        Return all attributes of the given node as a single dictionary.
+        Set the attribute `key` of the stored node and increment its version number, with a single partial update.
         """
-        return DbAttribute.get_all_values_for_node(self)
+        self._update_json_field('attributes', '|| %s::jsonb', [{key: value}])
+        self.attributes[key] = value
 
-    @property
-    def extras(self):
+    def del_attr(self, key):
+        """
+        Delete the attribute `key` of the stored node and increment its version number.
+
+        :raise AttributeError: if the attribute does not exist
+        """
+        if not self._update_json_field('attributes', '- %s::text', [key], 'attributes ? %s', [key]):
+            raise AttributeError("Attribute '{}' does not exist".format(key))
+        self.attributes.pop(key, None)
+
+    def set_extra(self, key, value, exclusive=False, increment_version=True):
         """
-        Return all extras of the given node as a single dictionary.
+        Set the extra `key` of the stored node, with a single partial update.
+
+        :param exclusive: if True, raise a UniquenessError if the extra already exists
+        :param increment_version: whether to increment the version number of the node
         """
-        return DbExtra.get_all_values_for_node(self)
+        from aiida.common.exceptions import UniquenessError
+
+        if exclusive:
+            condition, condition_params = 'NOT extras ? %s', [key]
+        else:
+            condition, condition_params = None, []
+
+        if not self._update_json_field('extras', '|| %s::jsonb', [{key: value}], condition, condition_params,
+                                       increment_version):
+            raise UniquenessError("An extra with key '{}' already exists".format(key))
+        self.extras[key] = value
+
+    def reset_extras(self, new_extras):
+        """
+        Replace all extras of the stored node and increment its version number.
+        """
+        self._update_json_field('extras', None, [new_extras])
+        self.extras = dict(new_extras)
+
+    def del_extra(self, key):
+        """
+        Delete the extra `key` of the stored node and increment its version number.
+
+        :raise AttributeError: if the extra does not exist
+        """
+        if not self._update_json_field('extras', '- %s::text', [key], 'extras ? %s', [key]):
+            raise AttributeError("DbExtra {} does not exist".format(key))
+        self.extras.pop(key, None)
+
+    def get_json_value(self, field_name, key):
+        """
+        Return the value of an attribute or extra of the stored node, without loading the whole column.
+
+        :param field_name: either 'attributes' or 'extras'
+        :param key: the key, where the separator can be used to get an element of a list or dictionary
+        :raise AttributeError: if the key does not exist
+        """
+        from django.db import connection
+        from aiida.backends.utils import isoformat_to_datetime
+
+        path = key.split(AIIDA_ATTRIBUTE_SEP)
+        query = 'SELECT {field} #> %s IS NOT NULL, {field} #> %s FROM db_dbnode WHERE id = %s'.format(
+            field=self._json_field_column(field_name))
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, [path, path, self.pk])
+            row = cursor.fetchone()
+
+        if row is None or not row[0]:
+            raise AttributeError("Key '{}' does not exist".format(key))
+
+        return isoformat_to_datetime(row[1])
+
+    def get_json_field(self, field_name):
+        """
+        Reload and return the attributes or extras of the stored node.
+
+        :param field_name: either 'attributes' or 'extras'
+        """
+        self._json_field_column(field_name)
+        value = DbNode.objects.filter(pk=self.pk).values_list(field_name, flat=True).get()
+        setattr(self, field_name, value)
+        return value
+
+    def _json_field_column(self, field_name):
+        if field_name not in self._JSON_FIELDS:
+            raise ValueError("invalid JSON field '{}'".format(field_name))
+        return field_name
+
+    def _update_json_field(self, field_name, operation, params, condition=None, condition_params=(),
+                           increment_version=True):
+        """
+        Update a JSON column of the stored node with a single statement, that does not write any other column.
+
+        :param field_name: either 'attributes' or 'extras'
+        :param operation: an SQL operator with a placeholder for its operand, which is applied to the current value of
+            the column, or None to replace the value of the column with the first parameter
+        :param params: the parameters of the operation, where dictionaries are converted to JSON
+        :param condition: an optional SQL condition for the node to be updated
+        :param condition_params: the parameters of the condition
+        :param increment_version: whether to increment the version number and the modification time of the node
+        :return: True if the node was updated, False if it does not satisfy the condition
+        """
+        from django.db import connection
+
+        column = self._json_field_column(field_name)
+        field = self._meta.get_field(column)
+
+        if operation is None:
+            assignment = '%s::jsonb'
+        else:
+            assignment = "(COALESCE({column}, '{{}}'::jsonb) {operation})".format(column=column, operation=operation)
+
+        assignments = ['{} = {}'.format(column, assignment)]
+        if increment_version:
+            assignments.append('nodeversion = nodeversion + 1')
+            assignments.append('mtime = NOW()')
+
+        query = 'UPDATE db_dbnode SET {} WHERE id = %s'.format(', '.join(assignments))
+        if condition is not None:
+            query += ' AND {}'.format(condition)
+        query += ' RETURNING nodeversion, mtime'
+
+        params = [field.get_prep_value(param) if isinstance(param, dict) else param for param in params]
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params + [self.pk] + list(condition_params))
+            row = cursor.fetchone()
+
+        if row is None:
+            return False
+
+        self.nodeversion, self.mtime = row
+        return True
 
     def __str__(self):
         simplename = self.get_simple_name(invalid_result="Unknown")
@@ -1020,215 +1177,6 @@ class DbMultipleValueAttributeBaseClass(m.Model):
         cls.objects.filter(query).delete()
 
 
-@python_2_unicode_compatible
-class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
-    """
-    Abstract base class for tables storing element-attribute-value data.
-    Element is the dbnode; attribute is the key name.
-    Value is the specific value to store.
-
-    This table had different SQL columns to store different types of data, and
-    a datatype field to know the actual datatype.
-
-    Moreover, this class unpacks dictionaries and lists when possible, so that
-    it is possible to query inside recursive lists and dicts.
-    """
-    # In this way, the related name for the DbAttribute inherited class will be
-    # 'dbattributes' and for 'dbextra' will be 'dbextras'
-    # Moreover, automatically destroy attributes and extras if the parent
-    # node is deleted
-    dbnode = m.ForeignKey('DbNode', related_name='%(class)ss', on_delete=m.CASCADE)
-    # max_length is required by MySql to have indexes and unique constraints
-
-    _subspecifier_field_name = 'dbnode'
-
-    class Meta:
-        unique_together = (("dbnode", "key"))
-        abstract = True
-
-    @classmethod
-    def list_all_node_elements(cls, dbnode):
-        """
-        Return a django queryset with the attributes of the given node,
-        only at deepness level zero (i.e., keys not containing the separator).
-        """
-        from django.db.models import Q
-
-        # This node, and does not contain the separator
-        # (=> show only level-zero entries)
-        query = Q(dbnode=dbnode) & ~Q(key__contains=cls._sep)
-        return cls.objects.filter(query)
-
-    @classmethod
-    def get_value_for_node(cls, dbnode, key):
-        """
-        Get an attribute from the database for the given dbnode.
-
-        :return: the value stored in the Db table, correctly converted
-            to the right type.
-        :raise AttributeError: if no key is found for the given dbnode
-        """
-        try:
-            attr = cls.objects.get(dbnode=dbnode, key=key)
-        except ObjectDoesNotExist:
-            raise AttributeError("{} with key {} for node {} not found "
-                                 "in db".format(cls.__name__, key, dbnode.pk))
-        return attr.getvalue()
-
-    @classmethod
-    def get_all_values_for_node(cls, dbnode):
-        """
-        Return a dictionary with all attributes for the given dbnode.
-
-        :return: a dictionary where each key is a level-0 attribute
-            stored in the Db table, correctly converted
-            to the right type.
-        """
-        return cls.get_all_values_for_nodepk(dbnode.pk)
-
-    @classmethod
-    def get_all_values_for_nodepk(cls, dbnodepk):
-        """
-        Return a dictionary with all attributes for the dbnode with given PK.
-
-        :return: a dictionary where each key is a level-0 attribute
-            stored in the Db table, correctly converted
-            to the right type.
-        """
-        dballsubvalues = cls.objects.filter(dbnode__id=dbnodepk).values_list(
-            'key', 'datatype', 'tval', 'fval',
-            'ival', 'bval', 'dval')
-
-        data = {_[0]: {
-            "datatype": _[1],
-            "tval": _[2],
-            "fval": _[3],
-            "ival": _[4],
-            "bval": _[5],
-            "dval": _[6],
-        } for _ in dballsubvalues
-        }
-        try:
-            return deserialize_attributes(data, sep=cls._sep,
-                                          original_class=cls,
-                                          original_pk=dbnodepk)
-        except DeserializationException as exc:
-            exc = DbContentError(exc)
-            exc.original_exception = exc
-            raise exc
-
-    @classmethod
-    def reset_values_for_node(cls, dbnode, attributes, with_transaction=True,
-                              return_not_store=False):
-        from django.db import transaction
-
-        # cls.validate_key(key)
-
-        nodes_to_store = []
-
-        try:
-            if with_transaction:
-                sid = transaction.savepoint()
-
-            if isinstance(dbnode, six.integer_types):
-                dbnode_node = DbNode(id=dbnode)
-            else:
-                dbnode_node = dbnode
-
-            # create_value returns a list of nodes to store
-            for k, v in attributes.items():
-                nodes_to_store.extend(
-                    cls.create_value(k, v,
-                                     subspecifier_value=dbnode_node,
-                                     ))
-
-            if return_not_store:
-                return nodes_to_store
-            else:
-                # Reset. For set, use also a filter for key__in=attributes.keys()
-                cls.objects.filter(dbnode=dbnode_node).delete()
-
-                if nodes_to_store:
-                    cls.objects.bulk_create(nodes_to_store)
-
-            if with_transaction:
-                transaction.savepoint_commit(sid)
-        except:
-            if with_transaction:
-                transaction.savepoint_rollback(sid)
-            raise
-
-    @classmethod
-    def set_value_for_node(cls, dbnode, key, value, with_transaction=True,
-                           stop_if_existing=False):
-        """
-        This is the raw-level method that accesses the DB. No checks are done
-        to prevent the user from (re)setting a valid key.
-        To be used only internally.
-
-        :todo: there may be some error on concurrent write;
-           not checked in this unlucky case!
-
-        :param dbnode: the dbnode for which the attribute should be stored;
-          in an integer is passed, this is used as the PK of the dbnode,
-          without any further check (for speed reasons)
-        :param key: the key of the attribute to store; must be a level-zero
-          attribute (i.e., no separators in the key)
-        :param value: the value of the attribute to store
-        :param with_transaction: if True (default), do this within a transaction,
-           so that nothing gets stored if a subitem cannot be created.
-           Otherwise, if this parameter is False, no transaction management
-           is performed.
-        :param stop_if_existing: if True, it will stop with an
-           UniquenessError exception if the key already exists
-           for the given node. Otherwise, it will
-           first delete the old value, if existent. The use with True is
-           useful if you want to use a given attribute as a "locking" value,
-           e.g. to avoid to perform an action twice on the same node.
-           Note that, if you are using transactions, you may get the error
-           only when the transaction is committed.
-
-        :raise ValueError: if the key contains the separator symbol used
-            internally to unpack dictionaries and lists (defined in cls._sep).
-        """
-        if isinstance(dbnode, six.integer_types):
-            dbnode_node = DbNode(id=dbnode)
-        else:
-            dbnode_node = dbnode
-
-        cls.set_value(key, value, with_transaction=with_transaction,
-                      subspecifier_value=dbnode_node,
-                      stop_if_existing=stop_if_existing)
-
-    @classmethod
-    def del_value_for_node(cls, dbnode, key):
-        """
-        Delete an attribute from the database for the given dbnode.
-
-        :note: no exception is raised if no attribute with the given key is
-          found in the DB.
-
-        :param dbnode: the dbnode for which you want to delete the key.
-        :param key: the key to delete.
-        """
-        cls.del_value(key, subspecifier_value=dbnode)
-
-    @classmethod
-    def has_key(cls, dbnode, key):
-        """
-        Return True if the given dbnode has an attribute with the given key,
-        False otherwise.
-        """
-        return bool(cls.objects.filter(dbnode=dbnode, key=key))
-
-    def __str__(self):
-        return "[{} ({})].{} ({})".format(
-            self.dbnode.get_simple_name(invalid_result="Unknown node"),
-            self.dbnode.pk,
-            self.key,
-            self.datatype, )
-
-
 @python_2_unicode_compatible
 class DbSetting(DbMultipleValueAttributeBaseClass):
     """
@@ -1243,26 +1191,6 @@ class DbSetting(DbMultipleValueAttributeBaseClass):
         return "'{}'={}".format(self.key, self.getvalue())
 
 
-class DbAttribute(DbAttributeBaseClass):
-    """
-    This table stores attributes that uniquely define the content of the
-    node. Therefore, their modification corrupts the data.
-    """
-    pass
-
-
-class DbExtra(DbAttributeBaseClass):
-    """
-    This table stores extra data, still in the key-value format,
-    that the user can attach to a node.
-    Therefore, their modification simply changes the user-defined data,
-    but does not corrupt the node (it will still be loadable without errors).
-    Could be useful to add "duplicate" information for easier querying, or
-    for tagging nodes.
-    """
-    pass
-
-
 class DbCalcState(m.Model):
     """
     Store the state of calculations.
@@ -1283,6 +1211,23 @@ class DbCalcState(m.Model):
         unique_together = (("dbnode", "state"))
 
 
+class DbCheckpoint(m.Model):
+    """
+    Store the checkpoint of a process, as its calculation node.
+
+    A checkpoint is split in one row per top-level key of the saved process state, such that a new checkpoint only
+    needs to rewrite the rows whose value changed since the previous one.
+    """
+    # Delete the checkpoint when deleting the calc, it cannot be loaded without it
+    dbnode = m.ForeignKey(DbNode, on_delete=m.CASCADE, related_name='dbcheckpoints')
+    key = m.CharField(max_length=255)
+    codec = m.CharField(max_length=32)
+    data = m.BinaryField()
+
+    class Meta:
+        unique_together = (("dbnode", "key"))
+
+
 @python_2_unicode_compatible
 class DbGroup(m.Model):
     """
@@ -1754,8 +1699,8 @@ class DbWorkflowStep(m.Model):
         if (state == None):
             return JobCalculation.query(workflow_step=self)
         else:
-            return JobCalculation.query(workflow_step=self).filter(
-                dbattributes__key="state", dbattributes__tval=state)
+            return JobCalculation.query(workflow_step=self).extra(
+                where=["db_dbnode.attributes ->> 'state' = %s"], params=[state])
 
     def remove_calculations(self):
         self.calculations.all().delete()
@@ -67,45 +67,34 @@ class TestDuplicateNodeUuidMigration(TestMigrations):
     migrate_to = '0014_add_node_uuid_unique_constraint'
 
     def setUpBeforeMigration(self, apps):
-        from aiida.orm.data.bool import Bool
-        from aiida.orm.data.int import Int
+        # The nodes are created through the historical models, since the current ORM requires the latest schema
+        from aiida.common.folders import RepositoryFolder
+        from aiida.common.utils import get_new_uuid
+
+        DbNode = apps.get_model('db', 'DbNode')
+        DbUser = apps.get_model('db', 'DbUser')
+        user = DbUser.objects.get(email=self.user_email)
 
         self.file_name = 'test.temp'
         self.file_content = '#!/bin/bash\n\necho test run\n'
 
+        self.nodes_boolean = []
+        self.nodes_integer = []
+        self.n_bool_duplicates = 2
+        self.n_int_duplicates = 4
+
         with tempfile.NamedTemporaryFile(mode='w+') as handle:
             handle.write(self.file_content)
             handle.flush()
 
-            self.nodes_boolean = []
-            self.nodes_integer = []
-            self.n_bool_duplicates = 2
-            self.n_int_duplicates = 4
-
-            node_bool = Bool(True)
-            node_bool.add_path(handle.name, self.file_name)
-            node_bool.store()
-
-            node_int = Int(1)
-            node_int.add_path(handle.name, self.file_name)
-            node_int.store()
-
-            self.nodes_boolean.append(node_bool)
-            self.nodes_integer.append(node_int)
-
-            for i in range(self.n_bool_duplicates):
-                node = Bool(True)
-                node.dbnode.uuid = node_bool.uuid
-                node.add_path(handle.name, self.file_name)
-                node.store()
-                self.nodes_boolean.append(node)
+            for node_type, nodes, n_duplicates in [('data.bool.Bool.', self.nodes_boolean, self.n_bool_duplicates),
+                                                   ('data.int.Int.', self.nodes_integer, self.n_int_duplicates)]:
+                uuid = get_new_uuid()
+                folder = RepositoryFolder('node', uuid).get_subfolder('path', create=True)
+                folder.insert_path(handle.name, self.file_name)
 
-            for i in range(self.n_int_duplicates):
-                node = Int(1)
-                node.dbnode.uuid = node_int.uuid
-                node.add_path(handle.name, self.file_name)
-                node.store()
-                self.nodes_integer.append(node)
+                for _ in range(n_duplicates + 1):
+                    nodes.append(DbNode.objects.create(type=node_type, uuid=uuid, user=user).pk)
 
         # Verify that there are duplicate UUIDs by checking that the following function raises
         with self.assertRaises(IntegrityError):
@@ -117,21 +106,68 @@ class TestDuplicateNodeUuidMigration(TestMigrations):
 
     def test_deduplicated_uuids(self):
         """Verify that after the migration, all expected nodes are still there with unique UUIDs."""
-        from aiida.orm import load_node
+        from aiida.common.folders import RepositoryFolder
+
+        DbNode = self.apps.get_model('db', 'DbNode')
 
         # If the duplicate UUIDs were successfully fixed, the following should not raise.
         verify_node_uuid_uniqueness()
 
         # Reload the nodes by PK and check that all UUIDs are now unique
-        nodes_boolean = [load_node(node.pk) for node in self.nodes_boolean]
-        uuids_boolean = [node.uuid for node in nodes_boolean]
-        self.assertEqual(len(set(uuids_boolean)), len(nodes_boolean))
+        uuids_boolean = DbNode.objects.filter(pk__in=self.nodes_boolean).values_list('uuid', flat=True)
+        self.assertEqual(len(set(uuids_boolean)), len(self.nodes_boolean))
 
-        nodes_integer = [load_node(node.pk) for node in self.nodes_integer]
-        uuids_integer = [node.uuid for node in nodes_integer]
-        self.assertEqual(len(set(uuids_integer)), len(nodes_integer))
+        uuids_integer = DbNode.objects.filter(pk__in=self.nodes_integer).values_list('uuid', flat=True)
+        self.assertEqual(len(set(uuids_integer)), len(self.nodes_integer))
 
-        for node in nodes_boolean:
-            with node._get_folder_pathsubfolder.open(self.file_name) as handle:
+        for uuid in uuids_boolean:
+            folder = RepositoryFolder('node', uuid).get_subfolder('path')
+            with folder.open(self.file_name) as handle:
                 content = handle.read()
                 self.assertEqual(content, self.file_content)
+
+
+class TestAttributesExtrasToJsonbMigration(TestMigrations):
+
+    migrate_from = '0017_add_checkpoint_table'
+    migrate_to = '0018_attributes_extras_jsonb'
+
+    def setUpBeforeMigration(self, apps):
+        from aiida.common.utils import get_new_uuid
+
+        DbNode = apps.get_model('db', 'DbNode')
+        DbUser = apps.get_model('db', 'DbUser')
+        DbAttribute = apps.get_model('db', 'DbAttribute')
+        DbExtra = apps.get_model('db', 'DbExtra')
+        user = DbUser.objects.get(email=self.user_email)
+
+        node = DbNode.objects.create(type='data.Data.', uuid=get_new_uuid(), user=user)
+        self.node_pk = node.pk
+        self.node_empty_pk = DbNode.objects.create(type='data.Data.', uuid=get_new_uuid(), user=user).pk
+
+        # The nested dictionary {'a': 1, 'b': [True, 'c']} as stored in the key-value tables
+        for model in [DbAttribute, DbExtra]:
+            model.objects.create(dbnode=node, key='integer', datatype='int', ival=2)
+            model.objects.create(dbnode=node, key='float', datatype='float', fval=2.5)
+            model.objects.create(dbnode=node, key='nested', datatype='dict', ival=2)
+            model.objects.create(dbnode=node, key='nested.a', datatype='int', ival=1)
+            model.objects.create(dbnode=node, key='nested.b', datatype='list', ival=2)
+            model.objects.create(dbnode=node, key='nested.b.0', datatype='bool', bval=True)
+            model.objects.create(dbnode=node, key='nested.b.1', datatype='txt', tval='c')
+
+        DbExtra.objects.create(dbnode=node, key='_aiida_hash', datatype='txt', tval='some_hash')
+
+    def test_attributes_extras(self):
+        """Verify that the attributes and extras have been copied into the JSONB columns."""
+        DbNode = self.apps.get_model('db', 'DbNode')
+
+        expected = {'integer': 2, 'float': 2.5, 'nested': {'a': 1, 'b': [True, 'c']}}
+
+        attributes, extras = DbNode.objects.filter(pk=self.node_pk).values_list('attributes', 'extras').get()
+        self.assertEqual(attributes, expected)
+        expected['_aiida_hash'] = 'some_hash'
+        self.assertEqual(extras, expected)
+
+        attributes, extras = DbNode.objects.filter(pk=self.node_empty_pk).values_list('attributes', 'extras').get()
+        self.assertEqual(attributes, {})
+        self.assertEqual(extras, {})
@@ -99,11 +99,9 @@ class TestDataNodeDjango(AiidaTestCase):
                                 output_links_b[1].output.uuid])
         self.assertEquals(uuid_set, uuid_set_db_link)
 
-        # Query for related fields using django syntax
-        # Note that being myvalue an attribute, it is internally stored starting
-        # with an underscore
-        nodes_with_given_attribute = Node.query(dbattributes__key='myvalue',
-                                                dbattributes__ival=145)
+        # Query on the attributes, that are stored in a JSONB column
+        nodes_with_given_attribute = Node.query().extra(
+            where=["db_dbnode.attributes @> %s::jsonb"], params=['{"myvalue": 145}'])
         # should be entry a3
         self.assertEquals(len(nodes_with_given_attribute), 1)
         self.assertTrue(isinstance(nodes_with_given_attribute[0], Node))
@@ -250,7 +248,7 @@ class TestNodeBasicDjango(AiidaTestCase):
         when replacing list and dict with objects that have no deepness,
         no junk is left in the DB (i.e., no 'dict.a', 'list.3.h', ...
         """
-        from aiida.backends.djsite.db.models import DbExtra
+        from aiida.backends.djsite.db.models import DbNode
 
         a = Node().store()
         extras_to_set = {
@@ -291,19 +289,19 @@ class TestNodeBasicDjango(AiidaTestCase):
         # Check (manually) that, when replacing list and dict with objects
         # that have no deepness, no junk is left in the DB (i.e., no
         # 'dict.a', 'list.3.h', ...
-        self.assertEquals(len(DbExtra.objects.filter(
-            dbnode=a, key__startswith=('list' + DbExtra._sep))), 0)
-        self.assertEquals(len(DbExtra.objects.filter(
-            dbnode=a, key__startswith=('dict' + DbExtra._sep))), 0)
+        extras_in_db = DbNode.objects.filter(pk=a.pk).values_list('extras', flat=True).get()
+        self.assertEquals(extras_in_db['list'], 66.3)
+        self.assertEquals(extras_in_db['dict'], 'text')
+        self.assertEquals(extras_in_db, extras_to_set)
 
     def test_attrs_and_extras_wrong_keyname(self):
         """
         Attribute keys cannot include the separator symbol in the key
         """
-        from aiida.backends.djsite.db.models import DbAttributeBaseClass
+        from aiida.backends.utils import AIIDA_ATTRIBUTE_SEP
         from aiida.common.exceptions import ValidationError
 
-        separator = DbAttributeBaseClass._sep
+        separator = AIIDA_ATTRIBUTE_SEP
 
         a = Node()
 
@@ -85,10 +85,8 @@ class DjangoQueryManager(AbstractQueryManager):
         if only_enabled:
             kwargs['dbcomputer__enabled'] = True
 
-        queryresults = JobCalculation.query(
-            dbattributes__key='state',
-            dbattributes__tval=state,
-            **kwargs)
+        queryresults = JobCalculation.query(**kwargs).extra(
+            where=["db_dbnode.attributes ->> 'state' = %s"], params=[state])
 
         if only_computer_user_pairs:
             computer_users_ids = queryresults.values_list(
@@ -197,10 +195,9 @@ class DjangoQueryManager(AbstractQueryManager):
         """
         Returns bands and closest parent structure     
         """
-        from collections import defaultdict
+        from django.db import connection
         from django.db.models import Q
         from aiida.common.utils import grouper
-        from aiida.backends.djsite.db import models
         from aiida.orm.backend import construct_backend
         from aiida.orm.data.structure import (get_formula, get_symbols_string)
         from aiida.orm.data.array.bands import BandsData
@@ -238,25 +235,11 @@ class DjangoQueryManager(AbstractQueryManager):
             struc_pks = [structure_dict[pk] for pk in pks]
 
             # query for the attributes needed for the structure formula
-            attr_query = Q(key__startswith='kinds') | Q(key__startswith='sites')
-            attrs = models.DbAttribute.objects.filter(attr_query,
-                                                      dbnode__in=struc_pks).values_list(
-                'dbnode__pk', 'key', 'datatype', 'tval', 'fval',
-                'ival', 'bval', 'dval')
-
-            results = defaultdict(dict)
-            for attr in attrs:
-                results[attr[0]][attr[1]] = {"datatype": attr[2],
-                                             "tval": attr[3],
-                                             "fval": attr[4],
-                                             "ival": attr[5],
-                                             "bval": attr[6],
-                                             "dval": attr[7]}
-            # organize all of it in a dictionary
-            deser_data = {}
-            for k in results:
-                deser_data[k] = models.deserialize_attributes(results[k],
-                                                              sep=models.DbAttribute._sep)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT id, attributes -> 'kinds', attributes -> 'sites' FROM db_dbnode "
+                               "WHERE id = ANY(%s)", [[pk for pk in struc_pks if pk is not None]])
+                # organize all of it in a dictionary
+                deser_data = {pk: {'kinds': kinds, 'sites': sites} for pk, kinds, sites in cursor.fetchall()}
 
             # prepare the printout
             for ((bid, blabel, bdate), struc_pk) in zip(this_chunk, struc_pks):
@@ -296,6 +279,20 @@ class DjangoQueryManager(AbstractQueryManager):
 
         return entry_list
 
+    def traverse_links(self, node_pks, forward_link_types=(), backward_link_types=(), max_depth=None,
+                       batch_size=1000):
+        """
+        Overrides the implementation using the QueryBuilder with a single recursive query, if the database is
+        PostgreSQL.
+        """
+        from django.db import connection
+
+        if connection.vendor != 'postgresql':
+            return super(DjangoQueryManager, self).traverse_links(
+                node_pks, forward_link_types, backward_link_types, max_depth=max_depth, batch_size=batch_size)
+
+        return self._traverse_links_recursive(node_pks, forward_link_types, backward_link_types, max_depth=max_depth)
+
     def get_all_parents(self, node_pks, return_values=['id']):
         """
         Get all the parents of given nodes
@@ -102,32 +102,6 @@ class DbCalcState(Base):
     )
 
 
-class DbAttribute(Base):
-    __tablename__ = "db_dbattribute"
-    id = Column(Integer, primary_key=True)
-    dbnode_id = Column(Integer, ForeignKey('db_dbnode.id'))
-    key = Column(String(255))
-    datatype = Column(String(10))
-    tval = Column(String, default='')
-    fval = Column(Float, default=None, nullable=True)
-    ival = Column(Integer, default=None, nullable=True)
-    bval = Column(Boolean, default=None, nullable=True)
-    dval = Column(DateTime, default=None, nullable=True)
-
-
-class DbExtra(Base):
-    __tablename__ = "db_dbextra"
-    id = Column(Integer, primary_key=True)
-    dbnode_id = Column(Integer, ForeignKey('db_dbnode.id'))
-    key = Column(String(255))
-    datatype = Column(String(10))
-    tval = Column(String, default='')
-    fval = Column(Float, default=None, nullable=True)
-    ival = Column(Integer, default=None, nullable=True)
-    bval = Column(Boolean, default=None, nullable=True)
-    dval = Column(DateTime, default=None, nullable=True)
-
-
 class DbComputer(Base):
     __tablename__ = "db_dbcomputer"
 
@@ -281,8 +255,8 @@ class DbNode(Base):
 
     nodeversion = Column(Integer, default=1)
 
-    attributes = relationship('DbAttribute', uselist=True, backref='dbnode')
-    extras = relationship('DbExtra', uselist=True, backref='dbnode')
+    attributes = Column(JSONB, default={})
+    extras = Column(JSONB, default={})
 
     outputs = relationship(
         "DbNode",
@@ -310,15 +284,28 @@ class DbNode(Base):
 
         :returns: An instance of the plugin class
         """
+        from aiida.orm.utils.identity_map import get_or_load_node
+
+        # A node already in the identity map is returned without instantiating the django DbNode
+        return get_or_load_node(self.id, self._load_aiida_class)
+
+    def _load_aiida_class(self):
+        """
+        Return a new instance of the plugin class of this node, see :meth:`get_aiida_class`.
+        """
         # I need to import the DbNode in the Django model,
         # and instantiate an object that has the same attributes as self.
         from aiida.backends.djsite.db.models import DbNode as DjangoSchemaDbNode
+        from aiida.backends.utils import isoformat_to_datetime
         dbnode = DjangoSchemaDbNode(
             id=self.id, type=self.type, process_type=self.process_type, uuid=self.uuid, ctime=self.ctime,
             mtime=self.mtime, label=self.label, description=self.description, dbcomputer_id=self.dbcomputer_id,
-            user_id=self.user_id, public=self.public, nodeversion=self.nodeversion
+            user_id=self.user_id, public=self.public, nodeversion=self.nodeversion,
+            attributes=isoformat_to_datetime(self.attributes), extras=isoformat_to_datetime(self.extras)
         )
-        return dbnode.get_aiida_class()
+        # The instance corresponds to an existing row, such that saving it does not overwrite its JSON columns
+        dbnode._state.adding = False
+        return dbnode._load_aiida_class()
 
     @hybrid_property
     def user_email(self):
@@ -12,26 +12,22 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
-import datetime
-from datetime import datetime
 from json import loads as json_loads
 
 import six
 
 # ~ import aiida.backends.djsite.querybuilder_django.dummy_model as dummy_model
 from . import dummy_model
-from aiida.backends.djsite.db.models import DbAttribute, DbExtra, ObjectDoesNotExist
 
-from sqlalchemy import and_, or_, not_, exists, select, exists, case
-from sqlalchemy.types import Float, String
-from sqlalchemy.orm import aliased
+from sqlalchemy import and_, or_, not_
 from sqlalchemy.orm.attributes import InstrumentedAttribute, QueryableAttribute
 
-from sqlalchemy.sql.expression import cast, ColumnClause
+from sqlalchemy.sql.expression import ColumnClause
 from sqlalchemy.sql.elements import Cast, Label
 from aiida.common.exceptions import InputValidationError
 from aiida.backends.general.querybuilder_interface import QueryBuilderInterface
-from aiida.backends.utils import _get_column
+from aiida.backends.sqlalchemy.querybuilder_sqla import get_filter_expr_from_jsonb, get_projectable_jsonb_attribute
+from aiida.backends.utils import _get_column, isoformat_to_datetime
 from aiida.common.exceptions import (
     InputValidationError, DbContentError,
     MissingPluginError, ConfigurationError
@@ -269,14 +265,10 @@ class QueryBuilderImplDjango(QueryBuilderInterface):
 
     def modify_expansions(self, alias, expansions):
         """
-        For the Django schema, we have as additioanl expansions 'attributes'
-        and 'extras'
+        For the Django schema, the metadata of the computers is stored in
+        the '_metadata' column
         """
-
-        if issubclass(alias._sa_class_manager.class_, self.Node):
-            expansions.append("attributes")
-            expansions.append("extras")
-        elif issubclass(alias._sa_class_manager.class_, self.Computer):
+        if issubclass(alias._sa_class_manager.class_, self.Computer):
             try:
                 expansions.remove('metadata')
                 expansions.append('_metadata')
@@ -290,172 +282,20 @@ class QueryBuilderImplDjango(QueryBuilderInterface):
             column=None, column_name=None,
             alias=None):
 
-        def get_attribute_db_column(mapped_class, dtype, castas=None):
-            if dtype == 't':
-                mapped_entity = mapped_class.tval
-                additional_type_constraint = None
-            elif dtype == 'b':
-                mapped_entity = mapped_class.bval
-                additional_type_constraint = None
-            elif dtype == 'f':
-                mapped_entity = mapped_class.fval
-                additional_type_constraint = None
-            elif dtype == 'i':
-                mapped_entity = mapped_class.ival
-                # IN the schema, we also have dicts and lists storing something in the
-                # ival column, namely the length. I need to check explicitly whether
-                # this is meant to be an integer!
-                additional_type_constraint = mapped_class.datatype == 'int'
-            elif dtype == 'd':
-                mapped_entity = mapped_class.dval
-                additional_type_constraint = None
-            else:
-                raise InputValidationError(
-                    "I don't know what to do with dtype {}".format(dtype)
-                )
-            if castas == 't':
-                mapped_entity = cast(mapped_entity, String)
-            elif castas == 'f':
-                mapped_entity = cast(mapped_entity, Float)
-
-            return mapped_entity, additional_type_constraint
+        # The attributes and extras are stored in JSONB columns, as in the SQLAlchemy schema
+        if column is None:
+            column = _get_column(column_name, alias)
 
-        if column:
-            mapped_class = column.prop.mapper.class_
-        else:
-            column = getattr(alias, column_name)
-            mapped_class = column.prop.mapper.class_
-        # Ok, so we have an attribute key here.
-        # Unless cast is specified, will try to infer my self where the value
-        # is stored
-        # Datetime -> dval
-        # bool -> bval
-        # string -> tval
-        # integer -> ival, fval (cast ival to float)
-        # float -> ival, fval (cast ival to float)
-        # If the user specified of_type ??
-        # That is basically a query for where the value is sitting
-        #   (which db_column in the dbattribtues)
-        # If the user specified in what to cast, he wants an operation to
-        #   be performed to cast the value to a different type
-        if isinstance(value, (list, tuple)):
-            value_type_set = set([type(i) for i in value])
-            if len(value_type_set) > 1:
-                raise InputValidationError('{}  contains more than one type'.format(value))
-            elif len(value_type_set) == 0:
-                raise InputValidationError('Given list is empty, cannot determine type')
-            else:
-                value_to_consider = value[0]
-        else:
-            value_to_consider = value
-
-        # First cases, I maybe need not do anything but just count the
-        # number of entries
-        if operator in ('of_length', 'shorter', 'longer'):
-            raise NotImplementedError(
-                "Filtering by lengths of arrays or lists is not implemented\n"
-                "in the Django-Backend"
-            )
-        elif operator == 'of_type':
-            raise NotImplementedError(
-                "Filtering by type is not implemented\n"
-                "in the Django-Backend"
-            )
-        elif operator == 'contains':
-            raise NotImplementedError(
-                "Contains is not implemented in the Django-backend"
-            )
-
-
-        elif operator == 'has_key':
-            if issubclass(mapped_class, dummy_model.DbAttribute):
-                expr = alias.attributes.any(mapped_class.key == '.'.join(attr_key + [value]))
-            elif issubclass(mapped_class, dummy_model.DbExtra):
-                expr = alias.extras.any(mapped_class.key == '.'.join(attr_key + [value]))
-            else:
-                raise TypeError("I was given {} as an attribute base class".format(mapped_class))
-
-        else:
-            types_n_casts = []
-            if isinstance(value_to_consider, six.string_types):
-                types_n_casts.append(('t', None))
-            elif isinstance(value_to_consider, bool):
-                types_n_casts.append(('b', None))
-            elif isinstance(value_to_consider, (int, float)):
-                types_n_casts.append(('f', None))
-                types_n_casts.append(('i', 'f'))
-            elif isinstance(value_to_consider, datetime):
-                types_n_casts.append(('d', None))
-
-            expressions = []
-            for dtype, castas in types_n_casts:
-                attr_column, additional_type_constraint = get_attribute_db_column(
-                                mapped_class, dtype, castas=castas)
-                expression_this_typ_cas = self.get_filter_expr(
-                            operator, value, attr_key=[],
-                            column=attr_column,
-                            is_attribute=False
-                        )
-                if additional_type_constraint is not None:
-                    expression_this_typ_cas = and_(
-                        expression_this_typ_cas, additional_type_constraint)
-                expressions.append(expression_this_typ_cas)
-
-            actual_attr_key = '.'.join(attr_key)
-            expr = column.any(and_(
-                mapped_class.key == actual_attr_key,
-                or_(*expressions)
-            )
-            )
-        return expr
+        return get_filter_expr_from_jsonb(operator, value, attr_key, column)
 
     def get_projectable_attribute(
             self, alias, column_name, attrpath,
             cast=None, **kwargs
     ):
-        if cast is not None:
-            raise NotImplementedError(
-                "Casting is not implemented in the Django backend"
-            )
-        if not attrpath:
-            # If the user with Django backend wants all the attributes or all
-            # the extras, I will select as entity the ID of the node.
-            # in get_aiida_res, this is transformed to the dictionary of attributes.
-            if column_name in ('attributes', 'extras'):
-                entity = alias.id
-            else:
-                raise NotImplementedError(
-                    "Whatever you asked for "
-                    "({}) is not implemented"
-                    "".format(column_name)
-                )
-        else:
-            aliased_attributes = aliased(getattr(alias, column_name).prop.mapper.class_)
-
-            if not issubclass(alias._aliased_insp.class_, self.Node):
-                NotImplementedError(
-                    "Other classes than Nodes are not implemented yet"
-                )
-
-            attrkey = '.'.join(attrpath)
-
-            exists_stmt = exists(select([1], correlate=True).select_from(
-                aliased_attributes
-            ).where(and_(
-                aliased_attributes.key == attrkey,
-                aliased_attributes.dbnode_id == alias.id
-            )))
-
-            select_stmt = select(
-                [aliased_attributes.id], correlate=True
-            ).select_from(aliased_attributes).where(and_(
-                aliased_attributes.key == attrkey,
-                aliased_attributes.dbnode_id == alias.id
-            )).label('miao')
-
-            entity = case([(exists_stmt, select_stmt), ], else_=None)
-
-        return entity
+        """
+        :returns: An attribute store in a JSON field of the give column
+        """
+        return get_projectable_jsonb_attribute(_get_column(column_name, alias), attrpath, cast)
 
     def get_aiida_res(self, key, res):
         """
@@ -467,29 +307,9 @@ class QueryBuilderImplDjango(QueryBuilderInterface):
 
         :returns: an aiida-compatible instance
         """
-        if key.startswith('attributes.'):
-            # If you want a specific attributes, that key was stored in res.
-            # So I call the getvalue method to expand into a dictionary
-            try:
-                returnval = DbAttribute.objects.get(id=res).getvalue()
-            except ObjectDoesNotExist:
-                # If the object does not exist, return None. This is consistent
-                # with SQLAlchemy inside the JSON
-                returnval = None
-        elif key.startswith('extras.'):
-            # Same as attributes
-            try:
-                returnval = DbExtra.objects.get(id=res).getvalue()
-            except ObjectDoesNotExist:
-                returnval = None
-        elif key == 'attributes':
-            # If you asked for all attributes, the QB return the ID of the node
-            # I use DbAttribute.get_all_values_for_nodepk
-            # to get the dictionary
-            return DbAttribute.get_all_values_for_nodepk(res)
-        elif key == 'extras':
-            # same as attributes
-            return DbExtra.get_all_values_for_nodepk(res)
+        if key.split('.', 1)[0] in ('attributes', 'extras'):
+            # The JSON values are deserialized by the database driver, but the dates still need to be converted
+            returnval = isoformat_to_datetime(res)
         elif key in ('_metadata', 'transport_params') and res is not None:
             # Metadata and transport_params are stored as json strings in the DB:
             return json_loads(res)
@@ -185,6 +185,210 @@ def delete_nodes_and_connections_django(pks_to_delete):  # pylint: disable=inval
         models.DbNode.objects.filter(pk__in=pks_to_delete).delete()
 
 
+def set_extras_many_django(pks, key, values):
+    """
+    Set the extra `key` of many nodes with a single executemany of in-place `jsonb_set` updates.
+
+    :param pks: a list of node pks
+    :param key: the key of the extra
+    :param values: a list with the value of the extra for each node in `pks`
+    """
+    from django.db import connection, transaction
+    from psycopg2.extras import Json
+    from aiida.backends.utils import datetime_to_isoformat, validate_attribute_key
+
+    validate_attribute_key(key)
+
+    statement = ("UPDATE db_dbnode SET "
+                 "extras = jsonb_set(COALESCE(extras, '{}'::jsonb), ARRAY[%s], %s::jsonb), "
+                 "nodeversion = nodeversion + 1 "
+                 "WHERE id = %s")
+    parameters = [(key, Json(datetime_to_isoformat(value)), pk) for pk, value in zip(pks, values)]
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.executemany(statement, parameters)
+
+
+def update_attributes_many_django(updates):
+    """
+    Set and delete attributes of many nodes with a single executemany of in-place jsonb updates.
+
+    :param updates: a list of tuples (pk, attributes, deleted_keys)
+    """
+    from django.db import connection, transaction
+    from aiida.backends.djsite.db.fields import JsonbField
+
+    field = JsonbField()
+    statement = ("UPDATE db_dbnode SET "
+                 "attributes = (COALESCE(attributes, '{}'::jsonb) - %s::text[]) || %s::jsonb, "
+                 "nodeversion = nodeversion + 1 "
+                 "WHERE id = %s")
+    parameters = [(list(deleted), field.get_prep_value(attributes), pk) for pk, attributes, deleted in updates]
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.executemany(statement, parameters)
+
+
+def get_node_pks_by_extra_django(key, values, node_types=None):
+    """
+    Return the nodes whose extra `key` is one of the given strings.
+
+    :param key: the key of the extra
+    :param values: a list of strings
+    :param node_types: optional list of type strings, to only include nodes whose type is exactly one of them
+    :return: a list of tuples (pk, type, value) ordered by pk
+    """
+    from django.db import connection
+
+    statement = "SELECT id, type, extras ->> %s FROM db_dbnode WHERE extras ->> %s = ANY(%s)"
+    parameters = [key, key, list(values)]
+
+    if node_types is not None:
+        statement += " AND type = ANY(%s)"
+        parameters.append(list(node_types))
+
+    with connection.cursor() as cursor:
+        cursor.execute(statement + " ORDER BY id", parameters)
+        return [tuple(row) for row in cursor.fetchall()]
+
+
+def _compile_querybuilder_pks(querybuilder):
+    """
+    Compile the query of a QueryBuilder into a statement that selects the distinct values of its first projection,
+    that can be executed as a subquery with a Django cursor.
+
+    :param querybuilder: a QueryBuilder
+    :return: a tuple with the SQL of the statement and a dictionary with its parameters
+    """
+    import json
+    from sqlalchemy import select
+    from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+    from aiida.backends.utils import datetime_to_isoformat
+
+    subquery = querybuilder.get_query().subquery()
+    statement = select([list(subquery.c)[0]]).distinct()
+
+    dialect = PGDialect_psycopg2(json_serializer=lambda value: json.dumps(datetime_to_isoformat(value)))
+    compiled = statement.compile(dialect=dialect)
+
+    parameters = compiled.construct_params()
+    for name, bind in compiled.binds.items():
+        processor = bind.type.bind_processor(dialect)
+        if processor is not None and name in parameters:
+            parameters[name] = processor(parameters[name])
+
+    return str(compiled), parameters
+
+
+def add_nodes_to_group_django(group_pk, node_pks, querybuilder):
+    """
+    Add the given nodes to a group with a single statement.
+
+    :param group_pk: the pk of the group
+    :param node_pks: a list of node pks, or None
+    :param querybuilder: a QueryBuilder that projects the nodes, or None
+    """
+    from django.db import connection
+
+    if querybuilder is not None:
+        subquery, parameters = _compile_querybuilder_pks(querybuilder)
+        parameters['aiida_group_pk'] = group_pk
+        statement = ("INSERT INTO db_dbgroup_dbnodes (dbgroup_id, dbnode_id) "
+                     "SELECT %(aiida_group_pk)s, members.id FROM ({}) AS members(id) "
+                     "ON CONFLICT DO NOTHING").format(subquery)
+    else:
+        statement = ("INSERT INTO db_dbgroup_dbnodes (dbgroup_id, dbnode_id) "
+                     "SELECT %s, id FROM db_dbnode WHERE id = ANY(%s) "
+                     "ON CONFLICT DO NOTHING")
+        parameters = [group_pk, node_pks]
+
+    with connection.cursor() as cursor:
+        cursor.execute(statement, parameters)
+
+
+def remove_nodes_from_group_django(group_pk, node_pks, querybuilder):
+    """
+    Remove the given nodes from a group with a single statement.
+
+    :param group_pk: the pk of the group
+    :param node_pks: a list of node pks, or None
+    :param querybuilder: a QueryBuilder that projects the nodes, or None
+    """
+    from django.db import connection
+
+    if querybuilder is not None:
+        subquery, parameters = _compile_querybuilder_pks(querybuilder)
+        parameters['aiida_group_pk'] = group_pk
+        statement = ("DELETE FROM db_dbgroup_dbnodes "
+                     "WHERE dbgroup_id = %(aiida_group_pk)s AND dbnode_id IN ({})").format(subquery)
+    else:
+        statement = "DELETE FROM db_dbgroup_dbnodes WHERE dbgroup_id = %s AND dbnode_id = ANY(%s)"
+        parameters = [group_pk, node_pks]
+
+    with connection.cursor() as cursor:
+        cursor.execute(statement, parameters)
+
+
+def get_checkpoint_rows_django(pk):
+    """
+    Return the rows of the checkpoint of the given calculation node.
+
+    :param pk: the pk of the calculation node
+    :return: a list of tuples (key, codec, data)
+    """
+    from aiida.backends.djsite.db import models
+
+    # pylint: disable=no-member
+    return list(models.DbCheckpoint.objects.filter(dbnode_id=pk).values_list('key', 'codec', 'data'))
+
+
+def set_checkpoint_rows_django(pk, rows, removed_keys):
+    """
+    Replace the rows of the checkpoint of the given calculation node with the given keys, with a single bulk insert.
+
+    :param pk: the pk of the calculation node
+    :param rows: a list of tuples (key, codec, data)
+    :param removed_keys: a list of keys of the rows to delete
+    """
+    from django.db import transaction
+    from aiida.backends.djsite.db import models
+
+    # pylint: disable=no-member
+    to_store = [models.DbCheckpoint(dbnode_id=pk, key=key, codec=codec, data=data) for key, codec, data in rows]
+
+    with transaction.atomic():
+        keys = [row.key for row in to_store] + list(removed_keys)
+        models.DbCheckpoint.objects.filter(dbnode_id=pk, key__in=keys).delete()
+        models.DbCheckpoint.objects.bulk_create(to_store)
+
+
+def delete_checkpoint_rows_django(pk):
+    """
+    Delete the rows of the checkpoint of the given calculation node.
+
+    :param pk: the pk of the calculation node
+    """
+    from aiida.backends.djsite.db import models
+
+    # pylint: disable=no-member
+    models.DbCheckpoint.objects.filter(dbnode_id=pk).delete()
+
+
+def set_node_uuid_django(pk, uuid):
+    """
+    Set the UUID of the given node.
+
+    :param pk: the pk of the node
+    :param uuid: the new UUID of the node
+    """
+    from aiida.backends.djsite.db import models
+
+    # pylint: disable=no-member
+    models.DbNode.objects.filter(pk=pk).update(uuid=uuid)
+
+
 def pass_to_django_manage(argv, profile=None):
     """
     Call the corresponding django manage.py command
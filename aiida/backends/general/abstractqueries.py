@@ -45,6 +45,92 @@ class AbstractQueryManager(object):
             """
         return self.raw(query)
 
+    def get_running_workflow_steps_summary(self):
+        """
+        Return a summary of the state of the calculations and sub workflows of each running step of the legacy
+        workflows, computed with a single aggregated query rather than by loading the calculations and sub workflows.
+
+        A calculation is new if it has no calculation state other than NEW. It finished ok if its process state is
+        finished with a zero exit status, and it failed if its process state is finished with any other exit status.
+        A sub workflow finished ok if it is either FINISHED or SLEEP, and it failed if it is in ERROR.
+
+        :return: list of tuples (step pk, step name, workflow pk, workflow state, number of calculations,
+            list of pks of the new calculations, number of calculations finished ok, number of failed calculations,
+            number of sub workflows, number of sub workflows finished ok, number of failed sub workflows),
+            ordered by step pk
+        """
+        from plumpy import ProcessState
+        from aiida.common.datastructures import calc_states, wf_states
+
+        query = """
+            SELECT step.id, step.name, workflow.id, workflow.state,
+                COALESCE(calculations.total, 0), COALESCE(calculations.new_pks, '{{}}'),
+                COALESCE(calculations.finished_ok, 0), COALESCE(calculations.failed, 0),
+                COALESCE(sub_workflows.total, 0), COALESCE(sub_workflows.finished_ok, 0),
+                COALESCE(sub_workflows.failed, 0)
+            FROM db_dbworkflowstep AS step
+            JOIN db_dbworkflow AS workflow ON workflow.id = step.parent_id
+            LEFT JOIN (
+                SELECT link.dbworkflowstep_id AS step_id, COUNT(*) AS total,
+                    array_agg(node.id ORDER BY node.id) FILTER (WHERE NOT EXISTS (
+                        SELECT 1 FROM db_dbcalcstate AS calcstate
+                        WHERE calcstate.dbnode_id = node.id AND calcstate.state <> '{new}'
+                    )) AS new_pks,
+                    COUNT(*) FILTER (WHERE node.attributes ->> 'process_state' = '{finished}'
+                        AND node.attributes -> 'exit_status' = '0'::jsonb) AS finished_ok,
+                    COUNT(*) FILTER (WHERE node.attributes ->> 'process_state' = '{finished}'
+                        AND node.attributes -> 'exit_status' IS DISTINCT FROM '0'::jsonb) AS failed
+                FROM db_dbworkflowstep_calculations AS link
+                JOIN db_dbnode AS node ON node.id = link.dbnode_id
+                JOIN db_dbworkflowstep AS running
+                    ON running.id = link.dbworkflowstep_id AND running.state = '{running}'
+                GROUP BY link.dbworkflowstep_id
+            ) AS calculations ON calculations.step_id = step.id
+            LEFT JOIN (
+                SELECT link.dbworkflowstep_id AS step_id, COUNT(*) AS total,
+                    COUNT(*) FILTER (WHERE sub.state IN ('{finished_wf}', '{sleep}')) AS finished_ok,
+                    COUNT(*) FILTER (WHERE sub.state = '{error}') AS failed
+                FROM db_dbworkflowstep_sub_workflows AS link
+                JOIN db_dbworkflow AS sub ON sub.id = link.dbworkflow_id
+                JOIN db_dbworkflowstep AS running
+                    ON running.id = link.dbworkflowstep_id AND running.state = '{running}'
+                GROUP BY link.dbworkflowstep_id
+            ) AS sub_workflows ON sub_workflows.step_id = step.id
+            WHERE step.state = '{running}'
+            ORDER BY step.id
+            """.format(
+            new=calc_states.NEW,
+            finished=ProcessState.FINISHED.value,
+            running=wf_states.RUNNING,
+            finished_wf=wf_states.FINISHED,
+            sleep=wf_states.SLEEP,
+            error=wf_states.ERROR)
+
+        return [tuple(row[:5]) + (list(row[5] or []),) + tuple(row[6:]) for row in self.raw(query)]
+
+    def get_terminated_legacy_workflow_pks(self, pks):
+        """
+        Return the pks of the legacy workflows, among the given ones, that have terminated, i.e. whose state is either
+        FINISHED, SLEEP or ERROR.
+
+        :param pks: a list of legacy workflow pks
+        :return: list of the pks of the terminated workflows
+        """
+        from aiida.common.datastructures import wf_states
+
+        if not pks:
+            return []
+
+        query = """
+            SELECT id FROM db_dbworkflow WHERE id IN ({pks}) AND state IN ('{finished}', '{sleep}', '{error}')
+            """.format(
+            pks=', '.join(str(int(pk)) for pk in pks),
+            finished=wf_states.FINISHED,
+            sleep=wf_states.SLEEP,
+            error=wf_states.ERROR)
+
+        return [row[0] for row in self.raw(query)]
+
     # This is an example of a query that could be overriden by a better implementation,
     # for performance reasons:
     def query_jobcalculations_by_computer_user_state(
@@ -330,6 +416,105 @@ class AbstractQueryManager(object):
 
         return entry_list
 
+    def traverse_links(self, node_pks, forward_link_types=(), backward_link_types=(), max_depth=None,
+                       batch_size=1000):
+        """
+        Return the pks of the nodes reachable from the given nodes through links of the given types.
+
+        This implementation expands the graph one level at a time with the QueryBuilder, querying the links of the
+        nodes reached at a level in batches. Backends that can, override it to run the traversal in the database.
+
+        :param node_pks: an iterable of the pks of the nodes to start from, which are always part of the result
+        :param forward_link_types: the values of the link types to follow from their input to their output node
+        :param backward_link_types: the values of the link types to follow from their output to their input node
+        :param max_depth: the maximum number of links followed from the starting nodes, no limit if None
+        :param batch_size: the maximum number of node pks per query
+        :return: a sorted list of node pks
+        """
+        from aiida.common.utils import grouper
+        from aiida.orm.querybuilder import QueryBuilder
+        from aiida.orm import Node
+
+        visited = set(node_pks)
+        frontier = set(visited)
+        depth = 0
+
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            reached = set()
+            for link_types, relationship in [(forward_link_types, 'output_of'), (backward_link_types, 'input_of')]:
+                if not link_types:
+                    continue
+                for chunk in grouper(batch_size, frontier):
+                    builder = QueryBuilder()
+                    builder.append(Node, tag='source', filters={'id': {'in': list(chunk)}})
+                    builder.append(Node, project=['id'], edge_filters={'type': {'in': list(link_types)}},
+                                   **{relationship: 'source'})
+                    reached.update(pk for pk, in builder.iterall(batch_size=batch_size))
+            frontier = reached - visited
+            visited.update(frontier)
+
+        return sorted(visited)
+
+    def _traverse_links_recursive(self, node_pks, forward_link_types=(), backward_link_types=(), max_depth=None):
+        """
+        Return the pks of the nodes reachable from the given nodes through links of the given types.
+
+        The whole traversal is done by the database with a single recursive query, which needs PostgreSQL. See
+        :py:meth:`traverse_links` for the meaning of the parameters.
+
+        :return: a sorted list of node pks
+        """
+        from aiida.common.links import LinkType
+
+        node_pks = sorted(set(int(pk) for pk in node_pks))
+
+        if not node_pks:
+            return []
+
+        def link_types_sql(link_types):
+            # The values are validated against the link types, so they can be safely inlined in the query
+            return ', '.join("'{}'".format(LinkType(link_type).value) for link_type in sorted(set(link_types)))
+
+        # The edges of the graph, oriented in the direction in which they are followed
+        edges = []
+        if forward_link_types:
+            edges.append('SELECT input_id AS source_id, output_id AS target_id FROM db_dblink '
+                         'WHERE type IN ({})'.format(link_types_sql(forward_link_types)))
+        if backward_link_types:
+            edges.append('SELECT output_id AS source_id, input_id AS target_id FROM db_dblink '
+                         'WHERE type IN ({})'.format(link_types_sql(backward_link_types)))
+
+        if not edges:
+            return node_pks
+
+        if max_depth is None:
+            # The UNION discards the nodes that were already reached, so the recursion ends also on cycles
+            query = """
+                WITH RECURSIVE traversal(id) AS (
+                    SELECT unnest(ARRAY[{pks}]::integer[])
+                  UNION
+                    SELECT edges.target_id FROM traversal JOIN ({edges}) AS edges ON edges.source_id = traversal.id
+                )
+                SELECT id FROM traversal ORDER BY id
+                """
+        else:
+            query = """
+                WITH RECURSIVE traversal(id, depth) AS (
+                    SELECT unnest(ARRAY[{pks}]::integer[]), 0
+                  UNION
+                    SELECT edges.target_id, traversal.depth + 1 FROM traversal
+                    JOIN ({edges}) AS edges ON edges.source_id = traversal.id
+                    WHERE traversal.depth < {max_depth}
+                )
+                SELECT DISTINCT id FROM traversal ORDER BY id
+                """
+
+        query = query.format(
+            pks=', '.join(str(pk) for pk in node_pks), edges=' UNION ALL '.join(edges), max_depth=int(max_depth or 0))
+
+        return [pk for pk, in self.raw(query)]
+
     def get_all_parents(self, node_pks, return_values=('id',)):
         """
         Get all the parents of given nodes
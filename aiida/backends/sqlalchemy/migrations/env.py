@@ -21,7 +21,7 @@ from aiida.backends.sqlalchemy.models.computer import DbComputer
 from aiida.backends.sqlalchemy.models.group import DbGroup
 from aiida.backends.sqlalchemy.models.log import DbLog
 from aiida.backends.sqlalchemy.models.node import (
-    DbCalcState, DbComputer,
+    DbCalcState, DbCheckpoint, DbComputer,
     DbContentError, DbLink, DbNode)
 from aiida.backends.sqlalchemy.models.settings import DbSetting
 from aiida.backends.sqlalchemy.models.user import DbUser
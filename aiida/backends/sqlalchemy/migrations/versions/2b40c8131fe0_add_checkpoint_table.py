@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Add the table that stores the checkpoints of the processes
+
+Revision ID: 2b40c8131fe0
+Revises: 7b38a9e783e7
+Create Date: 2018-11-19 14:02:37.503718
+
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2b40c8131fe0'
+down_revision = '7b38a9e783e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'db_dbcheckpoint',
+        sa.Column('id', sa.INTEGER(), nullable=False),
+        sa.Column('dbnode_id', sa.INTEGER(), autoincrement=False, nullable=False),
+        sa.Column('key', sa.VARCHAR(length=255), autoincrement=False, nullable=False),
+        sa.Column('codec', sa.VARCHAR(length=32), autoincrement=False, nullable=False),
+        sa.Column('data', sa.LargeBinary(), autoincrement=False, nullable=False),
+        sa.ForeignKeyConstraint(['dbnode_id'], [u'db_dbnode.id'], name=u'db_dbcheckpoint_dbnode_id_fkey',
+                                ondelete=u'CASCADE', initially=u'DEFERRED', deferrable=True),
+        sa.PrimaryKeyConstraint('id', name=u'db_dbcheckpoint_pkey'),
+        sa.UniqueConstraint('dbnode_id', 'key', name=u'db_dbcheckpoint_dbnode_id_key_key')
+    )  # yapf: disable
+
+
+def downgrade():
+    op.drop_table('db_dbcheckpoint')
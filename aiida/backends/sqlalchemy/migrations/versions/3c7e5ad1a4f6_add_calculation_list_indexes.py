@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Add partial indexes on the job calculations matching the keyset pagination of the list of calculations
+
+Revision ID: 3c7e5ad1a4f6
+Revises: 2b40c8131fe0
+Create Date: 2018-12-03 09:47:12.318450
+
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from alembic import op
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = '3c7e5ad1a4f6'
+down_revision = '2b40c8131fe0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_db_dbnode_jobcalculation_user_ctime_id',
+        'db_dbnode', ['user_id', 'ctime', 'id'],
+        postgresql_where=text("type LIKE 'calculation.job.%'"))
+    op.create_index(
+        'ix_db_dbnode_jobcalculation_ctime_id',
+        'db_dbnode', ['ctime', 'id'],
+        postgresql_where=text("type LIKE 'calculation.job.%'"))
+
+
+def downgrade():
+    op.drop_index('ix_db_dbnode_jobcalculation_ctime_id', table_name='db_dbnode')
+    op.drop_index('ix_db_dbnode_jobcalculation_user_ctime_id', table_name='db_dbnode')
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Add an index on the value of the hash extra of the nodes, used for the caching lookups
+
+Revision ID: 7b38a9e783e7
+Revises: 5d4d844852b6
+Create Date: 2018-11-12 10:21:45.139274
+
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from alembic import op
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = '7b38a9e783e7'
+down_revision = '5d4d844852b6'
+branch_labels = None
+depends_on = None
+
+# Currently valid hash key
+_HASH_EXTRA_KEY = '_aiida_hash'
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    statement = text("""CREATE INDEX ix_db_dbnode_extras_aiida_hash ON db_dbnode ((extras ->> '""" + _HASH_EXTRA_KEY +
+                     """'));""")
+    conn.execute(statement)
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    statement = text("""DROP INDEX ix_db_dbnode_extras_aiida_hash;""")
+    conn.execute(statement)
@@ -11,11 +11,11 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
-from sqlalchemy import ForeignKey, select, func, join, case
+from sqlalchemy import ForeignKey, select, func, join, case, cast, bindparam, literal_column, or_, text
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.schema import Column, UniqueConstraint, Index
-from sqlalchemy.types import Integer, String, Boolean, DateTime, Text
+from sqlalchemy.types import Integer, String, Boolean, DateTime, Text, LargeBinary
 # Specific to PGSQL. If needed to be agnostic
 # http://docs.sqlalchemy.org/en/rel_0_9/core/custom_types.html?highlight=guid#backend-agnostic-guid-type
 # Or maybe rely on sqlalchemy-utils UUID type
@@ -25,7 +25,6 @@ from sqlalchemy_utils.types.choice import ChoiceType
 from aiida.utils import timezone
 from aiida.backends.sqlalchemy.models.base import Base, _QueryProperty, _AiidaQuery
 from aiida.backends.sqlalchemy.models.utils import uuid_func
-from aiida.backends.sqlalchemy.utils import flag_modified
 
 from aiida.common.exceptions import DbContentError
 from aiida.common.datastructures import calc_states, _sorted_datastates, sort_states
@@ -64,6 +63,36 @@ class DbCalcState(Base):
     )
 
 
+class DbCheckpoint(Base):
+    """
+    The checkpoint of a process, stored as one row per top-level key of the saved process state, such that a new
+    checkpoint only needs to rewrite the rows whose value changed since the previous one.
+    """
+    __tablename__ = "db_dbcheckpoint"
+
+    id = Column(Integer, primary_key=True)
+
+    dbnode_id = Column(
+        Integer,
+        ForeignKey(
+            'db_dbnode.id', ondelete="CASCADE",
+            deferrable=True, initially="DEFERRED"
+        ),
+        nullable=False
+    )
+    dbnode = relationship(
+        'DbNode', backref=backref('dbcheckpoints', passive_deletes=True),
+    )
+
+    key = Column(String(255), nullable=False)
+    codec = Column(String(32), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('dbnode_id', 'key'),
+    )
+
+
 class DbNode(Base):
     __tablename__ = "db_dbnode"
 
@@ -104,6 +133,16 @@ class DbNode(Base):
     # this is probably a ON DELETE inside the DB. On removing node with id=x,
     # we would remove all link with x as an output.
 
+    # Index on the hash of the node, stored in the extras, for the caching lookups, and indexes on the job
+    # calculations matching the keyset pagination of the list of calculations
+    __table_args__ = (
+        Index('ix_db_dbnode_extras_aiida_hash', extras['_aiida_hash'].astext),
+        Index('ix_db_dbnode_jobcalculation_user_ctime_id', user_id, ctime, id,
+              postgresql_where=text("type LIKE 'calculation.job.%'")),
+        Index('ix_db_dbnode_jobcalculation_ctime_id', ctime, id,
+              postgresql_where=text("type LIKE 'calculation.job.%'")),
+    )
+
     ######### RELATIONSSHIPS ################
 
     dbcomputer = relationship(
@@ -149,6 +188,17 @@ class DbNode(Base):
         """
         Return the corresponding aiida instance of class aiida.orm.Node or a
         appropriate subclass.
+
+        Within the scope of an :func:`~aiida.orm.utils.identity_map.identity_map`, the instance that was already
+        loaded for this node is returned, if any.
+        """
+        from aiida.orm.utils.identity_map import get_or_load_node
+
+        return get_or_load_node(self.pk, self._load_aiida_class)
+
+    def _load_aiida_class(self):
+        """
+        Return a new aiida instance of class aiida.orm.Node or an appropriate subclass for this node.
         """
         from aiida.orm.node import Node
         from aiida.plugins.loader import get_plugin_type_from_type_string, load_plugin
@@ -185,48 +235,104 @@ class DbNode(Base):
             return thistype.rpartition('.')[2]
 
     def set_attr(self, key, value):
-        DbNode._set_attr(self.attributes, key, value)
-        flag_modified(self, "attributes")
-        self.save()
+        """
+        Set the attribute `key` of the stored node and increment its version number, with a single partial update.
+        """
+        DbNode._validate_key(key)
+        self._update_json_column('attributes', lambda column: column.op('||')(self._jsonb({key: value})))
 
-    def set_extra(self, key, value):
-        DbNode._set_attr(self.extras, key, value)
-        flag_modified(self, "extras")
-        self.save()
+    def set_extra(self, key, value, exclusive=False, increment_version=True):
+        """
+        Set the extra `key` of the stored node, with a single partial update.
+
+        :param exclusive: if True, raise a UniquenessError if the extra already exists
+        :param increment_version: whether to increment the version number of the node
+        """
+        from aiida.common.exceptions import UniquenessError
+
+        DbNode._validate_key(key)
+        condition = or_(DbNode.extras.is_(None), ~DbNode.extras.has_key(key)) if exclusive else None
+
+        if not self._update_json_column(
+                'extras', lambda column: column.op('||')(self._jsonb({key: value})), condition, increment_version):
+            raise UniquenessError("An extra with key '{}' already exists".format(key))
 
     def reset_extras(self, new_extras):
-        self.extras.clear()
-        self.extras.update(new_extras)
-        flag_modified(self, "extras")
-        self.save()
+        """
+        Replace all extras of the stored node and increment its version number.
+        """
+        self._update_json_column('extras', lambda column: self._jsonb(dict(new_extras)))
 
     def del_attr(self, key):
-        DbNode._del_attr(self.attributes, key)
-        flag_modified(self, "attributes")
-        self.save()
+        """
+        Delete the attribute `key` of the stored node and increment its version number.
+
+        :raise AttributeError: if the attribute does not exist
+        """
+        DbNode._validate_key(key)
+        if not self._update_json_column(
+                'attributes', lambda column: column.op('-')(cast(key, Text)), DbNode.attributes.has_key(key)):
+            raise AttributeError("Key {} does not exists".format(key))
 
     def del_extra(self, key):
-        DbNode._del_attr(self.extras, key)
-        flag_modified(self, "extras")
-        self.save()
+        """
+        Delete the extra `key` of the stored node and increment its version number.
+
+        :raise AttributeError: if the extra does not exist
+        """
+        DbNode._validate_key(key)
+        if not self._update_json_column(
+                'extras', lambda column: column.op('-')(cast(key, Text)), DbNode.extras.has_key(key)):
+            raise AttributeError("Key {} does not exists".format(key))
 
     @staticmethod
-    def _set_attr(d, key, value):
-        if '.' in key:
-            raise ValueError("We don't know how to treat key with dot in it yet")
+    def _jsonb(value):
+        """
+        Return a bound parameter for the given value, that is serialized with the JSON serializer of the engine.
+        """
+        return bindparam(None, value, type_=JSONB)
+
+    def _update_json_column(self, column_name, operation, condition=None, increment_version=True):
+        """
+        Update the attributes or extras of the stored node with a single statement, without rewriting the whole
+        document of the column from the values held in memory. The session is committed, which expires the instance,
+        such that the new values are loaded when the column is accessed again.
+
+        :param column_name: either 'attributes' or 'extras'
+        :param operation: a callable that, given the current value of the column, returns the expression of its new
+            value
+        :param condition: an optional expression that the node has to satisfy to be updated
+        :param increment_version: whether to increment the version number of the node
+        :return: True if the node was updated, False if it does not satisfy the condition
+        """
+        from aiida.backends.sqlalchemy import get_scoped_session
+
+        table = DbNode.__table__
+        column = table.c[column_name]
 
-        d[key] = value
+        values = {column: operation(func.coalesce(column, literal_column("'{}'::jsonb", type_=JSONB)))}
+        if increment_version:
+            values[table.c.nodeversion] = table.c.nodeversion + 1
+
+        statement = table.update().where(table.c.id == self.id).values(values)
+        if condition is not None:
+            statement = statement.where(condition)
+
+        session = get_scoped_session()
+        try:
+            result = session.execute(statement)
+            session.commit()
+        except:
+            session.rollback()
+            raise
+
+        return result.rowcount > 0
 
     @staticmethod
-    def _del_attr(d, key):
+    def _validate_key(key):
         if '.' in key:
             raise ValueError("We don't know how to treat key with dot in it yet")
 
-        if key not in d:
-            raise AttributeError("Key {} does not exists".format(key))
-
-        del d[key]
-
     @property
     def pk(self):
         return self.id
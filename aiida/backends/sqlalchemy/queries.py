@@ -34,6 +34,14 @@ class SqlaQueryManager(AbstractQueryManager):
 
         return result.fetchall()
 
+    def traverse_links(self, node_pks, forward_link_types=(), backward_link_types=(), max_depth=None,
+                       batch_size=1000):
+        """
+        Overrides the implementation using the QueryBuilder with a single recursive query, since the SQLAlchemy
+        backend always runs on PostgreSQL.
+        """
+        return self._traverse_links_recursive(node_pks, forward_link_types, backward_link_types, max_depth=max_depth)
+
     def get_creation_statistics(
             self,
             user_pk=None
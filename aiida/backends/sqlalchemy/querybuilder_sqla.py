@@ -72,6 +72,151 @@ def compile(element, compiler, **kw):
     return "jsonb_typeof(%s)" % compiler.process(element.clauses)
 
 
+def cast_according_to_type(path_in_json, value):
+    """
+    Return a filter on whether the element of a JSONB column has the JSON type that corresponds to the type of the
+    value and the element cast to the corresponding SQL type.
+
+    :param path_in_json: the element of the JSONB column
+    :param value: the value that the element is compared with
+    :returns: a tuple with the type filter and the cast element
+    """
+    if isinstance(value, bool):
+        type_filter = jsonb_typeof(path_in_json) == 'boolean'
+        casted_entity = path_in_json.astext.cast(Boolean)
+    elif isinstance(value, (int, float)):
+        type_filter = jsonb_typeof(path_in_json) == 'number'
+        casted_entity = path_in_json.astext.cast(Float)
+    elif isinstance(value, dict) or value is None:
+        type_filter = jsonb_typeof(path_in_json) == 'object'
+        casted_entity = path_in_json.astext.cast(JSONB)  # BOOLEANS?
+    elif isinstance(value, dict):
+        type_filter = jsonb_typeof(path_in_json) == 'array'
+        casted_entity = path_in_json.astext.cast(JSONB)  # BOOLEANS?
+    elif isinstance(value, six.string_types):
+        type_filter = jsonb_typeof(path_in_json) == 'string'
+        casted_entity = path_in_json.astext
+    elif value is None:
+        type_filter = jsonb_typeof(path_in_json) == 'null'
+        casted_entity = path_in_json.astext.cast(JSONB)  # BOOLEANS?
+    elif isinstance(value, datetime):
+        # type filter here is filter whether this attributes stores
+        # a string and a filter whether this string
+        # is compatible with a datetime (using a regex)
+        #  - What about historical values (BC, or before 1000AD)??
+        #  - Different ways to represent the timezone
+
+        type_filter = jsonb_typeof(path_in_json) == 'string'
+        regex_filter = path_in_json.astext.op(
+            "SIMILAR TO"
+        )("\d\d\d\d-[0-1]\d-[0-3]\dT[0-2]\d:[0-5]\d:\d\d\.\d+((\+|\-)\d\d:\d\d)?")
+        type_filter = and_(type_filter, regex_filter)
+        casted_entity = path_in_json.cast(DateTime)
+    else:
+        raise TypeError('Unknown type {}'.format(type(value)))
+    return type_filter, casted_entity
+
+
+def get_filter_expr_from_jsonb(operator, value, attr_key, column):
+    """
+    Return the filter expression on an element of a JSONB column, e.g. on an attribute or extra of the nodes.
+
+    :param operator: the operator of the filter
+    :param value: the value that the element is compared with
+    :param attr_key: the path of the element in the column, as a list of keys
+    :param column: the JSONB column
+    """
+    database_entity = column[tuple(attr_key)]
+    if operator == '==':
+        type_filter, casted_entity = cast_according_to_type(database_entity, value)
+        expr = case([(type_filter, casted_entity == value)], else_=False)
+    elif operator == '>':
+        type_filter, casted_entity = cast_according_to_type(database_entity, value)
+        expr = case([(type_filter, casted_entity > value)], else_=False)
+    elif operator == '<':
+        type_filter, casted_entity = cast_according_to_type(database_entity, value)
+        expr = case([(type_filter, casted_entity < value)], else_=False)
+    elif operator in ('>=', '=>'):
+        type_filter, casted_entity = cast_according_to_type(database_entity, value)
+        expr = case([(type_filter, casted_entity >= value)], else_=False)
+    elif operator in ('<=', '=<'):
+        type_filter, casted_entity = cast_according_to_type(database_entity, value)
+        expr = case([(type_filter, casted_entity <= value)], else_=False)
+    elif operator == 'of_type':
+        # http://www.postgresql.org/docs/9.5/static/functions-json.html
+        #  Possible types are object, array, string, number, boolean, and null.
+        valid_types = ('object', 'array', 'string', 'number', 'boolean', 'null')
+        if value not in valid_types:
+            raise InputValidationError(
+                "value {} for of_type is not among valid types\n"
+                "{}".format(value, valid_types)
+            )
+        expr = jsonb_typeof(database_entity) == value
+    elif operator == 'like':
+        type_filter, casted_entity = cast_according_to_type(database_entity, value)
+        expr = case([(type_filter, casted_entity.like(value))], else_=False)
+    elif operator == 'ilike':
+        type_filter, casted_entity = cast_according_to_type(database_entity, value)
+        expr = case([(type_filter, casted_entity.ilike(value))], else_=False)
+    elif operator == 'in':
+        type_filter, casted_entity = cast_according_to_type(database_entity, value[0])
+        expr = case([(type_filter, casted_entity.in_(value))], else_=False)
+    elif operator == 'contains':
+        expr = database_entity.cast(JSONB).contains(value)
+    elif operator == 'has_key':
+        expr = database_entity.cast(JSONB).has_key(value)  # noqa
+    elif operator == 'of_length':
+        expr = case([(
+            jsonb_typeof(database_entity) == 'array',
+            jsonb_array_length(database_entity.cast(JSONB)) == value)], else_=False)
+
+    elif operator == 'longer':
+        expr = case([(
+            jsonb_typeof(database_entity) == 'array',
+            jsonb_array_length(database_entity.cast(JSONB)) > value)], else_=False)
+
+    elif operator == 'shorter':
+        expr = case([(
+            jsonb_typeof(database_entity) == 'array',
+            jsonb_array_length(database_entity.cast(JSONB)) < value)], else_=False)
+    else:
+        raise InputValidationError(
+            "Unknown operator {} for filters in JSON field".format(operator)
+        )
+    return expr
+
+
+def get_projectable_jsonb_attribute(column, attrpath, cast=None):
+    """
+    Return the projectable element of a JSONB column, e.g. an attribute or extra of the nodes.
+
+    :param column: the JSONB column
+    :param attrpath: the path of the element in the column, as a list of keys
+    :param cast: an optional key of the type to cast the element to
+    :returns: the element of the column, optionally cast
+    """
+    entity = column[(attrpath)]
+    if cast is None:
+        entity = entity
+    elif cast == 'f':
+        entity = entity.astext.cast(Float)
+    elif cast == 'i':
+        entity = entity.astext.cast(Integer)
+    elif cast == 'b':
+        entity = entity.astext.cast(Boolean)
+    elif cast == 't':
+        entity = entity.astext
+    elif cast == 'j':
+        entity = entity.astext.cast(JSONB)
+    elif cast == 'd':
+        entity = entity.astext.cast(DateTime)
+    else:
+        raise InputValidationError(
+            "Unkown casting key {}".format(cast)
+        )
+    return entity
+
+
 class QueryBuilderImplSQLA(QueryBuilderInterface):
     """
     QueryBuilder to use with SQLAlchemy-backend and
@@ -346,103 +491,10 @@ class QueryBuilderImplSQLA(QueryBuilderInterface):
             column=None, column_name=None,
             alias=None):
 
-        def cast_according_to_type(path_in_json, value):
-            if isinstance(value, bool):
-                type_filter = jsonb_typeof(path_in_json) == 'boolean'
-                casted_entity = path_in_json.astext.cast(Boolean)
-            elif isinstance(value, (int, float)):
-                type_filter = jsonb_typeof(path_in_json) == 'number'
-                casted_entity = path_in_json.astext.cast(Float)
-            elif isinstance(value, dict) or value is None:
-                type_filter = jsonb_typeof(path_in_json) == 'object'
-                casted_entity = path_in_json.astext.cast(JSONB)  # BOOLEANS?
-            elif isinstance(value, dict):
-                type_filter = jsonb_typeof(path_in_json) == 'array'
-                casted_entity = path_in_json.astext.cast(JSONB)  # BOOLEANS?
-            elif isinstance(value, six.string_types):
-                type_filter = jsonb_typeof(path_in_json) == 'string'
-                casted_entity = path_in_json.astext
-            elif value is None:
-                type_filter = jsonb_typeof(path_in_json) == 'null'
-                casted_entity = path_in_json.astext.cast(JSONB)  # BOOLEANS?
-            elif isinstance(value, datetime):
-                # type filter here is filter whether this attributes stores
-                # a string and a filter whether this string
-                # is compatible with a datetime (using a regex)
-                #  - What about historical values (BC, or before 1000AD)??
-                #  - Different ways to represent the timezone
-
-                type_filter = jsonb_typeof(path_in_json) == 'string'
-                regex_filter = path_in_json.astext.op(
-                    "SIMILAR TO"
-                )("\d\d\d\d-[0-1]\d-[0-3]\dT[0-2]\d:[0-5]\d:\d\d\.\d+((\+|\-)\d\d:\d\d)?")
-                type_filter = and_(type_filter, regex_filter)
-                casted_entity = path_in_json.cast(DateTime)
-            else:
-                raise TypeError('Unknown type {}'.format(type(value)))
-            return type_filter, casted_entity
-
         if column is None:
             column = _get_column(column_name, alias)
 
-        database_entity = column[tuple(attr_key)]
-        if operator == '==':
-            type_filter, casted_entity = cast_according_to_type(database_entity, value)
-            expr = case([(type_filter, casted_entity == value)], else_=False)
-        elif operator == '>':
-            type_filter, casted_entity = cast_according_to_type(database_entity, value)
-            expr = case([(type_filter, casted_entity > value)], else_=False)
-        elif operator == '<':
-            type_filter, casted_entity = cast_according_to_type(database_entity, value)
-            expr = case([(type_filter, casted_entity < value)], else_=False)
-        elif operator in ('>=', '=>'):
-            type_filter, casted_entity = cast_according_to_type(database_entity, value)
-            expr = case([(type_filter, casted_entity >= value)], else_=False)
-        elif operator in ('<=', '=<'):
-            type_filter, casted_entity = cast_according_to_type(database_entity, value)
-            expr = case([(type_filter, casted_entity <= value)], else_=False)
-        elif operator == 'of_type':
-            # http://www.postgresql.org/docs/9.5/static/functions-json.html
-            #  Possible types are object, array, string, number, boolean, and null.
-            valid_types = ('object', 'array', 'string', 'number', 'boolean', 'null')
-            if value not in valid_types:
-                raise InputValidationError(
-                    "value {} for of_type is not among valid types\n"
-                    "{}".format(value, valid_types)
-                )
-            expr = jsonb_typeof(database_entity) == value
-        elif operator == 'like':
-            type_filter, casted_entity = cast_according_to_type(database_entity, value)
-            expr = case([(type_filter, casted_entity.like(value))], else_=False)
-        elif operator == 'ilike':
-            type_filter, casted_entity = cast_according_to_type(database_entity, value)
-            expr = case([(type_filter, casted_entity.ilike(value))], else_=False)
-        elif operator == 'in':
-            type_filter, casted_entity = cast_according_to_type(database_entity, value[0])
-            expr = case([(type_filter, casted_entity.in_(value))], else_=False)
-        elif operator == 'contains':
-            expr = database_entity.cast(JSONB).contains(value)
-        elif operator == 'has_key':
-            expr = database_entity.cast(JSONB).has_key(value)  # noqa
-        elif operator == 'of_length':
-            expr = case([(
-                jsonb_typeof(database_entity) == 'array',
-                jsonb_array_length(database_entity.cast(JSONB)) == value)], else_=False)
-
-        elif operator == 'longer':
-            expr = case([(
-                jsonb_typeof(database_entity) == 'array',
-                jsonb_array_length(database_entity.cast(JSONB)) > value)], else_=False)
-
-        elif operator == 'shorter':
-            expr = case([(
-                jsonb_typeof(database_entity) == 'array',
-                jsonb_array_length(database_entity.cast(JSONB)) < value)], else_=False)
-        else:
-            raise InputValidationError(
-                "Unknown operator {} for filters in JSON field".format(operator)
-            )
-        return expr
+        return get_filter_expr_from_jsonb(operator, value, attr_key, column)
 
     def get_projectable_attribute(
             self, alias, column_name, attrpath,
@@ -451,27 +503,7 @@ class QueryBuilderImplSQLA(QueryBuilderInterface):
         """
         :returns: An attribute store in a JSON field of the give column
         """
-
-        entity = _get_column(column_name, alias)[(attrpath)]
-        if cast is None:
-            entity = entity
-        elif cast == 'f':
-            entity = entity.astext.cast(Float)
-        elif cast == 'i':
-            entity = entity.astext.cast(Integer)
-        elif cast == 'b':
-            entity = entity.astext.cast(Boolean)
-        elif cast == 't':
-            entity = entity.astext
-        elif cast == 'j':
-            entity = entity.astext.cast(JSONB)
-        elif cast == 'd':
-            entity = entity.astext.cast(DateTime)
-        else:
-            raise InputValidationError(
-                "Unkown casting key {}".format(cast)
-            )
-        return entity
+        return get_projectable_jsonb_attribute(_get_column(column_name, alias), attrpath, cast)
 
     def get_aiida_res(self, key, res):
         """
@@ -24,15 +24,10 @@ except ImportError:
     json_dumps = json.dumps
     json_loads = json.loads
 
-import datetime
-import re
-
-import six
 from alembic import command
 from alembic.config import Config
 from alembic.runtime.environment import EnvironmentContext
 from alembic.script import ScriptDirectory
-from dateutil import parser
 from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.orm import sessionmaker
@@ -121,48 +116,18 @@ def dumps_json(d):
     """
     Transforms all datetime object into isoformat and then returns the JSON
     """
+    from aiida.backends.utils import datetime_to_isoformat
 
-    def f(v):
-        if isinstance(v, list):
-            return [f(_) for _ in v]
-        elif isinstance(v, dict):
-            return dict((key, f(val)) for key, val in v.items())
-        elif isinstance(v, datetime.datetime):
-            return v.isoformat()
-        return v
-
-    return json_dumps(f(d))
-
-
-date_reg = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+(\+\d{2}:\d{2})?$')
+    return json_dumps(datetime_to_isoformat(d))
 
 
 def loads_json(s):
     """
     Loads the json and try to parse each basestring as a datetime object
     """
+    from aiida.backends.utils import isoformat_to_datetime
 
-    ret = json_loads(s)
-
-    def f(d):
-        if isinstance(d, list):
-            for i, val in enumerate(d):
-                d[i] = f(val)
-            return d
-        elif isinstance(d, dict):
-            for k, v in d.items():
-                d[k] = f(v)
-            return d
-        elif isinstance(d, six.string_types):
-            if date_reg.match(d):
-                try:
-                    return parser.parse(d)
-                except (ValueError, TypeError):
-                    return d
-            return d
-        return d
-
-    return f(ret)
+    return isoformat_to_datetime(json_loads(s))
 
 
 # XXX the code here isn't different from the one use in Django. We may be able
@@ -544,3 +509,223 @@ def delete_nodes_and_connections_sqla(pks_to_delete):
         raise e
     finally:
         session.close()
+
+
+def get_node_pks_by_extra_sqla(key, values, node_types=None):
+    """
+    Return the nodes whose extra `key` is one of the given strings.
+
+    :param key: the key of the extra
+    :param values: a list of strings
+    :param node_types: optional list of type strings, to only include nodes whose type is exactly one of them
+    :return: a list of tuples (pk, type, value) ordered by pk
+    """
+    from aiida.backends import sqlalchemy as sa
+    from aiida.backends.sqlalchemy.models.node import DbNode
+
+    # The `->>` text expression is the one covered by the index on the hash extra
+    value_column = DbNode.extras[key].astext
+    query = sa.get_scoped_session().query(DbNode.id, DbNode.type, value_column).filter(value_column.in_(values))
+
+    if node_types is not None:
+        query = query.filter(DbNode.type.in_(node_types))
+
+    return [tuple(row) for row in query.order_by(DbNode.id)]
+
+
+def set_extras_many_sqla(pks, key, values):
+    """
+    Set the extra `key` of many nodes with a single executemany of in-place `jsonb_set` updates.
+
+    :param pks: a list of node pks
+    :param key: the key of the extra
+    :param values: a list with the value of the extra for each node in `pks`
+    """
+    from sqlalchemy import text
+    from aiida.backends import sqlalchemy as sa
+    from aiida.backends.utils import validate_attribute_key
+
+    validate_attribute_key(key)
+
+    statement = text(
+        "UPDATE db_dbnode SET "
+        "extras = jsonb_set(COALESCE(extras, CAST('{}' AS jsonb)), ARRAY[:key], CAST(:value AS jsonb)), "
+        "nodeversion = nodeversion + 1 "
+        "WHERE id = :pk")
+    parameters = [{'pk': pk, 'key': key, 'value': dumps_json(value)} for pk, value in zip(pks, values)]
+
+    session = sa.get_scoped_session()
+    try:
+        session.execute(statement, parameters)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+def update_attributes_many_sqla(updates):
+    """
+    Set and delete attributes of many nodes with a single executemany of in-place jsonb updates.
+
+    :param updates: a list of tuples (pk, attributes, deleted_keys)
+    """
+    from sqlalchemy import text
+
+    statement = text(
+        "UPDATE db_dbnode SET "
+        "attributes = (COALESCE(attributes, CAST('{}' AS jsonb)) - CAST(:deleted_keys AS text[])) "
+        "|| CAST(:attributes AS jsonb), "
+        "nodeversion = nodeversion + 1 "
+        "WHERE id = :pk")
+    parameters = [{
+        'pk': pk,
+        'attributes': dumps_json(attributes),
+        'deleted_keys': list(deleted_keys)
+    } for pk, attributes, deleted_keys in updates]
+
+    session = sa.get_scoped_session()
+    try:
+        session.execute(statement, parameters)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+def _select_group_members(node_pks, querybuilder):
+    """
+    Return a select statement of the distinct pks of the given nodes, where pks that do not correspond to a node are
+    left out.
+
+    :param node_pks: a list of node pks, or None
+    :param querybuilder: a QueryBuilder that projects the nodes, or None
+    """
+    from sqlalchemy import Integer, any_, bindparam, select
+    from sqlalchemy.dialects.postgresql import ARRAY
+    from aiida.backends.sqlalchemy.models.node import DbNode
+
+    if querybuilder is not None:
+        subquery = querybuilder.get_query().subquery()
+        return select([list(subquery.c)[0].label('id')]).distinct()
+
+    node_pks = bindparam('node_pks', node_pks, type_=ARRAY(Integer))
+    return select([DbNode.id.label('id')]).where(DbNode.id == any_(node_pks))
+
+
+def add_nodes_to_group_sqla(group_pk, node_pks, querybuilder):
+    """
+    Add the given nodes to a group with a single statement.
+
+    :param group_pk: the pk of the group
+    :param node_pks: a list of node pks, or None
+    :param querybuilder: a QueryBuilder that projects the nodes, or None
+    """
+    from sqlalchemy import literal, select
+    from sqlalchemy.dialects.postgresql import insert
+    from aiida.backends.sqlalchemy.models.group import table_groups_nodes
+
+    members = _select_group_members(node_pks, querybuilder).alias('members')
+    rows = select([literal(group_pk), members.c.id])
+    statement = insert(table_groups_nodes).from_select(['dbgroup_id', 'dbnode_id'], rows).on_conflict_do_nothing()
+
+    session = sa.get_scoped_session()
+    try:
+        session.execute(statement)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+def remove_nodes_from_group_sqla(group_pk, node_pks, querybuilder):
+    """
+    Remove the given nodes from a group with a single statement.
+
+    :param group_pk: the pk of the group
+    :param node_pks: a list of node pks, or None
+    :param querybuilder: a QueryBuilder that projects the nodes, or None
+    """
+    from aiida.backends.sqlalchemy.models.group import table_groups_nodes
+
+    statement = table_groups_nodes.delete().where(table_groups_nodes.c.dbgroup_id == group_pk).where(
+        table_groups_nodes.c.dbnode_id.in_(_select_group_members(node_pks, querybuilder)))
+
+    session = sa.get_scoped_session()
+    try:
+        session.execute(statement)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+def get_checkpoint_rows_sqla(pk):
+    """
+    Return the rows of the checkpoint of the given calculation node.
+
+    :param pk: the pk of the calculation node
+    :return: a list of tuples (key, codec, data)
+    """
+    from aiida.backends.sqlalchemy.models.node import DbCheckpoint
+
+    query = sa.get_scoped_session().query(DbCheckpoint.key, DbCheckpoint.codec, DbCheckpoint.data)
+    return [tuple(row) for row in query.filter(DbCheckpoint.dbnode_id == pk)]
+
+
+def set_checkpoint_rows_sqla(pk, rows, removed_keys):
+    """
+    Replace the rows of the checkpoint of the given calculation node with the given keys, with a single bulk insert.
+
+    :param pk: the pk of the calculation node
+    :param rows: a list of tuples (key, codec, data)
+    :param removed_keys: a list of keys of the rows to delete
+    """
+    from aiida.backends.sqlalchemy.models.node import DbCheckpoint
+
+    mappings = [{'dbnode_id': pk, 'key': key, 'codec': codec, 'data': data} for key, codec, data in rows]
+    keys = [mapping['key'] for mapping in mappings] + list(removed_keys)
+
+    session = sa.get_scoped_session()
+    try:
+        session.query(DbCheckpoint).filter(DbCheckpoint.dbnode_id == pk,
+                                           DbCheckpoint.key.in_(keys)).delete(synchronize_session=False)
+        session.bulk_insert_mappings(DbCheckpoint, mappings)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+def delete_checkpoint_rows_sqla(pk):
+    """
+    Delete the rows of the checkpoint of the given calculation node.
+
+    :param pk: the pk of the calculation node
+    """
+    from aiida.backends.sqlalchemy.models.node import DbCheckpoint
+
+    session = sa.get_scoped_session()
+    try:
+        session.query(DbCheckpoint).filter(DbCheckpoint.dbnode_id == pk).delete(synchronize_session=False)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+
+def set_node_uuid_sqla(pk, uuid):
+    """
+    Set the UUID of the given node.
+
+    :param pk: the pk of the node
+    :param uuid: the new UUID of the node
+    """
+    from aiida.backends.sqlalchemy.models.node import DbNode
+
+    session = sa.get_scoped_session()
+    try:
+        session.query(DbNode).filter(DbNode.id == pk).update({'uuid': uuid}, synchronize_session=False)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
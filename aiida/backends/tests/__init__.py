@@ -92,11 +92,13 @@ db_test_list = {
         'orm.data.remote': ['aiida.backends.tests.orm.data.remote'],
         'orm.log': ['aiida.backends.tests.orm.log'],
         'orm.mixins': ['aiida.backends.tests.orm.mixins'],
+        'orm.utils.identity_map': ['aiida.backends.tests.orm.utils.identity_map'],
         'orm.utils.loaders': ['aiida.backends.tests.orm.utils.loaders'],
         'work.class_loader': ['aiida.backends.tests.work.class_loader'],
         'work.daemon': ['aiida.backends.tests.work.daemon'],
         'work.futures': ['aiida.backends.tests.work.test_futures'],
         'work.launch': ['aiida.backends.tests.work.test_launch'],
+        'work.node_updates': ['aiida.backends.tests.work.test_node_updates'],
         'work.persistence': ['aiida.backends.tests.work.persistence'],
         'work.process': ['aiida.backends.tests.work.process'],
         'work.process_builder': ['aiida.backends.tests.work.test_process_builder'],
@@ -171,6 +171,40 @@ class TestVerdiCalculation(AiidaTestCase):
             self.assertIsNone(result.exception)
             self.assertEquals(len(get_result_lines(result)), limit)
 
+    def test_calculation_list_pages(self):
+        """Test that verdi calculation list returns all the calculations, in order, when they span several pages"""
+        from aiida.orm import JobCalculation
+
+        expected = [
+            calc.pk for calc in sorted(self.calcs + [self.arithmetic_job], key=lambda calc: (calc.ctime, calc.pk))
+        ]
+
+        page_size = JobCalculation._list_calculations_page_size
+        try:
+            JobCalculation._list_calculations_page_size = 3
+
+            for order_by, pks in [('ctime', expected), ('id', sorted(expected))]:
+                options = ['-r', '-a', '-A', '-O', order_by, '-P', 'pk']
+                result = self.cli_runner.invoke(command.calculation_list, options)
+                self.assertIsNone(result.exception, result.output)
+                self.assertEquals([int(line) for line in get_result_lines(result)], pks)
+
+            options = ['-r', '-a', '-A', '-l', '4', '-P', 'pk']
+            result = self.cli_runner.invoke(command.calculation_list, options)
+            self.assertIsNone(result.exception, result.output)
+            self.assertEquals([int(line) for line in get_result_lines(result)], expected[:4])
+        finally:
+            JobCalculation._list_calculations_page_size = page_size
+
+        with self.assertRaises(ValueError):
+            next(JobCalculation._iter_calculation_pages({}, {}, order_by='mtime'))
+
+        # The header is printed once, followed by the rows
+        options = ['-a', '-A', '-P', 'pk', 'state']
+        result = self.cli_runner.invoke(command.calculation_list, options)
+        self.assertIsNone(result.exception, result.output)
+        self.assertEquals(result.output.count('PK'), 1)
+
     def test_calculation_list_group(self):
         """Test verdi calculation list with the group option"""
         for flag in ['-G', '--groups']:
@@ -85,6 +85,18 @@ class TestVerdiRehash(AiidaTestCase):
         self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
         self.assertIsNone(result.exception)
 
+    def test_rehash_resume(self):
+        """Passing a start pk in small batches should only rehash the nodes with a larger pk, here 2 of them."""
+        from aiida.orm import load_node
+
+        expected_node_count = 2
+        self.node_int.set_extra('_aiida_hash', 'invalid')
+        options = ['-b', '1', '-s', str(self.node_bool_false.pk)]
+        result = self.cli_runner.invoke(cmd_rehash.rehash, options)
+        self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
+        self.assertIsNone(result.exception)
+        self.assertEqual(load_node(self.node_int.pk).get_extra('_aiida_hash'), self.node_int.get_hash())
+
     def test_rehash_entry_point_no_matches(self):
         """Limiting the queryset by defining explicit entry point, with no nodes should exit with non-zero status."""
         options = ['-e', 'aiida.data:structure']
@@ -144,6 +144,124 @@ class TestSinglefileData(AiidaTestCase):
             self.assertEquals(fhandle.read(), file_content)
 
 
+class TestUpfFamilyIndex(AiidaTestCase):
+    """
+    Test the index of the UpfFamily groups used to get the pseudos of structures.
+    """
+
+    @staticmethod
+    def _create_upf(folder, element, content=''):
+        import os
+
+        from aiida.orm.data.upf import UpfData
+
+        filename = os.path.join(folder, '{}.upf'.format(element))
+        with io.open(filename, 'w', encoding='utf8') as fhandle:
+            fhandle.write(u'<UPF version="2.0.1">\n<PP_HEADER\nelement="{}"\n/>\n{}\n'.format(element, content))
+
+        return UpfData(file=filename).store()
+
+    def test_get_pseudos_from_structures(self):
+        import shutil
+        import tempfile
+
+        from aiida.common.exceptions import MultipleObjectsError, NotExistent
+        from aiida.orm import Group
+        from aiida.orm.data.structure import StructureData
+        from aiida.orm.data.upf import (UPFGROUP_TYPE, UpfData, clear_upf_family_index_cache, get_upf_family_index,
+                                        get_pseudos_from_structure, get_pseudos_from_structures)
+
+        folder = tempfile.mkdtemp()
+        try:
+            upf_si = self._create_upf(folder, 'Si')
+            upf_o = self._create_upf(folder, 'O')
+            upf_si_other = self._create_upf(folder, 'Si', content='other')
+        finally:
+            shutil.rmtree(folder)
+
+        family = Group(name='test_upf_family_index', type_string=UPFGROUP_TYPE).store()
+        family.add_nodes([upf_si, upf_o])
+
+        silicon = StructureData(cell=((5., 0., 0.), (0., 5., 0.), (0., 0., 5.)))
+        silicon.append_atom(position=(0., 0., 0.), symbols='Si', name='Si1')
+        silicon.append_atom(position=(2.5, 2.5, 2.5), symbols='Si', name='Si2')
+        silica = StructureData(cell=((5., 0., 0.), (0., 5., 0.), (0., 0., 5.)))
+        silica.append_atom(position=(0., 0., 0.), symbols='Si')
+        silica.append_atom(position=(1.5, 0., 0.), symbols='O')
+
+        self.assertEqual(get_upf_family_index(family), {'Si': upf_si.pk, 'O': upf_o.pk})
+
+        pseudos = get_pseudos_from_structure(silica, family.name)
+        self.assertEqual({kind: pseudo.pk for kind, pseudo in pseudos.items()}, {'Si': upf_si.pk, 'O': upf_o.pk})
+        self.assertTrue(all(isinstance(pseudo, UpfData) for pseudo in pseudos.values()))
+
+        pseudos_silicon, pseudos_silica = get_pseudos_from_structures([silicon, silica], family.name)
+        self.assertEqual({kind: pseudo.pk for kind, pseudo in pseudos_silicon.items()},
+                         {'Si1': upf_si.pk, 'Si2': upf_si.pk})
+        # The nodes are loaded once and shared by all the structures
+        self.assertIs(pseudos_silicon['Si1'], pseudos_silica['Si'])
+
+        # Changing the members of the family invalidates its index
+        family.add_nodes(upf_si_other)
+        with self.assertRaises(MultipleObjectsError):
+            get_pseudos_from_structure(silicon, family.name)
+
+        family.remove_nodes([upf_si, upf_si_other])
+        with self.assertRaises(NotExistent):
+            get_pseudos_from_structure(silica, family.name)
+
+        clear_upf_family_index_cache()
+        self.assertEqual(get_upf_family_index(family), {'O': upf_o.pk})
+        self.assertEqual(get_pseudos_from_structures([], family.name), [])
+
+    def test_stale_index(self):
+        """
+        A cached index that is stale, because the family was changed without this process knowing, is rebuilt.
+        """
+        import shutil
+        import tempfile
+
+        from aiida.backends.utils import get_group_membership_version
+        from aiida.common.exceptions import NotExistent
+        from aiida.orm import Group
+        from aiida.orm.data import upf
+        from aiida.orm.data.structure import StructureData
+        from aiida.utils.delete_nodes import delete_nodes
+
+        folder = tempfile.mkdtemp()
+        try:
+            upf_si = self._create_upf(folder, 'Si')
+            upf_o = self._create_upf(folder, 'O')
+            upf_si_other = self._create_upf(folder, 'Si', content='other')
+        finally:
+            shutil.rmtree(folder)
+
+        family = Group(name='test_upf_family_stale_index', type_string=upf.UPFGROUP_TYPE).store()
+        family.add_nodes([upf_si, upf_o])
+
+        silica = StructureData(cell=((5., 0., 0.), (0., 5., 0.), (0., 0., 5.)))
+        silica.append_atom(position=(0., 0., 0.), symbols='Si')
+        silica.append_atom(position=(1.5, 0., 0.), symbols='O')
+
+        def set_cached_index(index):
+            upf._family_index_cache[family.pk] = (get_group_membership_version(family.pk), index)
+
+        # An element that was added by another process
+        set_cached_index({'Si': upf_si.pk})
+        pseudos = upf.get_pseudos_from_structure(silica, family.name)
+        self.assertEqual({kind: pseudo.pk for kind, pseudo in pseudos.items()}, {'Si': upf_si.pk, 'O': upf_o.pk})
+
+        # A pseudo that is no longer a member of the family
+        set_cached_index({'Si': upf_si_other.pk, 'O': upf_o.pk})
+        pseudos = upf.get_pseudos_from_structure(silica, family.name)
+        self.assertEqual({kind: pseudo.pk for kind, pseudo in pseudos.items()}, {'Si': upf_si.pk, 'O': upf_o.pk})
+
+        # Deleting a member of the family invalidates its index
+        delete_nodes([upf_o.pk], force=True)
+        with self.assertRaises(NotExistent):
+            upf.get_pseudos_from_structure(silica, family.name)
+
+
 class TestCifData(AiidaTestCase):
     """
     Tests for CifData class.
@@ -2029,6 +2147,123 @@ class TestStructureDataLock(AiidaTestCase):
         b.pbc = [True, True, True]
 
 
+class TestStructureDataArrays(AiidaTestCase):
+    """
+    Tests the array-based access to the sites and kinds of a structure.
+    """
+    from aiida.orm.data.structure import has_ase
+
+    @staticmethod
+    def get_structure():
+        """Return a structure built one atom at a time."""
+        from aiida.orm.data.structure import StructureData
+
+        structure = StructureData(cell=((4., 0., 0.), (0., 4., 0.), (0., 0., 4.)))
+        structure.append_atom(symbols='Ba', position=(0., 0., 0.))
+        structure.append_atom(symbols='Ti', position=(2., 2., 2.))
+        structure.append_atom(symbols='O', position=(2., 2., 0.))
+        structure.append_atom(symbols='O', position=(2., 0., 2.))
+        structure.append_atom(symbols='O', position=(0., 2., 2.))
+        return structure
+
+    def test_arrays(self):
+        """Test the arrays of positions and kind indices, before and after storing."""
+        import numpy as np
+
+        structure = self.get_structure()
+        positions = np.array([site.position for site in structure.sites])
+
+        for _ in range(2):
+            self.assertEqual(structure.get_positions_array().shape, (5, 3))
+            self.assertTrue(np.allclose(structure.get_positions_array(), positions))
+            self.assertEqual(structure.get_kind_indices_array().tolist(), [0, 1, 2, 2, 2])
+            structure.store()
+
+    def test_set_sites_from_arrays(self):
+        """Test that setting the sites from arrays is equivalent to appending them one by one."""
+        import numpy as np
+        from aiida.orm.data.structure import StructureData
+
+        reference = self.get_structure()
+
+        structure = StructureData(cell=reference.cell)
+        structure.set_sites_from_arrays(reference.kinds, reference.get_positions_array(),
+                                        reference.get_kind_indices_array())
+
+        self.assertEqual(structure.get_kind_names(), reference.get_kind_names())
+        self.assertEqual(structure.get_site_kindnames(), reference.get_site_kindnames())
+        self.assertTrue(np.allclose(structure.get_positions_array(), reference.get_positions_array()))
+        self.assertEqual(structure.get_formula(), 'BaO3Ti')
+        self.assertEqual(structure.get_formula(mode='count'), 'BaTiO3')
+        self.assertEqual(structure.get_composition(), {'Ba': 1, 'Ti': 1, 'O': 3})
+
+        # The kinds and sites are replaced, and the structure can be stored and reloaded
+        structure.set_sites_from_arrays(reference.kinds[1:], [[0., 0., 0.], [1., 1., 1.]], [1, 0])
+        self.assertEqual(structure.get_site_kindnames(), ['O', 'Ti'])
+        structure.store()
+
+        reloaded = load_node(structure.uuid)
+        self.assertEqual(reloaded.get_site_kindnames(), ['O', 'Ti'])
+        self.assertEqual(reloaded.get_kind_indices_array().tolist(), [1, 0])
+        self.assertTrue(np.allclose(reloaded.get_positions_array(), [[0., 0., 0.], [1., 1., 1.]]))
+
+        with self.assertRaises(ModificationNotAllowed):
+            structure.set_sites_from_arrays(reference.kinds, reference.get_positions_array(),
+                                            reference.get_kind_indices_array())
+
+    def test_set_sites_from_arrays_invalid(self):
+        """Test the validation of the arrays passed to `set_sites_from_arrays`."""
+        from aiida.orm.data.structure import StructureData, Kind
+
+        kinds = [Kind(symbols='Ba'), Kind(symbols='Ti')]
+        positions = [[0., 0., 0.], [1., 1., 1.]]
+        structure = StructureData()
+
+        # Duplicate kind names
+        with self.assertRaises(ValueError):
+            structure.set_sites_from_arrays([Kind(symbols='Ba'), Kind(symbols='Ba')], positions, [0, 1])
+        # Wrong shape of the positions
+        with self.assertRaises(ValueError):
+            structure.set_sites_from_arrays(kinds, [[0., 0.], [1., 1.]], [0, 1])
+        # Positions that cannot be stored
+        with self.assertRaises(ValueError):
+            structure.set_sites_from_arrays(kinds, [[0., 0., float('nan')], [1., 1., 1.]], [0, 1])
+        # Wrong number or type of kind indices
+        with self.assertRaises(ValueError):
+            structure.set_sites_from_arrays(kinds, positions, [0])
+        with self.assertRaises(ValueError):
+            structure.set_sites_from_arrays(kinds, positions, [0., 1.])
+        # Kind indices out of range
+        with self.assertRaises(ValueError):
+            structure.set_sites_from_arrays(kinds, positions, [0, 2])
+        with self.assertRaises(ValueError):
+            structure.set_sites_from_arrays(kinds, positions, [-1, 1])
+        # Kind without sites
+        with self.assertRaises(ValueError):
+            structure.set_sites_from_arrays(kinds, positions, [0, 0])
+
+        # Nothing was set by the failed calls
+        self.assertEqual(structure.sites, [])
+
+    @unittest.skipIf(not has_ase(), "Unable to import ase")
+    def test_get_ase(self):
+        """Test that the ase conversion keeps symbols, positions, masses and tags."""
+        import numpy as np
+        from aiida.orm.data.structure import StructureData, Kind
+
+        structure = StructureData(cell=((4., 0., 0.), (0., 4., 0.), (0., 0., 4.)))
+        kinds = [Kind(symbols='Fe', name='Fe1'), Kind(symbols='Fe', name='Fe2'), Kind(symbols='O', mass=17.)]
+        positions = [[0., 0., 0.], [2., 2., 2.], [1., 1., 1.], [3., 3., 3.]]
+        structure.set_sites_from_arrays(kinds, positions, [0, 1, 2, 2])
+
+        atoms = structure.get_ase()
+
+        self.assertEqual(atoms.get_chemical_symbols(), ['Fe', 'Fe', 'O', 'O'])
+        self.assertEqual(atoms.get_tags().tolist(), [1, 2, 0, 0])
+        self.assertTrue(np.allclose(atoms.get_positions(), positions))
+        self.assertAlmostEqual(atoms.get_masses()[3], 17.)
+
+
 class TestStructureDataReload(AiidaTestCase):
     """
     Tests the creation of StructureData, converting it to a raw format and
@@ -2888,6 +3123,164 @@ class TestArrayData(AiidaTestCase):
             if name == 'third':
                 self.assertAlmostEquals(abs(third - array).max(), 0.)
 
+    def test_mmap(self):
+        """
+        Check that arrays can be memory-mapped from the repository, before and after storing
+        """
+        from aiida.orm.data.array import ArrayData, get_array_cache
+        import numpy
+
+        n = ArrayData()
+        first = numpy.random.rand(5, 3)
+        n.set_array('first', first)
+
+        with self.assertRaises(ValueError):
+            n.get_array('first', mmap_mode='w+')
+
+        for _ in range(2):
+            array = n.get_array('first', mmap_mode='r')
+            self.assertIsInstance(array, numpy.memmap)
+            self.assertTrue(numpy.array_equal(array[2], first[2]))
+            with self.assertRaises(ValueError):
+                array[0, 0] = 1.
+            n.store()
+
+        # Memory-mapped arrays are not cached
+        self.assertNotIn((n.uuid, 'first'), get_array_cache())
+
+        for name, array in n.iterarrays(mmap_mode='r'):
+            self.assertEquals(name, 'first')
+            self.assertIsInstance(array, numpy.memmap)
+
+    def test_array_cache(self):
+        """
+        Check the cache of the arrays of stored nodes, and that it is bounded by the size of the arrays
+        """
+        from aiida.orm.data.array import ArrayData, ArrayCache, get_array_cache
+        import numpy
+
+        n = ArrayData()
+        n.set_array('first', numpy.arange(10))
+        n.store()
+
+        # The array is cached only after storing, and shared by all instances of the node
+        first = n.get_array('first')
+        self.assertIn((n.uuid, 'first'), get_array_cache())
+        self.assertIs(load_node(n.uuid).get_array('first'), first)
+
+        # The cached array is read-only, such that it cannot be modified for the other callers
+        with self.assertRaises(ValueError):
+            first[0] = 1
+        self.assertEquals(load_node(n.uuid).get_array('first')[0], 0)
+
+        n.clear_internal_cache()
+        self.assertNotIn((n.uuid, 'first'), get_array_cache())
+
+        cache = ArrayCache(max_bytes=200)
+        arrays = [numpy.zeros(10) for _ in range(3)]  # 80 bytes each
+        cache.set(('a', 'first'), arrays[0])
+        cache.set(('a', 'second'), arrays[1])
+        self.assertEquals(cache.nbytes, 160)
+
+        # Accessing the first array makes the second one the least recently used, that is evicted
+        self.assertIs(cache.get(('a', 'first')), arrays[0])
+        cache.set(('b', 'first'), arrays[2])
+        self.assertEquals(cache.nbytes, 160)
+        self.assertIsNone(cache.get(('a', 'second')))
+        self.assertIn(('a', 'first'), cache)
+
+        self.assertFalse(arrays[0].flags.writeable)
+
+        # Arrays larger than the cache are not cached
+        large = numpy.zeros(100)
+        cache.set(('c', 'large'), large)
+        self.assertNotIn(('c', 'large'), cache)
+        self.assertTrue(large.flags.writeable)
+
+        cache.discard('a')
+        self.assertEquals(len(cache), 1)
+        self.assertEquals(cache.nbytes, 80)
+        cache.clear()
+        self.assertEquals(cache.nbytes, 0)
+
+    def test_compressed(self):
+        """
+        Check the storage of compressed arrays in chunks, and the reading of slices of arrays
+        """
+        from aiida.orm.data.array import ArrayData
+        import numpy
+
+        n = ArrayData()
+        first = numpy.random.rand(100, 4, 3)
+        second = numpy.arange(10)
+        # Each chunk holds 10 rows of 4 x 3 floats
+        n.set_array('first', first, compressed=True, chunk_size=960)
+        n.set_array('second', second)
+
+        self.assertTrue(n.is_array_compressed('first'))
+        self.assertFalse(n.is_array_compressed('second'))
+        self.assertEquals(set(n.get_folder_list()), set(['first.npz', 'second.npy']))
+        self.assertEquals(first.shape, n.get_shape('first'))
+
+        for _ in range(2):
+            self.assertTrue(numpy.array_equal(n.get_array('first'), first))
+            self.assertTrue(numpy.array_equal(n.get_array('first', mmap_mode='r'), first))
+            for index in [5, -1, slice(15, 45, 7), (slice(None, None, -3), 0), numpy.array([99, 0, 50])]:
+                self.assertTrue(numpy.array_equal(n.get_array_slice('first', index), first[index]))
+            for index in [5, -1, slice(2, 8, 3)]:
+                self.assertTrue(numpy.array_equal(n.get_array_slice('second', index), second[index]))
+            n.store()
+            n.clear_internal_cache()
+
+        with self.assertRaises(KeyError):
+            n.get_array_slice('nonexistent_array', 0)
+
+        # Overwriting an array in the other format replaces its file
+        n = ArrayData()
+        n.set_array('first', first, compressed=True)
+        n.set_array('first', second)
+        self.assertEquals(n.get_folder_list(), ['first.npy'])
+        n.delete_array('first')
+        self.assertEquals(n.get_folder_list(), [])
+
+    def test_compressed_deterministic(self):
+        """
+        Saving the same array compressed twice gives the same file, and so nodes with the same hash
+        """
+        import io
+        import os
+        import shutil
+        import tempfile
+        import time
+        from aiida.orm.data.array import ArrayData, save_chunked_array
+        import numpy
+
+        array = numpy.random.rand(100, 4, 3)
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            contents = []
+            for index in range(2):
+                filepath = os.path.join(temp_folder, '{}.npz'.format(index))
+                save_chunked_array(filepath, array, chunk_size=960)
+                with io.open(filepath, 'rb') as handle:
+                    contents.append(handle.read())
+                # The timestamps in the zip format have a resolution of two seconds
+                time.sleep(2)
+        finally:
+            shutil.rmtree(temp_folder)
+
+        self.assertEquals(contents[0], contents[1])
+
+        hashes = []
+        for _ in range(2):
+            n = ArrayData()
+            n.set_array('array', array, compressed=True, chunk_size=960)
+            hashes.append(n.store().get_hash())
+            time.sleep(2)
+
+        self.assertEquals(hashes[0], hashes[1])
+
 
 class TestTrajectoryData(AiidaTestCase):
     """
@@ -3075,6 +3468,76 @@ class TestTrajectoryData(AiidaTestCase):
             # Step 66 does not exist
             n.get_index_from_stepid(66)
 
+    def test_iter_step_data(self):
+        """
+        Check that the iteration over the steps, in blocks, returns the same data as the full arrays.
+        """
+        from aiida.orm.data.array.trajectory import TrajectoryData
+        import numpy
+
+        numsteps, numsites = 11, 3
+        stepids = numpy.arange(numsteps) * 10
+        cells = numpy.random.rand(numsteps, 3, 3)
+        symbols = numpy.array(['H', 'O', 'H'])
+        positions = numpy.random.rand(numsteps, numsites, 3)
+
+        for compressed in (False, True):
+            n = TrajectoryData()
+            n.set_trajectory(stepids=stepids, cells=cells, symbols=symbols, positions=positions, compressed=compressed)
+
+            for _ in range(2):
+                for indices in [None, [7, 2, -1]]:
+                    expected = list(range(numsteps)) if indices is None else indices
+                    steps = list(n.iter_step_data(indices, block_size=4))
+                    self.assertEqual(len(steps), len(expected))
+                    for index, (stepid, time, cell, step_symbols, step_positions, velocities) in zip(expected, steps):
+                        self.assertEqual(stepid, stepids[index])
+                        self.assertIsNone(time)
+                        self.assertTrue(numpy.array_equal(cell, cells[index]))
+                        self.assertEqual(step_symbols.tolist(), symbols.tolist())
+                        self.assertTrue(numpy.array_equal(step_positions, positions[index]))
+                        self.assertIsNone(velocities)
+                n.store()
+
+            with self.assertRaises(IndexError):
+                list(n.iter_step_data([numsteps]))
+
+            structure = n.get_step_structure(3)
+            self.assertEqual(structure.get_kind_names(), ['H', 'O'])
+            self.assertEqual(structure.get_site_kindnames(), symbols.tolist())
+            self.assertTrue(numpy.allclose(structure.get_positions_array(), positions[3]))
+
+    def test_compressed(self):
+        """
+        Check that the data of a step is read from compressed positions and velocities.
+        """
+        from aiida.orm.data.array.trajectory import TrajectoryData
+        import numpy
+
+        numsteps, numsites = 50, 4
+        stepids = numpy.arange(numsteps)
+        cells = numpy.tile(numpy.eye(3), (numsteps, 1, 1))
+        symbols = numpy.array(['H', 'H', 'O', 'O'])
+        positions = numpy.random.rand(numsteps, numsites, 3)
+        velocities = numpy.random.rand(numsteps, numsites, 3)
+
+        n = TrajectoryData()
+        n.set_trajectory(stepids=stepids, cells=cells, symbols=symbols, positions=positions, velocities=velocities,
+                         compressed=True)
+
+        self.assertTrue(n.is_array_compressed('positions'))
+        self.assertTrue(n.is_array_compressed('velocities'))
+        self.assertFalse(n.is_array_compressed('cells'))
+
+        for _ in range(2):
+            data = n.get_step_data(7)
+            self.assertEqual(data[0], 7)
+            self.assertTrue(numpy.array_equal(data[4], positions[7]))
+            self.assertTrue(numpy.array_equal(data[5], velocities[7]))
+            self.assertTrue(numpy.array_equal(n.get_positions(), positions))
+            n.store()
+            n.clear_internal_cache()
+
     def test_conversion_to_structure(self):
         """
         Check the methods to export a given time step to a StructureData node.
@@ -3240,6 +3703,7 @@ class TestTrajectoryData(AiidaTestCase):
         """
         import numpy
         import os
+        import shutil
         import tempfile
         from aiida.orm.data.array.trajectory import TrajectoryData
         from aiida.orm.data.cif import has_pycifrw
@@ -3302,20 +3766,41 @@ class TestTrajectoryData(AiidaTestCase):
         os.remove(filename)
 
         if has_pycifrw():
-            formats_to_test = ['cif', 'xsf']
+            formats_to_test = ['cif', 'xsf', 'xyz']
         else:
-            formats_to_test = ['xsf']
+            formats_to_test = ['xsf', 'xyz']
         for format in formats_to_test:
             files_created = []  # In case there is an exception
             try:
                 files_created = n.export(filename, fileformat=format)
                 with io.open(filename, encoding='utf8') as fhandle:
                     filedata = fhandle.read()
+                # The file is written step by step, with the same content that is returned as a whole
+                self.assertEqual(filedata, n._exportcontent(format)[0].decode('utf8'))
             finally:
                 for file in files_created:
                     if os.path.exists(file):
                         os.remove(file)
 
+        # A failing writer should neither leave a partial file nor remove the file that was to be overwritten
+        def failing_writer(handle, **kwargs):
+            handle.write(b'partial')
+            raise NotImplementedError('failing writer')
+
+        folder = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(folder, 'trajectory.xsf')
+            with io.open(filename, 'w', encoding='utf8') as fhandle:
+                fhandle.write(u'existing')
+            n._write_xsf = failing_writer
+            with self.assertRaises(NotImplementedError):
+                n.export(filename, overwrite=True)
+            self.assertEqual(os.listdir(folder), ['trajectory.xsf'])
+            with io.open(filename, encoding='utf8') as fhandle:
+                self.assertEqual(fhandle.read(), u'existing')
+        finally:
+            shutil.rmtree(folder)
+
 
 class TestKpointsData(AiidaTestCase):
     """
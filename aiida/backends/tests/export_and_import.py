@@ -177,6 +177,53 @@ class TestSpecificImport(AiidaTestCase):
             qb.append(Calculation, output_of='remote')
             self.assertGreater(len(qb.all()), 0)
 
+    def test_import_in_batches(self):
+        """
+        Verify that nodes, attributes and links are imported correctly when they are inserted in several batches
+        """
+        import tempfile
+        from aiida.common.links import LinkType
+        from aiida.orm import importexport
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.data.parameter import ParameterData
+        from aiida.orm.importexport import export, import_data
+        from aiida.orm.node import Node
+        from aiida.orm.querybuilder import QueryBuilder
+
+        calculation = Calculation()
+        calculation._set_attr('key', 'value')
+        calculation.store()
+
+        outputs = []
+        for index in range(5):
+            output = ParameterData(dict={'index': index})
+            output.add_link_from(calculation, label='output_{}'.format(index), link_type=LinkType.CREATE)
+            outputs.append(output.store())
+
+        attributes = {node.uuid: node.get_attrs() for node in [calculation] + outputs}
+
+        with tempfile.NamedTemporaryFile() as handle:
+
+            export([calculation], outfile=handle.name, overwrite=True, silent=True)
+
+            self.clean_db()
+            self.insert_data()
+
+            batch_size = importexport.IMPORT_BATCH_SIZE
+            importexport.IMPORT_BATCH_SIZE = 2
+            try:
+                import_data(handle.name, silent=True)
+            finally:
+                importexport.IMPORT_BATCH_SIZE = batch_size
+
+        builder = QueryBuilder().append(Node, project=['uuid', 'attributes'])
+        self.assertEquals({str(uuid): attrs for uuid, attrs in builder.all()}, attributes)
+
+        builder = QueryBuilder()
+        builder.append(Calculation, tag='calculation')
+        builder.append(ParameterData, output_of='calculation', edge_project=['label'])
+        self.assertEquals(sorted(label for label, in builder.all()), ['output_{}'.format(i) for i in range(5)])
+
 
 class TestSimple(AiidaTestCase):
 
@@ -448,6 +495,41 @@ class TestSimple(AiidaTestCase):
             export_tree([sd], folder=folder, silent=True,
                         forbidden_licenses=crashing_filter)
 
+    def test_failed_export_keeps_existing_file(self):
+        """
+        A failing export with overwrite should neither replace the existing file nor leave a partial archive.
+        """
+        import io
+        import os
+        import shutil
+        import tempfile
+        from aiida.common.exceptions import LicensingException
+        from aiida.orm import DataFactory
+        from aiida.orm.importexport import export
+
+        StructureData = DataFactory('structure')
+        sd = StructureData()
+        sd.source = {'license': 'GPL'}
+        sd.store()
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(temp_folder, 'export.aiida')
+            with io.open(filename, 'w', encoding='utf8') as handle:
+                handle.write(u'existing content')
+
+            with self.assertRaises(LicensingException):
+                export([sd], outfile=filename, overwrite=True, silent=True, forbidden_licenses=['GPL'])
+
+            self.assertEquals(os.listdir(temp_folder), ['export.aiida'])
+            with io.open(filename, encoding='utf8') as handle:
+                self.assertEquals(handle.read(), u'existing content')
+
+            export([sd], outfile=filename, overwrite=True, silent=True)
+            self.assertEquals(os.listdir(temp_folder), ['export.aiida'])
+        finally:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
     def test_5(self):
         """
         This test checks that nodes belonging to different users are correctly
@@ -1712,6 +1794,51 @@ class TestLinks(AiidaTestCase):
         finally:
             shutil.rmtree(tmp_folder, ignore_errors=True)
 
+    def test_data_input_forward(self):
+        """Verify that input_forward = True exports the calculations using the exported Data nodes and their outputs."""
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.common.datastructures import calc_states
+        from aiida.orm import Node
+        from aiida.orm.data.base import Int
+        from aiida.orm.calculation.job import JobCalculation
+        from aiida.orm.importexport import export
+        from aiida.common.links import LinkType
+        from aiida.orm.querybuilder import QueryBuilder
+
+        tmp_folder = tempfile.mkdtemp()
+
+        try:
+            data_input = Int(1).store()
+            data_output = Int(2).store()
+
+            calc = JobCalculation()
+            calc.set_computer(self.computer)
+            calc.set_option('resources', {"num_machines": 1, "num_mpiprocs_per_machine": 1})
+            calc.store()
+
+            calc.add_link_from(data_input, 'input', link_type=LinkType.INPUT)
+            calc._set_state(calc_states.PARSING)
+            data_output.add_link_from(calc, 'create', link_type=LinkType.CREATE)
+
+            uuids = set([data_input.uuid, data_output.uuid, calc.uuid])
+
+            export_file = os.path.join(tmp_folder, 'export.tar.gz')
+            export([data_input], outfile=export_file, silent=True, input_forward=True)
+
+            self.clean_db()
+            self.insert_data()
+
+            import_data(export_file, silent=True)
+
+            builder = QueryBuilder()
+            builder.append(Node, project=['uuid'])
+            self.assertEqual(set(str(uuid) for uuid, in builder.all()), uuids)
+        finally:
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
     def test_complex_workflow_graph_links(self):
         """
         This test checks that all the needed links are correctly exported and
@@ -328,6 +328,42 @@ class TestGroups(AiidaTestCase):
         # Cleanup
         g.delete()
 
+    def test_add_remove_nodes_bulk(self):
+        """
+        Test adding and removing nodes by pk and with a QueryBuilder, and iterating over the nodes in batches
+        """
+        from aiida.orm.group import Group
+        from aiida.orm.querybuilder import QueryBuilder
+
+        nodes = [Node().store() for _ in range(5)]
+        pks = [n.pk for n in nodes]
+        n_out = Node().store()
+
+        g = Group(name='test_add_remove_nodes_bulk').store()
+        g._nodes_batch_size = 2
+
+        # List of pks, with duplicates
+        g.add_nodes(pks[:3] + pks[:1])
+        self.assertEquals(sorted(pks[:3]), [_.pk for _ in g.nodes])
+
+        # A QueryBuilder, where the nodes already in the group are skipped
+        builder = QueryBuilder().append(Node, filters={'id': {'in': pks}}, project=['id'])
+        g.add_nodes(builder)
+        self.assertEquals(sorted(pks), [_.pk for _ in g.nodes])
+        self.assertEquals(len(g.nodes), len(pks))
+
+        # Removing with a QueryBuilder that projects the nodes themselves
+        builder = QueryBuilder().append(Node, filters={'id': {'in': pks[:2] + [n_out.pk]}})
+        g.remove_nodes(builder)
+        self.assertEquals(sorted(pks[2:]), [_.pk for _ in g.nodes])
+
+        # Removing by pk
+        g.remove_nodes(pks[2])
+        self.assertEquals(sorted(pks[3:]), [_.pk for _ in g.nodes])
+
+        # Cleanup
+        g.delete()
+
     def test_creation_from_dbgroup(self):
         from aiida.orm.group import Group
 
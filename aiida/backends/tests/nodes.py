@@ -22,7 +22,7 @@ from six.moves import range
 from sqlalchemy.exc import StatementError
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.common.exceptions import ModificationNotAllowed, UniquenessError
+from aiida.common.exceptions import ModificationNotAllowed, UniquenessError, ValidationError
 from aiida.common.links import LinkType
 from aiida.orm.calculation import Calculation
 from aiida.orm.data import Data
@@ -163,6 +163,32 @@ class TestNodeHashing(AiidaTestCase):
             self.assertNotEquals(a1.uuid, a2.uuid)
             self.assertFalse('_aiida_cached_from' in a2.extras())
 
+    def test_get_same_nodes_batch(self):
+        """
+        The batched lookup should return the same cache sources as the lookup node by node.
+        """
+        from aiida.orm.data.float import Float
+        from aiida.orm.data.int import Int
+        from aiida.orm.utils.caching import get_same_nodes
+
+        source = self.create_simple_node(3.0, 3.1, 3.2).store()
+        Int(31).store()
+
+        candidates = [
+            self.create_simple_node(3.0, 3.1, 3.2),
+            self.create_simple_node(4.0, 3.1, 3.2),
+            Int(31),
+            Float(31),
+        ]
+
+        same_nodes = get_same_nodes(candidates)
+        self.assertEqual([n.uuid if n else None for n in same_nodes],
+                         [n._get_same_node().uuid if n._get_same_node() else None for n in candidates])
+        self.assertEqual(same_nodes[0].uuid, source.uuid)
+        self.assertIsNone(same_nodes[1])
+        self.assertIsNotNone(same_nodes[2])
+        self.assertIsNone(same_nodes[3])
+
     def test_updatable_attributes(self):
         """
         Tests that updatable attributes are ignored.
@@ -195,6 +221,111 @@ class TestTransitiveNoLoops(AiidaTestCase):
             n1.add_link_from(n4, link_type=LinkType.CREATE)
 
 
+class TestNodeStoreMany(AiidaTestCase):
+    """
+    Test storing many unstored nodes at once, together with the links between them
+    """
+
+    def test_store_many(self):
+        from aiida.orm.backend import construct_backend
+
+        stored = Data().store()
+        data = Data()
+        data._set_attr('a', 1)
+        data.add_link_from(stored)
+        calc = Calculation()
+        calc.add_link_from(data, label='input')
+        output = Data()
+        output.add_link_from(calc, label='output', link_type=LinkType.CREATE)
+
+        # The order of the nodes should not matter and stored nodes are skipped
+        construct_backend().store_many([output, calc, stored, data])
+
+        for node in [data, calc, output]:
+            self.assertTrue(node.is_stored)
+            reloaded = load_node(node.pk)
+            self.assertEqual(reloaded.uuid, node.uuid)
+            self.assertEqual(reloaded.get_extra('_aiida_hash'), node.get_hash())
+
+        self.assertEqual(load_node(data.pk).get_attr('a'), 1)
+        self.assertEqual(load_node(data.pk).get_inputs(), [stored])
+        self.assertEqual(load_node(calc.pk).get_inputs_dict(), {'input': data})
+        self.assertEqual(load_node(output.pk).get_inputs_dict(link_type=LinkType.CREATE), {'output': calc})
+
+        # The nodes can be modified through the same instances after the storing
+        data.set_extra('b', 2)
+        self.assertEqual(load_node(data.pk).get_extra('b'), 2)
+
+    def test_store_many_files(self):
+        import tempfile
+
+        node = Data()
+        with tempfile.NamedTemporaryFile(mode='w+') as tmpf:
+            tmpf.write('some text ABCDE')
+            tmpf.flush()
+            node.add_path(tmpf.name, 'file1.txt')
+
+        Node.store_many([node])
+
+        reloaded = load_node(node.pk)
+        self.assertEqual(reloaded.get_folder_list(), ['file1.txt'])
+        with io.open(reloaded.get_abs_path('file1.txt'), encoding='utf8') as fhandle:
+            self.assertEqual(fhandle.read(), 'some text ABCDE')
+
+    def test_store_many_unstored_source(self):
+        source = Data()
+        node = Data()
+        node.add_link_from(source)
+
+        with self.assertRaises(ModificationNotAllowed):
+            Node.store_many([node])
+
+        self.assertFalse(source.is_stored)
+        self.assertFalse(node.is_stored)
+
+    def test_store_many_failed_level(self):
+        """A failure in a later level unstores the nodes stored by the previous levels, in bulk or one by one."""
+        import tempfile
+        from aiida.orm import JobCalculation
+
+        def invalid():
+            raise ValidationError('invalid node')
+
+        data = Data()
+        data._set_attr('a', 1)
+        with tempfile.NamedTemporaryFile(mode='w+') as tmpf:
+            tmpf.write('some text ABCDE')
+            tmpf.flush()
+            data.add_path(tmpf.name, 'file1.txt')
+        # The JobCalculation overrides `store`, so it is stored one by one in the first level
+        job = JobCalculation(computer=self.computer, resources={'num_machines': 1, 'num_mpiprocs_per_machine': 1})
+        self.assertFalse(job._can_store_in_bulk())
+        calc = Calculation()
+        calc.add_link_from(data, label='input')
+        calc._validate = invalid
+
+        with self.assertRaises(ValidationError):
+            Node.store_many([data, job, calc])
+
+        for node in [data, job, calc]:
+            self.assertFalse(node.is_stored)
+            self.assertIsNone(node.pk)
+
+        self.assertEqual(data.get_attr('a'), 1)
+        self.assertEqual(data.get_folder_list(), ['file1.txt'])
+        self.assertEqual(job.get_resources()['num_machines'], 1)
+        self.assertEqual(list(calc._inputlinks_cache.keys()), ['input'])
+
+        # The nodes can still be stored once the failure is fixed
+        del calc._validate
+        Node.store_many([data, job, calc])
+
+        self.assertEqual(load_node(data.pk).get_attr('a'), 1)
+        self.assertEqual(load_node(data.pk).get_folder_list(), ['file1.txt'])
+        self.assertEqual(load_node(job.pk).get_resources()['num_machines'], 1)
+        self.assertEqual(load_node(calc.pk).get_inputs_dict(), {'input': data})
+
+
 class TestQueryWithAiidaObjects(AiidaTestCase):
     """
     Test if queries work properly also with aiida.orm.Node classes instead of
@@ -498,43 +629,6 @@ class TestNodeBasic(AiidaTestCase):
         self.assertEquals(a.get_attr('list'), [1, 2, 3, 4])
         self.assertEquals(mylist, [1, 2, 3])
 
-    # pylint: disable=no-self-use,unused-argument,unused-variable,no-member
-    def DISABLED(self):
-        """
-        This test routine is disabled for the time being; I will re-enable
-        when I have time to implement the check of the length of the 'key'.
-        """
-
-        def test_very_deep_attributes(self):
-            """
-            Test attributes where the total length of the key, including the
-            separators, would be longer than the field length in the DB.
-            """
-            from aiida.backends.djsite.db import models
-
-            n = Node()
-
-            semi_long_string = "abcdefghijklmnopqrstuvwxyz"
-            value = "some value"
-
-            attribute = {semi_long_string: value}
-            key_len = len(semi_long_string)
-
-            max_len = models.DbAttribute._meta.get_field_by_name('key')[0].max_length
-
-            while key_len < 2 * max_len:
-                # Create a deep, recursive attribute
-                attribute = {semi_long_string: attribute}
-                key_len += len(semi_long_string) + len(models.DbAttribute._sep)
-
-            n._set_attr(semi_long_string, attribute)
-
-            n.store()
-
-            all_keys = models.DbAttribute.objects.filter(dbnode=n.dbnode).values_list('key', flat=True)
-
-            print(max(len(i) for i in all_keys))
-
     def test_datetime_attribute(self):
         from aiida.utils.timezone import (get_current_timezone, is_naive, make_aware, now)
 
@@ -1045,6 +1139,57 @@ class TestNodeBasic(AiidaTestCase):
             del all_extras[k]
             self.assertEquals({k: v for k, v in a.iterextras()}, all_extras)
 
+    def test_set_extra_partial_update(self):
+        """
+        Setting or deleting a single extra should leave the other extras and the attributes untouched,
+        and increment the node version once.
+        """
+        a = Node()
+        a._set_attr('dict', self.dictval)
+        a.store()
+
+        a.set_extra('first', self.listval)
+        a.set_extra('second', self.dictval)
+        nodeversion = a.dbnode.nodeversion
+
+        a.set_extra('first', 1)
+        self.assertEquals(a.dbnode.nodeversion, nodeversion + 1)
+        self.assertEquals(a.get_extra('first'), 1)
+        self.assertEquals(a.get_extra('second'), self.dictval)
+
+        a.del_extra('second')
+        self.assertEquals(a.dbnode.nodeversion, nodeversion + 2)
+        self.assertEquals(a.get_extras(), {'first': 1, '_aiida_hash': AnyValue()})
+        self.assertEquals(a.get_attr('dict'), self.dictval)
+
+        with self.assertRaises(AttributeError):
+            a.del_extra('second')
+
+        with self.assertRaises(UniquenessError):
+            a.set_extra('first', 2, exclusive=True)
+        self.assertEquals(a.get_extra('first'), 1)
+
+        a.set_extra('third', 3, exclusive=True)
+        self.assertEquals(a.get_extra('third'), 3)
+
+    def test_set_extras_many(self):
+        """Test setting the same extra on many nodes at once."""
+        nodes = [Node().store() for _ in range(3)]
+        nodes[0].set_extra('other', 'value')
+
+        Node.set_extras_many(nodes, 'many', [0, [1, 2], {'a': 'b'}])
+
+        self.assertEquals(nodes[0].get_extra('many'), 0)
+        self.assertEquals(nodes[0].get_extra('other'), 'value')
+        self.assertEquals(nodes[1].get_extra('many'), [1, 2])
+        self.assertEquals(nodes[2].get_extra('many'), {'a': 'b'})
+
+        with self.assertRaises(ValueError):
+            Node.set_extras_many(nodes, 'many', [1])
+
+        with self.assertRaises(ModificationNotAllowed):
+            Node.set_extras_many([Node()], 'many', [1])
+
     def test_replace_extras_1(self):
         """
         Checks the ability of replacing extras, removing the subkeys also when
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+from six.moves import range
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.common.links import LinkType
+from aiida.orm import Node
+from aiida.orm.querybuilder import QueryBuilder
+from aiida.orm.utils import load_node
+from aiida.orm.utils.identity_map import IdentityMap, get_identity_map, identity_map
+
+
+class TestIdentityMap(AiidaTestCase):
+
+    def test_load_node(self):
+        """Within an identity map scope the same instance is returned for the same node."""
+        node = Node().store()
+
+        self.assertIsNot(load_node(node.pk), load_node(node.pk))
+
+        with identity_map() as mapping:
+            self.assertIs(get_identity_map(), mapping)
+            loaded = load_node(node.pk)
+            self.assertIs(load_node(node.pk), loaded)
+            self.assertIs(load_node(node.uuid), loaded)
+            self.assertIs(QueryBuilder().append(Node, filters={'id': node.pk}).one()[0], loaded)
+
+            # Nested scopes share the same map
+            with identity_map() as nested:
+                self.assertIs(nested, mapping)
+                self.assertIs(load_node(node.pk), loaded)
+
+            self.assertIn(node.pk, mapping)
+
+        self.assertIsNone(get_identity_map())
+        self.assertIsNot(load_node(node.pk), loaded)
+
+    def test_links(self):
+        """The nodes returned by `get_inputs` and `get_outputs` are shared as well."""
+        source = Node().store()
+        target = Node().store()
+        target.add_link_from(source, label='link', link_type=LinkType.CREATE)
+
+        with identity_map():
+            loaded = load_node(source.pk)
+            self.assertIs(load_node(target.pk).get_inputs()[0], loaded)
+            self.assertIs(loaded.get_outputs()[0], load_node(target.pk))
+
+    def test_threads(self):
+        """The scope of an identity map is limited to the thread that entered it."""
+        import threading
+
+        mappings = []
+        with identity_map() as mapping:
+            thread = threading.Thread(target=lambda: mappings.append(get_identity_map()))
+            thread.start()
+            thread.join()
+            self.assertIs(get_identity_map(), mapping)
+
+        self.assertEqual(mappings, [None])
+
+    def test_max_size(self):
+        """The least recently used node is discarded when the map is full."""
+        nodes = [Node().store() for _ in range(3)]
+
+        mapping = IdentityMap(max_size=2)
+        mapping.add(nodes[0])
+        mapping.add(nodes[1])
+        self.assertIs(mapping.get(nodes[0].pk), nodes[0])
+
+        mapping.add(nodes[2])
+        self.assertEqual(len(mapping), 2)
+        self.assertNotIn(nodes[1].pk, mapping)
+        self.assertIn(nodes[0].pk, mapping)
+        self.assertIn(nodes[2].pk, mapping)
+
+        mapping.discard(nodes[0].pk)
+        self.assertIsNone(mapping.get(nodes[0].pk))
+
+        with self.assertRaises(ValueError):
+            IdentityMap(max_size=0)
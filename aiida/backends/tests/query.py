@@ -980,6 +980,50 @@ class QueryBuilderPath(AiidaTestCase):
         qb.add_filter('edge', {'depth': 6})
         self.assertTrue(set(next(zip(*qb.all()))), set([6]))
 
+    def test_traverse_links(self):
+        from aiida.backends.general.abstractqueries import AbstractQueryManager
+        from aiida.orm import Node
+        from aiida.common.links import LinkType
+        from aiida.orm.utils.traversal import TraversalRule, traverse_graph
+
+        q = self.backend.query_manager
+        nodes = []
+        for index in range(6):
+            node = Node()
+            node.label = 'n{}'.format(index)
+            nodes.append(node.store())
+        n0, n1, n2, n3, n4, n5 = nodes
+
+        # A chain 0 -> 1 -> 2 -> 3 of INPUT and CREATE links, a CALL link 1 -> 4 and an isolated node 5
+        n1.add_link_from(n0, link_type=LinkType.INPUT)
+        n2.add_link_from(n1, link_type=LinkType.CREATE)
+        n3.add_link_from(n2, link_type=LinkType.INPUT)
+        n4.add_link_from(n1, link_type=LinkType.CALL)
+
+        forward = [LinkType.INPUT.value, LinkType.CREATE.value]
+        cases = [
+            (([n0.pk], forward, [], None), [n0, n1, n2, n3]),
+            (([n0.pk], forward, [], 2), [n0, n1, n2]),
+            (([n3.pk], [], forward, None), [n0, n1, n2, n3]),
+            (([n2.pk], forward, forward, None), [n0, n1, n2, n3]),
+            (([n4.pk], [], [LinkType.CALL.value], None), [n1, n4]),
+            (([n5.pk, n4.pk], [], [], None), [n4, n5]),
+            (([], forward, [], None), []),
+        ]
+
+        for args, expected in cases:
+            expected = sorted(node.pk for node in expected)
+            self.assertEqual(q.traverse_links(*args[:3], max_depth=args[3]), expected)
+            # The generic implementation of the query manager must give the same result
+            self.assertEqual(AbstractQueryManager.traverse_links(q, *args[:3], max_depth=args[3], batch_size=1),
+                             expected)
+
+        pks = traverse_graph([n0.pk], [TraversalRule(LinkType.INPUT, forward=True),
+                                       TraversalRule(LinkType.CREATE, forward=True)])
+        self.assertEqual(list(pks), sorted([n0.pk, n1.pk, n2.pk, n3.pk]))
+        self.assertIn(n3.pk, pks)
+        self.assertNotIn(n4.pk, pks)
+
 
 class TestConsistency(AiidaTestCase):
     def test_create_node_and_query(self):
@@ -1001,6 +1045,74 @@ class TestConsistency(AiidaTestCase):
         self.assertTrue(len(QueryBuilder().append(Node, project=['id', 'label']).all(batch_size=10)) > 99)
 
 
+class TestPrefetch(AiidaTestCase):
+    def test_prefetch_links(self):
+        from aiida.common.exceptions import InputValidationError
+        from aiida.common.links import LinkType
+        from aiida.orm import Node, load_node
+        from aiida.orm.querybuilder import QueryBuilder
+        from aiida.orm.utils.identity_map import identity_map
+
+        source = Node().store()
+        targets = [Node().store() for _ in range(3)]
+        for index, target in enumerate(targets):
+            target.add_link_from(source, label='link_{}'.format(index), link_type=LinkType.CREATE)
+
+        filters = {'id': {'in': [target.pk for target in targets]}}
+        queries = [
+            QueryBuilder().append(Node, filters=filters, project=['*']).prefetch().all(batch_size=2),
+            [[row['node']['*']] for row in QueryBuilder(prefetch=True).append(
+                Node, filters=filters, project=['*'], tag='node').iterdict(batch_size=2)],
+        ]
+
+        for rows in queries:
+            self.assertEqual(len(rows), 3)
+            for node, in rows:
+                self.assertIsNotNone(node._prefetched_links)
+                self.assertEqual(node.get_outputs(), [])
+                self.assertEqual(len(node.get_inputs(link_type=LinkType.CREATE)), 1)
+                self.assertEqual(node.get_inputs(link_type=LinkType.INPUT), [])
+                label, input_node = node.get_inputs(also_labels=True)[0]
+                self.assertEqual(input_node.uuid, source.uuid)
+                self.assertTrue(label.startswith('link_'))
+
+        node = QueryBuilder().append(Node, filters={'id': source.pk}).prefetch().first()[0]
+        self.assertEqual(len(node.get_outputs()), 3)
+
+        # Adding a link discards the prefetched links, which are then queried again
+        Node().store().add_link_from(node, label='new', link_type=LinkType.CREATE)
+        self.assertIsNone(node._prefetched_links)
+        self.assertEqual(len(node.get_outputs()), 4)
+
+        # Also when the link is stored from the cache of the unstored target, one by one or in bulk
+        for index, store in enumerate([lambda target: target.store(), lambda target: Node.store_many([target])]):
+            node = QueryBuilder().append(Node, filters={'id': source.pk}).prefetch().first()[0]
+            self.assertEqual(len(node.get_outputs()), 4 + index)
+            target = Node()
+            target.add_link_from(node, label='cached', link_type=LinkType.CREATE)
+            store(target)
+            self.assertIn(target.uuid, [output.uuid for output in node.get_outputs()])
+
+        # Removing an input link discards the prefetched links of the instance of the source in the identity map
+        with identity_map():
+            node = QueryBuilder().append(Node, filters={'id': source.pk}).prefetch().first()[0]
+            self.assertEqual(len(node.get_outputs()), 6)
+            load_node(targets[0].pk)._remove_link_from('link_0')
+            self.assertIsNone(node._prefetched_links)
+            self.assertEqual(len(node.get_outputs()), 5)
+
+        node = QueryBuilder().append(Node, filters={'id': source.pk}).first()[0]
+        self.assertIsNone(node._prefetched_links)
+
+        # The prefetching is part of the queryhelp
+        queryhelp = QueryBuilder().append(Node).prefetch().get_json_compatible_queryhelp()
+        self.assertTrue(queryhelp['prefetch'])
+        self.assertTrue(QueryBuilder(**queryhelp)._prefetch)
+
+        with self.assertRaises(InputValidationError):
+            QueryBuilder().prefetch('yes')
+
+
 class TestManager(AiidaTestCase):
     def test_statistics(self):
         """
@@ -12,7 +12,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
-import six
+import plumpy
 
 from aiida.backends.testbase import AiidaTestCase
 from aiida.work.persistence import AiiDAPersister
@@ -57,11 +57,71 @@ class TestAiiDAPersister(AiidaTestCase):
 
         self.assertDictEqual(bundle_saved, bundle_loaded)
 
+    def test_save_load_checkpoint_pickle(self):
+        """Pickled checkpoints are only loaded by a persister that opted in to the pickle codec."""
+        import plumpy
+
+        persister = AiiDAPersister(codec='pickle')
+        process = DummyProcess()
+        bundle_saved = persister.save_checkpoint(process)
+        bundle_loaded = persister.load_checkpoint(process.calc.pk)
+
+        self.assertDictEqual(bundle_saved, bundle_loaded)
+
+        with self.assertRaises(plumpy.PersistenceError):
+            self.persister.load_checkpoint(process.calc.pk)
+
+    def test_load_legacy_checkpoint(self):
+        """Checkpoints stored as YAML in the attributes of the calculation can still be loaded."""
+        from aiida.utils import serialize
+
+        process = DummyProcess()
+        bundle = work.Bundle(process)
+        process.calc._set_attr(process.calc.CHECKPOINT_KEY, serialize.serialize(bundle))
+
+        self.assertDictEqual(self.persister.load_checkpoint(process.calc.pk), bundle)
+
+        self.persister.delete_checkpoint(process.pid)
+        self.assertEquals(process.calc.get_attr(process.calc.CHECKPOINT_KEY, None), None)
+
+    def test_delta_checkpoint(self):
+        """Only the rows of the checkpoint that changed since the previous one should be written."""
+        from aiida.backends import utils
+
+        process = DummyProcess()
+        self.persister.save_checkpoint(process)
+        rows = utils.get_checkpoint_rows(process.calc.pk)
+        self.assertTrue(rows)
+
+        written = []
+        set_checkpoint_rows = utils.set_checkpoint_rows
+
+        def record_checkpoint_rows(pk, rows, removed_keys=()):
+            written.extend(rows)
+            set_checkpoint_rows(pk, rows, removed_keys)
+
+        utils.set_checkpoint_rows = record_checkpoint_rows
+        try:
+            self.persister.save_checkpoint(process)
+            self.assertEqual(written, [])
+
+            AiiDAPersister(delta=False).save_checkpoint(process)
+            self.assertEqual(len(written), len(rows))
+        finally:
+            utils.set_checkpoint_rows = set_checkpoint_rows
+
+        self.assertEqual(sorted(utils.get_checkpoint_rows(process.calc.pk)), sorted(rows))
+
     def test_delete_checkpoint(self):
+        from aiida.backends.utils import get_checkpoint_rows
+
         process = DummyProcess()
 
         self.persister.save_checkpoint(process)
-        self.assertTrue(isinstance(process.calc.checkpoint, six.string_types))
+        self.assertTrue(get_checkpoint_rows(process.calc.pk))
 
         self.persister.delete_checkpoint(process.pid)
-        self.assertEquals(process.calc.checkpoint, None)
+        self.assertEquals(get_checkpoint_rows(process.calc.pk), [])
+
+        with self.assertRaises(plumpy.PersistenceError):
+            self.persister.load_checkpoint(process.pid)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import tornado.ioloop
+from tornado import gen
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.common.exceptions import ModificationNotAllowed
+from aiida.orm import load_node
+from aiida.orm.calculation.work import WorkCalculation
+from aiida.work.node_updates import NodeUpdateBuffer
+
+
+class TestNodeUpdateBuffer(AiidaTestCase):
+    """Tests for the write-behind buffer of the node updates."""
+
+    def setUp(self):
+        super(TestNodeUpdateBuffer, self).setUp()
+        self.loop = tornado.ioloop.IOLoop()
+        self.buffer = NodeUpdateBuffer(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        super(TestNodeUpdateBuffer, self).tearDown()
+
+    def test_coalesce(self):
+        """Only the last update of every attribute is written, in a single update of each node."""
+        calcs = [WorkCalculation().store() for _ in range(2)]
+        versions = [load_node(calc.pk).nodeversion for calc in calcs]
+
+        for calc in calcs:
+            self.buffer.set_attribute(calc, calc.PROCESS_STATE_KEY, 'created')
+            self.buffer.set_process_status(calc, 'first')
+            self.buffer.set_attribute(calc, calc.PROCESS_STATE_KEY, 'running')
+        self.buffer.set_process_status(calcs[1], None)
+
+        self.assertEqual(len(self.buffer), 2)
+        self.assertIsNone(load_node(calcs[0].pk).process_state)
+
+        self.buffer.flush()
+        self.assertEqual(len(self.buffer), 0)
+
+        for calc, version in zip(calcs, versions):
+            loaded = load_node(calc.pk)
+            self.assertEqual(loaded.get_attr(calc.PROCESS_STATE_KEY), 'running')
+            self.assertEqual(loaded.nodeversion, version + 1)
+
+        self.assertEqual(load_node(calcs[0].pk).process_status, 'first')
+        self.assertIsNone(load_node(calcs[1].pk).process_status)
+
+    def test_flush_in_loop(self):
+        """The pending updates are written in the next iteration of the event loop."""
+        calc = WorkCalculation().store()
+        self.buffer.set_attribute(calc, calc.PROCESS_PAUSED_KEY, True)
+
+        @gen.coroutine
+        def next_iteration():
+            yield gen.moment
+
+        self.loop.run_sync(next_iteration)
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertTrue(load_node(calc.pk).paused)
+
+    def test_defer(self):
+        """A deferred callback replaces the callback pending under the same key."""
+        called = []
+
+        self.buffer.defer('key', lambda: called.append(1))
+        self.buffer.defer('key', lambda: called.append(2))
+        self.buffer.defer('other', lambda: called.append(3))
+        self.buffer.discard('other')
+        self.buffer.flush()
+
+        self.assertEqual(called, [2])
+
+    def test_failed_flush(self):
+        """When writing the updates fails, they and the deferred callbacks are kept until the next flush."""
+        from aiida.backends import utils
+
+        calc = WorkCalculation().store()
+        called = []
+        update_attributes_many = utils.update_attributes_many
+
+        def fail_once(updates):
+            utils.update_attributes_many = update_attributes_many
+            raise RuntimeError('transient failure')
+
+        self.buffer.set_attribute(calc, calc.PROCESS_STATE_KEY, 'running')
+        self.buffer.defer('key', lambda: called.append(1))
+
+        utils.update_attributes_many = fail_once
+        try:
+            with self.assertRaises(RuntimeError):
+                self.buffer.flush()
+        finally:
+            utils.update_attributes_many = update_attributes_many
+
+        self.assertEqual(len(self.buffer), 2)
+        self.assertEqual(called, [])
+        self.assertIsNone(load_node(calc.pk).process_state)
+
+        self.buffer.flush()
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(called, [1])
+        self.assertEqual(load_node(calc.pk).get_attr(calc.PROCESS_STATE_KEY), 'running')
+
+    def test_immutable_attribute(self):
+        """Attributes that are not updatable cannot be buffered for stored nodes."""
+        calc = WorkCalculation().store()
+
+        with self.assertRaises(ModificationNotAllowed):
+            self.buffer.set_attribute(calc, 'immutable', 1)
@@ -78,6 +78,54 @@ class TestWorkchain(AiidaTestCase):
         self._run_loop_for(10.)
         self.assertTrue(future.result())
 
+    def test_call_on_calculation_finish_batched(self):
+        """Check that all the awaited calculations are watched together and called back once they terminate."""
+        from aiida.orm.calculation import Calculation
+        from aiida.work import termination
+
+        loop = self.runner.loop
+        calcs = [Calculation().store() for _ in range(3)]
+        for calc in calcs:
+            calc._set_process_state(plumpy.ProcessState.RUNNING)  # pylint: disable=protected-access
+        called = []
+
+        def calc_done(pk):
+            called.append(pk)
+            if len(called) == len(calcs):
+                loop.stop()
+
+        for calc in calcs:
+            self.runner.call_on_calculation_finish(calc.pk, calc_done)
+
+        self.assertEqual(len(self.runner.termination_watcher), len(calcs))
+        self.assertEqual(termination.get_terminated_calculation_pks([calc.pk for calc in calcs]), [])
+
+        for calc, state in zip(calcs, [plumpy.ProcessState.FINISHED, plumpy.ProcessState.EXCEPTED,
+                                       plumpy.ProcessState.KILLED]):
+            calc._set_process_state(state)  # pylint: disable=protected-access
+
+        self.assertEqual(
+            sorted(termination.get_terminated_calculation_pks([calc.pk for calc in calcs])),
+            sorted([calc.pk for calc in calcs]))
+
+        self._run_loop_for(5.)
+        self.assertEqual(sorted(called), sorted([calc.pk for calc in calcs]))
+        self.assertEqual(len(self.runner.termination_watcher), 0)
+
+    def test_call_on_calculation_finish_not_existent(self):
+        """Check that awaiting a calculation that does not exist raises instead of waiting forever."""
+        from aiida.common.exceptions import NotExistent
+        from aiida.orm.calculation import Calculation
+        from aiida.utils.delete_nodes import delete_nodes
+
+        pk = Calculation().store().pk
+        delete_nodes([pk], force=True)
+
+        with self.assertRaises(NotExistent):
+            self.runner.call_on_calculation_finish(pk, lambda pk: None)
+
+        self.assertEqual(len(self.runner.termination_watcher), 0)
+
     def _run_loop_for(self, seconds):
         loop = self.runner.loop
         loop.call_later(seconds, the_hans_klok_comeback, self.runner.loop)
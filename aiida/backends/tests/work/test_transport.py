@@ -145,3 +145,50 @@ class TestTransportQueue(AiidaTestCase):
 
         finally:
             transport_class._DEFAULT_SAFE_OPEN_INTERVAL = original_interval
+
+    def test_pooled_transport_reuse(self):
+        """Test that with an idle timeout the transport is kept open and reused by the next request."""
+        queue = TransportQueue(idle_timeout=60)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+            raise Return(trans)
+
+        try:
+            trans1 = loop.run_sync(lambda: test())
+            self.assertTrue(trans1.is_open)
+            trans2 = loop.run_sync(lambda: test())
+            self.assertIs(trans1, trans2)
+            self.assertEqual(queue.stats.misses, 1)
+            self.assertEqual(queue.stats.hits, 1)
+            self.assertEqual(queue.stats.opened, 1)
+            self.assertEqual(queue.stats.waits, 2)
+        finally:
+            queue.close()
+
+        self.assertFalse(trans1.is_open)
+
+    def test_pooled_transport_reconnect(self):
+        """Test that a pooled transport that is no longer alive is replaced by a new one."""
+        queue = TransportQueue(idle_timeout=60)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+                self.assertTrue(trans.is_alive())
+            raise Return(trans)
+
+        try:
+            trans1 = loop.run_sync(lambda: test())
+            trans1.close()
+            trans2 = loop.run_sync(lambda: test())
+            self.assertIsNot(trans1, trans2)
+            self.assertEqual(queue.stats.reconnects, 1)
+            self.assertEqual(queue.stats.opened, 2)
+        finally:
+            queue.close()
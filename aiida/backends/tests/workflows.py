@@ -234,6 +234,41 @@ class TestWorkflowBasic(AiidaTestCase):
         finally:
             pass
 
+    def test_running_workflow_steps_summary(self):
+        """
+        Check that the aggregated summary of the running steps, used by the
+        workflow manager, matches the states of the calculations and sub
+        workflows of each step as computed by loading them.
+        """
+        from aiida.orm.implementation import get_all_running_steps
+
+        wf = WFTestSimpleWithSubWF()
+        wf.store()
+        wf.start()
+
+        summary = construct_backend().query_manager.get_running_workflow_steps_summary()
+        steps = list(get_all_running_steps())
+
+        self.assertEqual([row[0] for row in summary], sorted(step.pk for step in steps))
+        self.assertIn(wf.pk, [row[2] for row in summary])
+
+        steps = {step.pk: step for step in steps}
+        for row in summary:
+            step = steps[row[0]]
+            calcs = step.get_calculations()
+            sub_workflows = step.get_sub_workflows()
+
+            self.assertEqual(row[1], step.name)
+            self.assertEqual(row[2], step.parent.pk)
+            self.assertEqual(row[3], step.parent.state)
+            self.assertEqual(row[4], len(calcs))
+            self.assertEqual(row[5], sorted(c.pk for c in calcs if c._is_new()))
+            self.assertEqual(row[6], len([c for c in calcs if c.is_finished_ok]))
+            self.assertEqual(row[7], len([c for c in calcs if c.is_failed]))
+            self.assertEqual(row[8], len(sub_workflows))
+            self.assertEqual(row[9], len([sw for sw in sub_workflows if sw.has_finished_ok()]))
+            self.assertEqual(row[10], len([sw for sw in sub_workflows if sw.has_failed()]))
+
     def test_result_parameter_name_colision(self):
         """
         This test checks that the the workflow parameters and results do not
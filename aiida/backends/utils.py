@@ -12,6 +12,10 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import collections
+import datetime
+import re
+
 import six
 
 from aiida.backends import settings
@@ -41,6 +45,50 @@ def validate_attribute_key(key):
             AIIDA_ATTRIBUTE_SEP))
 
 
+# Only strings with this format are converted back to dates when the attributes are loaded from a JSON column
+DATETIME_ISOFORMAT_REGEX = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+(\+\d{2}:\d{2})?$')
+
+
+def datetime_to_isoformat(value):
+    """
+    Return a copy of the given value, where all datetime objects, also those nested in lists and dictionaries, are
+    converted to strings in ISO format, so that it can be stored in a JSON column.
+
+    :param value: a value of an attribute or extra
+    """
+    if isinstance(value, list):
+        return [datetime_to_isoformat(_) for _ in value]
+    elif isinstance(value, dict):
+        return dict((key, datetime_to_isoformat(val)) for key, val in value.items())
+    elif isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def isoformat_to_datetime(value):
+    """
+    Convert, in place, all strings in ISO format of the given value, also those nested in lists and dictionaries, to
+    datetime objects. It is the inverse of :py:func:`datetime_to_isoformat` for a value loaded from a JSON column.
+
+    :param value: a value of an attribute or extra
+    :return: the converted value
+    """
+    from dateutil import parser
+
+    if isinstance(value, list):
+        for index, val in enumerate(value):
+            value[index] = isoformat_to_datetime(val)
+    elif isinstance(value, dict):
+        for key, val in value.items():
+            value[key] = isoformat_to_datetime(val)
+    elif isinstance(value, six.string_types) and DATETIME_ISOFORMAT_REGEX.match(value):
+        try:
+            return parser.parse(value)
+        except (ValueError, TypeError):
+            pass
+    return value
+
+
 def is_dbenv_loaded():
     """
     Return True of the dbenv was already loaded (with a call to load_dbenv),
@@ -207,6 +255,271 @@ def delete_nodes_and_connections(pks):
     delete_nodes_backend(pks)
 
 
+def set_extras_many(pks, key, values):
+    """
+    Set the extra `key` of many stored nodes in one transaction with batched statements.
+
+    :param pks: a list of node pks
+    :param key: the key of the extra, must be a level-zero key
+    :param values: a list with the value of the extra for each node in `pks`
+    """
+    from aiida.orm.implementation.general.node import clean_value
+
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import set_extras_many_django as set_extras_many_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import set_extras_many_sqla as set_extras_many_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    pks = list(pks)
+    values = [clean_value(value) for value in values]
+
+    if len(pks) != len(values):
+        raise ValueError('the number of values does not match the number of nodes')
+
+    if pks:
+        set_extras_many_backend(pks, key, values)
+
+
+def update_attributes_many(updates):
+    """
+    Set and delete attributes of many stored nodes in one transaction with batched statements.
+
+    The version number of each node is incremented once. Updates of nodes that no longer exist are ignored.
+
+    :param updates: a list of tuples (pk, attributes, deleted_keys) with a dictionary of the attributes to set and a
+        list of the keys of the attributes to delete, which must all be level-zero keys, for each node
+    """
+    from aiida.orm.implementation.general.node import clean_value
+
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import update_attributes_many_django as update_attributes_many_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import update_attributes_many_sqla as update_attributes_many_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    cleaned = []
+    for pk, attributes, deleted_keys in updates:
+        for key in list(attributes) + list(deleted_keys):
+            validate_attribute_key(key)
+        cleaned.append((pk, {key: clean_value(value) for key, value in attributes.items()}, list(deleted_keys)))
+
+    if cleaned:
+        update_attributes_many_backend(cleaned)
+
+
+def get_node_pks_by_hash(hashes, node_types=None):
+    """
+    Return the stored nodes whose hash, stored in the `_aiida_hash` extra, is one of the given hashes.
+
+    The lookup goes through the index on the hash extra, so it does not scan the extras of all nodes.
+
+    :param hashes: a list of hashes
+    :param node_types: optional list of type strings, to only include nodes whose type is exactly one of them
+    :return: a list of tuples (pk, type, hash) ordered by pk
+    """
+    from aiida.orm.implementation.general.node import _HASH_EXTRA_KEY
+
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import get_node_pks_by_extra_django as get_node_pks_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import get_node_pks_by_extra_sqla as get_node_pks_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    hashes = list(set(hashes))
+
+    if not hashes:
+        return []
+
+    if node_types is not None:
+        node_types = list(set(node_types))
+
+    return get_node_pks_backend(_HASH_EXTRA_KEY, hashes, node_types)
+
+
+# Number of changes of the members of each group made by this process, used to invalidate the caches of group members.
+# The changes that may concern any group are counted under the key None.
+_GROUP_MEMBERSHIP_VERSIONS = collections.Counter()
+
+
+def get_group_membership_version(group_pk):
+    """
+    Return the number of times that the members of a group, or possibly of any group, were changed by this process.
+
+    Caches of the members of a group can compare this number with the one at the time they were filled to know whether
+    they are still valid. Changes made by other processes are not counted.
+
+    :param group_pk: the pk of the group
+    :return: the membership version of the group
+    """
+    return _GROUP_MEMBERSHIP_VERSIONS[group_pk] + _GROUP_MEMBERSHIP_VERSIONS[None]
+
+
+def increment_group_membership_version(group_pk=None):
+    """
+    Record a change of the members of a group that was not made through :func:`add_nodes_to_group` or
+    :func:`remove_nodes_from_group`, such as the deletion of nodes or their import.
+
+    :param group_pk: the pk of the group, or None if the members of any group may have changed
+    """
+    _GROUP_MEMBERSHIP_VERSIONS[group_pk] += 1
+
+
+def add_nodes_to_group(group_pk, node_pks=None, querybuilder=None):
+    """
+    Add many nodes to a group with a single `INSERT ... SELECT ... ON CONFLICT DO NOTHING` statement.
+
+    Nodes that are already in the group are skipped, as are pks that do not correspond to a node.
+
+    :param group_pk: the pk of the group
+    :param node_pks: a list of node pks
+    :param querybuilder: alternatively, a QueryBuilder whose first projection is the pk of the nodes, or the nodes
+        themselves, which is then executed as a subquery of the statement
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import add_nodes_to_group_django as add_nodes_to_group_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import add_nodes_to_group_sqla as add_nodes_to_group_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    if (node_pks is None) == (querybuilder is None):
+        raise ValueError('specify either the node pks or a querybuilder')
+
+    if node_pks is not None:
+        node_pks = list(node_pks)
+        if not node_pks:
+            return
+
+    add_nodes_to_group_backend(group_pk, node_pks, querybuilder)
+    increment_group_membership_version(group_pk)
+
+
+def remove_nodes_from_group(group_pk, node_pks=None, querybuilder=None):
+    """
+    Remove many nodes from a group with a single `DELETE` statement.
+
+    Nodes that are not in the group are ignored.
+
+    :param group_pk: the pk of the group
+    :param node_pks: a list of node pks
+    :param querybuilder: alternatively, a QueryBuilder whose first projection is the pk of the nodes, or the nodes
+        themselves, which is then executed as a subquery of the statement
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import remove_nodes_from_group_django as remove_nodes_from_group_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import remove_nodes_from_group_sqla as remove_nodes_from_group_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    if (node_pks is None) == (querybuilder is None):
+        raise ValueError('specify either the node pks or a querybuilder')
+
+    if node_pks is not None:
+        node_pks = list(node_pks)
+        if not node_pks:
+            return
+
+    remove_nodes_from_group_backend(group_pk, node_pks, querybuilder)
+    increment_group_membership_version(group_pk)
+
+
+def get_checkpoint_rows(pk):
+    """
+    Return the rows of the checkpoint stored for the process of the given calculation node.
+
+    :param pk: the pk of the calculation node
+    :return: a list of tuples (key, codec, data), which is empty if there is no checkpoint
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import get_checkpoint_rows_django as get_checkpoint_rows_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import get_checkpoint_rows_sqla as get_checkpoint_rows_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    return [(key, codec, bytes(data)) for key, codec, data in get_checkpoint_rows_backend(pk)]
+
+
+def set_checkpoint_rows(pk, rows, removed_keys=()):
+    """
+    Write rows of the checkpoint of the process of the given calculation node in one transaction.
+
+    The rows with the given keys replace the existing ones, the rows with any other key are left untouched, apart
+    from those in `removed_keys` which are deleted.
+
+    :param pk: the pk of the calculation node
+    :param rows: a list of tuples (key, codec, data)
+    :param removed_keys: a list of keys of the rows to delete
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import set_checkpoint_rows_django as set_checkpoint_rows_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import set_checkpoint_rows_sqla as set_checkpoint_rows_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    rows = list(rows)
+    removed_keys = list(removed_keys)
+
+    if rows or removed_keys:
+        set_checkpoint_rows_backend(pk, rows, removed_keys)
+
+
+def delete_checkpoint_rows(pk):
+    """
+    Delete all rows of the checkpoint of the process of the given calculation node.
+
+    :param pk: the pk of the calculation node
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import delete_checkpoint_rows_django as delete_checkpoint_rows_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import delete_checkpoint_rows_sqla as delete_checkpoint_rows_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    delete_checkpoint_rows_backend(pk)
+
+
+def set_node_uuid(pk, uuid):
+    """
+    Set the UUID of the node with the given pk, without loading the node itself.
+
+    :param pk: the pk of the node
+    :param uuid: the new UUID of the node
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import set_node_uuid_django as set_node_uuid_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import set_node_uuid_sqla as set_node_uuid_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    set_node_uuid_backend(pk, uuid)
+
+
+def close_db_connections():
+    """
+    Close the database connections held by this process, for example before forking worker processes.
+
+    The connections are transparently reopened the next time the database is accessed.
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connections
+        connections.close_all()
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends import sqlalchemy as sa
+        sa.get_scoped_session().close()
+        sa.engine.dispose()
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+
 def _get_column(colname, alias):
     """
     Return the column for a given projection. Needed by the QueryBuilder
@@ -25,7 +25,7 @@ from aiida.cmdline.params import arguments, options, types
 from aiida.cmdline.utils import decorators, echo
 
 LIST_PROJECT_HEADERS = ['Id', 'Label']
-EXPORT_FORMATS = ['cif', 'tcod', 'xsf']
+EXPORT_FORMATS = ['cif', 'tcod', 'xsf', 'xyz']
 VISUALIZATION_FORMATS = ['jmol', 'xcrysden', 'mpl_heatmap', 'mpl_pos']
 
 
@@ -27,33 +27,54 @@ from aiida.cmdline.utils import decorators, echo
     type=PluginParamType(group=('node', 'calculations', 'data'), load=True),
     default='node',
     help='Only include nodes that are class or sub class of the class identified by this entry point.')
+@click.option(
+    '-n',
+    '--processes',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='Number of worker processes that compute the hashes.')
+@click.option(
+    '-b',
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help='Number of nodes whose hashes are written to the database in a single transaction.')
+@click.option(
+    '-s',
+    '--start-pk',
+    type=int,
+    default=None,
+    help='Only rehash nodes with a pk larger than this value, to resume an interrupted run.')
 @decorators.with_dbenv()
-def rehash(nodes, entry_point):
+def rehash(nodes, entry_point, processes, batch_size, start_pk):
     """Recompute the hash for nodes in the database
 
     The set of nodes that will be rehashed can be filtered by their identifier and/or based on their class.
+    Nodes are processed in order of increasing pk, so an interrupted run can be resumed with the `--start-pk` option
+    set to the last pk that was reported.
     """
-    from aiida.orm.querybuilder import QueryBuilder
+    from aiida.orm.utils.rehash import rehash_nodes
+
+    def report_progress(stats):
+        echo.echo('{} nodes re-hashed ({:.1f} nodes/s), last pk {}'.format(stats.processed, stats.throughput,
+                                                                           stats.last_pk))
 
     if nodes:
-        to_hash = [(node,) for node in nodes if isinstance(node, entry_point)]
+        pks = [node.pk for node in nodes if isinstance(node, entry_point)]
+        if not pks:
+            echo.echo_critical('no matching nodes found')
     else:
-        builder = QueryBuilder()
-        builder.append(entry_point, tag='node')
-        to_hash = builder.all()
+        pks = None
 
-    if not to_hash:
-        echo.echo_critical('no matching nodes found')
-
-    count = 0
+    stats = rehash_nodes(
+        entry_point, pks=pks, start_pk=start_pk, batch_size=batch_size, processes=processes, callback=report_progress)
 
-    for i, (node,) in enumerate(to_hash):
-
-        if i % 100 == 0:
-            echo.echo('.', nl=False)
+    if not stats.processed:
+        echo.echo_critical('no matching nodes found')
 
-        node.rehash()
-        count += 1
+    if stats.failed:
+        echo.echo_warning('the hash of {} nodes could not be computed and was set to None'.format(stats.failed))
 
-    echo.echo('')
-    echo.echo_success('{} nodes re-hashed'.format(count))
+    echo.echo_success('{} nodes re-hashed in {:.1f} s'.format(stats.processed, stats.elapsed))
@@ -10,6 +10,7 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+import errno
 import os
 import shutil
 import fnmatch
@@ -419,7 +420,12 @@ class Folder(object):
         # Create parent dir, if needed, with the right mode
         pardir = os.path.dirname(self.abspath)
         if not os.path.exists(pardir):
-            os.makedirs(pardir, mode=self.mode_dir)
+            try:
+                os.makedirs(pardir, mode=self.mode_dir)
+            except OSError as exception:
+                # The directory may have been created concurrently, e.g. when folders are imported in parallel
+                if exception.errno != errno.EEXIST:
+                    raise
 
         if move:
             shutil.move(srcdir, self.abspath)
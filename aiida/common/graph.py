@@ -25,7 +25,8 @@ def draw_graph(origin_node,
                include_calculation_inputs=False,
                include_calculation_outputs=False):
     """
-    The algorithm starts from the original node and goes both input-ward and output-ward via a breadth-first algorithm.
+    The algorithm starts from the original node and goes both input-ward and output-ward, finding the ancestors and
+    the descendants with a graph traversal each, and draws the links among the ancestors and among the descendants.
 
     :param origin_node: An Aiida node, the starting point for drawing the graph
     :param int ancestor_depth: The maximum depth of the ancestors drawn. If left to None, we recurse until the graph is fully explored
@@ -47,7 +48,9 @@ def draw_graph(origin_node,
     from aiida.orm.code import Code
     from aiida.orm.node import Node
     from aiida.common.links import LinkType
+    from aiida.common.utils import grouper
     from aiida.orm.querybuilder import QueryBuilder
+    from aiida.orm.utils.traversal import TRAVERSAL_BATCH_SIZE, TraversalRule, traverse_graph
 
     def draw_node_settings(node, **kwargs):
         """
@@ -91,96 +94,73 @@ def draw_graph(origin_node,
         return '    {} -> {} [label="{}", color="{}", style="{}"];'.format("N{}".format(inp_id), "N{}".format(out_id),
                                                                            link_label, color, style)
 
-    # Breadth-first search of all ancestors and descendant nodes of a given node
+    def iter_links(node_pks, forward):
+        """
+        Yield the links going out of (if forward is True) or coming into the given nodes, in batches of nodes.
+
+        :return: generator of tuples (link id, input pk, output pk, link label, link type)
+        """
+        for chunk in grouper(TRAVERSAL_BATCH_SIZE, node_pks):
+            link_query = QueryBuilder()
+            link_query.append(Node, filters={'id': {'in': list(chunk)}}, project='id', tag='n')
+            if forward:
+                link_query.append(Node, output_of='n', edge_project=('id', 'label', 'type'), project='id')
+                for pk, other_pk, link_id, link_label, link_type in link_query.iterall():
+                    yield link_id, pk, other_pk, link_label, link_type
+            else:
+                link_query.append(Node, input_of='n', edge_project=('id', 'label', 'type'), project='id')
+                for pk, other_pk, link_id, link_label, link_type in link_query.iterall():
+                    yield link_id, other_pk, pk, link_label, link_type
+
+    def iter_nodes(node_pks):
+        """Yield the nodes with the given pks, loaded in batches."""
+        for chunk in grouper(TRAVERSAL_BATCH_SIZE, node_pks):
+            node_query = QueryBuilder()
+            node_query.append(Node, filters={'id': {'in': list(chunk)}})
+            for node, in node_query.iterall():
+                yield node
+
+    # All ancestors and descendant nodes of a given node, up to the given depths, are found with a single graph
+    # traversal each
+    ancestor_pks = traverse_graph([origin_node.pk], [TraversalRule(link_type, forward=False) for link_type in LinkType],
+                                  max_depth=ancestor_depth)
+    descendant_pks = traverse_graph([origin_node.pk], [TraversalRule(link_type, forward=True) for link_type in LinkType],
+                                    max_depth=descendant_depth)
+
     links = {}  # Accumulate links here
-    nodes = {
-        origin_node.pk: draw_node_settings(origin_node, style='filled', color='lightblue')
-    }  #Accumulate nodes specs here
-    # Additional nodes (the ones added with either one of  include_calculation_inputs or include_calculation_outputs
-    # is set to true. I have to put them in a different dictionary because nodes is the one used for the recursion,
-    # whereas these should not be used for the recursion:
-    additional_nodes = {}
-
-    last_nodes = [origin_node]  # Put the nodes whose links have not been scanned yet
-
-    # Go through the graph on-ward (i.e. look at inputs)
-    depth = 0
-    while last_nodes:
-        # I augment depth every time I get through a new iteration
-        depth += 1
-        # I check whether I should stop here:
-        if ancestor_depth is not None and depth > ancestor_depth:
-            break
-        # I continue by adding new nodes here!
-        new_nodes = []
-        for node in last_nodes:
-            # This query gives me all the inputs of this node, and link labels and types!
-            input_query = QueryBuilder()
-            input_query.append(Node, filters={'id': node.pk}, tag='n')
-            input_query.append(Node, input_of='n', edge_project=('id', 'label', 'type'), project='*', tag='inp')
-            for inp, link_id, link_label, link_type in input_query.iterall():
-                # I removed this check, to me there is no way that this link was already referred to!
-                # if link_id not in links:
-                links[link_id] = draw_link_settings(inp.pk, node.pk, link_label, link_type)
-                # For the nodes I need to check, maybe this same node is referred to multiple times.
-                if inp.pk not in nodes:
-                    nodes[inp.pk] = draw_node_settings(inp)
-                    new_nodes.append(inp)
-
-            # Checking whether I also should include all the outputs of a calculation into the drawing:
-            if include_calculation_outputs and isinstance(node, Calculation):
-                # Query for the outputs, giving me also link labels and types:
-                output_query = QueryBuilder()
-                output_query.append(Node, filters={'id': node.pk}, tag='n')
-                output_query.append(Node, output_of='n', edge_project=('id', 'label', 'type'), project='*', tag='out')
-                # Iterate through results
-                for out, link_id, link_label, link_type in output_query.iterall():
-                    # This link might have been drawn already, because the output is maybe
-                    # already drawn.
-                    # To check: Maybe it's more efficient not to check this, since
-                    # the dictionaries are large and contain many keys...
-                    # I.e. just always draw, also when overwriting an existing (identical) entry.
-                    if link_id not in links:
-                        links[link_id] = draw_link_settings(node.pk, out.pk, link_label, link_type)
-                    if out.pk not in nodes and out.pk not in additional_nodes:
-                        additional_nodes[out.pk] = draw_node_settings(out)
-
-        last_nodes = new_nodes
-
-    # Go through the graph down-ward (i.e. look at outputs)
-    last_nodes = [origin_node]
-    depth = 0
-    while last_nodes:
-        depth += 1
-        # Also here, checking of maximum descendant depth is set and applies.
-        if descendant_depth is not None and depth > descendant_depth:
-            break
-        new_nodes = []
-
-        for node in last_nodes:
-            # Query for the outputs:
-            output_query = QueryBuilder()
-            output_query.append(Node, filters={'id': node.pk}, tag='n')
-            output_query.append(Node, output_of='n', edge_project=('id', 'label', 'type'), project='*', tag='out')
-
-            for out, link_id, link_label, link_type in output_query.iterall():
-                # Draw the link
-                links[link_id] = draw_link_settings(node.pk, out.pk, link_label, link_type)
-                if out.pk not in nodes:
-                    nodes[out.pk] = draw_node_settings(out)
-                    new_nodes.append(out)
-
-            if include_calculation_inputs and isinstance(node, Calculation):
-                input_query = QueryBuilder()
-                input_query.append(Node, filters={'id': node.pk}, tag='n')
-                input_query.append(Node, input_of='n', edge_project=('id', 'label', 'type'), project='*', tag='inp')
-                for inp, link_id, link_label, link_type in input_query.iterall():
-                    # Also here, maybe it's just better not to check?
-                    if link_id not in links:
-                        links[link_id] = draw_link_settings(inp.pk, node.pk, link_label, link_type)
-                    if inp.pk not in nodes and inp.pk not in additional_nodes:
-                        additional_nodes[inp.pk] = draw_node_settings(inp)
-        last_nodes = new_nodes
+    # Additional nodes (the ones added with either one of include_calculation_inputs or include_calculation_outputs
+    # is set to true), which are drawn but are not part of the traversal
+    additional_pks = set()
+
+    # The links between the ancestors, i.e. the inputs of the ancestors that are ancestors themselves
+    for link_id, inp_pk, out_pk, link_label, link_type in iter_links(ancestor_pks, forward=False):
+        if inp_pk in ancestor_pks:
+            links[link_id] = draw_link_settings(inp_pk, out_pk, link_label, link_type)
+
+    # The links between the descendants, i.e. the outputs of the descendants that are descendants themselves
+    for link_id, inp_pk, out_pk, link_label, link_type in iter_links(descendant_pks, forward=True):
+        if out_pk in descendant_pks:
+            links[link_id] = draw_link_settings(inp_pk, out_pk, link_label, link_type)
+
+    # Checking whether I also should include all the outputs of the calculations among the ancestors, or all the
+    # inputs of the calculations among the descendants, into the drawing
+    for include, node_pks, forward in [(include_calculation_outputs, ancestor_pks, True),
+                                       (include_calculation_inputs, descendant_pks, False)]:
+        if not include:
+            continue
+        calculation_query = QueryBuilder()
+        calculation_query.append(Calculation, filters={'id': {'in': list(node_pks)}}, project='id')
+        calculation_pks = [pk for pk, in calculation_query.iterall()]
+        for link_id, inp_pk, out_pk, link_label, link_type in iter_links(calculation_pks, forward=forward):
+            links[link_id] = draw_link_settings(inp_pk, out_pk, link_label, link_type)
+            additional_pks.add(out_pk if forward else inp_pk)
+
+    nodes = {}  #Accumulate nodes specs here
+    for node in iter_nodes(set(ancestor_pks) | set(descendant_pks) | additional_pks):
+        if node.pk == origin_node.pk:
+            nodes[node.pk] = draw_node_settings(node, style='filled', color='lightblue')
+        else:
+            nodes[node.pk] = draw_node_settings(node)
 
     # Writing the graph to a temporary file
     fd, fname = tempfile.mkstemp(suffix='.dot')
@@ -190,8 +170,6 @@ def draw_graph(origin_node,
             fhandle.write(u'    {}\n'.format(l_values))
         for n_name, n_values in nodes.items():
             fhandle.write(u"    {}\n".format(n_values))
-        for n_name, n_values in additional_nodes.items():
-            fhandle.write(u"    {}\n".format(n_values))
         fhandle.write(u"}\n")
 
     # Now I am producing the output file
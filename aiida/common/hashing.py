@@ -20,7 +20,10 @@ try:  # Python3
 except ImportError:  # Python2
     from pyblake2 import blake2b
 import numbers
+import os
 import random
+import sqlite3
+import threading
 import time
 import uuid
 import struct
@@ -61,6 +64,12 @@ HASHING_KEY = "HashingKey"
 # The key that is used to store the hash in the node extras
 _HASH_EXTRA_KEY = '_aiida_hash'
 
+# The size in bytes of the chunks in which files are read to compute their digest
+FILE_CHUNK_SIZE = 2**20
+
+# The name of the file in the AiiDA configuration folder where the digests of file contents are persisted
+FILE_DIGEST_CACHE_FILENAME = 'file_digests.sqlite'
+
 pwd_context = CryptContext(  # pylint: disable=invalid-name
     # The list of hashes that we support
     schemes=["argon2", "pbkdf2_sha256", "des_crypt"],
@@ -300,15 +309,176 @@ def _(val, **kwargs):
     return [_single_digest('uuid', val.bytes)]
 
 
+class FileDigestCache(object):
+    """
+    Cache of the digests of the content of files, keyed on the absolute path, size and modification time of the file.
+
+    The digests are kept in memory, up to a maximum number of entries, and persisted in an SQLite database such that
+    they can be reused by other processes, e.g. the daemon workers or a later `verdi rehash`. Rehashing a file that
+    did not change then only costs a call to `os.stat`. Files that were modified less than `min_age` seconds ago are
+    not cached, because a later modification within the resolution of the file system timestamps would go unnoticed.
+    """
+
+    def __init__(self, filepath=None, max_entries=100000, min_age=2.):
+        """
+        :param filepath: path of the SQLite database to persist the digests in, if None they are only kept in memory
+        :param max_entries: maximum number of digests to keep in memory
+        :param min_age: minimum time in seconds since the last modification of a file for its digest to be cached
+        """
+        self._filepath = filepath
+        self._max_entries = max_entries
+        self._min_age = min_age
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _get_connection(self):
+        """Return the connection to the database, creating it if needed, or None if it cannot be used."""
+        if self._filepath is None:
+            return None
+
+        if self._connection is None:
+            try:
+                self._connection = sqlite3.connect(self._filepath, timeout=5., check_same_thread=False)
+                self._connection.execute('CREATE TABLE IF NOT EXISTS file_digest '
+                                         '(path TEXT, size INTEGER, mtime INTEGER, digest BLOB, '
+                                         'PRIMARY KEY (path, size, mtime))')
+                self._connection.commit()
+            except sqlite3.Error:
+                # Do not try again, the digests will only be cached in memory
+                self._filepath = None
+                self._connection = None
+
+        return self._connection
+
+    def get_digest(self, filepath, digest_function):
+        """
+        Return the digest of the content of a file, computing it with `digest_function` if it is not cached.
+
+        :param filepath: the absolute path of the file
+        :param digest_function: a function that takes the path of the file and returns the digest of its content
+        :return: the digest
+        """
+        stat = os.stat(filepath)
+        mtime = getattr(stat, 'st_mtime_ns', None) or int(stat.st_mtime * 1e9)
+        key = (os.path.realpath(filepath), stat.st_size, mtime)
+
+        with self._lock:
+            digest = self._get(key)
+
+        if digest is not None:
+            return digest
+
+        digest = digest_function(filepath)
+
+        if time.time() - stat.st_mtime > self._min_age:
+            with self._lock:
+                self._set(key, digest)
+
+        return digest
+
+    def _get(self, key):
+        """Return the cached digest for the key, looking in memory first and then in the database, or None."""
+        digest = self._digests.pop(key, None)
+
+        if digest is None:
+            connection = self._get_connection()
+            if connection is not None:
+                try:
+                    row = connection.execute('SELECT digest FROM file_digest WHERE path=? AND size=? AND mtime=?',
+                                             key).fetchone()
+                except sqlite3.Error:
+                    row = None
+                if row is not None:
+                    digest = bytes(row[0])
+
+        if digest is not None:
+            self._digests[key] = digest
+
+        return digest
+
+    def _set(self, key, digest):
+        """Cache the digest for the key, both in memory and in the database."""
+        self._digests[key] = digest
+        while len(self._digests) > self._max_entries:
+            self._digests.popitem(last=False)
+
+        connection = self._get_connection()
+        if connection is not None:
+            try:
+                connection.execute('INSERT OR REPLACE INTO file_digest VALUES (?, ?, ?, ?)',
+                                   key + (sqlite3.Binary(digest),))
+                connection.commit()
+            except sqlite3.Error:
+                pass
+
+    def clear(self):
+        """Remove all the cached digests, both from memory and from the database."""
+        with self._lock:
+            self._digests.clear()
+            connection = self._get_connection()
+            if connection is not None:
+                try:
+                    connection.execute('DELETE FROM file_digest')
+                    connection.commit()
+                except sqlite3.Error:
+                    pass
+
+
+_FILE_DIGEST_CACHE = None
+
+
+def get_file_digest_cache():
+    """
+    Return the global cache of file content digests, which is persisted in the AiiDA configuration folder
+
+    :rtype: :class:`FileDigestCache`
+    """
+    global _FILE_DIGEST_CACHE  # pylint: disable=global-statement
+
+    if _FILE_DIGEST_CACHE is None:
+        from aiida.common.setup import get_aiida_dir
+
+        filepath = os.path.join(get_aiida_dir(), FILE_DIGEST_CACHE_FILENAME)
+        if not os.path.isdir(os.path.dirname(filepath)):
+            filepath = None
+        _FILE_DIGEST_CACHE = FileDigestCache(filepath)
+
+    return _FILE_DIGEST_CACHE
+
+
+def _file_content_digest(filepath):
+    """Compute the digest of the content of a file, reading it in chunks of `FILE_CHUNK_SIZE` bytes."""
+    digest = blake2b(person=b'fcontent', node_depth=0, **BLAKE2B_OPTIONS)
+
+    with open(filepath, 'rb') as fhandle:
+        for chunk in iter(lambda: fhandle.read(FILE_CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+    return digest.digest()
+
+
 @_make_hash.register(Folder)
 def _(folder, **kwargs):
     """
     Hash the content of a Folder object. The name of the folder itself is actually ignored
+
+    Files are read in chunks and the digests of their content are cached, see :class:`FileDigestCache`.
+
     :param ignored_folder_content: list of filenames to be ignored for the hashing
+    :param use_file_digest_cache: boolean, whether to use the cache of file digests, True by default
     """
 
     ignored_folder_content = kwargs.get('ignored_folder_content', [])
 
+    if kwargs.get('use_file_digest_cache', True):
+        cache = get_file_digest_cache()
+
+        def content_digest(filepath):
+            return cache.get_digest(filepath, _file_content_digest)
+    else:
+        content_digest = _file_content_digest
+
     def folder_digests(subfolder):
         """traverses the given folder and yields digests for the contained objects"""
         for name, isfile in sorted(subfolder.get_content_list(only_paths=False), key=itemgetter(0)):
@@ -317,8 +487,7 @@ def _(folder, **kwargs):
 
             if isfile:
                 yield _single_digest('fname', name.encode('utf-8'))
-                with subfolder.open(name, mode='rb') as fhandle:
-                    yield _single_digest('fcontent', fhandle.read())
+                yield content_digest(subfolder.get_abs_path(name))
             else:
                 yield _single_digest('dir(', name.encode('utf-8'))
                 for digest in folder_digests(subfolder.get_subfolder(name)):
@@ -771,6 +771,34 @@ class _NoDefaultValue(object):
 _property_table = {
     "runner.poll.interval": ("runner_poll_interval", "int", "The polling interval in seconds to be used by process runners",
                        1, None),
+    "runner.transport.idle_timeout": ("runner_transport_idle_timeout", "int",
+                                      "The time in seconds that a transport no longer used by any task is kept open "
+                                      "by process runners to be reused, set to 0 to close transports immediately",
+                                      60, None),
+    "runner.transport.max_connections": ("runner_transport_max_connections", "int",
+                                         "The maximum number of transports that a process runner keeps open at the "
+                                         "same time for a single computer, set to 0 for no limit", 0, None),
+    "runner.node_update.max_delay": ("runner_node_update_max_delay", "int",
+                                     "The maximum time in seconds that a process runner buffers the updates of the "
+                                     "process state and status of the nodes of its processes, to write them in a "
+                                     "single transaction, set to 0 to write them in the next iteration of its event "
+                                     "loop", 0, None),
+    "runner.transport.bulk_upload": ("runner_transport_bulk_upload", "bool",
+                                     "Boolean whether to upload the input files of a calculation as a single archive "
+                                     "that is unpacked on the remote, instead of copying them one by one", True, None),
+    "runner.transport.bulk_retrieve": ("runner_transport_bulk_retrieve", "bool",
+                                       "Boolean whether to retrieve the output files of a calculation as a single "
+                                       "archive that is created on the remote, instead of copying them one by one",
+                                       True, None),
+    "runner.checkpoint.codec": ("runner_checkpoint_codec", "string",
+                                "The codec with which the process runners encode the checkpoints of processes. "
+                                "The 'pickle' codec is faster and more compact, but decoding a pickled checkpoint can "
+                                "execute arbitrary code, so only use it if every user that can write to the database, "
+                                "including through imports, is trusted, and its checkpoints cannot be loaded by a "
+                                "different major version of python", "yaml", ["yaml", "pickle"]),
+    "arraydata.cache_size": ("arraydata_cache_size", "int",
+                             "The maximum total size in megabytes of the arrays of stored ArrayData nodes that each "
+                             "process keeps in memory after reading them, set to 0 to disable the cache", 512, None),
     "daemon.timeout": ("daemon_timeout", "int", "The timeout in seconds for calls to the circus client",
                        DEFAULT_DAEMON_TIMEOUT, None),
     "verdishell.modules": ("modules_for_verdi_shell", "string",
@@ -16,6 +16,9 @@ from __future__ import print_function
 from __future__ import absolute_import
 import itertools
 import collections
+import os
+import shutil
+import tempfile
 import uuid
 import math
 from datetime import datetime
@@ -28,7 +31,7 @@ try:
 except ImportError:
     import unittest
 
-from aiida.common.hashing import make_hash, create_unusable_pass, is_password_usable, truncate_float64
+from aiida.common.hashing import make_hash, create_unusable_pass, is_password_usable, truncate_float64, FileDigestCache
 from aiida.common.folders import SandboxFolder
 
 
@@ -228,3 +231,63 @@ class MakeHashTest(unittest.TestCase):
 
             self.assertNotEqual(make_hash(folder), folder_hash)
             self.assertEqual(make_hash(folder, ignored_folder_content=['file3.npy', 'some_subdir']), folder_hash)
+
+    def test_folder_without_digest_cache(self):
+        """The hash of a folder should not depend on the use of the cache of file digests."""
+        with SandboxFolder(sandbox_in_repo=False) as folder:
+            with folder.open('file', 'wb') as fhandle:
+                fhandle.write(os.urandom(3 * 2**20 + 1))
+
+            self.assertEqual(make_hash(folder), make_hash(folder, use_file_digest_cache=False))
+
+
+class FileDigestCacheTest(unittest.TestCase):
+    """
+    Tests for the cache of the digests of file contents.
+    """
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.database = os.path.join(self.folder, 'digests.sqlite')
+        self.filepath = os.path.join(self.folder, 'file')
+        self.calls = []
+
+        with open(self.filepath, 'wb') as fhandle:
+            fhandle.write(b'content')
+
+        # Make the file old enough for its digest to be cached
+        os.utime(self.filepath, (1000000000, 1000000000))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def digest_function(self, filepath):
+        self.calls.append(filepath)
+        with open(filepath, 'rb') as fhandle:
+            return fhandle.read()
+
+    def test_cached_digest(self):
+        """The digest should only be computed once, also by a new cache instance using the same database."""
+        cache = FileDigestCache(self.database)
+        self.assertEqual(cache.get_digest(self.filepath, self.digest_function), b'content')
+        self.assertEqual(cache.get_digest(self.filepath, self.digest_function), b'content')
+        self.assertEqual(len(self.calls), 1)
+
+        cache = FileDigestCache(self.database)
+        self.assertEqual(cache.get_digest(self.filepath, self.digest_function), b'content')
+        self.assertEqual(len(self.calls), 1)
+
+    def test_modified_file(self):
+        """The digest should be recomputed when the file is modified."""
+        cache = FileDigestCache(self.database)
+        cache.get_digest(self.filepath, self.digest_function)
+
+        with open(self.filepath, 'wb') as fhandle:
+            fhandle.write(b'new content')
+
+        self.assertEqual(cache.get_digest(self.filepath, self.digest_function), b'new content')
+        self.assertEqual(len(self.calls), 2)
+
+        # The file was just modified, so its digest should not have been cached
+        cache.get_digest(self.filepath, self.digest_function)
+        self.assertEqual(len(self.calls), 3)
@@ -16,6 +16,7 @@ plugin-specific operations.
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+import contextlib
 import os
 
 from six.moves import zip
@@ -139,19 +140,24 @@ def upload_calculation(calculation, transport, calc_info, script_filename):
     # default files to be overwritten by the plugin itself.
     # Still, beware! The code file itself could be overwritten...
     # But I checked for this earlier.
+    # The files are collected as (src_abs_path, dest_rel_path) tuples in the order in which they have to be copied,
+    # such that they can be sent in a single transfer, see `_upload_files`
+    upload_list = []
+    executables = []
+
     for code in input_codes:
         if code.is_local():
             # Note: this will possibly overwrite files
             for f in code.get_folder_list():
-                transport.put(code.get_abs_path(f), f)
-            transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
+                upload_list.append((code.get_abs_path(f), f))
+            executables.append(code.get_local_executable())
 
     # copy all files, recursively with folders
     for f in folder.get_content_list():
         execlogger.debug("[submission of calculation {}] "
                          "copying file/folder {}...".format(calculation.pk, f),
                          extra=logger_extra)
-        transport.put(folder.get_abs_path(f), f)
+        upload_list.append((folder.get_abs_path(f), f))
 
     # local_copy_list is a list of tuples,
     # each with (src_abs_path, dest_rel_path)
@@ -167,7 +173,12 @@ def upload_calculation(calculation, transport, calc_info, script_filename):
                              "copying local file/folder to {}".format(
                 calculation.pk, dest_rel_path),
                 extra=logger_extra)
-            transport.put(src_abs_path, dest_rel_path)
+            upload_list.append((src_abs_path, dest_rel_path))
+
+    _upload_files(calculation, transport, workdir, upload_list, logger_extra)
+
+    for executable in executables:
+        transport.chmod(executable, 0o755)  # rwxr-xr-x
 
     if remote_copy_list is not None:
         for (remote_computer_uuid, remote_abs_path,
@@ -221,6 +232,36 @@ def upload_calculation(calculation, transport, calc_info, script_filename):
     return calc_info, script_filename
 
 
+def _upload_files(calculation, transport, workdir, upload_list, logger_extra=None):
+    """
+    Copy the local files of a calculation to its remote working directory
+
+    Unless disabled through the `runner.transport.bulk_upload` property, all files are sent with a single
+    transfer through `Transport.putarchive`. If that fails, for example because the `tar` command is not available
+    on the remote, it falls back to copying the files one by one with `Transport.put`.
+
+    :param calculation: the instance of JobCalculation that is being uploaded
+    :param transport: an already opened transport
+    :param workdir: the absolute path of the remote working directory of the calculation
+    :param upload_list: list of (src_abs_path, dest_rel_path) tuples, in the order in which they should be copied
+    :param logger_extra: the extra dictionary to pass to the logger
+    """
+    from aiida.common.setup import get_property
+
+    if upload_list and get_property('runner.transport.bulk_upload'):
+        try:
+            transport.putarchive(upload_list, workdir)
+        except (IOError, OSError, NotImplementedError) as exception:
+            execlogger.warning("[submission of calculation {}] "
+                               "bulk upload failed, falling back to copying the files one by one: "
+                               "{}".format(calculation.pk, exception), extra=logger_extra)
+        else:
+            return
+
+    for src_abs_path, dest_rel_path in upload_list:
+        transport.put(src_abs_path, dest_rel_path)
+
+
 def submit_calculation(calculation, transport, calc_info, script_filename):
     """
     Submit a calculation
@@ -273,25 +314,28 @@ def retrieve_calculation(calculation, transport, retrieved_temporary_folder):
         retrieve_temporary_list = calculation._get_retrieve_temporary_list()
         retrieve_singlefile_list = calculation._get_retrieve_singlefile_list()
 
-        with SandboxFolder() as folder:
-            retrieve_files_from_list(calculation, transport, folder.abspath, retrieve_list)
-            # Here I retrieved everything; now I store them inside the calculation
-            retrieved_files.replace_with_folder(folder.abspath, overwrite=True)
+        with _retrieval_source(calculation, transport, (retrieve_list or []) + (retrieve_temporary_list or []),
+                               logger_extra) as source:
+
+            # The files are retrieved directly in the repository folder of the FolderData
+            folder = retrieved_files._get_folder_pathsubfolder
+            folder.create()
+            retrieve_files_from_list(calculation, source, folder.abspath, retrieve_list)
+
+            # Retrieve the temporary files in the retrieved_temporary_folder if any files were
+            # specified in the 'retrieve_temporary_list' key
+            if retrieve_temporary_list:
+                retrieve_files_from_list(calculation, source, retrieved_temporary_folder, retrieve_temporary_list)
+
+                # Log the files that were retrieved in the temporary folder
+                for filename in os.listdir(retrieved_temporary_folder):
+                    execlogger.debug("[retrieval of calc {}] Retrieved temporary file or folder '{}'".format(
+                        calculation.pk, filename), extra=logger_extra)
 
         # Second, retrieve the singlefiles
         with SandboxFolder() as folder:
             _retrieve_singlefiles(calculation, transport, folder, retrieve_singlefile_list, logger_extra)
 
-        # Retrieve the temporary files in the retrieved_temporary_folder if any files were
-        # specified in the 'retrieve_temporary_list' key
-        if retrieve_temporary_list:
-            retrieve_files_from_list(calculation, transport, retrieved_temporary_folder, retrieve_temporary_list)
-
-            # Log the files that were retrieved in the temporary folder
-            for filename in os.listdir(retrieved_temporary_folder):
-                execlogger.debug("[retrieval of calc {}] Retrieved temporary file or folder '{}'".format(
-                    calculation.pk, filename), extra=logger_extra)
-
         # Store everything
         execlogger.debug(
             "[retrieval of calc {}] "
@@ -300,6 +344,54 @@ def retrieve_calculation(calculation, transport, retrieved_temporary_folder):
         retrieved_files.store()
 
 
+@contextlib.contextmanager
+def _retrieval_source(calculation, transport, retrieve_list, logger_extra=None):
+    """
+    Context manager that yields the transport from which the files of the retrieve list should be retrieved
+
+    Unless disabled through the `runner.transport.bulk_retrieve` property, all the files matching the entries of the
+    retrieve list are fetched from the remote working directory with a single transfer through
+    `Transport.getarchive` and unpacked in a local sandbox. A `LocalTransport` that points to the sandbox is then
+    yielded, such that `retrieve_files_from_list` can be used unchanged and resolves the globs and depths of the
+    entries without any further round trip. If the bulk retrieval is not possible, for example because an entry
+    is not a relative path within the working directory or the `tar` command failed on the remote, the original
+    transport is yielded instead.
+
+    :param calculation: the instance of JobCalculation that is being retrieved
+    :param transport: an already opened transport, whose current directory is the remote working directory
+    :param retrieve_list: the list of entries, in the format of the `retrieve_list`, that will be retrieved
+    :param logger_extra: the extra dictionary to pass to the logger
+    """
+    from aiida.common.setup import get_property
+    from aiida.transport.plugins.local import LocalTransport
+
+    remote_paths = [item[0] if isinstance(item, (list, tuple)) else item for item in retrieve_list]
+
+    if not remote_paths or not get_property('runner.transport.bulk_retrieve') or any(
+            os.path.isabs(path) or os.pardir in path.split(os.sep) for path in remote_paths):
+        yield transport
+        return
+
+    with SandboxFolder() as sandbox:
+        try:
+            transport.getarchive(remote_paths, sandbox.abspath)
+        except (IOError, OSError, NotImplementedError) as exception:
+            execlogger.warning("[retrieval of calc {}] "
+                               "bulk retrieval failed, falling back to retrieving the files one by one: "
+                               "{}".format(calculation.pk, exception), extra=logger_extra)
+            sandbox.erase(create_empty_folder=True)
+            local_transport = None
+        else:
+            local_transport = LocalTransport()
+
+        if local_transport is None:
+            yield transport
+        else:
+            with local_transport:
+                local_transport.chdir(sandbox.abspath)
+                yield local_transport
+
+
 def kill_calculation(calculation, transport):
     """
     Kill the calculation through the scheduler
@@ -472,7 +564,7 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
                     local_names.append(os.path.sep.join([tmp_lname] + to_append))
             else:
                 remote_names = [tmp_rname]
-                to_append = remote_names.split(os.path.sep)[-depth:] if depth > 0 else []
+                to_append = tmp_rname.split(os.path.sep)[-depth:] if depth > 0 else []
                 local_names = [os.path.sep.join([tmp_lname] + to_append)]
             if depth > 1:  # create directories in the folder, if needed
                 for this_local_file in local_names:
@@ -23,14 +23,13 @@ def execute_steps():
     This method loops on the RUNNING workflows and handled the execution of the
     steps until each workflow reaches an end (or gets stopped for errors).
 
-    In the loop for each RUNNING workflow the method loops also in each of its 
-    RUNNING steps, testing if all the calculation and subworkflows attached to 
-    the step are FINISHED. In this case the step is set as FINISHED and the 
-    workflow is advanced to the step's next method present in the db with 
-    ``advance_workflow``, otherwise if any step's JobCalculation is found in 
-    NEW state the method will submit. If none of the previous conditions apply 
-    the step is flagged as ERROR and cannot proceed anymore, blocking the future
-    execution of the step and, connected, the workflow.
+    The state of the calculations and subworkflows attached to each RUNNING
+    step is obtained for all steps at once with a single aggregated query.
+    If all the calculation and subworkflows attached to a step are FINISHED,
+    the step is set as FINISHED and the workflow is advanced to the step's
+    next method present in the db with ``advance_workflow``, otherwise if any
+    step's JobCalculation is found in NEW state the method will submit. Only
+    the steps that are ready to be advanced are loaded from the database.
 
     Finally, for each workflow the method tests if there are INITIALIZED steps 
     to be launched, and in case reloads the workflow and execute the specific 
@@ -39,49 +38,55 @@ def execute_steps():
     """
 
     from aiida.orm import JobCalculation
+    from aiida.orm.backend import construct_backend
     from aiida.orm.implementation import get_all_running_steps
- 
+
     logger.debug("Querying the worflow DB")
-    
-    running_steps = get_all_running_steps()
 
-    for s in running_steps:
-        if s.parent.state == wf_states.FINISHED:
-            s.set_state(wf_states.FINISHED)
-            continue
+    steps_summary = construct_backend().query_manager.get_running_workflow_steps_summary()
 
-        w = s.parent.get_aiida_class()
+    ready_steps = []
 
-        logger.info("[{0}] Found active step: {1}".format(w.pk, s.name))
+    for (step_pk, step_name, workflow_pk, workflow_state, s_calcs_num, s_calcs_new, s_calcs_finished,
+         s_calcs_failed, s_sub_wf_num, s_sub_wf_finished, s_sub_wf_failed) in steps_summary:
 
-        s_calcs_new = [c.pk for c in s.get_calculations() if c._is_new()]
-        s_calcs_finished = [c.pk for c in s.get_calculations() if c.is_finished_ok]
-        s_calcs_failed = [c.pk for c in s.get_calculations() if c.is_failed]
-        s_calcs_num = len(s.get_calculations())
+        if workflow_state == wf_states.FINISHED:
+            ready_steps.append(step_pk)
+            continue
 
-        s_sub_wf_finished = [sw.pk for sw in s.get_sub_workflows() if sw.has_finished_ok()]
-        s_sub_wf_failed = [sw.pk for sw in s.get_sub_workflows() if sw.has_failed()]
-        s_sub_wf_num = len(s.get_sub_workflows())
+        logger.info("[{0}] Found active step: {1}".format(workflow_pk, step_name))
 
-        if (s_calcs_num == (len(s_calcs_finished) + len(s_calcs_failed)) and
-            s_sub_wf_num == (len(s_sub_wf_finished) + len(s_sub_wf_failed))):
+        if (s_calcs_num == (s_calcs_finished + s_calcs_failed) and
+                s_sub_wf_num == (s_sub_wf_finished + s_sub_wf_failed)):
 
-            logger.info("[{0}] Step: {1} ready to move".format(w.pk, s.name))
+            logger.info("[{0}] Step: {1} ready to move".format(workflow_pk, step_name))
 
-            s.set_state(wf_states.FINISHED)
-            
-            advance_workflow(w, s)
+            ready_steps.append(step_pk)
 
-        elif len(s_calcs_new) > 0:
+        elif s_calcs_new:
 
             for pk in s_calcs_new:
 
                 obj_calc = JobCalculation.get_subclass_from_pk(pk=pk)
                 try:
                     obj_calc.submit()
-                    logger.info("[{0}] Step: {1} launched calculation {2}".format(w.pk, s.name, pk))
+                    logger.info("[{0}] Step: {1} launched calculation {2}".format(workflow_pk, step_name, pk))
                 except:
-                    logger.error("[{0}] Step: {1} cannot launch calculation {2}".format(w.pk, s.name, pk))
+                    logger.error("[{0}] Step: {1} cannot launch calculation {2}".format(workflow_pk, step_name, pk))
+
+    if not ready_steps:
+        return
+
+    for s in get_all_running_steps(pks=ready_steps):
+        if s.parent.state == wf_states.FINISHED:
+            s.set_state(wf_states.FINISHED)
+            continue
+
+        w = s.parent.get_aiida_class()
+
+        s.set_state(wf_states.FINISHED)
+
+        advance_workflow(w, s)
 
 
 def advance_workflow(w, step):
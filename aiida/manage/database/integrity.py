@@ -57,7 +57,8 @@ def deduplicate_node_uuids(dry_run=True):
     from collections import defaultdict
 
     from aiida.backends.settings import AIIDANODES_UUID_VERSION
-    from aiida.orm import load_node
+    from aiida.backends.utils import set_node_uuid
+    from aiida.common.folders import RepositoryFolder
 
     uuid_generator = getattr(UUID, 'uuid{}'.format(AIIDANODES_UUID_VERSION))
 
@@ -66,40 +67,24 @@ def deduplicate_node_uuids(dry_run=True):
     for pk, uuid in get_duplicate_node_uuids():
         mapping[uuid].append(int(pk))
 
-    def copy_repo_folder(node_source, uuid):
-        """
-        Copy the repository folder from source node to a new location based on the given UUID.
-
-        :param node_source: the node whose repository folder contents to copy
-        :param uuid: the UUID that will be used to generate the sharded folder location for the copied folder
-        """
-        from aiida.common.folders import RepositoryFolder
-        folder = RepositoryFolder('node', uuid)
-        folder.replace_with_folder(node_source.folder.abspath)
-
     messages = []
 
-    for uuid, nodes in mapping.items():
-
-        uuid_old = None
+    # The nodes are not loaded through the ORM, such that this also works on a database whose schema has not yet been
+    # migrated to the latest version, which is precisely when the duplicates have to be fixed
+    for uuid_old, nodes in mapping.items():
 
-        for pk in nodes:
+        folder_source = RepositoryFolder('node', uuid_old)
 
-            # We don't have to change all nodes that have the same UUID, the first one can keep the original
-            if uuid_old is None:
-                node_source = load_node(pk)
-                uuid_old = uuid
-                continue
+        # We don't have to change all nodes that have the same UUID, the first one can keep the original
+        for pk in sorted(nodes)[1:]:
 
-            node = load_node(pk)
             uuid_new = str(uuid_generator())
 
             if dry_run:
                 messages.append('would update UUID of Node<{}> from {} to {}'.format(pk, uuid_old, uuid_new))
             else:
-                node._dbnode.uuid = uuid_new  # pylint: disable=protected-access
-                node._dbnode.save()  # pylint: disable=protected-access
-                copy_repo_folder(node_source, uuid_new)
+                set_node_uuid(pk, uuid_new)
+                RepositoryFolder('node', uuid_new).replace_with_folder(folder_source.abspath)
                 messages.append('updated UUID of Node<{}> from {} to {}'.format(pk, uuid_old, uuid_new))
 
     if not messages:
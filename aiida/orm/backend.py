@@ -103,6 +103,22 @@ class Backend(object):
         :return: the new query builder
         """
 
+    def store_many(self, nodes, with_transaction=True):
+        """
+        Store many nodes at once, with batched statements within a single transaction
+
+        The unstored nodes are stored together with the input links in their cache, the unstored sources of which
+        must be among the nodes. Nodes that are already stored are skipped.
+        See :meth:`aiida.orm.implementation.general.node.AbstractNode.store_many`.
+
+        :param nodes: an iterable of nodes
+        :param with_transaction: if False, no transaction is used, meant to be used only within an open transaction
+        :return: the list of the nodes
+        """
+        from aiida.orm.node import Node
+
+        return Node.store_many(nodes, with_transaction=with_transaction)
+
 
 class Collection(object):
     """Container class that represents a collection of entries of a particular backend entity."""
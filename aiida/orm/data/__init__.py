@@ -214,6 +214,11 @@ class Data(Node):
         """
         Save a Data object to a file.
 
+        If the class defines a ``_write_<fileformat>(handle, main_file_name, **kwargs)``
+        method, the content is written to the file directly by that method, so
+        that it does not have to be held in memory. Otherwise, it is created by
+        the ``_prepare_<fileformat>`` method.
+
         :param fname: string with file name. Can be an absolute or relative path.
         :param fileformat: kind of format to use for the export. If not present,
             it will try to use the extension of the file name.
@@ -223,6 +228,7 @@ class Data(Node):
         :return: the list of files created
         """
         import os
+        import uuid
 
         if not path:
             raise ValueError("Path not recognized")
@@ -242,6 +248,21 @@ class Data(Node):
             # by default assume the fileformat string is identical to the extension
             fileformat = self._custom_export_format_replacements.get(extension, extension)
 
+        writer = getattr(self, '_write_{}'.format(fileformat), None)
+        if writer is not None:
+            # The file is written to a temporary path that only replaces the output file if the writer succeeds, such
+            # that a failing writer neither leaves a partial file nor removes the one that was to be overwritten
+            tmppath = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+            try:
+                with io.open(tmppath, 'wb', encoding=None) as fhandle:
+                    writer(fhandle, main_file_name=path, **kwargs)
+                os.rename(tmppath, path)
+            except Exception:
+                if os.path.exists(tmppath):
+                    os.remove(tmppath)
+                raise
+            return [path]
+
         retlist = []
 
         filetext, extra_files = self._exportcontent(
@@ -10,8 +10,209 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+import collections
+import io
+import threading
+
 from aiida.orm import Data
 
+_ARRAY_CACHE = None
+
+# Default uncompressed size in bytes of the chunks of compressed arrays
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class ArrayCache(object):
+    """
+    A least recently used cache of arrays, bounded by the total number of bytes of the cached arrays.
+
+    The cache is shared by all the ArrayData nodes of the process, see :py:func:`get_array_cache`, and the arrays are
+    keyed by the UUID of the node and the name of the array. An array that is larger than the cache is not cached.
+    Since the same array is returned to all callers, the cached arrays are made read-only.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        :param max_bytes: the maximum total size in bytes of the cached arrays, 0 disables the cache.
+        """
+        self._max_bytes = max_bytes
+        self._arrays = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self):
+        """Return the maximum total size in bytes of the cached arrays."""
+        return self._max_bytes
+
+    @property
+    def nbytes(self):
+        """Return the total size in bytes of the cached arrays."""
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def __contains__(self, key):
+        return key in self._arrays
+
+    def get(self, key):
+        """
+        Return the cached array and mark it as the most recently used.
+
+        :param key: a tuple with the UUID of the node and the name of the array
+        :return: the array, or None if it is not cached
+        """
+        with self._lock:
+            try:
+                array = self._arrays.pop(key)
+            except KeyError:
+                return None
+            self._arrays[key] = array
+            return array
+
+    def set(self, key, array):
+        """
+        Cache an array, evicting the least recently used arrays until the total size fits in the cache.
+
+        :param key: a tuple with the UUID of the node and the name of the array
+        :param array: a numpy array, that is made read-only if it is cached
+        """
+        with self._lock:
+            self._pop(key)
+
+            if array.nbytes > self._max_bytes:
+                return
+
+            array.flags.writeable = False
+
+            while self._arrays and self._nbytes + array.nbytes > self._max_bytes:
+                self._nbytes -= self._arrays.popitem(last=False)[1].nbytes
+
+            self._arrays[key] = array
+            self._nbytes += array.nbytes
+
+    def discard(self, uuid):
+        """
+        Remove all the cached arrays of a node.
+
+        :param uuid: the UUID of the node
+        """
+        with self._lock:
+            for key in [key for key in self._arrays if key[0] == uuid]:
+                self._pop(key)
+
+    def clear(self):
+        """Remove all the cached arrays."""
+        with self._lock:
+            self._arrays.clear()
+            self._nbytes = 0
+
+    def _pop(self, key):
+        """Remove an array from the cache, if present. The lock has to be held by the caller."""
+        array = self._arrays.pop(key, None)
+        if array is not None:
+            self._nbytes -= array.nbytes
+
+
+def get_array_cache():
+    """
+    Return the cache of arrays shared by all the ArrayData nodes of the process.
+
+    Its size is set by the ``arraydata.cache_size`` property, in megabytes, when it is first used.
+
+    :return: an :py:class:`ArrayCache` instance
+    """
+    global _ARRAY_CACHE  # pylint: disable=global-statement
+
+    if _ARRAY_CACHE is None:
+        from aiida.common.setup import get_property
+        _ARRAY_CACHE = ArrayCache(max_bytes=get_property('arraydata.cache_size') * 1024 * 1024)
+
+    return _ARRAY_CACHE
+
+
+def save_chunked_array(filepath, array, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Save an array as a zip archive of compressed chunks of consecutive rows, i.e. slices along its first axis.
+
+    Each chunk is a member of the archive in .npy format, named after the index of its first row, so that the file is
+    also a valid .npz file that can be read with ``numpy.load``.
+
+    :param filepath: the path of the file to write
+    :param array: a numpy array
+    :param chunk_size: the approximate uncompressed size in bytes of each chunk
+    """
+    import zipfile
+    import numpy
+
+    if array.ndim == 0 or len(array) == 0:
+        rows, starts = len(array) if array.ndim else None, [0]
+    else:
+        rows = max(1, chunk_size // max(1, array[0].nbytes))
+        starts = range(0, len(array), rows)
+
+    with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for start in starts:
+            buffer = io.BytesIO()
+            numpy.save(buffer, array[start:start + rows] if array.ndim else array)
+            # The members get a fixed timestamp, such that the file, and so the hash of the node, only depends on the
+            # content of the array
+            info = zipfile.ZipInfo('{}.npy'.format(start), date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o600 << 16
+            archive.writestr(info, buffer.getvalue())
+
+
+def load_chunked_array(filepath, shape, index=None):
+    """
+    Load an array, or a part of it, from a file written by :py:func:`save_chunked_array`.
+
+    Only the chunks that contain the selected rows are decompressed.
+
+    :param filepath: the path of the file
+    :param shape: the shape of the array
+    :param index: if not None, the index of the part of the array to load, as passed to ``array[index]``. Its first
+        element, that selects the rows, can be an integer, a slice, or an array of integers or booleans.
+    :return: the array, or the selected part of it
+    """
+    import numpy
+
+    load_all = index is None
+
+    if not isinstance(index, tuple):
+        index = (index,)
+
+    rows_index, rest = index[0], index[1:]
+
+    with numpy.load(filepath) as archive:
+        starts = sorted(int(start) for start in archive.files)
+
+        if load_all or not shape or rows_index is None or rows_index is Ellipsis:
+            # Load all the chunks, and then apply the full index
+            chunks = [archive[str(start)] for start in starts]
+            array = chunks[0] if len(chunks) == 1 else numpy.concatenate(chunks)
+            return array if load_all else array[index]
+
+        rows = numpy.arange(shape[0])[rows_index]
+        is_scalar = rows.ndim == 0
+        rows = numpy.atleast_1d(rows)
+
+        result = None
+        for start, end in zip(starts, starts[1:] + [shape[0]]):
+            mask = (rows >= start) & (rows < end)
+            # Skip the chunks without selected rows, unless none is selected and the data type is not known yet
+            if not mask.any() and (result is not None or len(rows)):
+                continue
+            chunk = archive[str(start)]
+            if result is None:
+                result = numpy.empty((len(rows),) + tuple(shape[1:]), dtype=chunk.dtype)
+            result[mask] = chunk[rows[mask] - start]
+
+    if is_scalar:
+        return result[0][rest] if rest else result[0]
+
+    return result[(slice(None),) + rest] if rest else result
 
 
 class ArrayData(Data):
@@ -20,35 +221,32 @@ class ArrayData(Data):
     way using numpy.save() (therefore, this class requires numpy to be
     installed).
 
-    Each array is stored within the Node folder as a different .npy file.
+    Each array is stored within the Node folder as a different .npy file or,
+    if it is compressed, as a .npz file of compressed chunks of rows (see
+    :py:func:`save_chunked_array`), from which slices can be read without
+    decompressing the whole array with :py:meth:`.get_array_slice`.
 
     :note: Before storing, no caching is done: if you perform a
       :py:meth:`.get_array` call, the array will be re-read from disk.
       If instead the ArrayData node has already been stored,
       the array is cached in memory after the first read, and the cached array
-      is used thereafter.
-      If too much RAM memory is used, you can clear the
-      cache with the :py:meth:`.clear_internal_cache` method.
+      is used thereafter. The cache is shared by all nodes of the process and
+      keeps the most recently used arrays up to the total size set by the
+      ``arraydata.cache_size`` property, so the same read-only array object is
+      returned for all the instances of a stored node: copy it to modify it.
+      You can remove the arrays of a node from the cache with the
+      :py:meth:`.clear_internal_cache` method, or avoid loading an array in
+      memory altogether by passing a ``mmap_mode`` to :py:meth:`.get_array`.
     """
     array_prefix = "array|"
 
-    def __init__(self, *args, **kwargs):
-        super(ArrayData, self).__init__(*args, **kwargs)
-        self._cached_arrays = {}
-
     def delete_array(self, name):
         """
         Delete an array from the node. Can only be called before storing.
 
         :param name: The name of the array to delete from the node.
         """
-        import numpy
-
-        fname = '{}.npy'.format(name)
-        if fname not in self.get_folder_list():
-            raise KeyError(
-                "Array with name '{}' not found in node pk= {}".format(
-                    name, self.pk))
+        fname = self._get_array_filename(name)
 
         # remove both file and attribute
         self.remove_path(fname)
@@ -88,7 +286,32 @@ class ArrayData(Data):
         Return a list of all arrays stored in the node, listing the files (and
         not relying on the properties).
         """
-        return [i[:-4] for i in self.get_folder_list() if i.endswith('.npy')]
+        return [i[:-4] for i in self.get_folder_list() if i.endswith('.npy') or i.endswith('.npz')]
+
+    def _get_array_filename(self, name):
+        """
+        Return the name of the file of an array in the folder of the node,
+        either name.npy or, for compressed arrays, name.npz.
+
+        :param name: The name of the array.
+        :raise KeyError: if there is no array with this name.
+        """
+        folder_list = self.get_folder_list()
+        for fname in ('{}.npy'.format(name), '{}.npz'.format(name)):
+            if fname in folder_list:
+                return fname
+
+        raise KeyError(
+            "Array with name '{}' not found in node pk= {}".format(
+                name, self.pk))
+
+    def is_array_compressed(self, name):
+        """
+        Return whether an array is stored compressed.
+
+        :param name: The name of the array.
+        """
+        return self._get_array_filename(name).endswith('.npz')
 
     def _arraynames_from_properties(self):
         """
@@ -107,67 +330,123 @@ class ArrayData(Data):
         """
         return tuple(self.get_attr("{}{}".format(self.array_prefix, name)))
 
-    def iterarrays(self):
+    def iterarrays(self, mmap_mode=None):
         """
         Iterator that returns tuples (name, array) for each array stored in the
         node.
+
+        :param mmap_mode: passed to :py:meth:`.get_array`, to memory-map the
+            arrays instead of loading them all in memory.
         """
         for name in self.get_arraynames():
-            yield (name, self.get_array(name))
+            yield (name, self.get_array(name, mmap_mode=mmap_mode))
 
-    def get_array(self, name):
+    def get_array(self, name, mmap_mode=None):
         """
         Return an array stored in the node
 
         :param name: The name of the array to return.
+        :param mmap_mode: if None, the array is loaded in memory. Otherwise,
+            either 'r' or 'c', the array is memory-mapped from the file in the
+            repository, read-only or copy-on-write respectively (see
+            ``numpy.load``), so that only the parts of the array that are
+            accessed are read from disk. Memory-mapped arrays are not cached.
+            Compressed arrays cannot be memory-mapped, and are always loaded:
+            use :py:meth:`.get_array_slice` to read only a part of them.
         """
         import numpy
 
+        if mmap_mode not in (None, 'r', 'c'):
+            raise ValueError("Invalid mmap_mode '{}', it can only be None, 'r' or 'c'".format(mmap_mode))
+
         # raw function used only internally
         def get_array_from_file(self, name):
-            fname = '{}.npy'.format(name)
-            if fname not in self.get_folder_list():
-                raise KeyError(
-                    "Array with name '{}' not found in node pk= {}".format(
-                        name, self.pk))
+            fname = self._get_array_filename(name)
 
-            array = numpy.load(self.get_abs_path(fname))
+            if fname.endswith('.npz'):
+                return load_chunked_array(self.get_abs_path(fname), self.get_shape(name))
+
+            array = numpy.load(self.get_abs_path(fname), mmap_mode=mmap_mode)
             return array
 
         # Return with proper caching, but only after storing. Before, instead,
         # always re-read from disk
-        if not self.is_stored:
+        if not self.is_stored or (mmap_mode is not None and not self.is_array_compressed(name)):
             return get_array_from_file(self, name)
         else:
-            if name not in self._cached_arrays:
-                self._cached_arrays[name] = get_array_from_file(self, name)
-            return self._cached_arrays[name]
+            cache = get_array_cache()
+            array = cache.get((self.uuid, name))
+            if array is None:
+                array = get_array_from_file(self, name)
+                cache.set((self.uuid, name), array)
+            return array
+
+    def get_array_slice(self, name, index):
+        """
+        Return a part of an array stored in the node, reading from disk only
+        the selected rows if the array is not already cached.
+
+        Uncompressed arrays are memory-mapped, while for compressed arrays
+        only the chunks that contain the selected rows are decompressed.
+
+        :param name: The name of the array.
+        :param index: The index of the part of the array to return, as passed
+            to ``array[index]``, e.g. an integer to get a single row, or a
+            tuple ``(slice(0, 10), 0)``.
+        :return: the selected part of the array, that is a copy unless the
+            array was already cached.
+        """
+        import numpy
+
+        if self.is_stored:
+            array = get_array_cache().get((self.uuid, name))
+            if array is not None:
+                return array[index]
+
+        fname = self._get_array_filename(name)
+
+        if fname.endswith('.npz'):
+            return load_chunked_array(self.get_abs_path(fname), self.get_shape(name), index)
+
+        return numpy.array(numpy.load(self.get_abs_path(fname), mmap_mode='r')[index])
 
     def clear_internal_cache(self):
         """
-        Clear the internal memory cache where the arrays are stored after being
-        read from disk (used in order to reduce at minimum the readings from
-        disk).
+        Remove the arrays of this node from the memory cache where the arrays
+        are stored after being read from disk (used in order to reduce at
+        minimum the readings from disk).
         This function is useful if you want to keep the node in memory, but you
         do not want to waste memory to cache the arrays in RAM.
         """
-        self._cached_arrays = {}
+        get_array_cache().discard(self.uuid)
 
-    def set_array(self, name, array):
+    def set_array(self, name, array, compressed=False, chunk_size=DEFAULT_CHUNK_SIZE):
         """
         Store a new numpy array inside the node. Possibly overwrite the array
         if it already existed.
 
-        Internally, it stores a name.npy file in numpy format.
+        Internally, it stores a name.npy file in numpy format, written
+        directly in the folder of the node. Compressed arrays are stored
+        instead in a name.npz file, in chunks of rows that are compressed
+        separately, so that they can be partially read with
+        :py:meth:`.get_array_slice`.
 
         :param name: The name of the array.
         :param array: The numpy array to store.
+        :param compressed: Whether to store the array compressed.
+        :param chunk_size: The approximate uncompressed size in bytes of the
+            chunks of a compressed array.
         """
         import re
-        import tempfile
 
         import numpy
 
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "Cannot insert a path after storing the node")
+
         if not (isinstance(array, numpy.ndarray)):
             raise TypeError("ArrayData can only store numpy arrays. Convert "
                             "the object to an array first")
@@ -177,14 +456,19 @@ class ArrayData(Data):
             raise ValueError("The name assigned to the array ({}) is not valid,"
                              "it can only contain digits, letters or underscores")
 
-        fname = "{}.npy".format(name)
+        # Remove the file of the array, if it exists in the other format
+        fname, other_fname = ("{}.npz".format(name), "{}.npy".format(name))
+        if not compressed:
+            fname, other_fname = other_fname, fname
 
-        with tempfile.NamedTemporaryFile() as f:
-            # Store in a temporary file, and then add to the node
-            numpy.save(f, array)
-            f.flush()  # Important to flush here, otherwise the next copy command
-            # will just copy an empty file
-            self.add_path(f.name, fname)
+        if other_fname in self.get_folder_list():
+            self.remove_path(other_fname)
+
+        if compressed:
+            save_chunked_array(self._get_folder_pathsubfolder.get_abs_path(fname), array, chunk_size)
+        else:
+            with self._get_folder_pathsubfolder.open(fname, 'wb') as handle:
+                numpy.save(handle, array)
 
         # Mainly for convenience, for querying purposes (both stores the fact
         # that there is an array with that name, and its shape)
@@ -193,7 +477,7 @@ class ArrayData(Data):
 
     def _validate(self):
         """
-        Check if the list of .npy files stored inside the node and the
+        Check if the list of .npy and .npz files stored inside the node and the
         list of properties match. Just a name check, no check on the size
         since this would require to reload all arrays and this may take time
         and memory.
@@ -11,10 +11,12 @@ from __future__ import division
 from __future__ import absolute_import
 from __future__ import print_function
 
+import io
+
 import six
 from six.moves import range, zip
 
-from aiida.orm.data.array import ArrayData
+from aiida.orm.data.array import ArrayData, DEFAULT_CHUNK_SIZE
 from aiida.orm.calculation.inline import optional_inline
 
 
@@ -88,7 +90,7 @@ class TrajectoryData(ArrayData):
                                  "have shape (s,n,3), "
                                  "with s=number of steps and n=number of symbols")
 
-    def set_trajectory(self, stepids, cells, symbols, positions, times=None, velocities=None):
+    def set_trajectory(self, stepids, cells, symbols, positions, times=None, velocities=None, compressed=False):
         r"""
         Store the whole trajectory, after checking that types and dimensions
         are correct.
@@ -133,6 +135,9 @@ class TrajectoryData(ArrayData):
         :param velocities: if specified, must be a float array with the same
                       dimensions of the ``positions`` array.
                       The array contains the velocities in the atoms.
+        :param compressed: if True, the positions and velocities are stored
+                      compressed, in chunks of steps (see
+                      :py:meth:`~aiida.orm.data.array.ArrayData.set_array`).
 
         .. todo :: Choose suitable units for velocities
         """
@@ -140,7 +145,7 @@ class TrajectoryData(ArrayData):
         self.set_array('steps', stepids)
         self.set_array('cells', cells)
         self.set_array('symbols', symbols)
-        self.set_array('positions', positions)
+        self.set_array('positions', positions, compressed=compressed)
         if times is not None:
             self.set_array('times', times)
         else:
@@ -150,7 +155,7 @@ class TrajectoryData(ArrayData):
             except KeyError:
                 pass
         if velocities is not None:
-            self.set_array('velocities', velocities)
+            self.set_array('velocities', velocities, compressed=compressed)
         else:
             # Delete velocities array, if it was present
             try:
@@ -191,12 +196,19 @@ class TrajectoryData(ArrayData):
         # check dimensions, types
         from aiida.common.exceptions import ValidationError
 
+        def get_array_mmap(name):
+            """Return the array memory-mapped, so that it is not loaded just to check its shape and type."""
+            try:
+                return self.get_array(name, mmap_mode='r')
+            except (AttributeError, KeyError):
+                return None
+
         try:
-            self._internal_validate(self.get_stepids(),
-                                    self.get_cells(),
-                                    self.get_symbols(), self.get_positions(),
-                                    self.get_times(),
-                                    self.get_velocities())
+            self._internal_validate(self.get_array('steps', mmap_mode='r'),
+                                    self.get_array('cells', mmap_mode='r'),
+                                    self.get_symbols(), self.get_array('positions', mmap_mode='r'),
+                                    get_array_mmap('times'),
+                                    get_array_mmap('velocities'))
         # Should catch TypeErrors, ValueErrors, and KeyErrors for missing arrays
         except Exception as exception:
             raise ValidationError("The TrajectoryData did not validate. "
@@ -349,19 +361,64 @@ class TrajectoryData(ArrayData):
            0 to ``self.numsteps - 1``.
         :raises IndexError: if you require an index beyond the limits.
         :raises KeyError: if you did not store the trajectory yet.
+
+        .. note:: Only the data of the requested step is read from the
+          arrays, see :py:meth:`~aiida.orm.data.array.ArrayData.get_array_slice`.
         """
         if index >= self.numsteps:
             raise IndexError("You have only {} steps, but you are looking beyond"
                              " (index={})".format(self.numsteps, index))
 
-        vel = self.get_velocities()
-        if vel is not None:
-            vel = vel[index, :, :]
-        time = self.get_times()
-        if time is not None:
-            time = time[index]
-        return (self.get_stepids()[index], time, self.get_cells()[index, :, :],
-                self.get_symbols(), self.get_positions()[index, :, :], vel)
+        return next(self.iter_step_data([index]))
+
+    def iter_step_data(self, indices=None, block_size=None):
+        """
+        Iterate over the data of the steps with the given indices, in the
+        format returned by :py:meth:`.get_step_data`.
+
+        The arrays are read in blocks of steps, so that only the data of
+        ``block_size`` steps is loaded in memory at any time (see
+        :py:meth:`~aiida.orm.data.array.ArrayData.get_array_slice`).
+
+        :param indices: an iterable of step indices, by default all the steps
+           in order.
+        :param block_size: the number of steps read at once, by default such
+           that the positions of a block take about as much memory as a chunk
+           of a compressed array.
+        :return: an iterator over tuples
+          ``(stepid, time, cell, symbols, positions, velocities)``
+        :raises IndexError: if you require an index beyond the limits.
+        :raises KeyError: if you did not store the trajectory yet.
+        """
+        import numpy
+
+        numsteps = self.numsteps
+
+        if indices is None:
+            indices = numpy.arange(numsteps)
+        else:
+            indices = numpy.array(list(indices), dtype=int)
+            if indices.size and (indices.max() >= numsteps or indices.min() < -numsteps):
+                raise IndexError("You have only {} steps, but you are looking beyond".format(numsteps))
+
+        if block_size is None:
+            block_size = max(1, DEFAULT_CHUNK_SIZE // max(1, self.numsites * 3 * 8))
+
+        arraynames = self.get_arraynames()
+        symbols = self.get_symbols()
+
+        def get_block(name, block):
+            """Return the rows of the array for the steps of the block, or a list of None if there is no array."""
+            if name not in arraynames:
+                return [None] * len(block)
+            return self.get_array_slice(name, block)
+
+        for start in range(0, len(indices), block_size):
+            block = indices[start:start + block_size]
+            arrays = [get_block(name, block) for name in ('steps', 'times', 'cells', 'positions', 'velocities')]
+
+            for stepid, time, cell, positions, velocities in zip(*arrays):
+                yield (stepid, time, cell, symbols, positions, velocities)
 
 
     def step_to_structure(self, index, custom_kinds=None):
@@ -398,7 +455,7 @@ class TrajectoryData(ArrayData):
           meaning that the strings in the ``symbols`` array must be valid
           chemical symbols.
         """
-        from aiida.orm.data.structure import StructureData, Kind, Site
+        from aiida.orm.data.structure import StructureData, Kind
 
         # ignore step, time, and velocities
         _, _, cell, symbols, positions, _ = self.get_step_data(index)
@@ -420,16 +477,17 @@ class TrajectoryData(ArrayData):
                                  "passed {}, but the symbols are {}".format(
                     sorted(kind_names), sorted(symbols)))
 
+        import numpy
+
+        if custom_kinds is None:
+            # Automatic species generation, with one kind for each symbol, in the order of their first appearance
+            _, first_indices = numpy.unique(symbols, return_index=True)
+            custom_kinds = [Kind(symbols=symbols[i]) for i in sorted(first_indices)]
+
+        kind_indices = {k.name: i for i, k in enumerate(custom_kinds)}
+
         struc = StructureData(cell=cell)
-        if custom_kinds is not None:
-            for k in custom_kinds:
-                struc.append_kind(k)
-            for s, p in zip(symbols, positions):
-                struc.append_site(Site(kind_name=s, position=p))
-        else:
-            for s, p in zip(symbols, positions):
-                # Automatic species generation
-                struc.append_atom(symbols=s, position=p)
+        struc.set_sites_from_arrays(custom_kinds, positions, [kind_indices[s] for s in symbols])
 
         return struc
 
@@ -437,54 +495,89 @@ class TrajectoryData(ArrayData):
         """
         Write the given trajectory to a string of format XSF (for XCrySDen).
         """
+        handle = io.BytesIO()
+        self._write_xsf(handle, index=index, main_file_name=main_file_name)
+        return handle.getvalue(), {}
+
+    def _write_xsf(self, handle, index=None, main_file_name=""):
+        """
+        Write the given trajectory in format XSF (for XCrySDen) to a binary
+        file handle, one step at a time.
+        """
         from aiida.common.constants import elements
         _atomic_numbers = {data['symbol']: num for num, data in elements.items()}
 
         indices = list(range(self.numsteps))
         if index is not None:
             indices = [index]
-        return_string = "ANIMSTEPS {}\nCRYSTAL\n".format(len(indices))
+        handle.write("ANIMSTEPS {}\nCRYSTAL\n".format(len(indices)).encode('utf-8'))
         # Do the checks once and for all here:
         structure = self.get_step_structure(index=0)
         if structure.is_alloy() or structure.has_vacancies():
             raise NotImplementedError("XSF for alloys or systems with "
                                       "vacancies not implemented.")
-        cells = self.get_cells()
-        positions = self.get_positions()
         symbols = self.get_symbols()
         atomic_numbers_list = [_atomic_numbers[s] for s in symbols]
         nat = len(symbols)
 
-        for idx in indices:
-            return_string += "PRIMVEC {}\n".format(idx+1)
-            #~ structure = self.get_step_structure(index=idx)
-            #~ sites = structure.sites
-            #~ if structure.is_alloy() or structure.has_vacancies():
-                #~ raise NotImplementedError("XSF for alloys or systems with "
-                                          #~ "vacancies not implemented.")
-            for cell_vector in cells[idx]:
-                return_string += " ".join(["{:18.5f}".format(i) for i in cell_vector])
-                return_string += "\n"
-            return_string += "PRIMCOORD {}\n".format(idx+1)
-            return_string += "{} 1\n" .format(nat)
-            for atn, pos in zip(atomic_numbers_list, positions[idx]):
-                try:
-                    return_string += "{} {:18.10f} {:18.10f} {:18.10f}\n".format(atn, pos[0], pos[1], pos[2] )
-                except:
-                    print(atn, pos)
-                    raise
-        return return_string.encode('utf-8'), {}
+        for idx, (_, _, cell, _, positions, _) in zip(indices, self.iter_step_data(indices)):
+            lines = ["PRIMVEC {}".format(idx + 1)]
+            for cell_vector in cell:
+                lines.append(" ".join(["{:18.5f}".format(i) for i in cell_vector]))
+            lines.append("PRIMCOORD {}".format(idx + 1))
+            lines.append("{} 1".format(nat))
+            for atn, pos in zip(atomic_numbers_list, positions):
+                lines.append("{} {:18.10f} {:18.10f} {:18.10f}".format(atn, pos[0], pos[1], pos[2]))
+            handle.write(("\n".join(lines) + "\n").encode('utf-8'))
+
+    def _prepare_xyz(self, trajectory_index=None, main_file_name=""):
+        """
+        Write the given trajectory to a string of format XYZ.
+        """
+        handle = io.BytesIO()
+        self._write_xyz(handle, trajectory_index=trajectory_index, main_file_name=main_file_name)
+        return handle.getvalue(), {}
+
+    def _write_xyz(self, handle, trajectory_index=None, main_file_name=""):
+        """
+        Write the given trajectory in format XYZ to a binary file handle, one
+        step at a time.
+
+        The comment line of each step follows the extended XYZ convention, with
+        the cell, the step id and, if present, the time of the step.
+        """
+        indices = list(range(self.numsteps))
+        if trajectory_index is not None:
+            indices = [trajectory_index]
+
+        for stepid, time, cell, symbols, positions, _ in self.iter_step_data(indices):
+            comment = 'Lattice="{}" Properties=species:S:1:pos:R:3 step={}'.format(
+                " ".join("{:.10f}".format(i) for i in cell.flatten()), stepid)
+            if time is not None:
+                comment += ' time={}'.format(time)
+            lines = ["{}".format(len(symbols)), comment]
+            for symbol, pos in zip(symbols, positions):
+                lines.append("{} {:18.10f} {:18.10f} {:18.10f}".format(symbol, pos[0], pos[1], pos[2]))
+            handle.write(("\n".join(lines) + "\n").encode('utf-8'))
 
     def _prepare_cif(self, trajectory_index=None, main_file_name=""):
         """
         Write the given trajectory to a string of format CIF.
         """
+        handle = io.BytesIO()
+        self._write_cif(handle, trajectory_index=trajectory_index, main_file_name=main_file_name)
+        return handle.getvalue(), {}
+
+    def _write_cif(self, handle, trajectory_index=None, main_file_name=""):
+        """
+        Write the given trajectory in format CIF to a binary file handle, one
+        step at a time.
+        """
         import CifFile
         from aiida.orm.data.cif \
             import ase_loops, cif_from_ase, pycifrw_from_cif
         from aiida.common.utils import HiddenPrints
 
-        cif = ""
         indices = list(range(self.numsteps))
         if trajectory_index is not None:
             indices = [trajectory_index]
@@ -493,8 +586,7 @@ class TrajectoryData(ArrayData):
             ciffile = pycifrw_from_cif(cif_from_ase(structure.get_ase()),
                                        ase_loops)
             with HiddenPrints():
-                cif = cif + ciffile.WriteOut()
-        return cif.encode('utf-8'), {}
+                handle.write(ciffile.WriteOut().encode('utf-8'))
 
     def _prepare_tcod(self, main_file_name="", **kwargs):
         """
@@ -756,7 +848,7 @@ class TrajectoryData(ArrayData):
         try:
             if self.get_attr('units|positions') in ('bohr', 'atomic'):
                 from aiida.common.constants import bohr_to_ang
-                positions *= bohr_to_ang
+                positions = positions * bohr_to_ang
         except KeyError:
             pass
 
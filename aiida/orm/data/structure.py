@@ -597,6 +597,61 @@ def has_vacancies(weights):
     return not (1. - w_sum < _sum_threshold)
 
 
+def get_ase_tags(kinds):
+    """
+    Return the ASE tags of a list of kinds, in the same order.
+
+    The tag distinguishes kinds of the same element: it is the integer that follows the symbol in the kind name, if
+    any, otherwise the next free integer for that element. Kinds whose name is the element symbol, as well as alloys
+    and kinds with vacancies, get no tag (None).
+
+    :param kinds: a list of Kind objects
+    :return: a list of integers or None
+    """
+    from collections import defaultdict
+
+    # I create the list of tags
+    tag_list = []
+    used_tags = defaultdict(list)
+    for k in kinds:
+        # Skip alloys and vacancies
+        if k.is_alloy() or k.has_vacancies():
+            tag_list.append(None)
+        # If the kind name is equal to the specie name,
+        # then no tag should be set
+        elif six.text_type(k.name) == six.text_type(k.symbols[0]):
+            tag_list.append(None)
+        else:
+            # Name is not the specie name
+            if k.name.startswith(k.symbols[0]):
+                try:
+                    new_tag = int(k.name[len(k.symbols[0])])
+                    tag_list.append(new_tag)
+                    used_tags[k.symbols[0]].append(new_tag)
+                    continue
+                except ValueError:
+                    pass
+            tag_list.append(k.symbols[0])  # I use a string as a placeholder
+
+    for i in range(len(tag_list)):
+        # If it is a string, it is the name of the element,
+        # and I have to generate a new integer for this element
+        # and replace tag_list[i] with this new integer
+        if isinstance(tag_list[i], six.string_types):
+            # I get a list of used tags for this element
+            existing_tags = used_tags[tag_list[i]]
+            if existing_tags:
+                new_tag = max(existing_tags) + 1
+            else:  # empty list
+                new_tag = 1
+            # I store it also as a used tag!
+            used_tags[tag_list[i]].append(new_tag)
+            # I update the tag
+            tag_list[i] = new_tag
+
+    return tag_list
+
+
 def symop_ortho_from_fract(cell):
     """
     Creates a matrix for conversion from orthogonal to fractional
@@ -1264,8 +1319,8 @@ class StructureData(Data):
             used to group and/or order the symbols in the formula
         """
 
-        symbol_list = [self.get_kind(s.kind_name).get_symbols_string()
-                       for s in self.sites]
+        symbols = [kind.get_symbols_string() for kind in self.kinds]
+        symbol_list = [symbols[index] for index in self.get_kind_indices_array().tolist()]
 
         return get_formula(symbol_list, mode=mode, separator=separator)
 
@@ -1280,7 +1335,7 @@ class StructureData(Data):
 
         :return: a list of strings
         """
-        return [this_site.kind_name for this_site in self.sites]
+        return [site['kind_name'] for site in self._get_raw_sites()]
 
     def get_composition(self):
         """
@@ -1292,13 +1347,16 @@ class StructureData(Data):
 
         :returns: a dictionary with the composition
         """
-        symbols_list = [self.get_kind(s.kind_name).get_symbols_string()
-                        for s in self.sites]
-        composition = {
-            symbol: symbols_list.count(symbol)
-            for symbol
-            in set(symbols_list)
-            }
+        import numpy as np
+
+        kinds = self.kinds
+        counts = np.bincount(self.get_kind_indices_array(), minlength=len(kinds))
+
+        composition = {}
+        for kind, count in zip(kinds, counts.tolist()):
+            if count:
+                symbol = kind.get_symbols_string()
+                composition[symbol] = composition.get(symbol, 0) + count
         return composition
 
     def get_ase(self):
@@ -1387,7 +1445,7 @@ class StructureData(Data):
 
         new_kind = Kind(kind=kind)  # So we make a copy
 
-        if kind.name in [k.name for k in self.kinds]:
+        if kind.name in self.get_kind_names():
             raise ValueError("A kind with the same name ({}) already exists."
                              "".format(kind.name))
 
@@ -1417,10 +1475,10 @@ class StructureData(Data):
 
         new_site = Site(site=site)  # So we make a copy
 
-        if site.kind_name not in [k.name for k in self.kinds]:
+        kind_names = self.get_kind_names()
+        if site.kind_name not in kind_names:
             raise ValueError("No kind with name '{}', available kinds are: "
-                             "{}".format(site.kind_name,
-                                         [k.name for k in self.kinds]))
+                             "{}".format(site.kind_name, kind_names))
 
         # If here, no exceptions have been raised, so I add the site.
         self._append_to_attr('sites', new_site.get_raw())
@@ -1625,27 +1683,122 @@ class StructureData(Data):
 
         self._set_attr('sites', [])
 
+    def _get_raw_sites(self):
+        """
+        Return the list of raw sites, as stored in the attributes, without building the Site objects.
+        """
+        return self.get_attr('sites', [])
+
+    def _get_raw_kinds(self):
+        """
+        Return the list of raw kinds, as stored in the attributes, without building the Kind objects.
+        """
+        return self.get_attr('kinds', [])
+
     @property
     def sites(self):
         """
         Returns a list of sites.
         """
-        try:
-            raw_sites = self.get_attr('sites')
-        except AttributeError:
-            raw_sites = []
-        return [Site(raw=i) for i in raw_sites]
+        return [Site(raw=i) for i in self._get_raw_sites()]
 
     @property
     def kinds(self):
         """
         Returns a list of kinds.
         """
+        return [Kind(raw=i) for i in self._get_raw_kinds()]
+
+    def get_positions_array(self):
+        """
+        Return the positions of all sites as an array.
+
+        :return: a numpy float array of shape (N, 3), with the absolute positions in angstrom of the N sites.
+        """
+        import numpy as np
+
+        return np.array([site['position'] for site in self._get_raw_sites()], dtype=float).reshape(-1, 3)
+
+    def get_kind_indices_array(self):
+        """
+        Return, for each site, the index of its kind in the list returned by the ``self.kinds`` property.
+
+        :return: a numpy integer array of length N, the number of sites.
+        """
+        import numpy as np
+
+        indices = {name: index for index, name in enumerate(self.get_kind_names())}
         try:
-            raw_kinds = self.get_attr('kinds')
-        except AttributeError:
-            raw_kinds = []
-        return [Kind(raw=i) for i in raw_kinds]
+            return np.array([indices[site['kind_name']] for site in self._get_raw_sites()], dtype=int)
+        except KeyError as exc:
+            raise ValueError("Kind name '{}' unknown".format(exc.args[0]))
+
+    def set_sites_from_arrays(self, kinds, positions, kind_indices):
+        """
+        Replace all the kinds and sites of the structure at once.
+
+        This is equivalent to calling ``clear_kinds``, then ``append_kind`` for each kind and ``append_site`` for each
+        site, but the sites are validated and set in bulk, which is much faster for large structures.
+
+        :param kinds: a list of Kind objects, whose names have to be unique. A copy of each kind is stored.
+        :param positions: an array-like of shape (N, 3) with the absolute positions in angstrom of the N sites.
+        :param kind_indices: an array-like of N integers, the index in `kinds` of the kind of each site.
+
+        :raise ModificationNotAllowed: if the structure is already stored
+        :raise ValueError: if the arrays are invalid, if the kind names are not unique or if a kind has no site
+        """
+        import numpy as np
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "The StructureData object cannot be modified, "
+                "it has already been stored")
+
+        new_kinds = [Kind(kind=kind) for kind in kinds]
+        kind_names = [kind.name for kind in new_kinds]
+
+        if len(set(kind_names)) != len(kind_names):
+            raise ValueError("The kind names are not unique: {}".format(kind_names))
+
+        try:
+            positions = np.asarray(positions, dtype=float)
+        except (ValueError, TypeError):
+            raise ValueError("Wrong format for the positions, must be an array of floats")
+
+        if positions.size == 0:
+            positions = positions.reshape(0, 3)
+
+        if positions.ndim != 2 or positions.shape[1] != 3:
+            raise ValueError("The positions must be an array of shape (N, 3), found {}".format(positions.shape))
+
+        if not np.all(np.isfinite(positions)):
+            raise ValueError("The positions contain nan or inf values")
+
+        kind_indices = np.asarray(kind_indices)
+
+        if kind_indices.size == 0:
+            kind_indices = kind_indices.astype(int)
+
+        if kind_indices.shape != (len(positions),) or not np.issubdtype(kind_indices.dtype, np.integer):
+            raise ValueError("The kind indices must be an array of {} integers".format(len(positions)))
+
+        counts = np.bincount(kind_indices, minlength=len(new_kinds)) if np.all(kind_indices >= 0) else None
+
+        if counts is None or len(counts) != len(new_kinds):
+            raise ValueError("The kind indices must be between 0 and {}".format(len(new_kinds) - 1))
+
+        if not np.all(counts):
+            raise ValueError("The following kinds are defined, but there are no sites with that kind: {}".format(
+                [name for name, count in zip(kind_names, counts) if not count]))
+
+        self._set_attr('kinds', [kind.get_raw() for kind in new_kinds])
+        # The sites are built from plain python types, so they do not need to be cleaned
+        self._set_attr('sites', [{
+            'position': position,
+            'kind_name': kind_names[index]
+        } for position, index in zip(positions.tolist(), kind_indices.tolist())], clean=False)
+        self._internal_kind_tags = {index: kind._internal_tag for index, kind in enumerate(new_kinds)}
 
     def get_kind(self, kind_name):
         """
@@ -1684,7 +1837,7 @@ class StructureData(Data):
 
         :return: a list of strings.
         """
-        return [k.name for k in self.kinds]
+        return [kind['name'] for kind in self._get_raw_kinds()]
 
     @property
     def cell(self):
@@ -1753,7 +1906,8 @@ class StructureData(Data):
         else:
 
             # test consistency of th enew input
-            n_sites = len(self.sites)
+            sites = self.sites
+            n_sites = len(sites)
             if n_sites != len(new_positions) and conserve_particle:
                 raise ValueError(
                     "the new positions should be as many as the previous structure.")
@@ -1772,14 +1926,12 @@ class StructureData(Data):
                                      "found instead {}".format(len(this_pos)))
 
                 # now append this Site to the new_site list.
-                new_site = Site(site=self.sites[i])  # So we make a copy
+                new_site = Site(site=sites[i])  # So we make a copy
                 new_site.position = copy.deepcopy(this_pos)
                 new_sites.append(new_site)
 
-            # now clear the old sites, and substitute with the new ones
-            self.clear_sites()
-            for this_new_site in new_sites:
-                self.append_site(this_new_site)
+            # now substitute the old sites with the new ones, that have the same kinds
+            self._set_attr('sites', [this_new_site.get_raw() for this_new_site in new_sites])
 
     @property
     def pbc(self):
@@ -1923,13 +2075,27 @@ class StructureData(Data):
         :return: an ase.Atoms object
         """
         import ase
+        import numpy as np
 
-        asecell = ase.Atoms(cell=self.cell, pbc=self.pbc)
-        _kinds = self.kinds
+        kinds = self.kinds
+        kind_indices = self.get_kind_indices_array()
+
+        for index in np.unique(kind_indices).tolist():
+            if kinds[index].is_alloy() or kinds[index].has_vacancies():
+                raise ValueError("Cannot convert to ASE if the kind represents "
+                                 "an alloy or it has vacancies.")
 
-        for site in self.sites:
-            asecell.append(site.get_ase(kinds=_kinds))
-        return asecell
+        symbols = [str(kind.symbols[0]) for kind in kinds]
+        masses = np.array([kind.mass for kind in kinds], dtype=float)
+        tags = np.array([tag or 0 for tag in get_ase_tags(kinds)], dtype=int)
+
+        return ase.Atoms(
+            symbols=[symbols[index] for index in kind_indices.tolist()],
+            positions=self.get_positions_array(),
+            masses=masses[kind_indices],
+            tags=tags[kind_indices],
+            cell=self.cell,
+            pbc=self.pbc)
 
     def _get_object_pymatgen(self,**kwargs):
         """
@@ -1978,7 +2144,10 @@ class StructureData(Data):
             raise ValueError("Periodic boundary conditions must apply in "
                              "all three dimensions of real space")
 
-        species = []
+        kinds = self.kinds
+        kind_indices = self.get_kind_indices_array().tolist()
+        # The species are built once per kind, for the kinds that have at least one site
+        kind_species = {}
         additional_kwargs = {}
 
         if (kwargs.pop('add_spin',False) and 
@@ -1986,21 +2155,21 @@ class StructureData(Data):
             # case when spins are defined -> no partial occupancy allowed
             from pymatgen.core.structure import Specie
             oxidation_state = 0 # now I always set the oxidation_state to zero
-            for s in self.sites:
-                k = self.get_kind(s.kind_name)
+            for index in set(kind_indices):
+                k = kinds[index]
                 if len(k.symbols)!=1 or (len(k.weights)!=1 or sum(k.weights)<1.):
                     raise ValueError("Cannot set partial occupancies and spins "
                                      "at the same time")
-                species.append(Specie(k.symbols[0],oxidation_state,
+                kind_species[index] = Specie(k.symbols[0],oxidation_state,
                                       properties={'spin': -1 if k.name.endswith('1')
-                                            else 1 if k.name.endswith('2') else 0}))
+                                            else 1 if k.name.endswith('2') else 0})
         else:
             # case when no spin are defined
-            for s in self.sites:
-                k = self.get_kind(s.kind_name)
-                species.append({s: w for s, w in zip(k.symbols, k.weights)})
-            if any([create_automatic_kind_name(self.get_kind(name).symbols,self.get_kind(name).weights)!=name
-                    for name in self.get_site_kindnames()]):
+            for index in set(kind_indices):
+                k = kinds[index]
+                kind_species[index] = {s: w for s, w in zip(k.symbols, k.weights)}
+            if any([create_automatic_kind_name(kinds[index].symbols, kinds[index].weights) != kinds[index].name
+                    for index in kind_species]):
                     # add "kind_name" as a properties to each site, whenever
                     # the kind_name cannot be automatically obtained from the symbols
                 additional_kwargs['site_properties'] = {'kind_name': self.get_site_kindnames()}
@@ -2009,7 +2178,8 @@ class StructureData(Data):
             raise ValueError("Unrecognized parameters passed to pymatgen "
                              "converter: {}".format(kwargs.keys()))
 
-        positions = [list(x.position) for x in self.sites]
+        species = [kind_species[index] for index in kind_indices]
+        positions = self.get_positions_array().tolist()
         return Structure(self.cell, species, positions,
                          coords_are_cartesian=True,**additional_kwargs)
 
@@ -2032,12 +2202,10 @@ class StructureData(Data):
             raise ValueError("Unrecognized parameters passed to pymatgen "
                              "converter: {}".format(kwargs.keys()))
 
-        species = []
-        for s in self.sites:
-            k = self.get_kind(s.kind_name)
-            species.append({s: w for s, w in zip(k.symbols, k.weights)})
+        kind_species = [{s: w for s, w in zip(k.symbols, k.weights)} for k in self.kinds]
+        species = [kind_species[index] for index in self.get_kind_indices_array().tolist()]
 
-        positions = [list(x.position) for x in self.sites]
+        positions = self.get_positions_array().tolist()
         return Molecule(species, positions)
 
 
@@ -2519,47 +2687,9 @@ class Site(object):
         .. note:: If any site is an alloy or has vacancies, a ValueError
             is raised (from the site.get_ase() routine).
         """
-        from collections import defaultdict
         import ase
 
-        # I create the list of tags
-        tag_list = []
-        used_tags = defaultdict(list)
-        for k in kinds:
-            # Skip alloys and vacancies
-            if k.is_alloy() or k.has_vacancies():
-                tag_list.append(None)
-            # If the kind name is equal to the specie name,
-            # then no tag should be set
-            elif six.text_type(k.name) == six.text_type(k.symbols[0]):
-                tag_list.append(None)
-            else:
-                # Name is not the specie name
-                if k.name.startswith(k.symbols[0]):
-                    try:
-                        new_tag = int(k.name[len(k.symbols[0])])
-                        tag_list.append(new_tag)
-                        used_tags[k.symbols[0]].append(new_tag)
-                        continue
-                    except ValueError:
-                        pass
-                tag_list.append(k.symbols[0])  # I use a string as a placeholder
-
-        for i in range(len(tag_list)):
-            # If it is a string, it is the name of the element,
-            # and I have to generate a new integer for this element
-            # and replace tag_list[i] with this new integer
-            if isinstance(tag_list[i], six.string_types):
-                # I get a list of used tags for this element
-                existing_tags = used_tags[tag_list[i]]
-                if existing_tags:
-                    new_tag = max(existing_tags) + 1
-                else:  # empty list
-                    new_tag = 1
-                # I store it also as a used tag!
-                used_tags[tag_list[i]].append(new_tag)
-                # I update the tag
-                tag_list[i] = new_tag
+        tag_list = get_ase_tags(kinds)
 
         found = False
         for k, t in zip(kinds, tag_list):
@@ -51,6 +51,61 @@ _element_v2_regexp = re.compile(
    """, re.VERBOSE)
 
 
+# Cache of the index of the UPF families, mapping the pk of the group to its membership version and to the index
+_family_index_cache = {}
+
+
+def get_upf_family_index(family):
+    """
+    Return the index of a UpfFamily group, mapping each element to the pk of the UpfData of the group for that element.
+
+    The index is built with a single query, projecting the pk and the element of the members of the group, and is
+    cached for the lifetime of the process. The cached index is rebuilt when the members of the group are changed by
+    this process, and by :func:`get_pseudos_from_structures` when it is found to be stale, e.g. because the members
+    were changed by another process; use :func:`clear_upf_family_index_cache` to force it to be rebuilt.
+
+    :param family: the UpfFamily group
+    :return: a dictionary {element: pk}
+    :raise MultipleObjectsError: if more than one UPF for the same element is
+       found in the group.
+    """
+    from aiida.backends.utils import get_group_membership_version
+    from aiida.common.exceptions import MultipleObjectsError
+    from aiida.orm import Group
+    from aiida.orm.querybuilder import QueryBuilder
+
+    version = get_group_membership_version(family.pk)
+    try:
+        cached_version, index = _family_index_cache[family.pk]
+    except KeyError:
+        pass
+    else:
+        if cached_version == version:
+            return index
+
+    builder = QueryBuilder()
+    builder.append(Group, filters={'id': family.pk}, tag='group')
+    builder.append(UpfData, member_of='group', project=['id', 'attributes.element'])
+
+    index = {}
+    for pk, element in builder.iterall():
+        if element in index:
+            raise MultipleObjectsError(
+                "More than one UPF for element {} found in "
+                "family {}".format(element, family.name))
+        index[element] = pk
+
+    _family_index_cache[family.pk] = (version, index)
+    return index
+
+
+def clear_upf_family_index_cache():
+    """
+    Clear the cached indexes of the UpfFamily groups, for example after their members were changed by another process.
+    """
+    _family_index_cache.clear()
+
+
 def get_pseudos_from_structure(structure, family_name):
     """
     Given a family name (a UpfFamily group in the DB) and a AiiDA
@@ -62,28 +117,58 @@ def get_pseudos_from_structure(structure, family_name):
     :raise NotExistent: if no UPF for an element in the group is
        found in the group.
     """
-    from aiida.common.exceptions import NotExistent, MultipleObjectsError
+    return get_pseudos_from_structures([structure], family_name)[0]
 
-    family_pseudos = {}
-    family = UpfData.get_upf_group(family_name)
-    for node in family.nodes:
-        if isinstance(node, UpfData):
-            if node.element in family_pseudos:
-                raise MultipleObjectsError(
-                    "More than one UPF for element {} found in "
-                    "family {}".format(node.element, family_name))
-            family_pseudos[node.element] = node
-
-    pseudo_list = {}
-    for kind in structure.kinds:
-        symbol = kind.symbol
-        try:
-            pseudo_list[kind.name] = family_pseudos[symbol]
-        except KeyError:
-            raise NotExistent("No UPF for element {} found in family {}".format(
-                symbol, family_name))
 
-    return pseudo_list
+def get_pseudos_from_structures(structures, family_name):
+    """
+    Given a family name (a UpfFamily group in the DB) and a list of AiiDA
+    structures, return for each structure a dictionary associating each kind
+    name with its UpfData object.
+
+    The family is resolved once and the UpfData of all the elements of all the
+    structures are loaded with a single query, so the same UpfData object is
+    shared by all the dictionaries. If an element, or its UpfData, is not found
+    with the cached index of the family, the index is rebuilt once in case it
+    was stale.
+
+    :raise MultipleObjectsError: if more than one UPF for the same element is
+       found in the group.
+    :raise NotExistent: if no UPF for an element in the group is
+       found in the group.
+    """
+    from aiida.common.exceptions import NotExistent
+    from aiida.orm import Group
+    from aiida.orm.querybuilder import QueryBuilder
+
+    family = UpfData.get_upf_group(family_name)
+    symbols = {kind.symbol for structure in structures for kind in structure.kinds}
+
+    # The cached index may be stale if the family was changed by another process, so if an element or one of its
+    # UpfData is not found, the index is rebuilt once before giving up
+    for attempt in range(2):
+        if attempt:
+            _family_index_cache.pop(family.pk, None)
+
+        family_index = get_upf_family_index(family)
+        missing = sorted(symbol for symbol in symbols if symbol not in family_index)
+        if missing:
+            continue
+
+        needed_pks = {family_index[symbol] for symbol in symbols}
+        pseudos = {}
+        if needed_pks:
+            builder = QueryBuilder()
+            builder.append(Group, filters={'id': family.pk}, tag='group')
+            builder.append(UpfData, member_of='group', filters={'id': {'in': list(needed_pks)}})
+            pseudos = {node.pk: node for node, in builder.iterall()}
+
+        missing = sorted(symbol for symbol in symbols if family_index[symbol] not in pseudos)
+        if not missing:
+            return [{kind.name: pseudos[family_index[kind.symbol]] for kind in structure.kinds}
+                    for structure in structures]
+
+    raise NotExistent("No UPF for element {} found in family {}".format(missing[0], family_name))
 
 
 def get_pseudos_dict(structure, family_name):
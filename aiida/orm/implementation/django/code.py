@@ -33,23 +33,7 @@ class Code(AbstractCode):
 
     @classmethod
     def list_for_plugin(cls, plugin, labels=True):
-        """
-        Return a list of valid code strings for a given plugin.
-
-        :param plugin: The string of the plugin.
-        :param labels: if True, return a list of code names, otherwise
-          return the code PKs (integers).
-        :return: a list of string, with the code names if labels is True,
-          otherwise a list of integers with the code PKs.
-        """
-        valid_codes = list(cls.query(
-            dbattributes__key="input_plugin",
-            dbattributes__tval=plugin))
-
-        if labels:
-            return [c.label for c in valid_codes]
-        else:
-            return [c.pk for c in valid_codes]
+        return super(Code, cls).list_for_plugin(plugin, labels)
 
     def set_remote_computer_exec(self, remote_computer_exec):
         """
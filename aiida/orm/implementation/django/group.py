@@ -148,45 +148,42 @@ class Group(AbstractGroup):
         return self
 
     def add_nodes(self, nodes):
-        from aiida.backends.djsite.db.models import DbNode
+        from aiida.backends.utils import add_nodes_to_group
+        from aiida.orm.querybuilder import QueryBuilder
+
         if not self.is_stored:
             raise ModificationNotAllowed("Cannot add nodes to a group before "
                                          "storing")
 
-        # First convert to a list
-        if isinstance(nodes, (Node, DbNode)):
-            nodes = [nodes]
-
-        if isinstance(nodes, six.string_types) or not isinstance(nodes, collections.Iterable):
-            raise TypeError("Invalid type passed as the 'nodes' parameter to "
-                            "add_nodes, can only be a Node, DbNode, or a list "
-                            "of such objects, it is instead {}".format(
-                str(type(nodes))))
-
-        list_pk = []
-        for node in nodes:
-            if not isinstance(node, (Node, DbNode)):
-                raise TypeError("Invalid type of one of the elements passed "
-                                "to add_nodes, it should be either a Node or "
-                                "a DbNode, it is instead {}".format(
-                    str(type(node))))
-            if node.pk is None:
-                raise ValueError("At least one of the provided nodes is "
-                                 "unstored, stopping...")
-            list_pk.append(node.pk)
-
-        self._dbgroup.dbnodes.add(*list_pk)
+        if isinstance(nodes, QueryBuilder):
+            add_nodes_to_group(self.pk, querybuilder=nodes)
+        else:
+            add_nodes_to_group(self.pk, node_pks=self._get_node_pks(nodes, 'add_nodes'))
 
     @property
     def nodes(self):
         class iterator(object):
-            def __init__(self, dbnodes):
+            def __init__(self, dbnodes, batch_size):
                 self.dbnodes = dbnodes
+                self.batch_size = batch_size
                 self.generator = self._genfunction()
 
             def _genfunction(self):
-                for n in self.dbnodes:
-                    yield n.get_aiida_class()
+                # Load the nodes in batches of consecutive pks, rather
+                # than either all at once or with one query per node
+                last_pk = None
+                while True:
+                    batch = self.dbnodes.order_by('pk')
+                    if last_pk is not None:
+                        batch = batch.filter(pk__gt=last_pk)
+                    batch = list(batch[:self.batch_size])
+
+                    for n in batch:
+                        yield n.get_aiida_class()
+
+                    if len(batch) < self.batch_size:
+                        return
+                    last_pk = batch[-1].pk
 
             def __iter__(self):
                 return self
@@ -201,46 +198,65 @@ class Group(AbstractGroup):
             def next(self):
                 return next(self.generator)
 
-        return iterator(self._dbgroup.dbnodes.all())
+        return iterator(self._dbgroup.dbnodes.all(), self._nodes_batch_size)
 
     def remove_nodes(self, nodes):
-        from aiida.backends.djsite.db.models import DbNode
+        from aiida.backends.utils import remove_nodes_from_group
+        from aiida.orm.querybuilder import QueryBuilder
+
         if not self.is_stored:
             raise ModificationNotAllowed("Cannot remove nodes from a group "
                                          "before storing")
 
+        if isinstance(nodes, QueryBuilder):
+            remove_nodes_from_group(self.pk, querybuilder=nodes)
+        else:
+            remove_nodes_from_group(self.pk, node_pks=self._get_node_pks(nodes, 'remove_nodes'))
+
+    @staticmethod
+    def _get_node_pks(nodes, method_name):
+        """
+        Return the pks of the given nodes, that can be Nodes, DbNodes or pks.
+
+        :param nodes: a Node, DbNode or pk, or a list of such objects
+        :param method_name: the name of the calling method, for the error messages
+        """
+        from aiida.backends.djsite.db.models import DbNode
+
         # First convert to a list
-        if isinstance(nodes, (Node, DbNode)):
+        if isinstance(nodes, (Node, DbNode) + six.integer_types):
             nodes = [nodes]
 
         if isinstance(nodes, six.string_types) or not isinstance(
                 nodes, collections.Iterable):
             raise TypeError("Invalid type passed as the 'nodes' parameter to "
-                            "remove_nodes, can only be a Node, DbNode, or a "
-                            "list of such objects, it is instead {}".format(
-                str(type(nodes))))
+                            "{}, can only be a Node, DbNode, pk, QueryBuilder or "
+                            "a list of such objects, it is instead {}".format(
+                method_name, str(type(nodes))))
 
         list_pk = []
         for node in nodes:
+            if isinstance(node, six.integer_types):
+                list_pk.append(node)
+                continue
             if not isinstance(node, (Node, DbNode)):
                 raise TypeError("Invalid type of one of the elements passed "
-                                "to add_nodes, it should be either a Node or "
-                                "a DbNode, it is instead {}".format(
-                    str(type(node))))
+                                "to {}, it should be either a Node, a DbNode "
+                                "or a pk, it is instead {}".format(
+                    method_name, str(type(node))))
             if node.pk is None:
                 raise ValueError("At least one of the provided nodes is "
                                  "unstored, stopping...")
             list_pk.append(node.pk)
 
-        self._dbgroup.dbnodes.remove(*list_pk)
+        return list_pk
 
     @classmethod
     def query(cls, name=None, type_string="", pk=None, uuid=None, nodes=None,
               user=None, node_attributes=None, past_days=None,
               name_filters=None, **kwargs):
 
-        from aiida.backends.djsite.db.models import (DbGroup, DbNode,
-                                                     DbAttribute)
+        from aiida.backends.djsite.db.models import DbGroup, DbNode
 
         # Analyze args and kwargs to create the query
         queryobject = Q()
@@ -295,14 +311,11 @@ class Group(AbstractGroup):
                     vlist = [vlist]
 
                 for v in vlist:
-                    # This will be a dictionary of the type
-                    # {'datatype': 'txt', 'tval': 'xxx') for instance, if
-                    # the passed data is a string
-                    base_query_dict = DbAttribute.get_query_dict(v)
-                    # prepend to the key the right django string to SQL-join
-                    # on the right table
-                    query_dict = {'dbnodes__dbattributes__{}'.format(k2): v2
-                                  for k2, v2 in base_query_dict.items()}
+                    # The nodes whose attributes contain the key with the
+                    # given value, using the containment operator of JSONB
+                    dbnodes = DbNode.objects.extra(
+                        where=['db_dbnode.attributes @> %s::jsonb'],
+                        params=[DbNode._meta.get_field('attributes').get_prep_value({k: v})])
 
                     # I narrow down the list of groups.
                     # I had to do it in this way, with multiple DB hits and
@@ -311,8 +324,7 @@ class Group(AbstractGroup):
                     # Since typically one requires a small number of filters,
                     # this should be ok.
                     groups_pk = groups_pk.intersection(DbGroup.objects.filter(
-                        pk__in=groups_pk, dbnodes__dbattributes__key=k,
-                        **query_dict).values_list('pk', flat=True))
+                        pk__in=groups_pk, dbnodes__in=dbnodes).values_list('pk', flat=True))
 
         retlist = []
         # Return sorted by pk
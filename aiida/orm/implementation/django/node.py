@@ -214,7 +214,11 @@ class Node(AbstractNode):
                 self._add_dblink_from(src, label, link_type)
 
     def _remove_dblink_from(self, label):
-        DbLink.objects.filter(output=self._dbnode, label=label).delete()
+        links = DbLink.objects.filter(output=self._dbnode, label=label)
+        source_pks = list(links.values_list('input_id', flat=True))
+        links.delete()
+        self._prefetched_links = None
+        self._discard_prefetched_links(source_pks)
 
     def _add_dblink_from(self, src, label=None, link_type=LinkType.UNSPECIFIED):
         from aiida.orm.querybuilder import QueryBuilder
@@ -245,6 +249,10 @@ class Node(AbstractNode):
                 raise ValueError(
                     "The link you are attempting to create would generate a loop")
 
+        # The prefetched links of both nodes no longer match the database
+        self._prefetched_links = None
+        src._prefetched_links = None
+
         if label is None:
             autolabel_idx = 1
 
@@ -293,8 +301,9 @@ class Node(AbstractNode):
         link_filter = {'output': self._dbnode}
         if link_type is not None:
             link_filter['type'] = link_type.value
+        # The input nodes are loaded by the same query, rather than by one query per link
         return [(i.label, i.input.get_aiida_class()) for i in
-                DbLink.objects.filter(**link_filter).distinct()]
+                DbLink.objects.filter(**link_filter).select_related('input').distinct()]
 
     def _get_db_output_links(self, link_type):
         from aiida.backends.djsite.db.models import DbLink
@@ -303,7 +312,7 @@ class Node(AbstractNode):
         if link_type is not None:
             link_filter['type'] = link_type.value
         return ((i.label, i.output.get_aiida_class()) for i in
-                DbLink.objects.filter(**link_filter).distinct())
+                DbLink.objects.filter(**link_filter).select_related('output').distinct())
 
     def get_computer(self):
         """
@@ -330,69 +339,39 @@ class Node(AbstractNode):
         :param str key: key name
         :param value: its value
         """
-        from aiida.backends.djsite.db.models import DbAttribute
-
-        DbAttribute.set_value_for_node(self._dbnode, key, value)
-        self._increment_version_number_db()
+        self._dbnode.set_attr(key, value)
 
     def _del_db_attr(self, key):
-        from aiida.backends.djsite.db.models import DbAttribute
-        if not DbAttribute.has_key(self._dbnode, key):
-            raise AttributeError("DbAttribute {} does not exist".format(
-                key))
-        DbAttribute.del_value_for_node(self._dbnode, key)
-        self._increment_version_number_db()
+        self._dbnode.del_attr(key)
 
     def _get_db_attr(self, key):
-        from aiida.backends.djsite.db.models import DbAttribute
-        return DbAttribute.get_value_for_node(
-            dbnode=self._dbnode, key=key)
+        return self._dbnode.get_json_value('attributes', key)
 
     def _set_db_extra(self, key, value, exclusive=False):
-        from aiida.backends.djsite.db.models import DbExtra
-
-        DbExtra.set_value_for_node(self._dbnode, key, value,
-                                   stop_if_existing=exclusive)
-        self._increment_version_number_db()
+        self._dbnode.set_extra(key, value, exclusive=exclusive)
 
     def _reset_db_extras(self, new_extras):
-        raise NotImplementedError("Reset of extras has not been implemented"
-                                  "for Django backend.")
+        self._dbnode.reset_extras(new_extras)
 
     def _get_db_extra(self, key):
-        from aiida.backends.djsite.db.models import DbExtra
-        return DbExtra.get_value_for_node(dbnode=self._dbnode, key=key)
+        try:
+            return self._dbnode.get_json_value('extras', key)
+        except AttributeError:
+            raise AttributeError("DbExtra {} does not exist".format(key))
 
     def _del_db_extra(self, key):
-        from aiida.backends.djsite.db.models import DbExtra
-        if not DbExtra.has_key(self._dbnode, key):
-            raise AttributeError("DbExtra {} does not exist".format(
-                key))
-        return DbExtra.del_value_for_node(self._dbnode, key)
-        self._increment_version_number_db()
+        self._dbnode.del_extra(key)
 
     def _db_iterextras(self):
-        from aiida.backends.djsite.db.models import DbExtra
-        extraslist = DbExtra.list_all_node_elements(self._dbnode)
-        for e in extraslist:
-            yield (e.key, e.getvalue())
+        return iter(self._dbnode.get_json_field('extras').items())
 
     def _db_iterattrs(self):
-        from aiida.backends.djsite.db.models import DbAttribute
-
-        all_attrs = DbAttribute.get_all_values_for_node(self._dbnode)
-        for attr in all_attrs:
-            yield (attr, all_attrs[attr])
+        for key, val in self._dbnode.get_json_field('attributes').items():
+            yield (key, val)
 
     def _db_attrs(self):
-        # Note: I "duplicate" the code from iterattrs and reimplement it
-        # here, rather than
-        # calling iterattrs from here, because iterattrs is slow on each call
-        # since it has to call .getvalue(). To improve!
-        from aiida.backends.djsite.db.models import DbAttribute
-        attrlist = DbAttribute.list_all_node_elements(self._dbnode)
-        for attr in attrlist:
-            yield attr.key
+        for key in self._dbnode.get_json_field('attributes').keys():
+            yield key
 
     def add_comment(self, content, user=None):
         from aiida.backends.djsite.db.models import DbComment
@@ -485,13 +464,12 @@ class Node(AbstractNode):
     def _increment_version_number_db(self):
         from aiida.backends.djsite.db.models import DbNode
         # I increment the node number using a filter
-        self._dbnode.nodeversion = F('nodeversion') + 1
-        self._dbnode.save()
+        queryset = DbNode.objects.filter(pk=self._dbnode.pk)
+        queryset.update(nodeversion=F('nodeversion') + 1)
 
-        # This reload internally the node of self._dbnode
-        # Note: I have to reload the object (to have the right values in memory,
-        # otherwise I only get the Django Field F object as a result!
-        self._dbnode = DbNode.objects.get(pk=self._dbnode.pk)
+        # I reload only the new version number, the attributes and extras
+        # of the node do not need to be loaded again
+        self._dbnode.nodeversion = queryset.values_list('nodeversion', flat=True).get()
 
     @property
     def uuid(self):
@@ -539,6 +517,78 @@ class Node(AbstractNode):
 
         return self
 
+    @classmethod
+    def _store_many_transaction(cls, with_transaction=True):
+        from aiida.common.utils import EmptyContextManager
+
+        if with_transaction:
+            return transaction.atomic()
+
+        return EmptyContextManager()
+
+    @classmethod
+    def _db_store_many(cls, nodes, hashes):
+        from django.db import connection
+        from aiida.backends.djsite.db.models import DbNode
+
+        # Reserve the pks of the nodes with a single query, such that the links can be inserted in bulk as well
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT nextval(pg_get_serial_sequence('db_dbnode', 'id')) FROM generate_series(1, %s)",
+                           [len(nodes)])
+            pks = [row[0] for row in cursor.fetchall()]
+
+        # As in `_db_store`, the files are moved before the rows are inserted
+        moved = []
+        try:
+            for node in nodes:
+                node._move_to_repository()
+                moved.append(node)
+
+            dbnodes = []
+            for node, pk, hash_ in zip(nodes, pks, hashes):
+                dbnode = node._dbnode
+                dbnode.pk = pk
+                dbnode.attributes = node._attrs_cache
+                dbnode.extras = dict(dbnode.extras or {})
+                dbnode.extras[_HASH_EXTRA_KEY] = hash_
+                dbnodes.append(dbnode)
+
+            DbNode.objects.bulk_create(dbnodes, batch_size=cls._store_many_batch_size)
+
+            links = [
+                DbLink(input_id=src.pk, output_id=node.pk, label=label, type=link_type.value)
+                for node in nodes
+                for label, (src, link_type) in node._inputlinks_cache.items()
+            ]
+            DbLink.objects.bulk_create(links, batch_size=cls._store_many_batch_size)
+
+        # This is one of the few cases where it is ok to do a 'global'
+        # except, also because I am re-raising the exception
+        except:
+            for node in moved:
+                node._move_back_to_sandbox()
+            for node in nodes:
+                node._dbnode.pk = None
+            raise
+
+        for node in nodes:
+            # The rows were inserted by `bulk_create`, so the models have to be marked as saved explicitly
+            node._dbnode._state.adding = False
+            node._dbnode._state.db = connection.alias
+            del node._attrs_cache
+            node._temp_folder = None
+            node._to_be_stored = False
+            # The stored sources of the links may have prefetched outputs that do not include the node
+            for src, _ in node._inputlinks_cache.values():
+                src._prefetched_links = None
+            node._inputlinks_cache.clear()
+
+    @classmethod
+    def _db_unstore_many(cls, nodes):
+        for node in nodes:
+            node._dbnode.pk = None
+            node._dbnode._state.adding = True
+
     def get_user(self):
         return self._backend.users.from_dbmodel(self._dbnode.user)
 
@@ -619,7 +669,6 @@ class Node(AbstractNode):
         from django.db import transaction
         from aiida.common.utils import EmptyContextManager
         from aiida.common.exceptions import ValidationError
-        from aiida.backends.djsite.db.models import DbAttribute
         import aiida.orm.autogroup
 
         if with_transaction:
@@ -641,13 +690,10 @@ class Node(AbstractNode):
         # problems, especially with SQLite
         try:
             with context_man:
-                # Save the row
+                # Save the row, together with its attributes, without
+                # incrementing the version for each add.
+                self._dbnode.attributes = self._attrs_cache
                 self._dbnode.save()
-                # Save its attributes 'manually' without incrementing
-                # the version for each add.
-                DbAttribute.reset_values_for_node(self._dbnode,
-                                                  attributes=self._attrs_cache,
-                                                  with_transaction=False)
                 # This should not be used anymore: I delete it to
                 # possibly free memory
                 del self._attrs_cache
@@ -668,8 +714,7 @@ class Node(AbstractNode):
                 self._repository_folder.abspath, move=True, overwrite=True)
             raise
 
-        from aiida.backends.djsite.db.models import DbExtra
         # I store the hash without cleaning and without incrementing the nodeversion number
-        DbExtra.set_value_for_node(self._dbnode, _HASH_EXTRA_KEY, self.get_hash())
+        self._dbnode.set_extra(_HASH_EXTRA_KEY, self.get_hash(), increment_version=False)
 
         return self
@@ -590,9 +590,17 @@ def kill_all():
         Workflow.get_subclass_from_uuid(w.uuid).kill()
 
 
-def get_all_running_steps():
+def get_all_running_steps(pks=None):
+    """
+    Return the running steps of all workflows.
+
+    :param pks: optionally, only return the running steps with these pks
+    """
     from aiida.backends.djsite.db.models import DbWorkflowStep
-    return DbWorkflowStep.objects.filter(state=wf_states.RUNNING)
+    steps = DbWorkflowStep.objects.filter(state=wf_states.RUNNING)
+    if pks is not None:
+        steps = steps.filter(pk__in=pks).order_by('pk')
+    return steps
 
 
 def get_workflow_info(w, tab_size=2, short=False, pre_string="",
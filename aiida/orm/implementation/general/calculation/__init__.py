@@ -14,6 +14,7 @@ from __future__ import absolute_import
 import collections
 import enum
 import logging
+import warnings
 
 import six
 from plumpy import ProcessState
@@ -425,22 +426,36 @@ class AbstractCalculation(Sealable):
         """
         Return the checkpoint bundle set for the Calculation
 
+        :note: deprecated, this only returns the checkpoints stored as YAML in the attributes by previous versions.
+            The checkpoints of processes are now stored by the :py:class:`aiida.work.persistence.AiiDAPersister` in
+            their own table, use its `load_checkpoint` method instead.
+
         :returns: checkpoint bundle if it exists, None otherwise
         """
+        warnings.warn('the checkpoint attribute is deprecated, use the load_checkpoint method of the AiiDAPersister',
+                      DeprecationWarning)
         return self.get_attr(self.CHECKPOINT_KEY, None)
 
     def set_checkpoint(self, checkpoint):
         """
         Set the checkpoint bundle set for the Calculation
 
+        :note: deprecated, use the `save_checkpoint` method of the :py:class:`aiida.work.persistence.AiiDAPersister`
+
         :param state: string representation of the stepper state info
         """
+        warnings.warn('the checkpoint attribute is deprecated, use the save_checkpoint method of the AiiDAPersister',
+                      DeprecationWarning)
         return self._set_attr(self.CHECKPOINT_KEY, checkpoint)
 
     def del_checkpoint(self):
         """
         Delete the checkpoint bundle set for the Calculation
+
+        :note: deprecated, use the `delete_checkpoint` method of the :py:class:`aiida.work.persistence.AiiDAPersister`
         """
+        warnings.warn('the checkpoint attribute is deprecated, use the delete_checkpoint method of the AiiDAPersister',
+                      DeprecationWarning)
         try:
             self._del_attr(self.CHECKPOINT_KEY)
         except AttributeError:
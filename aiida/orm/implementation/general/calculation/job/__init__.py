@@ -15,6 +15,7 @@ import copy
 import datetime
 import enum
 import io
+import sys
 import warnings
 
 import six
@@ -1271,6 +1272,9 @@ class AbstractJobCalculation(AbstractCalculation):
         'computer': ('computer', 'name')
     }
 
+    # Number of calculations fetched by each query of `_list_calculations`
+    _list_calculations_page_size = 1000
+
     compound_projection_map = {
         'state': ('calculation', (PROCESS_STATE_KEY, EXIT_STATUS_KEY)),
         'job_state': ('calculation', ('state', SCHEDULER_STATE_KEY))
@@ -1315,8 +1319,6 @@ class AbstractJobCalculation(AbstractCalculation):
         :return: a string with description of calculations.
         """
 
-        from aiida.orm.querybuilder import QueryBuilder
-        from tabulate import tabulate
         from aiida.orm.backend import construct_backend
 
         projection_label_dict = {
@@ -1395,14 +1397,6 @@ class AbstractJobCalculation(AbstractCalculation):
 
         calc_list_header = [projection_label_dict[p] for p in projections]
 
-        qb = QueryBuilder()
-        qb.append(cls, filters=calculation_filters, tag='calculation')
-        if group_filters is not None:
-            qb.append(type='group', filters=group_filters, group_of='calculation')
-
-        qb.append(type='computer', computer_of='calculation', tag='computer')
-        qb.append(type='user', creator_of="calculation", tag="user")
-
         projections_dict = {'calculation': [], 'user': [], 'computer': []}
 
         # Expand compound projections
@@ -1417,47 +1411,135 @@ class AbstractJobCalculation(AbstractCalculation):
                 for k, v in [cls.projection_map[p]]:
                     projections_dict[k].append(v)
 
-        for k, v in projections_dict.items():
-            qb.add_projection(k, v)
+        pages = cls._iter_calculation_pages(
+            calculation_filters, projections_dict, group_filters=group_filters, order_by=order_by, limit=limit)
 
-        # ORDER
-        if order_by is not None:
-            qb.order_by({'calculation': [order_by]})
+        # Stream the rows page by page, with the column widths fixed by the header and the first page
+        widths = None
+        counter = 0
+        for page in pages:
+            rows = [cls._get_calculation_info_row(res, projections, now if relative_ctime else None) for res in page]
 
-        # LIMIT
-        if limit is not None:
-            qb.limit(limit)
+            if widths is None:
+                widths = [
+                    max([len(header)] + [len(six.text_type(row[i])) for row in rows])
+                    for i, header in enumerate(calc_list_header)
+                ]
+                if not raw:
+                    print('  '.join(header.ljust(width) for header, width in zip(calc_list_header, widths)).rstrip())
+                    print('  '.join('-' * width for width in widths))
 
-        results_generator = qb.iterdict()
+            for row in rows:
+                print(cls._format_calculation_list_row(row, widths))
+            sys.stdout.flush()
 
-        counter = 0
-        while True:
-            calc_list_data = []
-            try:
-                for i in range(100):
-                    res = next(results_generator)
+            counter += len(rows)
 
-                    row = cls._get_calculation_info_row(res, projections, now if relative_ctime else None)
+        if widths is None and not raw:
+            print('  '.join(calc_list_header))
+            print('  '.join('-' * len(header) for header in calc_list_header))
 
-                    # Build the row of information
-                    calc_list_data.append(row)
+        if not raw:
+            print("\nTotal results: {}\n".format(counter))
 
-                    counter += 1
+    @classmethod
+    def _iter_calculation_pages(cls, filters, projections, group_filters=None, order_by=None, limit=None,
+                                page_size=None):
+        """
+        Iterate over the pages of the results of a query for calculations, joined with their computer and user.
 
-                if raw:
-                    print(tabulate(calc_list_data, tablefmt='plain'))
-                else:
-                    print(tabulate(calc_list_data, headers=calc_list_header))
+        The pages are fetched with keyset pagination: the results are ordered by creation time and pk, or by pk only,
+        and every page is a new query that seeks past the last row of the previous one rather than using an offset.
+        Each query can therefore be answered by reading the first rows of an index on (ctime, id) or (user_id, ctime,
+        id), whatever the number of calculations.
+
+        :param filters: the filters on the calculations
+        :param projections: a dictionary with the list of projections for the tags 'calculation', 'computer' and 'user'
+        :param group_filters: if not None, only the calculations in the groups matching these filters are returned
+        :param order_by: 'ctime' or 'id', the key the calculations are sorted on in ascending order, default is 'ctime'
+        :param limit: the maximum number of results, None means no limit
+        :param page_size: the number of results in each page, by default `_list_calculations_page_size`
+        :return: a generator of lists of result dictionaries, as returned by `QueryBuilder.iterdict`
+        :raise ValueError: if `order_by` is neither 'ctime' nor 'id'
+        """
+        from aiida.orm.querybuilder import QueryBuilder
+
+        if order_by is None:
+            order_by = 'ctime'
+
+        if order_by not in ('ctime', 'id'):
+            raise ValueError("invalid order_by '{}', it can only be 'ctime' or 'id'".format(order_by))
 
-            except StopIteration:
-                if raw:
-                    print(tabulate(calc_list_data, tablefmt='plain'))
+        if page_size is None:
+            page_size = cls._list_calculations_page_size
+
+        keys = ['ctime', 'id'] if order_by == 'ctime' else ['id']
+
+        calculation_projections = list(projections.get('calculation', []))
+        calculation_projections.extend(key for key in keys if key not in calculation_projections)
+
+        last_row = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_filters = dict(filters)
+            if last_row is not None:
+                if order_by == 'ctime':
+                    # Equivalent to (ctime, id) > (last ctime, last id), written such that the condition on the
+                    # leading column of the index bounds the range of the index scan
+                    seek_filter = [{'ctime': {'>=': last_row['ctime']}},
+                                   {'or': [{'ctime': {'>': last_row['ctime']}}, {'id': {'>': last_row['id']}}]}]
                 else:
-                    print(tabulate(calc_list_data, headers=calc_list_header))
-                break
+                    seek_filter = [{'id': {'>': last_row['id']}}]
+                page_filters = {'and': [filters] + seek_filter} if filters else {'and': seek_filter}
 
-        if not raw:
-            print("\nTotal results: {}\n".format(counter))
+            qb = QueryBuilder()
+            qb.append(cls, filters=page_filters, tag='calculation')
+            if group_filters is not None:
+                qb.append(type='group', filters=group_filters, group_of='calculation')
+                # A calculation may be in more than one of the groups
+                qb.distinct()
+
+            qb.append(type='computer', computer_of='calculation', tag='computer')
+            qb.append(type='user', creator_of="calculation", tag="user")
+
+            qb.add_projection('calculation', calculation_projections)
+            for tag in ['computer', 'user']:
+                if projections.get(tag):
+                    qb.add_projection(tag, projections[tag])
+
+            qb.order_by({'calculation': keys})
+            qb.limit(page_size if remaining is None else min(page_size, remaining))
+
+            page = list(qb.iterdict())
+            if not page:
+                return
+
+            yield page
+
+            if len(page) < page_size:
+                return
+
+            last_row = page[-1]['calculation']
+            if remaining is not None:
+                remaining -= len(page)
+
+    @staticmethod
+    def _format_calculation_list_row(row, widths):
+        """
+        Format a row of the list of calculations, aligning the numbers to the right and the rest to the left.
+
+        :param row: the list of values of the row
+        :param widths: the widths of the columns, longer values are not truncated
+        :return: the formatted row
+        """
+        columns = []
+        for value, width in zip(row, widths):
+            if isinstance(value, (six.integer_types, float)) and not isinstance(value, bool):
+                columns.append(six.text_type(value).rjust(width))
+            else:
+                columns.append(six.text_type(value).ljust(width))
+
+        return '  '.join(columns).rstrip()
 
     @classmethod
     def _get_calculation_info_row(cls, res, projections, times_since=None):
@@ -44,6 +44,9 @@ class AbstractGroup(object):
     An AiiDA ORM implementation of group of nodes.
     """
 
+    # The number of nodes that the iterator of `nodes` loads with each query
+    _nodes_batch_size = 1000
+
     @abstractmethod
     def __init__(self, **kwargs):
         """
@@ -249,12 +252,16 @@ class AbstractGroup(object):
         """
         Add a node or a set of nodes to the group.
 
+        All nodes are added with a single statement, and nodes that are
+        already in the group are skipped.
+
         :note: The group must be already stored.
 
         :note: each of the nodes passed to add_nodes must be already stored.
 
-        :param nodes: a Node or DbNode object to add to the group, or
-          a list of Nodes or DbNodes to add.
+        :param nodes: a Node or DbNode object or a pk to add to the group, or
+          a list of Nodes, DbNodes or pks to add, or a QueryBuilder whose
+          first projection are the nodes (or their pks) to add.
         """
         pass
 
@@ -264,6 +271,8 @@ class AbstractGroup(object):
         Return a generator/iterator that iterates over all nodes and returns
         the respective AiiDA subclasses of Node, and also allows to ask for
         the number of nodes in the group using len().
+
+        The nodes are loaded in batches, ordered by pk.
         """
         pass
 
@@ -272,12 +281,16 @@ class AbstractGroup(object):
         """
         Remove a node or a set of nodes to the group.
 
+        All nodes are removed with a single statement, and nodes that are
+        not in the group are ignored.
+
         :note: The group must be already stored.
 
         :note: each of the nodes passed to add_nodes must be already stored.
 
-        :param nodes: a Node or DbNode object to add to the group, or
-          a list of Nodes or DbNodes to add.
+        :param nodes: a Node or DbNode object or a pk to remove from the group,
+          or a list of Nodes, DbNodes or pks to remove, or a QueryBuilder whose
+          first projection are the nodes (or their pks) to remove.
         """
         pass
 
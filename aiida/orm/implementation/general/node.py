@@ -145,6 +145,12 @@ class AbstractNode(object):
     # Flag that determines whether the class can be cached.
     _cacheable = True
 
+    # Maximum number of rows inserted by a single statement of `store_many`
+    _store_many_batch_size = 1000
+
+    # The input and output links loaded by `_prefetch_links`, used by `get_inputs` and `get_outputs` if set
+    _prefetched_links = None
+
     def get_desc(self):
         """
         Returns a string with infos retrieved from a node's properties.
@@ -713,7 +719,8 @@ class AbstractNode(object):
         :note: this function should not be called directly; it acts directly on
             the database.
 
-        :note: No checks are done to verify that the link actually exists.
+        :note: No checks are done to verify that the link actually exists. The prefetched links of the current
+            Node are reset, and those of the source node only for its instance in the current identity map.
 
         :param str label: the label of the link from src to the current Node
         :param link_type: The type of link, must be one of the enum values form
@@ -728,7 +735,7 @@ class AbstractNode(object):
         Both nodes must be a Node instance (or a subclass of Node)
 
         :note: this function should not be called directly; it acts directly on
-            the database.
+            the database. It also resets the prefetched links of both nodes.
 
         :param src: the source object
         :param str label: the name of the label to set the link from src.
@@ -816,7 +823,9 @@ class AbstractNode(object):
         if link_type is not None and not isinstance(link_type, LinkType):
             raise TypeError('link_type should be a LinkType object')
 
-        inputs_list = self._get_db_input_links(link_type=link_type)
+        inputs_list = self._get_prefetched_links('inputs', link_type)
+        if inputs_list is None:
+            inputs_list = self._get_db_input_links(link_type=link_type)
 
         if not only_in_db:
             # Needed for the check
@@ -869,7 +878,9 @@ class AbstractNode(object):
         if link_type is not None and not isinstance(link_type, LinkType):
             raise TypeError('link_type should be a LinkType object')
 
-        outputs_list = self._get_db_output_links(link_type=link_type)
+        outputs_list = self._get_prefetched_links('outputs', link_type)
+        if outputs_list is None:
+            outputs_list = self._get_db_output_links(link_type=link_type)
 
         if node_type is None:
             filtered_list = outputs_list
@@ -892,6 +903,72 @@ class AbstractNode(object):
         """
         pass
 
+    def _get_prefetched_links(self, direction, link_type):
+        """
+        Return the links in the given direction that were loaded by `_prefetch_links`.
+
+        :param direction: either 'inputs' or 'outputs'
+        :param link_type: if not None, a link type to filter results
+        :return: a list of tuples (label, aiida_class), or None if the links were not prefetched
+        """
+        if self._prefetched_links is None:
+            return None
+
+        return [(label, node) for label, node, type_ in self._prefetched_links[direction]
+                if link_type is None or type_ == link_type.value]
+
+    @classmethod
+    def _prefetch_links(cls, nodes):
+        """
+        Load the input and output links of the given nodes, together with the nodes at their other end, with two
+        queries, such that `get_inputs` and `get_outputs` of the nodes do not query the database.
+
+        The prefetched links of a node are discarded when a link to or from it is added, replaced or removed through
+        that instance. When an input link is removed, the prefetched links of the source are only discarded for the
+        instance of the source in the current identity map, see :func:`aiida.orm.utils.identity_map.identity_map`,
+        since the other instances of the source are not known to the target node.
+
+        :param nodes: an iterable of nodes, those that are not stored are ignored
+        """
+        from aiida.orm.querybuilder import QueryBuilder
+        from aiida.orm import Node
+
+        nodes = {node.pk: node for node in nodes if node.is_stored}
+        if not nodes:
+            return
+
+        links = {pk: {'inputs': [], 'outputs': []} for pk in nodes}
+
+        for direction, relationship in [('inputs', 'input_of'), ('outputs', 'output_of')]:
+            builder = QueryBuilder()
+            builder.append(Node, filters={'id': {'in': list(nodes)}}, project=['id'], tag='node')
+            builder.append(Node, project=['*'], edge_project=['label', 'type'], edge_tag='link', tag='other',
+                           **{relationship: 'node'})
+            for result in builder.iterdict():
+                link = result['link']
+                links[result['node']['id']][direction].append((link['label'], result['other']['*'], link['type']))
+
+        for pk, node in nodes.items():
+            node._prefetched_links = links[pk]
+
+    @staticmethod
+    def _discard_prefetched_links(pks):
+        """
+        Discard the prefetched links of the instances of the nodes with the given pks in the current identity map.
+
+        :param pks: an iterable of node pks
+        """
+        from aiida.orm.utils.identity_map import get_identity_map
+
+        mapping = get_identity_map()
+        if mapping is None:
+            return
+
+        for pk in pks:
+            node = mapping.get(pk)
+            if node is not None:
+                node._prefetched_links = None
+
     @abstractmethod
     def get_computer(self):
         """
@@ -1143,6 +1220,31 @@ class AbstractNode(object):
         except AttributeError:
             raise AttributeError("set_extras takes a dictionary as argument")
 
+    @classmethod
+    def set_extras_many(cls, nodes, key, values):
+        """
+        Immediately sets the same extra on many nodes, in the DB, with a
+        single batch of partial updates of their extras, rather than one
+        transaction per node.
+        Can be used *only* after saving.
+
+        :param nodes: a list of stored nodes
+        :param key: key name, must be a level-zero key
+        :param values: a list with the value of the extra for each node
+        :raise ModificationNotAllowed: if any of the nodes is not stored
+        """
+        from aiida.backends.utils import set_extras_many
+
+        validate_attribute_key(key)
+
+        nodes = list(nodes)
+        if any(node._to_be_stored for node in nodes):
+            raise ModificationNotAllowed(
+                "The extras of a node can be set only after "
+                "storing the node")
+
+        set_extras_many([node.pk for node in nodes], key, values)
+
     def reset_extras(self, new_extras):
         """
         Deletes existing extras and creates new ones.
@@ -1761,6 +1863,170 @@ class AbstractNode(object):
         """
         pass
 
+    @classmethod
+    def store_many(cls, nodes, with_transaction=True):
+        """
+        Store many nodes at once, together with the input links in their cache.
+
+        The unstored nodes are inserted with batched statements, together with their attributes, hash and cached input
+        links, and their repository folders are moved in one pass, all within a single transaction. The nodes that
+        need more than this, because their class overrides `store` or has caching enabled, are stored one by one
+        within the same transaction, once the nodes they depend on are stored. Nodes that are already stored are
+        skipped.
+
+        :param nodes: an iterable of nodes; the unstored sources of their cached input links must be among them
+        :param with_transaction: if False, no transaction is used. This
+          is meant to be used ONLY if the outer calling function has already
+          a transaction open!
+        :return: the list of the nodes
+        :raise ModificationNotAllowed: if the source of a cached input link is neither stored nor among the nodes
+        :raise ValueError: if the cached input links between the nodes form a cycle
+        """
+        from aiida.orm.autogroup import current_autogroup, Autogroup, VERDIAUTOGROUP_TYPE
+        from aiida.orm import Group
+
+        nodes = list(nodes)
+        stored_in_bulk = []
+        stored = []
+        caches = {}
+
+        with cls._store_many_transaction(with_transaction):
+            try:
+                for level in cls._get_store_many_levels(nodes):
+                    # The caches are consumed by the storing, so they are kept to restore them on failure
+                    caches.update(
+                        {id(node): (dict(node._attrs_cache), dict(node._inputlinks_cache)) for node in level})
+
+                    bulk = [node for node in level if node._can_store_in_bulk()]
+                    if bulk:
+                        for node in bulk:
+                            node._validate()
+                        # The hash is computed from the content of the sandbox folder, which is moved to the repository
+                        cls._db_store_many(bulk, [node.get_hash() for node in bulk])
+                        stored_in_bulk.extend(bulk)
+                        stored.extend(bulk)
+
+                    for node in level:
+                        if not node.is_stored:
+                            node.store(with_transaction=False)
+                            stored.append(node)
+
+            # The transaction is rolled back, so the nodes stored by the previous levels, in bulk or one by one, are
+            # unstored again
+            except:
+                cls._db_unstore_many(stored)
+                for node in stored:
+                    node._to_be_stored = True
+                    node._move_back_to_sandbox()
+                    node._attrs_cache, node._inputlinks_cache = caches[id(node)]
+                raise
+
+        # Set up autogrouping used by verdi run, the nodes stored one by one have been added already by `store`
+        if current_autogroup is not None:
+            if not isinstance(current_autogroup, Autogroup):
+                raise ValidationError("current_autogroup is not an AiiDA Autogroup")
+
+            to_be_grouped = [node for node in stored_in_bulk if current_autogroup.is_to_be_grouped(node)]
+            group_name = current_autogroup.get_group_name()
+            if to_be_grouped and group_name is not None:
+                group = Group.get_or_create(name=group_name, type_string=VERDIAUTOGROUP_TYPE)[0]
+                group.add_nodes(to_be_grouped)
+
+        return nodes
+
+    @staticmethod
+    def _get_store_many_levels(nodes):
+        """
+        Return the unstored nodes among the given ones, grouped in levels such that the unstored sources of the cached
+        input links of the nodes of a level are in the previous levels.
+
+        :param nodes: a list of nodes
+        :return: a list of lists of nodes
+        :raise ModificationNotAllowed: if the source of a cached input link is neither stored nor among the nodes
+        :raise ValueError: if the cached input links between the nodes form a cycle
+        """
+        unstored = collections.OrderedDict()
+        for node in nodes:
+            if not node.is_stored:
+                unstored[id(node)] = node
+
+        parents = collections.OrderedDict()
+        for key, node in unstored.items():
+            parents[key] = set()
+            for label, (src, _) in node._inputlinks_cache.items():
+                if src.is_stored:
+                    continue
+                if id(src) not in unstored:
+                    raise ModificationNotAllowed(
+                        "Cannot store the input link '{}' because the source node is neither stored nor among the "
+                        "nodes to store".format(label))
+                parents[key].add(id(src))
+
+        levels = []
+        placed = set()
+        while parents:
+            level = [key for key, keys in parents.items() if keys <= placed]
+            if not level:
+                raise ValueError("The cached input links of the nodes to store form a loop")
+            for key in level:
+                del parents[key]
+            placed.update(level)
+            levels.append([unstored[key] for key in level])
+
+        return levels
+
+    def _can_store_in_bulk(self):
+        """
+        Return whether the node can be stored by `store_many` with the batched insertion, which is the case unless
+        its class overrides `store` or has caching enabled.
+        """
+        store = getattr(type(self).store, '__func__', type(self).store)
+        base_store = getattr(AbstractNode.store, '__func__', AbstractNode.store)
+        return store is base_store and not get_use_cache(type(self))
+
+    def _move_to_repository(self):
+        """Move the sandbox folder of the unstored node to its repository folder."""
+        self._repository_folder.replace_with_folder(self._get_temp_folder().abspath, move=True, overwrite=True)
+
+    def _move_back_to_sandbox(self):
+        """Move the repository folder of the node back to its sandbox folder, when its storing failed."""
+        self._get_temp_folder().replace_with_folder(self._repository_folder.abspath, move=True, overwrite=True)
+
+    @abstractclassmethod
+    def _store_many_transaction(cls, with_transaction=True):
+        """
+        Return a context manager for the transaction of `store_many`, which is committed on exit.
+
+        :parameter with_transaction: if False, no transaction is used. This
+          is meant to be used ONLY if the outer calling function has already
+          a transaction open!
+        """
+        pass
+
+    @abstractclassmethod
+    def _db_store_many(cls, nodes, hashes):
+        """
+        Insert the given unstored nodes with batched statements, with their attributes, hash and cached input links,
+        after moving their sandbox folders to the repository.
+
+        :note: the unstored sources of the cached input links must be among the nodes; this function does not use a
+          transaction, always call it from within one!
+
+        :param nodes: a list of unstored nodes
+        :param hashes: a list with the hash of each node
+        """
+        pass
+
+    @abstractclassmethod
+    def _db_unstore_many(cls, nodes):
+        """
+        Reset the models of the given nodes, stored by `_db_store_many` or `store` within a transaction that is rolled
+        back, to those of unstored nodes.
+
+        :param nodes: a list of nodes stored within the transaction
+        """
+        pass
+
     def __del__(self):
         """
         Called only upon real object destruction from memory
@@ -1847,10 +2113,10 @@ class AbstractNode(object):
         if not hash_:
             return iter(())
 
-        from aiida.orm.querybuilder import QueryBuilder
-        qb = QueryBuilder()
-        qb.append(self.__class__, filters={'extras._aiida_hash': hash_}, project='*', subclassing=False)
-        same_nodes = (n[0] for n in qb.iterall())
+        from aiida.backends.utils import get_node_pks_by_hash
+        from aiida.orm.utils import load_node
+        matches = get_node_pks_by_hash([hash_], node_types=[self._plugin_type_string])
+        same_nodes = (load_node(pk) for pk, _, _ in matches)
         return (n for n in same_nodes if n._is_valid_cache())
 
     def _is_valid_cache(self):
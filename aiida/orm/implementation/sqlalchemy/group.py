@@ -154,68 +154,42 @@ class Group(AbstractGroup):
         return self
 
     def add_nodes(self, nodes):
-        from sqlalchemy.exc import IntegrityError
+        from aiida.backends.utils import add_nodes_to_group
+        from aiida.orm.querybuilder import QueryBuilder
 
         if not self.is_stored:
             raise ModificationNotAllowed("Cannot add nodes to a group before "
                                          "storing")
-        from aiida.orm.implementation.sqlalchemy.node import Node
-        from aiida.backends.sqlalchemy import get_scoped_session
 
-        # First convert to a list
-        if isinstance(nodes, (Node, DbNode)):
-            nodes = [nodes]
-
-        if isinstance(nodes, six.string_types) or not isinstance(
-                nodes, collections.Iterable):
-            raise TypeError("Invalid type passed as the 'nodes' parameter to "
-                            "add_nodes, can only be a Node, DbNode, or a list "
-                            "of such objects, it is instead {}".format(
-                str(type(nodes))))
-
-        with utils.disable_expire_on_commit(get_scoped_session()) as session:
-            # Get dbnodes here ONCE, otherwise each call to _dbgroup.dbnodes will
-            # re-read the current value in the database
-            dbnodes = self._dbgroup.dbnodes
-            for node in nodes:
-                if not isinstance(node, (Node, DbNode)):
-                    raise TypeError("Invalid type of one of the elements passed "
-                                    "to add_nodes, it should be either a Node or "
-                                    "a DbNode, it is instead {}".format(
-                        str(type(node))))
-
-                if node.id is None:
-                    raise ValueError("At least one of the provided nodes is "
-                                     "unstored, stopping...")
-                if isinstance(node, Node):
-                    to_add = node.dbnode
-                else:
-                    to_add = node
-
-                # Use pattern as suggested here:
-                # http://docs.sqlalchemy.org/en/latest/orm/session_transaction.html#using-savepoint
-                try:
-                    with session.begin_nested():
-                        dbnodes.append(to_add)
-                        session.flush()
-                except IntegrityError:
-                    # Duplicate entry, skip
-                    pass
-
-            # Commit everything as up till now we've just flushed
-            session.commit()
+        if isinstance(nodes, QueryBuilder):
+            add_nodes_to_group(self.pk, querybuilder=nodes)
+        else:
+            add_nodes_to_group(self.pk, node_pks=self._get_node_pks(nodes, 'add_nodes'))
 
     @property
     def nodes(self):
         class iterator(object):
-            def __init__(self, dbnodes):
+            def __init__(self, dbnodes, batch_size):
                 self._dbnodes = dbnodes
-                self._iter = dbnodes.__iter__()
+                self._batch_size = batch_size
                 self.generator = self._genfunction()
 
             def _genfunction(self):
-                for n in self._iter:
-                    yield n.get_aiida_class()
+                # Load the nodes in batches of consecutive ids, rather
+                # than either all at once or with one query per node
+                last_id = None
+                while True:
+                    batch = self._dbnodes.order_by(DbNode.id)
+                    if last_id is not None:
+                        batch = batch.filter(DbNode.id > last_id)
+                    batch = batch.limit(self._batch_size).all()
+
+                    for n in batch:
+                        yield n.get_aiida_class()
+
+                    if len(batch) < self._batch_size:
+                        return
+                    last_id = batch[-1].id
 
             def __iter__(self):
                 return self
@@ -230,48 +204,58 @@ class Group(AbstractGroup):
             def next(self):
                 return next(self.generator)
 
-        return iterator(self._dbgroup.dbnodes)
+        return iterator(self._dbgroup.dbnodes, self._nodes_batch_size)
 
     def remove_nodes(self, nodes):
+        from aiida.backends.utils import remove_nodes_from_group
+        from aiida.orm.querybuilder import QueryBuilder
+
         if not self.is_stored:
             raise ModificationNotAllowed("Cannot remove nodes from a group "
                                          "before storing")
 
+        if isinstance(nodes, QueryBuilder):
+            remove_nodes_from_group(self.pk, querybuilder=nodes)
+        else:
+            remove_nodes_from_group(self.pk, node_pks=self._get_node_pks(nodes, 'remove_nodes'))
+
+    @staticmethod
+    def _get_node_pks(nodes, method_name):
+        """
+        Return the pks of the given nodes, that can be Nodes, DbNodes or pks.
+
+        :param nodes: a Node, DbNode or pk, or a list of such objects
+        :param method_name: the name of the calling method, for the error messages
+        """
         from aiida.orm.implementation.sqlalchemy.node import Node
+
         # First convert to a list
-        if isinstance(nodes, (Node, DbNode)):
+        if isinstance(nodes, (Node, DbNode) + six.integer_types):
             nodes = [nodes]
 
         if isinstance(nodes, six.string_types) or not isinstance(
                 nodes, collections.Iterable):
             raise TypeError("Invalid type passed as the 'nodes' parameter to "
-                            "remove_nodes, can only be a Node, DbNode, or a "
-                            "list of such objects, it is instead {}".format(str(type(nodes))))
+                            "{}, can only be a Node, DbNode, pk, QueryBuilder or "
+                            "a list of such objects, it is instead {}".format(
+                method_name, str(type(nodes))))
 
-        list_nodes = []
-        # Have to save dbndoes here ONCE, otherwise it will be reloaded from
-        # the database each time we access it through _dbgroup.dbnodes
-        dbnodes = self._dbgroup.dbnodes
+        list_pk = []
         for node in nodes:
+            if isinstance(node, six.integer_types):
+                list_pk.append(node)
+                continue
             if not isinstance(node, (Node, DbNode)):
                 raise TypeError("Invalid type of one of the elements passed "
-                                "to add_nodes, it should be either a Node or "
-                                "a DbNode, it is instead {}".format(
-                    str(type(node))))
+                                "to {}, it should be either a Node, a DbNode "
+                                "or a pk, it is instead {}".format(
+                    method_name, str(type(node))))
             if node.id is None:
                 raise ValueError("At least one of the provided nodes is "
                                  "unstored, stopping...")
-            if isinstance(node, Node):
-                node = node.dbnode
-            # If we don't check first, SqlA might issue a DELETE statement for
-            # an unexisting key, resulting in an error
-            if node in dbnodes:
-                list_nodes.append(node)
-
-        for node in list_nodes:
-            dbnodes.remove(node)
+            list_pk.append(node.id)
 
-        sa.get_scoped_session().commit()
+        return list_pk
 
     @classmethod
     def query(cls, name=None, type_string="", pk=None, uuid=None, nodes=None,
@@ -14,9 +14,12 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import contextlib
+
 import six
 
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
 
 from aiida.backends.sqlalchemy.models.node import DbNode, DbLink
 from aiida.backends.sqlalchemy.models.comment import DbComment
@@ -244,9 +247,11 @@ class Node(AbstractNode):
     def _remove_dblink_from(self, label):
         from aiida.backends.sqlalchemy import get_scoped_session
         session = get_scoped_session()
-        link = DbLink.query.filter_by(label=label).first()
+        link = DbLink.query.filter_by(output_id=self.pk, label=label).first()
+        self._prefetched_links = None
         if link is not None:
             session.delete(link)
+            self._discard_prefetched_links([link.input_id])
 
     def _add_dblink_from(self, src, label=None, link_type=LinkType.UNSPECIFIED):
         from aiida.backends.sqlalchemy import get_scoped_session
@@ -279,6 +284,10 @@ class Node(AbstractNode):
                         }, tag='child', descendant_of='parent').count() > 0:
                 raise ValueError("The link you are attempting to create would generate a loop")
 
+        # The prefetched links of both nodes no longer match the database
+        self._prefetched_links = None
+        src._prefetched_links = None
+
         if label is None:
             autolabel_idx = 1
 
@@ -328,13 +337,16 @@ class Node(AbstractNode):
         link_filter = {'output': self._dbnode}
         if link_type is not None:
             link_filter['type'] = link_type.value
-        return [(i.label, i.input.get_aiida_class()) for i in DbLink.query.filter_by(**link_filter).distinct().all()]
+        # The input nodes are loaded by the same query, rather than by one query per link
+        query = DbLink.query.filter_by(**link_filter).options(joinedload(DbLink.input))
+        return [(i.label, i.input.get_aiida_class()) for i in query.distinct().all()]
 
     def _get_db_output_links(self, link_type):
         link_filter = {'input': self._dbnode}
         if link_type is not None:
             link_filter['type'] = link_type.value
-        return ((i.label, i.output.get_aiida_class()) for i in DbLink.query.filter_by(**link_filter).distinct().all())
+        query = DbLink.query.filter_by(**link_filter).options(joinedload(DbLink.output))
+        return ((i.label, i.output.get_aiida_class()) for i in query.distinct().all())
 
     def _set_db_computer(self, computer):
         self._dbnode.dbcomputer = DbComputer.get_dbcomputer(computer)
@@ -349,24 +361,10 @@ class Node(AbstractNode):
         :param str key: key name
         :param value: its value
         """
-        try:
-            self._dbnode.set_attr(key, value)
-            self._increment_version_number_db()
-        except:
-            from aiida.backends.sqlalchemy import get_scoped_session
-            session = get_scoped_session()
-            session.rollback()
-            raise
+        self._dbnode.set_attr(key, value)
 
     def _del_db_attr(self, key):
-        try:
-            self._dbnode.del_attr(key)
-            self._increment_version_number_db()
-        except:
-            from aiida.backends.sqlalchemy import get_scoped_session
-            session = get_scoped_session()
-            session.rollback()
-            raise
+        self._dbnode.del_attr(key)
 
     def _get_db_attr(self, key):
         try:
@@ -375,27 +373,10 @@ class Node(AbstractNode):
             raise AttributeError("Attribute '{}' does not exist".format(key))
 
     def _set_db_extra(self, key, value, exclusive=False):
-        if exclusive:
-            raise NotImplementedError("exclusive=True not implemented yet in SQLAlchemy backend")
-
-        try:
-            self._dbnode.set_extra(key, value)
-            self._increment_version_number_db()
-        except:
-            from aiida.backends.sqlalchemy import get_scoped_session
-            session = get_scoped_session()
-            session.rollback()
-            raise
+        self._dbnode.set_extra(key, value, exclusive=exclusive)
 
     def _reset_db_extras(self, new_extras):
-        try:
-            self._dbnode.reset_extras(new_extras)
-            self._increment_version_number_db()
-        except:
-            from aiida.backends.sqlalchemy import get_scoped_session
-            session = get_scoped_session()
-            session.rollback()
-            raise
+        self._dbnode.reset_extras(new_extras)
 
     def _get_db_extra(self, key):
         try:
@@ -404,14 +385,7 @@ class Node(AbstractNode):
             raise AttributeError("DbExtra {} does not exist".format(key))
 
     def _del_db_extra(self, key):
-        try:
-            self._dbnode.del_extra(key)
-            self._increment_version_number_db()
-        except:
-            from aiida.backends.sqlalchemy import get_scoped_session
-            session = get_scoped_session()
-            session.rollback()
-            raise
+        self._dbnode.del_extra(key)
 
     def _db_iterextras(self):
         extras = self._extras()
@@ -591,6 +565,103 @@ class Node(AbstractNode):
 
         return self
 
+    @classmethod
+    @contextlib.contextmanager
+    def _store_many_transaction(cls, with_transaction=True):
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+
+        try:
+            yield
+            if with_transaction:
+                session.commit()
+        except Exception:
+            if with_transaction:
+                session.rollback()
+            raise
+
+    @classmethod
+    def _db_store_many(cls, nodes, hashes):
+        from sqlalchemy.orm import make_transient_to_detached
+        from sqlalchemy.sql import text
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+
+        # Reserve the pks of the nodes with a single query, such that the links can be inserted in bulk as well
+        statement = text("SELECT nextval(pg_get_serial_sequence('db_dbnode', 'id')) FROM generate_series(1, :number)")
+        pks = [row[0] for row in session.execute(statement, {'number': len(nodes)})]
+
+        # As in `_db_store`, the files are moved before the rows are inserted
+        moved = []
+        try:
+            for node in nodes:
+                node._move_to_repository()
+                moved.append(node)
+
+            rows = []
+            for node, pk, hash_ in zip(nodes, pks, hashes):
+                dbnode = node._dbnode
+                dbnode.id = pk
+                dbnode.attributes = node._attrs_cache
+                dbnode.extras = dict(dbnode.extras or {})
+                dbnode.extras[_HASH_EXTRA_KEY] = hash_
+                dbnode.user_id = dbnode.user.id
+                if dbnode.dbcomputer is not None:
+                    dbnode.dbcomputer_id = dbnode.dbcomputer.id
+
+                # The defaults of the columns are only applied by the ORM, so they are set here for the core insert
+                for column in DbNode.__table__.columns:
+                    if getattr(dbnode, column.key) is None and column.default is not None:
+                        default = column.default
+                        setattr(dbnode, column.key, default.arg(None) if default.is_callable else default.arg)
+
+                rows.append({column.key: getattr(dbnode, column.key) for column in DbNode.__table__.columns})
+
+            links = [{
+                'input_id': src.pk,
+                'output_id': node.pk,
+                'label': label,
+                'type': link_type.value
+            } for node in nodes for label, (src, link_type) in node._inputlinks_cache.items()]
+
+            for table, values in [(DbNode.__table__, rows), (DbLink.__table__, links)]:
+                for start in range(0, len(values), cls._store_many_batch_size):
+                    session.execute(table.insert().values(values[start:start + cls._store_many_batch_size]))
+
+        # This is one of the few cases where it is ok to do a 'global'
+        # except, also because I am re-raising the exception
+        except:
+            for node in moved:
+                node._move_back_to_sandbox()
+            for node in nodes:
+                node._dbnode.id = None
+            raise
+
+        for node in nodes:
+            # The rows were inserted without the ORM, so the models are attached to the session as already persisted
+            make_transient_to_detached(node._dbnode)
+            session.add(node._dbnode)
+            del node._attrs_cache
+            node._temp_folder = None
+            node._to_be_stored = False
+            # The stored sources of the links may have prefetched outputs that do not include the node
+            for src, _ in node._inputlinks_cache.values():
+                src._prefetched_links = None
+            node._inputlinks_cache.clear()
+
+    @classmethod
+    def _db_unstore_many(cls, nodes):
+        from sqlalchemy.orm import make_transient
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+
+        # The models are detached before the rollback, which would otherwise expire them
+        for node in nodes:
+            if node._dbnode in session:
+                session.expunge(node._dbnode)
+            make_transient(node._dbnode)
+            node._dbnode.id = None
+
     def _store_cached_input_links(self, with_transaction=True):
         """
         Store all input links that are in the local cache, transferring them
@@ -707,7 +778,8 @@ class Node(AbstractNode):
             self._get_temp_folder().replace_with_folder(self._repository_folder.abspath, move=True, overwrite=True)
             raise
 
-        self._dbnode.set_extra(_HASH_EXTRA_KEY, self.get_hash())
+        # I store the hash without incrementing the nodeversion number
+        self._dbnode.set_extra(_HASH_EXTRA_KEY, self.get_hash(), increment_version=False)
         return self
 
     @property
@@ -750,10 +750,18 @@ def kill_all():
         Workflow.get_subclass_from_uuid(w.uuid).kill()
 
 
-def get_all_running_steps():
+def get_all_running_steps(pks=None):
+    """
+    Return the running steps of all workflows.
+
+    :param pks: optionally, only return the running steps with these pks
+    """
     from aiida.common.datastructures import wf_states
     from aiida.backends.sqlalchemy.models.workflow import DbWorkflowStep
-    return DbWorkflowStep.query.filter_by(state=wf_states.RUNNING).all()
+    steps = DbWorkflowStep.query.filter_by(state=wf_states.RUNNING)
+    if pks is not None:
+        steps = steps.filter(DbWorkflowStep.id.in_(pks)).order_by(DbWorkflowStep.id)
+    return steps.all()
 
 
 def get_workflow_info(w, tab_size=2, short=False, pre_string="",
@@ -311,6 +311,55 @@ def deserialize_field(k, v, fields_info, import_unique_ids_mappings,
             return ("{}_id".format(k), None)
 
 
+IMPORT_BATCH_SIZE = 1000
+IMPORT_REPOSITORY_THREADS = 4
+
+
+def _import_repository_folders(folder, uuids, nodes_export_subfolder='nodes', threads=IMPORT_REPOSITORY_THREADS):
+    """
+    Move the repository folders of the given nodes from the extracted archive to the repository.
+
+    All folders are checked to be present before any of them is moved; the folders are then moved by a pool of
+    threads, since the time is spent waiting on the file system rather than in the interpreter.
+
+    :param folder: the folder in which the archive was extracted
+    :param uuids: the UUIDs of the nodes whose folders to move
+    :param nodes_export_subfolder: the subfolder of `folder` containing the node folders
+    :param threads: the number of folders moved concurrently
+    :raises ValueError: if the folder of one of the nodes is missing from the archive
+    """
+    import os
+    from multiprocessing.pool import ThreadPool
+
+    from aiida.common.folders import RepositoryFolder
+
+    subfolders = []
+    for uuid in uuids:
+        subfolder = folder.get_subfolder(os.path.join(nodes_export_subfolder, export_shard_uuid(uuid)))
+        if not subfolder.exists():
+            raise ValueError("Unable to find the repository folder for node with UUID={} in the exported "
+                             "file".format(uuid))
+        subfolders.append((uuid, subfolder.abspath))
+
+    def move_folder(args):
+        uuid, srcdir = args
+        # Replace the folder, possibly destroying existing previous folders, and move the files (faster if we
+        # are on the same filesystem, and in any case the source is a SandboxFolder)
+        RepositoryFolder(section=Node._section_name, uuid=uuid).replace_with_folder(srcdir, move=True,
+                                                                                    overwrite=True)
+
+    if threads > 1 and len(subfolders) > 1:
+        pool = ThreadPool(min(threads, len(subfolders)))
+        try:
+            pool.map(move_folder, subfolders)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for args in subfolders:
+            move_folder(args)
+
+
 def import_data(in_path, ignore_unknown_nodes=False,
                 silent=False):
     from aiida.backends.settings import BACKEND
@@ -345,12 +394,13 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
     from django.db import transaction
     from aiida.utils import timezone
 
-    from aiida.orm import Node, Group
+    from aiida.orm import Group
     from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif
     from aiida.common.links import LinkType
     from aiida.common.exceptions import UniquenessError
-    from aiida.common.folders import SandboxFolder, RepositoryFolder
+    from aiida.common.folders import SandboxFolder
     from aiida.backends.djsite.db import models
+    from aiida.backends.utils import increment_group_membership_version
     from aiida.common.utils import get_class_string, get_object_from_string
     from aiida.common.datastructures import calc_states
     import aiida.utils.json as json
@@ -419,16 +469,12 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                                                for l in data['links_uuid']))
         group_nodes = set(chain.from_iterable(six.itervalues(data['groups_uuid'])))
 
-        # I preload the nodes, I need to check each of them later, and I also
-        # store them in a reverse table
+        # I preload the UUIDs of the linked nodes that are already in the database
         # I break up the query due to SQLite limitations..
-        relevant_db_nodes = {}
+        db_nodes_uuid = set()
         for group in grouper(999, linked_nodes):
-            relevant_db_nodes.update({n.uuid: n for n in
-                                      models.DbNode.objects.filter(
-                                          uuid__in=group)})
+            db_nodes_uuid.update(models.DbNode.objects.filter(uuid__in=group).values_list('uuid', flat=True))
 
-        db_nodes_uuid = set(relevant_db_nodes.keys())
         # ~ dbnode_model = get_class_string(models.DbNode)
         # ~ print(dbnode_model)
         if NODE_ENTITY_NAME in data['export_data']:
@@ -522,13 +568,12 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                         import_unique_ids = set(v[unique_identifier] for v in
                                                 data['export_data'][model_name].values())
 
-                        relevant_db_entries = {getattr(n, unique_identifier): n
-                                               for n in Model.objects.filter(
-                            **{'{}__in'.format(unique_identifier):
-                                   import_unique_ids})}
+                        relevant_db_entries = {}
+                        for group in grouper(IMPORT_BATCH_SIZE, import_unique_ids):
+                            relevant_db_entries.update(Model.objects.filter(
+                                **{'{}__in'.format(unique_identifier): group}).values_list(unique_identifier, 'pk'))
 
-                        foreign_ids_reverse_mappings[model_name] = {
-                            k: v.pk for k, v in relevant_db_entries.items()}
+                        foreign_ids_reverse_mappings[model_name] = relevant_db_entries.copy()
                         for k, v in data['export_data'][model_name].items():
                             if v[unique_identifier] in relevant_db_entries.keys():
                                 # Already in DB
@@ -613,33 +658,39 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                 # are nodes). Note: only for new entries!
                 if model_name == NODE_ENTITY_NAME:
                     if not silent:
-                        print("STORING NEW NODE FILES...")
+                        print("STORING NEW NODE FILES & ATTRIBUTES...")
+                    _import_repository_folders(folder, [o.uuid for o in objects_to_create],
+                                               nodes_export_subfolder=nodes_export_subfolder)
+
+                    # For DbNodes, we also have to store Attributes, which are
+                    # inserted together with the nodes
                     for o in objects_to_create:
+                        unique_id = o.uuid
+                        import_entry_id = import_entry_ids[unique_id]
+                        # Get attributes from import file
+                        try:
+                            attributes = data['node_attributes'][
+                                str(import_entry_id)]
+                            attributes_conversion = data[
+                                'node_attributes_conversion'][
+                                str(import_entry_id)]
+                        except KeyError:
+                            raise ValueError("Unable to find attribute info "
+                                             "for DbNode with UUID = {}".format(
+                                unique_id))
 
-                        subfolder = folder.get_subfolder(os.path.join(
-                            nodes_export_subfolder, export_shard_uuid(o.uuid)))
-                        if not subfolder.exists():
-                            raise ValueError("Unable to find the repository "
-                                             "folder for node with UUID={} " \
-                                             "in the exported "
-                                             "file".format(o.uuid))
-                        destdir = RepositoryFolder(
-                            section=Node._section_name,
-                            uuid=o.uuid)
-                        # Replace the folder, possibly destroying existing
-                        # previous folders, and move the files (faster if we
-                        # are on the same filesystem, and
-                        # in any case the source is a SandboxFolder)
-                        destdir.replace_with_folder(subfolder.abspath,
-                                                    move=True, overwrite=True)
+                        # Here I have to deserialize the attributes
+                        o.attributes = deserialize_attributes(
+                            attributes, attributes_conversion) or dict()
 
                 # Store them all in once; however, the PK are not set in this way...
-                Model.objects.bulk_create(objects_to_create)
+                Model.objects.bulk_create(objects_to_create, batch_size=IMPORT_BATCH_SIZE)
 
                 # Get back the just-saved entries
-                just_saved = dict(Model.objects.filter(
-                    **{"{}__in".format(unique_identifier):
-                           import_entry_ids.keys()}).values_list(unique_identifier, 'pk'))
+                just_saved = {}
+                for group in grouper(IMPORT_BATCH_SIZE, import_entry_ids.keys()):
+                    just_saved.update(Model.objects.filter(
+                        **{"{}__in".format(unique_identifier): group}).values_list(unique_identifier, 'pk'))
 
                 imported_states = []
                 if model_name == NODE_ENTITY_NAME:
@@ -651,7 +702,7 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                         imported_states.append(
                             models.DbCalcState(dbnode_id=new_pk,
                                                state=calc_states.IMPORTED))
-                    models.DbCalcState.objects.bulk_create(imported_states)
+                    models.DbCalcState.objects.bulk_create(imported_states, batch_size=IMPORT_BATCH_SIZE)
 
                 # Now I have the PKs, print the info
                 # Moreover, set the foreing_ids_reverse_mappings
@@ -668,32 +719,6 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                                                        import_entry_id,
                                                        new_pk))
 
-                # For DbNodes, we also have to store Attributes!
-                if model_name == NODE_ENTITY_NAME:
-                    if not silent:
-                        print("STORING NEW NODE ATTRIBUTES...")
-                    for unique_id, new_pk in just_saved.items():
-                        import_entry_id = import_entry_ids[unique_id]
-                        # Get attributes from import file
-                        try:
-                            attributes = data['node_attributes'][
-                                str(import_entry_id)]
-                            attributes_conversion = data[
-                                'node_attributes_conversion'][
-                                str(import_entry_id)]
-                        except KeyError:
-                            raise ValueError("Unable to find attribute info "
-                                             "for DbNode with UUID = {}".format(
-                                unique_id))
-
-                        # Here I have to deserialize the attributes
-                        deserialized_attributes = deserialize_attributes(
-                            attributes, attributes_conversion)
-                        models.DbAttribute.reset_values_for_node(
-                            dbnode=new_pk,
-                            attributes=deserialized_attributes,
-                            with_transaction=False)
-
             if not silent:
                 print("STORING NODE LINKS...")
             ## TODO: check that we are not creating input links of an already
@@ -701,14 +726,20 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
             import_links = data['links_uuid']
             links_to_store = []
 
-            # Needed for fast checks of existing links
-            existing_links_raw = models.DbLink.objects.all().values_list(
-                'input', 'output', 'label', 'type')
+            # ~ print(foreign_ids_reverse_mappings)
+            dbnode_reverse_mappings = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
+
+            # Needed for fast checks of existing links: only the links pointing to the outputs of the imported
+            # links can conflict with them, so only those are loaded
+            link_output_ids = set(dbnode_reverse_mappings[link['output']] for link in import_links
+                                  if link['output'] in dbnode_reverse_mappings)
+            existing_links_raw = []
+            for group in grouper(IMPORT_BATCH_SIZE, link_output_ids):
+                existing_links_raw.extend(models.DbLink.objects.filter(output__in=group).values_list(
+                    'input', 'output', 'label', 'type'))
             existing_links_labels = {(l[0], l[1]): l[2] for l in existing_links_raw}
             existing_input_links = {(l[1], l[2]): l[0] for l in existing_links_raw}
 
-            # ~ print(foreign_ids_reverse_mappings)
-            dbnode_reverse_mappings = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
             for link in import_links:
                 try:
                     in_id = dbnode_reverse_mappings[link['input']]
@@ -769,7 +800,7 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                 if not silent:
                     print("   ({} new links...)".format(len(links_to_store)))
 
-                models.DbLink.objects.bulk_create(links_to_store)
+                models.DbLink.objects.bulk_create(links_to_store, batch_size=IMPORT_BATCH_SIZE)
             else:
                 if not silent:
                     print("   (0 new links...)")
@@ -784,6 +815,7 @@ def import_data_dj(in_path, ignore_unknown_nodes=False,
                                   for node_uuid in groupnodes]
                 if nodes_to_store:
                     group.dbnodes.add(*nodes_to_store)
+                    increment_group_membership_version(group.pk)
 
             ######################################################
             # Put everything in a specific group
@@ -872,15 +904,17 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
 
     from aiida.orm import Node, Group
     from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif
-    from aiida.common.folders import SandboxFolder, RepositoryFolder
+    from aiida.common.folders import SandboxFolder
     from aiida.common.utils import get_object_from_string
     from aiida.common.datastructures import calc_states
     from aiida.orm.querybuilder import QueryBuilder
     from aiida.common.links import LinkType
     import aiida.utils.json as json
 
+    from uuid import UUID
+
     # Backend specific imports
-    from aiida.backends.sqlalchemy.models.node import DbCalcState
+    from aiida.backends.sqlalchemy.models.node import DbCalcState, DbLink, DbNode
 
     # This is the export version expected by this function
     expected_export_version = '0.3'
@@ -953,12 +987,12 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
         # relevant_db_nodes = {}
         db_nodes_uuid = set()
         import_nodes_uuid = set()
-        if linked_nodes:
+        for group in grouper(IMPORT_BATCH_SIZE, linked_nodes):
             qb = QueryBuilder()
-            qb.append(Node, filters={"uuid": {"in": linked_nodes}},
+            qb.append(Node, filters={"uuid": {"in": list(group)}},
                       project=["uuid"])
             for res in qb.iterall():
-                db_nodes_uuid.add(res[0])
+                db_nodes_uuid.add(str(res[0]))
 
         if NODE_ENTITY_NAME in data['export_data']:
             for v in data['export_data'][NODE_ENTITY_NAME].values():
@@ -1072,19 +1106,19 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                     if unique_identifier is not None:
                         import_unique_ids = set(v[unique_identifier] for v in data['export_data'][entity_name].values())
 
+                        # Only the unique identifiers and the pks of the entries already in the database are needed
                         relevant_db_entries = dict()
-                        if len(import_unique_ids) > 0:
+                        for group in grouper(IMPORT_BATCH_SIZE, import_unique_ids):
                             qb = QueryBuilder()
                             qb.append(entity, filters={
-                                unique_identifier: {"in": import_unique_ids}},
-                                      project=["*"], tag="res")
-                            relevant_db_entries = {
-                                getattr(v[0], unique_identifier):
-                                    v[0] for v in qb.all()}
+                                unique_identifier: {"in": list(group)}},
+                                      project=[unique_identifier, "id"], tag="res")
+                            for unique_id, pk in qb.iterall():
+                                if isinstance(unique_id, UUID):
+                                    unique_id = str(unique_id)
+                                relevant_db_entries[unique_id] = pk
 
-                            foreign_ids_reverse_mappings[entity_name] = {
-                                k: v.pk for k, v in
-                                relevant_db_entries.items()}
+                        foreign_ids_reverse_mappings[entity_name] = relevant_db_entries.copy()
 
                         dupl_counter = 0
                         imported_comp_names = set()
@@ -1192,9 +1226,13 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                             import_data[model_fkey] = import_data[file_fkey]
                             import_data.pop(file_fkey, None)
 
-                    db_entity = get_object_from_string(
-                        entity_names_to_sqla_schema[entity_name])
-                    objects_to_create.append(db_entity(**import_data))
+                    if entity_name == NODE_ENTITY_NAME:
+                        # The nodes are inserted in bulk from their plain column values
+                        objects_to_create.append(import_data)
+                    else:
+                        db_entity = get_object_from_string(
+                            entity_names_to_sqla_schema[entity_name])
+                        objects_to_create.append(db_entity(**import_data))
                     import_entry_ids[unique_id] = import_entry_id
 
                 # Before storing entries in the DB, I store the files (if these
@@ -1203,28 +1241,16 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
 
                     if not silent:
                         print("STORING NEW NODE FILES & ATTRIBUTES...")
-                    for o in objects_to_create:
 
-                        # Creating the needed files
-                        subfolder = folder.get_subfolder(os.path.join(
-                            nodes_export_subfolder, export_shard_uuid(o.uuid)))
-                        if not subfolder.exists():
-                            raise ValueError("Unable to find the repository "
-                                             "folder for node with UUID={} "
-                                             "in the exported file"
-                                             .format(o.uuid))
-                        destdir = RepositoryFolder(
-                            section=Node._section_name,
-                            uuid=o.uuid)
-                        # Replace the folder, possibly destroying existing
-                        # previous folders, and move the files (faster if we
-                        # are on the same filesystem, and
-                        # in any case the source is a SandboxFolder)
-                        destdir.replace_with_folder(subfolder.abspath,
-                                                    move=True, overwrite=True)
+                    # Creating the needed files
+                    _import_repository_folders(folder, [o['uuid'] for o in objects_to_create],
+                                               nodes_export_subfolder=nodes_export_subfolder)
+
+                    for o in objects_to_create:
 
                         # For DbNodes, we also have to store Attributes!
-                        import_entry_id = import_entry_ids[str(o.uuid)]
+                        unique_id = o['uuid']
+                        import_entry_id = import_entry_ids[unique_id]
                         # Get attributes from import file
                         try:
                             attributes = data['node_attributes'][
@@ -1243,27 +1269,26 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                         deserialized_attributes = deserialize_attributes(
                             attributes, attributes_conversion)
 
-                        if deserialized_attributes:
-                            from sqlalchemy.dialects.postgresql import JSONB
-                            o.attributes = dict()
-                            for k, v in deserialized_attributes.items():
-                                o.attributes[k] = v
+                        o['attributes'] = deserialized_attributes or dict()
+
+                    # Store them all in once, with batched insert statements
+                    for group in grouper(IMPORT_BATCH_SIZE, objects_to_create):
+                        session.bulk_insert_mappings(DbNode, group)
 
                 # Store them all in once; However, the PK
                 # are not set in this way...
-                if objects_to_create:
+                elif objects_to_create:
                     session.add_all(objects_to_create)
 
                 session.flush()
 
-                if import_entry_ids.keys():
+                just_saved = dict()
+                for group in grouper(IMPORT_BATCH_SIZE, import_entry_ids.keys()):
                     qb = QueryBuilder()
                     qb.append(entity, filters={
-                        unique_identifier: {"in": list(import_entry_ids.keys())}},
+                        unique_identifier: {"in": list(group)}},
                               project=[unique_identifier, "id"], tag="res")
-                    just_saved = {v[0]: v[1] for v in qb.all()}
-                else:
-                    just_saved = dict()
+                    just_saved.update({v[0]: v[1] for v in qb.iterall()})
 
                 imported_states = []
                 if entity_sig == entity_names_to_signatures[NODE_ENTITY_NAME]:
@@ -1276,15 +1301,15 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                     # for calculations
                     for unique_id, new_pk in just_saved.items():
                         imported_states.append(
-                            DbCalcState(dbnode_id=new_pk,
-                                        state=calc_states.IMPORTED))
+                            dict(dbnode_id=new_pk,
+                                 state=calc_states.IMPORTED))
 
-                    session.add_all(imported_states)
+                    for group in grouper(IMPORT_BATCH_SIZE, imported_states):
+                        session.bulk_insert_mappings(DbCalcState, group)
 
                 # Now I have the PKs, print the info
                 # Moreover, set the foreing_ids_reverse_mappings
                 for unique_id, new_pk in just_saved.items():
-                    from uuid import UUID
                     if isinstance(unique_id, UUID):
                         unique_id = str(unique_id)
                     import_entry_id = import_entry_ids[unique_id]
@@ -1306,16 +1331,21 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
             import_links = data['links_uuid']
             links_to_store = []
 
-            # Needed for fast checks of existing links
-            from aiida.backends.sqlalchemy.models.node import DbLink
-            existing_links_raw = session.query(
-                DbLink.input_id, DbLink.output_id,DbLink.label).all()
+            dbnode_reverse_mappings = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
+
+            # Needed for fast checks of existing links: only the links pointing to the outputs of the imported
+            # links can conflict with them, so only those are loaded
+            link_output_ids = set(dbnode_reverse_mappings[link['output']] for link in import_links
+                                  if link['output'] in dbnode_reverse_mappings)
+            existing_links_raw = []
+            for group in grouper(IMPORT_BATCH_SIZE, link_output_ids):
+                existing_links_raw.extend(session.query(
+                    DbLink.input_id, DbLink.output_id, DbLink.label).filter(DbLink.output_id.in_(group)).all())
             existing_links_labels = {(l[0], l[1]): l[2]
                                      for l in existing_links_raw}
             existing_input_links = {(l[1], l[2]): l[0]
                                     for l in existing_links_raw}
 
-            dbnode_reverse_mappings = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
             for link in import_links:
                 try:
                     in_id = dbnode_reverse_mappings[link['input']]
@@ -1365,7 +1395,7 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                                             link['input'], existing_input))
                     except KeyError:
                         # New link
-                        links_to_store.append(DbLink(
+                        links_to_store.append(dict(
                             input_id=in_id, output_id=out_id,
                             label=link['label'], type=LinkType(link['type']).value))
                         if LINK_ENTITY_NAME not in ret_dict:
@@ -1376,7 +1406,8 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
             if links_to_store:
                 if not silent:
                     print("   ({} new links...)".format(len(links_to_store)))
-                session.add_all(links_to_store)
+                for group in grouper(IMPORT_BATCH_SIZE, links_to_store):
+                    session.bulk_insert_mappings(DbLink, group)
             else:
                 if not silent:
                     print("   (0 new links...)")
@@ -1433,7 +1464,6 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
 
                 # Add all the nodes to the new group
                 # TODO: decide if we want to return the group name
-                from aiida.backends.sqlalchemy.models.node import DbNode
                 group.add_nodes(session.query(DbNode).filter(
                     DbNode.id.in_(pks_for_group)).distinct().all())
 
@@ -1684,11 +1714,144 @@ def fill_in_query(partial_query, originating_entity_str, current_entity_str,
                       new_tag_suffixes)
 
 
+EXPORT_BATCH_SIZE = 1000
+
+
+def get_export_closure(data_ids, calculation_ids, input_forward=False, create_reversed=True,
+                       return_reversed=False, call_reversed=False, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Return the ids of all the nodes that should be exported together with the given Data and Calculation nodes.
+
+    Since each link type connects nodes of fixed kinds (e.g. INPUT links go from a Data node to a Calculation), the
+    rules of the export are expressed as the link types to follow and their direction, and the whole closure is
+    computed with a single graph traversal.
+
+    :param data_ids: the ids of the Data (and Code) nodes to export
+    :param calculation_ids: the ids of the Calculation nodes to export
+    :param input_forward: follow forward INPUT links
+    :param create_reversed: follow reversed CREATE links
+    :param return_reversed: follow reversed RETURN links
+    :param call_reversed: follow reversed CALL links
+    :param batch_size: the maximum number of node ids per query, if the traversal cannot be done in a single query
+    :return: a :py:class:`~aiida.orm.utils.traversal.NodePks` array of node ids
+    """
+    from aiida.common.links import LinkType
+    from aiida.orm.utils.traversal import TraversalRule, traverse_graph
+
+    # The inputs of calculations, and the data and calculations they create, return and call, are always exported
+    rules = [
+        TraversalRule(LinkType.INPUT, forward=False),
+        TraversalRule(LinkType.CREATE, forward=True),
+        TraversalRule(LinkType.RETURN, forward=True),
+        TraversalRule(LinkType.CALL, forward=True),
+    ]
+    if input_forward:
+        rules.append(TraversalRule(LinkType.INPUT, forward=True))
+    if create_reversed:
+        rules.append(TraversalRule(LinkType.CREATE, forward=False))
+    if return_reversed:
+        rules.append(TraversalRule(LinkType.RETURN, forward=False))
+    if call_reversed:
+        rules.append(TraversalRule(LinkType.CALL, forward=False))
+
+    return traverse_graph(set(data_ids) | set(calculation_ids), rules, batch_size=batch_size)
+
+
+def _iter_entity_rows(entity_name, entity_ids, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield the serialized entries of the entities with the given ids and of the entities they refer to.
+
+    The entities are queried in batches of ids, each batch joining the referenced entities (e.g. the user and the
+    computer of a node) as the single query of the non-streaming export did.
+
+    :param entity_name: the name of the entity, e.g. `Node`
+    :param entity_ids: the ids of the entities
+    :param batch_size: the maximum number of ids per query
+    :return: generator of tuples (entity name, id, serialized fields)
+    """
+    from aiida.orm.querybuilder import QueryBuilder
+
+    entity_separator = '_'
+    all_fields_info, _ = get_all_fields_info()
+
+    project_cols = ['id']
+    for prop in all_fields_info[entity_name].keys():
+        project_cols.append(file_fields_to_model_fields.get(entity_name, {}).get(prop, prop))
+
+    foreign_fields = {k: v for k, v in all_fields_info[entity_name].items() if 'requires' in v}
+
+    for chunk in grouper(batch_size, entity_ids):
+        builder = QueryBuilder()
+        builder.append(entity_names_to_entities[entity_name], filters={'id': {'in': list(chunk)}},
+                       project=project_cols, tag=entity_name, outerjoin=True)
+
+        for k, v in foreign_fields.items():
+            fill_in_query(builder, entity_name, v['requires'], [entity_name], entity_separator)
+
+        for temp_d in builder.iterdict(batch_size=batch_size):
+            for k in temp_d.keys():
+                # Get current entity
+                current_entity = k.split(entity_separator)[-1]
+
+                # This is a empty result of an outer join.
+                # It should not be taken into account.
+                if temp_d[k]["id"] is None:
+                    continue
+
+                yield current_entity, temp_d[k]["id"], serialize_dict(
+                    temp_d[k], remove_fields=['id'], rename_fields=model_fields_to_file_fields[current_entity])
+
+
+def _write_json_members(fhandle, members, first=True):
+    """
+    Write key-value pairs to a file handle as members of a JSON object, without the enclosing braces.
+
+    :param fhandle: a file handle opened in text mode
+    :param members: an iterable of (key, value) tuples
+    :param first: whether the first member written is the first of the object
+    :return: the number of members written
+    """
+    import aiida.utils.json as json
+
+    count = 0
+    for key, value in members:
+        if count or not first:
+            fhandle.write(u', ')
+        fhandle.write(json.dumps(six.text_type(key)) + u': ' + json.dumps(value))
+        count += 1
+    return count
+
+
+def _write_json_elements(fhandle, elements, first=True):
+    """
+    Write values to a file handle as elements of a JSON array, without the enclosing brackets.
+
+    :param fhandle: a file handle opened in text mode
+    :param elements: an iterable of values
+    :param first: whether the first element written is the first of the array
+    :return: the number of elements written
+    """
+    import aiida.utils.json as json
+
+    count = 0
+    for value in elements:
+        if count or not first:
+            fhandle.write(u', ')
+        fhandle.write(json.dumps(value))
+        count += 1
+    return count
+
+
 def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
                 silent=False, input_forward=False, create_reversed=True,
-                return_reversed=False, call_reversed=False, **kwargs):
+                return_reversed=False, call_reversed=False, batch_size=EXPORT_BATCH_SIZE, **kwargs):
     """
     Export the entries passed in the 'what' list to a file tree.
+
+    The export is streamed: the nodes are queried in batches and their entries, attributes and links are written to
+    the `data.json` file of the folder as they are read, so the memory usage does not grow with the size of the
+    export beyond the set of ids of the exported nodes.
+
     :todo: limit the export to finished or failed calculations.
     :param what: a list of entity instances; they can belong to
     different models/entities.
@@ -1710,9 +1873,14 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
     then calls function for licenses of Data nodes expecting True if
     license is allowed, False otherwise.
     :param silent: suppress debug prints
+    :param batch_size: the maximum number of entities queried at once
     :raises LicensingException: if any node is licensed under forbidden
     license
     """
+    import os
+    import shutil
+    import tempfile
+
     import aiida
     from aiida.orm import Node, Calculation, Data, Group, Code
     from aiida.common.links import LinkType
@@ -1727,25 +1895,15 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
 
     all_fields_info, unique_identifiers = get_all_fields_info()
 
-    # The set that contains the nodes ids of the nodes that should be exported
-    to_be_exported = set()
-
     given_data_entry_ids = set()
     given_calculation_entry_ids = set()
     given_group_entry_ids = set()
     given_computer_entry_ids = set()
-    given_groups = set()
 
     # I store a list of the actual dbnodes
     for entry in what:
-        # This returns the class name (as in imports). E.g. for a model node:
-        # aiida.backends.djsite.db.models.DbNode
-        entry_class_string = get_class_string(entry)
-        # Now a load the backend-independent name into entry_entity_name, e.g. Node!
-        entry_entity_name = schema_to_entity_names(entry_class_string)
         if issubclass(entry.__class__, Group):
             given_group_entry_ids.add(entry.pk)
-            given_groups.add(entry)
         elif issubclass(entry.__class__, Node):
             # The Code node should be treated as a Data node
             if (issubclass(entry.__class__, Data) or issubclass(entry.__class__, Code)):
@@ -1758,251 +1916,35 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
             raise ValueError("I was given {}, which is not a DbNode or DbGroup instance".format(entry))
 
     # Add all the nodes contained within the specified groups
-    for group in given_groups:
-        for entry in group.nodes:
-            # The Code node should be treated as a Data nodes
-            if (issubclass(entry.__class__, Data) or issubclass(entry.__class__, Code)):
-                given_data_entry_ids.add(entry.pk)
-            elif issubclass(entry.__class__, Calculation):
-                given_calculation_entry_ids.add(entry.pk)
-
-    # We will iteratively explore the AiiDA graph to find further nodes that
-    # should also be exported.
-
-    # We repeat until there are no further nodes to be visited
-    while given_calculation_entry_ids or given_data_entry_ids:
-
-        # If is is a calculation node
-        if given_calculation_entry_ids:
-            curr_node_id = given_calculation_entry_ids.pop()
-            # If it is already visited continue to the next node
-            if curr_node_id in to_be_exported:
-                continue
-            # Otherwise say that it is a node to be exported
-            else:
-                to_be_exported.add(curr_node_id)
-
-            # INPUT(Data, Calculation) - Reversed
-            qb = QueryBuilder()
-            qb.append(Data, tag='predecessor', project=['id'])
-            qb.append(Calculation, output_of='predecessor',
-                      filters={'id': {'==': curr_node_id}},
-                      edge_filters={
-                          'type': {
-                              '==': LinkType.INPUT.value}})
-            res = {_[0] for _ in qb.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-            # The same until Code becomes a subclass of Data
-            qb = QueryBuilder()
-            qb.append(Code, tag='predecessor', project=['id'])
-            qb.append(Calculation, output_of='predecessor',
-                      filters={'id': {'==': curr_node_id}},
-                      edge_filters={
-                          'type': {
-                              '==': LinkType.INPUT.value}})
-            res = {_[0] for _ in qb.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-
-
-            # INPUT(Data, Calculation) - Forward
-            if input_forward:
-                qb = QueryBuilder()
-                qb.append(Data, tag='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}})
-                qb.append(Calculation, output_of='predecessor',
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.INPUT.value}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-                # The same until Code becomes a subclass of Data
-                qb = QueryBuilder()
-                qb.append(Code, tag='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}})
-                qb.append(Calculation, output_of='predecessor',
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.INPUT.value}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-
-
-            # CREATE/RETURN(Calculation, Data) - Forward
+    if given_group_entry_ids:
+        for node_classes, entry_ids in [((Data, Code), given_data_entry_ids),
+                                        (Calculation, given_calculation_entry_ids)]:
             qb = QueryBuilder()
-            qb.append(Calculation, tag='predecessor',
-                      filters={'id': {'==': curr_node_id}})
-            qb.append(Data, output_of='predecessor', project=['id'],
-                      edge_filters={
-                          'type': {
-                              'in': [LinkType.CREATE.value,
-                                     LinkType.RETURN.value]}})
-            res = {_[0] for _ in qb.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-            # The same until Code becomes a subclass of Data
-            qb = QueryBuilder()
-            qb.append(Calculation, tag='predecessor',
-                      filters={'id': {'==': curr_node_id}})
-            qb.append(Code, output_of='predecessor', project=['id'],
-                      edge_filters={
-                          'type': {
-                              'in': [LinkType.CREATE.value,
-                                     LinkType.RETURN.value]}})
-            res = {_[0] for _ in qb.all()}
-            given_data_entry_ids.update(res - to_be_exported)
-
-
-            # CREATE(Calculation, Data) - Reversed
-            if create_reversed:
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Data, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  'in': [LinkType.CREATE.value]}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-                # The same until Code becomes a subclass of Data
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Code, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  'in': [LinkType.CREATE.value]}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-
-
-            # RETURN(Calculation, Data) - Reversed
-            if return_reversed:
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Data, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  'in': [LinkType.RETURN.value]}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-                # The same until Code becomes a subclass of Data
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Code, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  'in': [LinkType.RETURN.value]}})
-                res = {_[0] for _ in qb.all()}
-                given_data_entry_ids.update(res - to_be_exported)
-
-            # CALL(Calculation, Calculation) - Forward
-            qb = QueryBuilder()
-            qb.append(Calculation, tag='predecessor',
-                      filters={'id': {'==': curr_node_id}})
-            qb.append(Calculation, output_of='predecessor', project=['id'],
-                      edge_filters={
-                          'type': {
-                              '==': LinkType.CALL.value}})
-            res = {_[0] for _ in qb.all()}
-            given_calculation_entry_ids.update(res - to_be_exported)
-
-
-            # CALL(Calculation, Calculation) - Reversed
-            if call_reversed:
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor')
-                qb.append(Calculation, output_of='predecessor', project=['id'],
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.CALL.value}})
-                res = {_[0] for _ in qb.all()}
-                given_calculation_entry_ids.update(res - to_be_exported)
-
-
-        # If it is a Data node
-        else:
-            curr_node_id = given_data_entry_ids.pop()
-            # If it is already visited continue to the next node
-            if curr_node_id in to_be_exported:
-                continue
-            # Otherwise say that it is a node to be exported
-            else:
-                to_be_exported.add(curr_node_id)
-
-            # Case 2:
-            # CREATE(Calculation, Data) - Reversed
-            if create_reversed:
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor', project=['id'])
-                qb.append(Data, output_of='predecessor',
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.CREATE.value}})
-                res = {_[0] for _ in qb.all()}
-                given_calculation_entry_ids.update(res - to_be_exported)
-                # The same until Code becomes a subclass of Data
-                qb = QueryBuilder()
-                qb.append(Calculation, tag='predecessor', project=['id'])
-                qb.append(Code, output_of='predecessor',
-                          filters={'id': {'==': curr_node_id}},
-                          edge_filters={
-                              'type': {
-                                  '==': LinkType.CREATE.value}})
-                res = {_[0] for _ in qb.all()}
-                given_calculation_entry_ids.update(res - to_be_exported)
-
-    # Here we get all the columns that we plan to project per entity that we
-    # would like to extract
-    given_entities = list()
-    if len(given_group_entry_ids) > 0:
-        given_entities.append(GROUP_ENTITY_NAME)
-    if len(to_be_exported) > 0:
-        given_entities.append(NODE_ENTITY_NAME)
-    if len(given_computer_entry_ids) > 0:
-        given_entities.append(COMPUTER_ENTITY_NAME)
-
-    entries_to_add = dict()
-    for given_entity in given_entities:
-        project_cols = ["id"]
-        # The following gets a list of fields that we need,
-        # e.g. user, mtime, uuid, computer
-        entity_prop = all_fields_info[given_entity].keys()
-
-        # Here we do the necessary renaming of properties
-        for prop in entity_prop:
-            # nprop contains the list of projections
-            nprop = (file_fields_to_model_fields[given_entity][prop]
-                     if prop in file_fields_to_model_fields[given_entity]
-                     else prop)
-            project_cols.append(nprop)
-
-        # Getting the ids that correspond to the right entity
-        if given_entity == GROUP_ENTITY_NAME:
-            entry_ids_to_add = given_group_entry_ids
-        elif given_entity == NODE_ENTITY_NAME:
-            entry_ids_to_add = to_be_exported
-        elif given_entity == COMPUTER_ENTITY_NAME:
-            entry_ids_to_add = given_computer_entry_ids
-
-        qb = QueryBuilder()
-        qb.append(entity_names_to_entities[given_entity],
-                  filters={"id": {"in": entry_ids_to_add}},
-                  project=project_cols,
-                  tag=given_entity, outerjoin=True)
-        entries_to_add[given_entity] = qb
+            qb.append(Group, tag='group', filters={'id': {'in': list(given_group_entry_ids)}})
+            qb.append(node_classes, project=['id'], member_of='group')
+            entry_ids.update(pk for pk, in qb.iterall(batch_size=batch_size))
+
+    # We explore the AiiDA graph to find further nodes that should also be exported.
+    to_be_exported = get_export_closure(
+        given_data_entry_ids, given_calculation_entry_ids, input_forward=input_forward,
+        create_reversed=create_reversed, return_reversed=return_reversed, call_reversed=call_reversed,
+        batch_size=batch_size)
 
     # TODO (Spyros) To see better! Especially for functional licenses
     # Check the licenses of exported data.
     if allowed_licenses is not None or forbidden_licenses is not None:
-        qb = QueryBuilder()
-        qb.append(Node, project=["id", "attributes.source.license"],
-                  filters={"id": {"in": to_be_exported}})
-        # Skip those nodes where the license is not set (this is the standard behavior with Django)
-        node_licenses = list((a, b) for [a, b] in qb.all() if b is not None)
-        check_licences(node_licenses, allowed_licenses, forbidden_licenses)
+        for chunk in grouper(batch_size, to_be_exported):
+            qb = QueryBuilder()
+            qb.append(Node, project=["id", "attributes.source.license"],
+                      filters={"id": {"in": list(chunk)}})
+            # Skip those nodes where the license is not set (this is the standard behavior with Django)
+            node_licenses = list((a, b) for [a, b] in qb.all() if b is not None)
+            check_licences(node_licenses, allowed_licenses, forbidden_licenses)
+
+    if not to_be_exported and not given_group_entry_ids and not given_computer_entry_ids:
+        if not silent:
+            print("No nodes to store, exiting...")
+        return
 
     ############################################################
     ##### Start automatic recursive export data generation #####
@@ -2010,360 +1952,122 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
     if not silent:
         print("STORING DATABASE ENTRIES...")
 
-    export_data = dict()
-    entity_separator = '_'
-    for entity_name, partial_query in entries_to_add.items():
+    # N.B. We're really calling zipfolder.open
+    with folder.open('data.json', mode='w') as fhandle:
 
-        foreign_fields = {k: v for k, v in
-                          all_fields_info[entity_name].items()
-                          # all_fields_info[model_name].items()
-                          if 'requires' in v}
+        # The node entries are written as they are read, while the entries of the other entities, i.e. the given
+        # groups and computers and the users and computers the nodes refer to, are few and collected in memory
+        export_data = dict()
 
-        for k, v in foreign_fields.items():
-            ref_model_name = v['requires']
-            fill_in_query(partial_query, entity_name, ref_model_name,
-                          [entity_name], entity_separator)
+        def iter_node_entries():
+            for entity_name, pk, entry in _iter_entity_rows(NODE_ENTITY_NAME, to_be_exported, batch_size):
+                if entity_name == NODE_ENTITY_NAME:
+                    yield pk, entry
+                else:
+                    export_data.setdefault(entity_name, {})[pk] = entry
 
-        for temp_d in partial_query.iterdict():
-            for k in temp_d.keys():
-                # Get current entity
-                current_entity = k.split(entity_separator)[-1]
+        fhandle.write(u'{"export_data": {')
+        fhandle.write(json.dumps(NODE_ENTITY_NAME) + u': {')
+        number_of_nodes = _write_json_members(fhandle, iter_node_entries())
+        fhandle.write(u'}')
 
-                # This is a empty result of an outer join.
-                # It should not be taken into account.
-                if temp_d[k]["id"] is None:
-                    continue
+        for entity_name, entity_ids in [(GROUP_ENTITY_NAME, given_group_entry_ids),
+                                        (COMPUTER_ENTITY_NAME, given_computer_entry_ids)]:
+            for current_entity, pk, entry in _iter_entity_rows(entity_name, entity_ids, batch_size):
+                export_data.setdefault(current_entity, {})[pk] = entry
 
-                temp_d2 = {
-                    temp_d[k]["id"]:
-                        serialize_dict(temp_d[k],
-                                       remove_fields=['id'],
-                                       rename_fields=
-                                       model_fields_to_file_fields[current_entity])}
-                try:
-                    export_data[current_entity].update(temp_d2)
-                except KeyError:
-                    export_data[current_entity] = temp_d2
+        _write_json_members(fhandle, export_data.items(), first=False)
+        fhandle.write(u'}')
 
-    ######################################
-    # Manually manage links and attributes
-    ######################################
-    # I use .get because there may be no nodes to export
-    all_nodes_pk = list()
-    if NODE_ENTITY_NAME in export_data:
-        all_nodes_pk.extend(export_data.get(NODE_ENTITY_NAME).keys())
+        if not silent:
+            print("Exporting a total of {} db entries, of which {} nodes."
+                  .format(number_of_nodes + sum(len(model_data) for model_data in export_data.values()),
+                          number_of_nodes))
 
-    if sum(len(model_data) for model_data in export_data.values()) == 0:
+        ## ATTRIBUTES
         if not silent:
-            print("No nodes to store, exiting...")
-        return
+            print("STORING NODE ATTRIBUTES...")
 
-    if not silent:
-        print("Exporting a total of {} db entries, of which {} nodes."
-              .format(sum(len(model_data) for model_data in export_data.values()),
-                      len(all_nodes_pk)))
+        # The conversion information is collected in a temporary file, to be written after the attributes
+        conversion_fd, conversion_path = tempfile.mkstemp()
+        try:
+            with io.open(conversion_fd, 'w+', encoding='utf8') as conversion_handle:
+                fhandle.write(u', "node_attributes": {')
+                first = True
+                for chunk in grouper(batch_size, to_be_exported):
+                    all_nodes_query = QueryBuilder()
+                    all_nodes_query.append(Node, filters={"id": {"in": list(chunk)}},
+                                           project=["*"])
+                    for res in all_nodes_query.iterall(batch_size=batch_size):
+                        n = res[0]
+                        attributes, conversion = serialize_dict(n.get_attrs(), track_conversion=True)
+                        _write_json_members(fhandle, [(str(n.pk), attributes)], first=first)
+                        _write_json_members(conversion_handle, [(str(n.pk), conversion)], first=first)
+                        first = False
+                fhandle.write(u'}, "node_attributes_conversion": {')
+                conversion_handle.seek(0)
+                shutil.copyfileobj(conversion_handle, fhandle)
+                fhandle.write(u'}')
+        finally:
+            os.remove(conversion_path)
 
-    ## ATTRIBUTES
-    if not silent:
-        print("STORING NODE ATTRIBUTES...")
-    node_attributes = {}
-    node_attributes_conversion = {}
-
-    # A second QueryBuilder query to get the attributes. See if this can be
-    # optimized
-    if len(all_nodes_pk) > 0:
-        all_nodes_query = QueryBuilder()
-        all_nodes_query.append(Node, filters={"id": {"in": all_nodes_pk}},
-                               project=["*"])
-        for res in all_nodes_query.iterall():
-            n = res[0]
-            (node_attributes[str(n.pk)],
-             node_attributes_conversion[str(n.pk)]) = serialize_dict(
-                n.get_attrs(), track_conversion=True)
+        if not silent:
+            print("STORING NODE LINKS...")
+
+        # Since the closure follows all the link types that are exported, the exported links are exactly the links
+        # between two exported nodes. Each link is queried once, through the batch containing its output node.
+        def iter_links():
+            link_types = [LinkType.INPUT.value, LinkType.CREATE.value, LinkType.RETURN.value, LinkType.CALL.value]
+            for chunk in grouper(batch_size, to_be_exported):
+                links_qb = QueryBuilder()
+                links_qb.append(Node, project=['id', 'uuid'], tag='input')
+                links_qb.append(Node, project=['uuid'], tag='output',
+                                filters={'id': {'in': list(chunk)}},
+                                edge_filters={'type': {'in': link_types}},
+                                edge_project=['label', 'type'], output_of='input')
+                for input_id, input_uuid, output_uuid, link_label, link_type in links_qb.iterall(
+                        batch_size=batch_size):
+                    if input_id in to_be_exported:
+                        yield {
+                            'input': str(input_uuid),
+                            'output': str(output_uuid),
+                            'label': str(link_label),
+                            'type': str(link_type)
+                        }
+
+        fhandle.write(u', "links_uuid": [')
+        _write_json_elements(fhandle, iter_links())
+        fhandle.write(u']')
 
-    if not silent:
-        print("STORING NODE LINKS...")
-
-    links_uuid_dict = dict()
-    if len(all_nodes_pk) > 0:
-        # INPUT (Data, Calculation) - Forward, by the Calculation node
-        if input_forward:
-            # INPUT (Data, Calculation)
-            links_qb = QueryBuilder()
-            links_qb.append(Data,
-                            project=['uuid'], tag='input',
-                            filters = {'id': {'in': all_nodes_pk}})
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='output',
-                            edge_filters={'type':{'==':LinkType.INPUT.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-            # INPUT (Code, Calculation)
-            # The same as above until Code becomes a subclass of Data
-            links_qb = QueryBuilder()
-            links_qb.append(Code,
-                            project=['uuid'], tag='input',
-                            filters = {'id': {'in': all_nodes_pk}})
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='output',
-                            edge_filters={'type':{'==':LinkType.INPUT.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-
-        # INPUT (Data, Calculation) - Backward, by the Calculation node
-        links_qb = QueryBuilder()
-        links_qb.append(Data,
-                        project=['uuid'], tag='input')
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='output',
-                        filters={'id': {'in': all_nodes_pk}},
-                        edge_filters={'type':{'==':LinkType.INPUT.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type':str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-        # INPUT (Data, Calculation) - Backward, by the Calculation node
-        # The same as above until Code becomes a subclass of Data
-        links_qb = QueryBuilder()
-        links_qb.append(Code,
-                        project=['uuid'], tag='input')
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='output',
-                        filters={'id': {'in': all_nodes_pk}},
-                        edge_filters={
-                            'type': {'==': LinkType.INPUT.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type': str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-
-        # CREATE (Calculation, Data) - Forward, by the Calculation node
-        links_qb = QueryBuilder()
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='input',
-                        filters={'id': {'in': all_nodes_pk}})
-        links_qb.append(Data,
-                        project=['uuid'], tag='output',
-                        edge_filters={'type': {'==': LinkType.CREATE.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type':str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-        # CREATE (Calculation, Code) - Forward, by the Calculation node
-        # The same as above until Code becomes a subclass of Data
-        # This case will not happen (with the current setup - a code is not
-        # created by a calculation) but it is addded for completeness
-        links_qb = QueryBuilder()
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='input',
-                        filters={'id': {'in': all_nodes_pk}})
-        links_qb.append(Code,
-                        project=['uuid'], tag='output',
-                        edge_filters={'type': {'==': LinkType.CREATE.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type': str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-
-
-        # CREATE (Calculation, Data) - Backward, by the Data node
-        if create_reversed:
-            links_qb = QueryBuilder()
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='input',
-                            filters={'id': {'in': all_nodes_pk}})
-            links_qb.append(Data,
-                            project=['uuid'], tag='output',
-                            edge_filters={'type': {'==': LinkType.CREATE.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-        # CREATE (Calculation, Code) - Backward, by the Code node
-        # The same as above until Code becomes a subclass of Data
-        # This case will not happen (with the current setup - a code is not
-        # created by a calculation) but it is addded for completeness
-        if create_reversed:
-            links_qb = QueryBuilder()
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='input',
-                            filters={'id': {'in': all_nodes_pk}})
-            links_qb.append(Data,
-                            project=['uuid'], tag='output',
-                            edge_filters={'type': {'==': LinkType.CREATE.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-
-        # RETURN (Calculation, Data) - Forward, by the Calculation node
-        links_qb = QueryBuilder()
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='input',
-                        filters={'id': {'in': all_nodes_pk}})
-        links_qb.append(Data,
-                        project=['uuid'], tag='output',
-                        edge_filters={'type': {'==': LinkType.RETURN.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type':str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-
-        # RETURN (Calculation, Data) - Backward, by the Data node
-        if return_reversed:
-            links_qb = QueryBuilder()
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='input')
-            links_qb.append(Data,
-                            project=['uuid'], tag='output',
-                            filters={'id': {'in': all_nodes_pk}},
-                            edge_filters={'type': {'==': LinkType.RETURN.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-
-        # CALL (Calculation [caller], Calculation [called]) - Forward, by
-        # the Calculation node
-        links_qb = QueryBuilder()
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='input',
-                        filters={'id': {'in': all_nodes_pk}})
-        links_qb.append(Calculation,
-                        project=['uuid'], tag='output',
-                        edge_filters={'type': {'==': LinkType.CALL.value}},
-                        edge_project=['label', 'type'], output_of='input')
-        for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-            val = {
-                'input': str(input_uuid),
-                'output': str(output_uuid),
-                'label': str(link_label),
-                'type':str(link_type)
-            }
-            links_uuid_dict[frozenset(val.items())] = val
-
-        # CALL (Calculation [caller], Calculation [called]) - Backward,
-        # by the Calculation [called] node
-        if call_reversed:
-            links_qb = QueryBuilder()
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='input')
-            links_qb.append(Calculation,
-                            project=['uuid'], tag='output',
-                            filters={'id': {'in': all_nodes_pk}},
-                            edge_filters={'type': {'==': LinkType.CALL.value}},
-                            edge_project=['label', 'type'], output_of='input')
-            for input_uuid, output_uuid, link_label, link_type in links_qb.iterall():
-                val = {
-                    'input': str(input_uuid),
-                    'output': str(output_uuid),
-                    'label': str(link_label),
-                    'type':str(link_type)
-                }
-                links_uuid_dict[frozenset(val.items())] = val
-
-    links_uuid = list(links_uuid_dict.values())
+        if not silent:
+            print("STORING GROUP ELEMENTS...")
 
-    if not silent:
-        print("STORING GROUP ELEMENTS...")
-    groups_uuid = dict()
-    # If a group is in the exported date, we export the group/node correlation
-    if GROUP_ENTITY_NAME in export_data:
-        for curr_group in export_data[GROUP_ENTITY_NAME]:
+        # If a group is in the exported date, we export the group/node correlation
+        fhandle.write(u', "groups_uuid": {')
+        first = True
+        for curr_group in export_data.get(GROUP_ENTITY_NAME, {}):
             group_uuid_qb = QueryBuilder()
             group_uuid_qb.append(entity_names_to_entities[GROUP_ENTITY_NAME],
                                  filters={'id': {'==': curr_group}},
                                  project=['uuid'], tag='group')
             group_uuid_qb.append(entity_names_to_entities[NODE_ENTITY_NAME],
                                  project=['uuid'], member_of='group')
-            for res in group_uuid_qb.iterall():
-                if str(res[0]) in groups_uuid:
-                    groups_uuid[str(res[0])].append(str(res[1]))
-                else:
-                    groups_uuid[str(res[0])] = [str(res[1])]
-
-    ######################################
-    # Now I store
-    ######################################
-    # subfolder inside the export package
-    nodesubfolder = folder.get_subfolder('nodes', create=True,
-                                         reset_limit=True)
-
-    # Add the proper signatures to the exported data
-    for entity_name in export_data.keys():
-        export_data[entity_name] = (
-            export_data.pop(entity_name))
+            members = group_uuid_qb.iterall(batch_size=batch_size)
 
-    if not silent:
-        print("STORING DATA...")
-    
-
-    data = {
-        'node_attributes': node_attributes,
-        'node_attributes_conversion': node_attributes_conversion,
-        'export_data': export_data,
-        'links_uuid': links_uuid,
-        'groups_uuid': groups_uuid,
-    }
+            # Only groups with at least one exported node are written, as the non-streaming export did
+            try:
+                group_uuid, node_uuid = next(members)
+            except StopIteration:
+                continue
 
-
-    # N.B. We're really calling zipfolder.open
-    with folder.open('data.json', mode='w') as fhandle:
-        fhandle.write(json.dumps(data))
+            if not first:
+                fhandle.write(u', ')
+            fhandle.write(json.dumps(str(group_uuid)) + u': [')
+            _write_json_elements(fhandle, [str(node_uuid)])
+            _write_json_elements(fhandle, (str(node_uuid) for _, node_uuid in members), first=False)
+            fhandle.write(u']')
+            first = False
+        fhandle.write(u'}}')
 
     # Add proper signature to unique identifiers & all_fields_info
     # Ignore if a key doesn't exist in any of the two dictionaries
@@ -2381,14 +2085,17 @@ def export_tree(what, folder,allowed_licenses=None, forbidden_licenses=None,
     if silent is not True:
         print("STORING FILES...")
 
-    # If there are no nodes, there are no files to store
-    if len(all_nodes_pk) > 0:
-        # Large speed increase by not getting the node itself and looping in memory
-        # in python, but just getting the uuid
+    # subfolder inside the export package
+    nodesubfolder = folder.get_subfolder('nodes', create=True,
+                                         reset_limit=True)
+
+    # Large speed increase by not getting the node itself and looping in memory
+    # in python, but just getting the uuid
+    for chunk in grouper(batch_size, to_be_exported):
         uuid_query = QueryBuilder()
-        uuid_query.append(Node, filters={"id": {"in": all_nodes_pk}},
+        uuid_query.append(Node, filters={"id": {"in": list(chunk)}},
                           project=["uuid"])
-        for res in uuid_query.all():
+        for res in uuid_query.iterall(batch_size=batch_size):
             uuid = str(res[0])
             sharded_uuid = export_shard_uuid(uuid)
 
@@ -2468,25 +2175,46 @@ def get_all_parents_dj(node_pks):
 
 
 class MyWritingZipFile(object):
+    """
+    A file opened for writing inside a zip file.
+
+    The content is spooled to a temporary file on disk, which is added to the zip file when the file is closed, so
+    that large files are never held in memory.
+    """
+
     def __init__(self, zipfile, fname):
         self._zipfile = zipfile
         self._fname = fname
         self._buffer = None
+        self._buffer_path = None
 
     def open(self):
-        from six.moves import StringIO as StringIO
+        import os
+        import tempfile
 
         if self._buffer is not None:
             raise IOError("Cannot open again!")
-        self._buffer = StringIO()
+        handle, self._buffer_path = tempfile.mkstemp()
+        os.close(handle)
+        self._buffer = io.open(self._buffer_path, 'w', encoding='utf8')
 
     def write(self, data):
         self._buffer.write(data)
 
+    def _store(self, path):
+        """Add the file at the given path, with the spooled content, to the archive."""
+        self._zipfile.write(path, self._fname)
+
     def close(self):
-        self._buffer.seek(0)
-        self._zipfile.writestr(self._fname, self._buffer.read())
-        self._buffer = None
+        import os
+
+        self._buffer.close()
+        try:
+            self._store(self._buffer_path)
+        finally:
+            os.remove(self._buffer_path)
+            self._buffer = None
+            self._buffer_path = None
 
     def __enter__(self):
         self.open()
@@ -2496,6 +2224,109 @@ class MyWritingZipFile(object):
         self.close()
 
 
+class MyWritingTarFile(MyWritingZipFile):
+    """
+    A file opened for writing inside a tar file.
+
+    The content is spooled to a temporary file on disk, which is added to the tar file when the file is closed.
+    """
+
+    def __init__(self, tarfile, fname):
+        super(MyWritingTarFile, self).__init__(zipfile=None, fname=fname)
+        self._tarfile = tarfile
+
+    def _store(self, path):
+        self._tarfile.add(path, arcname=self._fname)
+
+
+class TarFolder(object):
+    """
+    A folder-like interface to a tar file being written, analogous to the :py:class:`ZipFolder`.
+
+    Files and folders are added to the tar file as they are inserted, so an export can be written directly to a
+    compressed tar file without first copying the whole export to a sandbox folder.
+    """
+
+    def __init__(self, tarfolder_or_fname, mode=None, subfolder='.'):
+        """
+        :param tarfolder_or_fname: either another TarFolder instance,
+          of which you want to get a subfolder, or a filename to create.
+        :param mode: the file mode; see the tarfile.open docs for valid
+          strings. Note: can be specified only if tarfolder_or_fname is a
+          string (the filename to generate)
+        :param subfolder: the subfolder that specified the "current working
+          directory" in the tar file. If tarfolder_or_fname is a TarFolder,
+          subfolder is a relative path from tarfolder_or_fname.subfolder
+        """
+        import tarfile
+        import os
+
+        if isinstance(tarfolder_or_fname, six.string_types):
+            the_mode = mode
+            if the_mode is None:
+                the_mode = "w:gz"
+            self._tarfile = tarfile.open(tarfolder_or_fname, the_mode, format=tarfile.PAX_FORMAT,
+                                         dereference=True)
+            self._pwd = subfolder
+        else:
+            if mode is not None:
+                raise ValueError("Cannot specify 'mode' when passing a TarFolder")
+            self._tarfile = tarfolder_or_fname._tarfile
+            self._pwd = os.path.join(tarfolder_or_fname.pwd, subfolder)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        self._tarfile.close()
+
+    @property
+    def pwd(self):
+        return self._pwd
+
+    def open(self, fname, mode='r'):
+        if mode == 'w':
+            return MyWritingTarFile(
+                tarfile=self._tarfile, fname=self._get_internal_path(fname))
+        else:
+            return self._tarfile.extractfile(self._get_internal_path(fname))
+
+    def _get_internal_path(self, filename):
+        import os
+        return os.path.normpath(os.path.join(self.pwd, filename))
+
+    def get_subfolder(self, subfolder, create=False, reset_limit=False):
+        # reset_limit: ignored
+        # create: ignored, folders are created in the tar file when a file is inserted in them
+        subfolder = TarFolder(self, subfolder=subfolder)
+        return subfolder
+
+    def insert_path(self, src, dest_name=None, overwrite=True):
+        import os
+
+        if dest_name is None:
+            base_filename = six.text_type(os.path.basename(src))
+        else:
+            base_filename = six.text_type(dest_name)
+
+        base_filename = self._get_internal_path(base_filename)
+
+        src = six.text_type(src)
+
+        if not os.path.isabs(src):
+            raise ValueError("src must be an absolute path in insert_file")
+
+        if not overwrite:
+            if base_filename in self._tarfile.getnames():
+                raise IOError("destination already exists: {}".format(
+                    base_filename))
+
+        self._tarfile.add(src, arcname=base_filename)
+
+
 class ZipFolder(object):
     """
     To improve: if zipfile is closed, do something
@@ -2653,35 +2484,30 @@ def export(what, outfile='export_data.aiida.tar.gz', overwrite=False,
     :raise IOError: if overwrite==False and the filename already exists.
     """
     import os
-    import tarfile
     import time
-
-    from aiida.common.folders import SandboxFolder
+    import uuid
 
     if not overwrite and os.path.exists(outfile):
         raise IOError("The output file '{}' already "
                       "exists".format(outfile))
 
-    folder = SandboxFolder()
-    t1 = time.time()
-    export_tree(what, folder=folder, silent=silent, **kwargs)
-
-    t2 = time.time()
-
-    if not silent:
-        print("COMPRESSING...")
+    t = time.time()
 
-    t3 = time.time()
-    with tarfile.open(outfile, "w:gz", format=tarfile.PAX_FORMAT,
-                      dereference=True) as tar:
-        tar.add(folder.abspath, arcname="")
-    t4 = time.time()
+    # The export is compressed while it is written, rather than first written to a sandbox folder. It is written to
+    # a temporary file in the same folder, which only replaces the output file once the export succeeded, such that
+    # a failed export does not leave a partial archive nor lose the file that was to be overwritten
+    tmpfile = '{}.{}.tmp'.format(outfile, uuid.uuid4().hex)
+    try:
+        with TarFolder(tmpfile, mode='w:gz') as folder:
+            export_tree(what, folder=folder, silent=silent, **kwargs)
+        os.rename(tmpfile, outfile)
+    except Exception:
+        if os.path.exists(tmpfile):
+            os.remove(tmpfile)
+        raise
 
     if not silent:
-        filecr_time = t2 - t1
-        filecomp_time = t4 - t3
-        print("Exported in {:6.2g}s, compressed in {:6.2g}s, total: {:6.2g}s."
-              .format(filecr_time, filecomp_time, filecr_time + filecomp_time))
+        print("Exported and compressed in {:6.2g}s.".format(time.time() - t))
 
     if not silent:
         print("DONE.")
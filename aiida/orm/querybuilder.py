@@ -201,6 +201,9 @@ class QueryBuilder(object):
         :param order_by:
             How to order the results. As the 2 above, can be set also at later stage,
             check :func:`QueryBuilder.order_by` for more information.
+        :param bool prefetch:
+            Load the input and output links of the returned nodes in batches.
+            Check :func:`QueryBuilder.prefetch` for more information.
 
         """
         from aiida.backends.settings import BACKEND
@@ -326,6 +329,9 @@ class QueryBuilder(object):
         if order_spec:
             self.order_by(order_spec)
 
+        # Whether the links of the returned nodes are loaded in batches, can also be set with QueryBuilder.prefetch
+        self.prefetch(kwargs.pop('prefetch', False))
+
         # I've gone through all the keywords, popping each item
         # If kwargs is not empty, there is a problem:
         if kwargs:
@@ -1812,6 +1818,7 @@ class QueryBuilder(object):
             'order_by': self._order_by,
             'limit': self._limit,
             'offset': self._offset,
+            'prefetch': self._prefetch,
         })
 
         # ~ self._get_json_compatible()
@@ -2163,6 +2170,75 @@ class QueryBuilder(object):
         self._query = self.get_query().distinct()
         return self
 
+    def prefetch(self, prefetch=True):
+        """
+        Load the input and output links of the nodes that are returned, together with the nodes at their other end,
+        with two queries for each batch of results, such that calling ``get_inputs`` or ``get_outputs`` on the
+        returned nodes does not query the database again.
+        The attributes and extras of the nodes are always loaded together with them.
+        Does not execute the query!
+
+        Usage::
+
+            qb = QueryBuilder()
+            qb.append(Calculation, project=['*'])
+            for calc, in qb.prefetch().iterall(batch_size=1000):
+                print calc.get_inputs_dict()
+
+        To share the neighbouring nodes between the returned nodes, combine this with an identity map,
+        see :func:`aiida.orm.utils.identity_map.identity_map`.
+
+        :param bool prefetch: whether to prefetch the links
+        :returns: self
+        """
+        if not isinstance(prefetch, bool):
+            raise InputValidationError("prefetch has to be a boolean")
+        self._prefetch = prefetch
+        return self
+
+    def _prefetch_links(self, rows):
+        """
+        Prefetch the links of the nodes in the given rows of results, if prefetching is enabled.
+
+        :param rows: a list of rows, either lists of values or dictionaries of the values of each tag
+        """
+        if not self._prefetch:
+            return
+
+        nodes = []
+        for row in rows:
+            values = row
+            if isinstance(row, dict):
+                values = [value for projections in row.values() for value in projections.values()]
+            nodes.extend(value for value in values if isinstance(value, Node))
+
+        Node._prefetch_links(nodes)  # pylint: disable=protected-access
+
+    def _iter_prefetched(self, rows, batch_size):
+        """
+        Yield the given rows of results, prefetching the links of their nodes one batch of rows at a time.
+
+        :param rows: an iterable of rows of results
+        :param int batch_size: the number of rows of each batch, 100 if None
+        """
+        if not self._prefetch:
+            for row in rows:
+                yield row
+            return
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == (batch_size or 100):
+                self._prefetch_links(batch)
+                for item in batch:
+                    yield item
+                batch = []
+
+        self._prefetch_links(batch)
+        for item in batch:
+            yield item
+
     def first(self):
         """
         Executes query asking for one instance.
@@ -2193,6 +2269,8 @@ class QueryBuilder(object):
             # It still returns a list!
             else:
                 returnval = [self._impl.get_aiida_res(self._attrkeys_as_in_sql_result[0], resultrow)]
+        if returnval is not None:
+            self._prefetch_links([returnval])
         return returnval
 
     def one(self):
@@ -2235,8 +2313,9 @@ class QueryBuilder(object):
         """
 
         query = self.get_query()
+        rows = self._impl.iterall(query, batch_size, self._attrkeys_as_in_sql_result)
 
-        for item in self._impl.iterall(query, batch_size, self._attrkeys_as_in_sql_result):
+        for item in self._iter_prefetched(rows, batch_size):
             yield item
         return
 
@@ -2256,7 +2335,9 @@ class QueryBuilder(object):
         """
 
         query = self.get_query()
-        for item in self._impl.iterdict(query, batch_size, self.tag_to_projected_entity_dict):
+        rows = self._impl.iterdict(query, batch_size, self.tag_to_projected_entity_dict)
+
+        for item in self._iter_prefetched(rows, batch_size):
             yield item
 
     def all(self, batch_size=None):
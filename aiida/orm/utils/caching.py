@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Utilities to resolve cache hits for many nodes at once."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import collections
+
+__all__ = ['get_same_nodes']
+
+
+def get_same_nodes(nodes):
+    """
+    Return for each of the given nodes the stored node from which it can be cached, or `None` if there is none.
+
+    This is the batched equivalent of calling `node._get_same_node()` for each node: the stored nodes matching any of
+    the hashes are looked up with a single query on the hash index and the candidates are loaded with a single
+    further query. As for a single node, the candidates must be of the exact same class and be a valid cache, and the
+    one with the lowest pk is returned.
+
+    :param nodes: a list of nodes
+    :return: a list of the same length with, for each node, the stored node that is a valid cache for it or `None`
+    """
+    # pylint: disable=protected-access
+    from aiida.backends.utils import get_node_pks_by_hash
+    from aiida.orm.node import Node
+    from aiida.orm.querybuilder import QueryBuilder
+
+    keys = []
+    for node in nodes:
+        hash_ = node.get_hash() if node._cacheable else None
+        keys.append((hash_, node._plugin_type_string) if hash_ else None)
+
+    hashes = [key[0] for key in keys if key is not None]
+    node_types = [key[1] for key in keys if key is not None]
+
+    candidates = collections.defaultdict(list)
+    for pk, node_type, hash_ in get_node_pks_by_hash(hashes, node_types=node_types):
+        candidates[(hash_, node_type)].append(pk)
+
+    loaded = {}
+    candidate_pks = [pk for pks in candidates.values() for pk in pks]
+
+    if candidate_pks:
+        builder = QueryBuilder()
+        builder.append(Node, filters={'id': {'in': candidate_pks}})
+        loaded = {node.pk: node for node, in builder.iterall()}
+
+    same_nodes = []
+    for key in keys:
+        same_node = None
+        for pk in candidates.get(key, []) if key is not None else []:
+            if pk in loaded and loaded[pk]._is_valid_cache():
+                same_node = loaded[pk]
+                break
+        same_nodes.append(same_node)
+
+    return same_nodes
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Identity map that shares the node instances loaded from the database within a scope.
+
+By default every query or `load_node` call builds new node instances. Within the scope of the :func:`identity_map`
+context manager, a node that was already loaded is returned as the same instance instead, as long as it is among
+the most recently loaded ones::
+
+    from aiida.orm.utils.identity_map import identity_map
+
+    with identity_map():
+        assert load_node(pk) is load_node(pk)
+
+Note that the values of a node are therefore those of the first time it was loaded within the scope: changes made
+to the node by another process, or through another instance loaded outside of the scope, are not seen.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import collections
+import contextlib
+import threading
+
+__all__ = ('IdentityMap', 'identity_map', 'get_identity_map')
+
+DEFAULT_MAX_SIZE = 10000
+
+# The identity map of the current scope is kept per thread, since the node instances are not meant to be shared
+_STATE = threading.local()
+
+
+class IdentityMap(object):
+    """
+    Map of the pks of loaded nodes onto their instances, bounded to a maximum number of nodes.
+
+    When the map is full, adding a node discards the least recently used one.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        """
+        :param max_size: the maximum number of nodes in the map
+        """
+        if max_size < 1:
+            raise ValueError('the maximum size of the identity map should be a positive integer')
+
+        self._max_size = max_size
+        self._nodes = collections.OrderedDict()
+
+    @property
+    def max_size(self):
+        """Return the maximum number of nodes in the map."""
+        return self._max_size
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, pk):
+        return pk in self._nodes
+
+    def get(self, pk):
+        """
+        Return the node with the given pk, marking it as the most recently used one.
+
+        :param pk: the pk of the node
+        :return: the node instance, or None if it is not in the map
+        """
+        node = self._nodes.pop(pk, None)
+        if node is not None:
+            self._nodes[pk] = node
+        return node
+
+    def add(self, node):
+        """
+        Add a stored node to the map, discarding the least recently used node if the map is full.
+
+        :param node: the stored node instance
+        """
+        self._nodes.pop(node.pk, None)
+        self._nodes[node.pk] = node
+        while len(self._nodes) > self._max_size:
+            self._nodes.popitem(last=False)
+
+    def discard(self, pk):
+        """
+        Remove the node with the given pk from the map, if it is there.
+
+        :param pk: the pk of the node
+        """
+        self._nodes.pop(pk, None)
+
+    def clear(self):
+        """Remove all the nodes from the map."""
+        self._nodes.clear()
+
+
+def get_identity_map():
+    """
+    Return the identity map of the current scope.
+
+    :return: the :class:`IdentityMap`, or None if no :func:`identity_map` scope is active
+    """
+    return getattr(_STATE, 'identity_map', None)
+
+
+@contextlib.contextmanager
+def identity_map(max_size=DEFAULT_MAX_SIZE):
+    """
+    Context manager within which the loaded nodes are shared through an identity map.
+
+    Nested scopes use the identity map of the outermost one, which is cleared when that scope is exited. The scope
+    only applies to the thread that entered it.
+
+    :param max_size: the maximum number of nodes in the map
+    :return: the :class:`IdentityMap` of the scope
+    """
+    mapping = get_identity_map()
+
+    if mapping is not None:
+        yield mapping
+        return
+
+    mapping = _STATE.identity_map = IdentityMap(max_size)
+    try:
+        yield mapping
+    finally:
+        mapping.clear()
+        _STATE.identity_map = None
+
+
+def get_or_load_node(pk, loader):
+    """
+    Return the node with the given pk from the identity map, or load it and add it to the map.
+
+    Without an active identity map, or for a node without pk, this simply returns the loaded node.
+
+    :param pk: the pk of the node
+    :param loader: a callable without arguments that returns a new instance of the node
+    :return: the node instance
+    """
+    mapping = get_identity_map()
+
+    if mapping is None or pk is None:
+        return loader()
+
+    node = mapping.get(pk)
+    if node is None:
+        node = loader()
+        mapping.add(node)
+
+    return node
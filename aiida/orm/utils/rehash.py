@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Bulk recomputation of the hashes of stored nodes.
+
+The pipeline streams the pks of the nodes to rehash in pages ordered by pk, computes the hashes of each page, either
+in this process or in a pool of worker processes, and writes the `_aiida_hash` extras of the whole page back with
+batched statements. Since pages are processed in order of increasing pk, an interrupted run can be resumed from the
+last pk that was written.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import time
+
+__all__ = ['RehashStats', 'rehash_nodes', 'iter_node_pks']
+
+
+class RehashStats(object):
+    """Progress and throughput of a bulk rehash."""
+
+    def __init__(self):
+        self.processed = 0
+        self.failed = 0
+        self.last_pk = None
+        self.time_start = time.time()
+
+    @property
+    def elapsed(self):
+        """Return the time in seconds since the rehash started."""
+        return time.time() - self.time_start
+
+    @property
+    def throughput(self):
+        """Return the average number of nodes rehashed per second."""
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.
+
+
+def iter_node_pks(node_class, pks=None, start_pk=None, batch_size=1000):
+    """
+    Yield the pks of the nodes to rehash as lists of at most `batch_size` pks, ordered by increasing pk.
+
+    The pks are fetched page by page, seeking on the pk of the last node of the previous page, so that the pages can
+    be consumed while writes are committed in between and the memory usage does not depend on the number of nodes.
+
+    :param node_class: only include nodes that are an instance of this class or a sub class
+    :param pks: optional explicit list of pks, in which case the database is not queried
+    :param start_pk: only include nodes with a pk strictly larger than this value
+    :param batch_size: the number of pks per page
+    """
+    from aiida.orm.querybuilder import QueryBuilder
+
+    if pks is not None:
+        pks = sorted(pk for pk in set(pks) if start_pk is None or pk > start_pk)
+        for index in range(0, len(pks), batch_size):
+            yield pks[index:index + batch_size]
+        return
+
+    last_pk = start_pk
+
+    while True:
+        filters = {'id': {'>': last_pk}} if last_pk is not None else {}
+        builder = QueryBuilder()
+        builder.append(node_class, filters=filters, project=['id'], tag='node')
+        builder.order_by({'node': [{'id': 'asc'}]})
+        builder.limit(batch_size)
+        page = [pk for pk, in builder.iterall(batch_size=batch_size)]
+
+        if not page:
+            return
+
+        yield page
+        last_pk = page[-1]
+
+
+def _compute_hash(pk):
+    """Return the pk and the hash of the node with the given pk; the hash is `None` if it could not be computed."""
+    from aiida.orm import load_node
+    return pk, load_node(pk).get_hash()
+
+
+def rehash_nodes(node_class=None, pks=None, start_pk=None, batch_size=1000, processes=1, callback=None):
+    """
+    Recompute the hash of stored nodes and store it in their `_aiida_hash` extra.
+
+    :param node_class: only rehash nodes that are an instance of this class or a sub class, defaults to all nodes
+    :param pks: optional explicit list of pks of the nodes to rehash
+    :param start_pk: resume a previous run by only rehashing the nodes with a pk strictly larger than this value
+    :param batch_size: the number of nodes whose hashes are written in a single transaction
+    :param processes: the number of worker processes computing the hashes, with 1 they are computed in this process
+    :param callback: optional callable invoked with the :class:`RehashStats` after each batch has been written
+    :return: the :class:`RehashStats` of the run
+    """
+    from aiida.backends.utils import close_db_connections, set_extras_many
+    from aiida.orm.implementation.general.node import _HASH_EXTRA_KEY
+
+    if node_class is None:
+        from aiida.orm.node import Node
+        node_class = Node
+
+    stats = RehashStats()
+    pool = None
+
+    if processes > 1:
+        import multiprocessing
+        # Forked workers must not share the connections of this process, which reopens its own lazily afterwards
+        close_db_connections()
+        pool = multiprocessing.Pool(processes)
+
+    try:
+        for page in iter_node_pks(node_class, pks=pks, start_pk=start_pk, batch_size=batch_size):
+            if pool is not None:
+                results = pool.map(_compute_hash, page, chunksize=max(1, len(page) // (4 * processes)))
+            else:
+                results = [_compute_hash(pk) for pk in page]
+
+            set_extras_many([pk for pk, _ in results], _HASH_EXTRA_KEY, [hash_ for _, hash_ in results])
+
+            stats.processed += len(results)
+            stats.failed += len([hash_ for _, hash_ in results if hash_ is None])
+            stats.last_pk = page[-1]
+
+            if callback is not None:
+                callback(stats)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    return stats
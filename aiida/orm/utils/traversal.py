@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Traversal of the provenance graph.
+
+The nodes reachable from a set of nodes are defined by a set of rules, each of which is a link type and the direction
+in which links of that type are followed. The traversal is delegated to the query manager of the backend, which on
+PostgreSQL computes the whole closure with a single recursive query, and the resulting pks are returned as a compact
+sorted array rather than as a set of Python integers.
+"""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+
+import array
+import bisect
+from collections import namedtuple
+
+__all__ = ['NodePks', 'TraversalRule', 'traverse_graph']
+
+# The maximum number of node pks per query, when the traversal cannot be done in a single query
+TRAVERSAL_BATCH_SIZE = 1000
+
+
+class TraversalRule(namedtuple('TraversalRule', ['link_type', 'forward'])):
+    """
+    A rule of the graph traversal: follow the links of type `link_type`, a :py:class:`LinkType`, from their input to
+    their output node if `forward` is True, or from their output to their input node otherwise.
+    """
+    __slots__ = ()
+
+
+class NodePks(array.array):  # pylint: disable=too-few-public-methods
+    """
+    A sorted array of distinct node pks.
+
+    It takes a fraction of the memory of a set of integers, and membership is tested with a binary search.
+    """
+
+    def __new__(cls, pks=()):
+        return super(NodePks, cls).__new__(cls, 'l', sorted(set(pks)))
+
+    def __contains__(self, pk):
+        index = bisect.bisect_left(self, pk)
+        return index < len(self) and self[index] == pk
+
+
+def traverse_graph(node_pks, rules, max_depth=None, batch_size=TRAVERSAL_BATCH_SIZE):
+    """
+    Return the pks of the nodes reachable from the given nodes by following links according to the given rules.
+
+    :param node_pks: an iterable of the pks of the nodes to start from, which are always part of the result
+    :param rules: an iterable of :py:class:`TraversalRule`
+    :param max_depth: the maximum number of links followed from the starting nodes, no limit if None
+    :param batch_size: the maximum number of node pks per query, if the traversal cannot be done in a single query
+    :return: a :py:class:`NodePks` array
+    """
+    from aiida.orm.backend import construct_backend
+
+    forward_link_types = set()
+    backward_link_types = set()
+
+    for rule in rules:
+        if rule.forward:
+            forward_link_types.add(rule.link_type.value)
+        else:
+            backward_link_types.add(rule.link_type.value)
+
+    query_manager = construct_backend().query_manager
+    pks = query_manager.traverse_links(
+        node_pks, sorted(forward_link_types), sorted(backward_link_types), max_depth=max_depth, batch_size=batch_size)
+
+    return NodePks(pks)
@@ -314,6 +314,69 @@ class Scheduler(object):
         with self.transport:
             retval, stdout, stderr = self.transport.exec_command_wait(command)
 
+        return self._format_detailed_jobinfo(command, retval, stdout, stderr)
+
+    def _get_detailed_jobinfo_many_command(self, jobids):
+        """
+        Return the command to run to get the detailed information on many jobs at once.
+
+        Plugins that implement this method should also implement `_split_detailed_jobinfo_output`.
+
+        :param jobids: a list of job ids
+        :raises: :class:`aiida.common.exceptions.FeatureNotAvailable`
+        """
+        # pylint: disable=no-self-use, unused-argument
+        raise FeatureNotAvailable("Cannot get detailed job info of many jobs at once")
+
+    def _split_detailed_jobinfo_output(self, jobids, stdout):
+        """
+        Split the output of the command returned by `_get_detailed_jobinfo_many_command` per job.
+
+        :param jobids: the list of job ids that were passed to `_get_detailed_jobinfo_many_command`
+        :param stdout: the output of the command
+        :return: a dictionary with the job ids as keys and the part of the output relative to that job as values
+        """
+        raise NotImplementedError
+
+    def get_detailed_jobinfo_many(self, jobids):
+        """
+        Return the detailed job information of many jobs, as returned by `get_detailed_jobinfo` for each of them.
+
+        If the plugin implements `_get_detailed_jobinfo_many_command`, a single command is run for all the jobs,
+        otherwise `get_detailed_jobinfo` is called for each job.
+
+        :param jobids: a list of job ids
+        :return: a dictionary with the job ids as keys and the detailed job information strings as values
+        :raises: :class:`aiida.common.exceptions.FeatureNotAvailable`
+        """
+        if not jobids:
+            return {}
+
+        try:
+            command = self._get_detailed_jobinfo_many_command(jobids=jobids)
+        except FeatureNotAvailable:
+            return {jobid: self.get_detailed_jobinfo(jobid) for jobid in jobids}
+
+        with self.transport:
+            retval, stdout, stderr = self.transport.exec_command_wait(command)
+
+        if retval == 0:
+            outputs = self._split_detailed_jobinfo_output(jobids, stdout)
+        else:
+            outputs = {}
+
+        return {
+            jobid: self._format_detailed_jobinfo(command, retval, outputs.get(jobid, stdout), stderr)
+            for jobid in jobids
+        }
+
+    @staticmethod
+    def _format_detailed_jobinfo(command, retval, stdout, stderr):
+        """
+        Format the output of a detailed job info command.
+
+        :return: a string with the command, its return value, stdout and stderr
+        """
         return u"""Detailed jobinfo obtained with command '{}'
 Return Code: {}
 -------------------------------------------------------------
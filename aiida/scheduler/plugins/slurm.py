@@ -165,6 +165,16 @@ class SlurmScheduler(aiida.scheduler.Scheduler):
     # The class to be used for the job resource.
     _job_resource_class = SlurmJobResource
 
+    # Fields to query with sacct for the detailed job information
+    _detailed_jobinfo_fields = [
+        'AllocCPUS', 'Account', 'AssocID', 'AveCPU', 'AvePages', 'AveRSS', 'AveVMSize', 'Cluster', 'Comment',
+        'CPUTime', 'CPUTimeRAW', 'DerivedExitCode', 'Elapsed', 'Eligible', 'End', 'ExitCode', 'GID', 'Group', 'JobID',
+        'JobName', 'MaxRSS', 'MaxRSSNode', 'MaxRSSTask', 'MaxVMSize', 'MaxVMSizeNode', 'MaxVMSizeTask', 'MinCPU',
+        'MinCPUNode', 'MinCPUTask', 'NCPUS', 'NNodes', 'NodeList', 'NTasks', 'Priority', 'Partition', 'QOSRAW',
+        'ReqCPUS', 'Reserved', 'ResvCPU', 'ResvCPURAW', 'Start', 'State', 'Submit', 'Suspended', 'SystemCPU',
+        'Timelimit', 'TotalCPU', 'UID', 'User', 'UserCPU'
+    ]
+
     # Fields to query or to parse
     # Unavailable fields: substate, cputime
     fields = [
@@ -231,13 +241,39 @@ class SlurmScheduler(aiida.scheduler.Scheduler):
         --parsable split the fields with a pipe (|), adding a pipe also at
         the end.
         """
-        return "sacct --format=AllocCPUS,Account,AssocID,AveCPU,AvePages," \
-               "AveRSS,AveVMSize,Cluster,Comment,CPUTime,CPUTimeRAW,DerivedExitCode," \
-               "Elapsed,Eligible,End,ExitCode,GID,Group,JobID,JobName,MaxRSS,MaxRSSNode," \
-               "MaxRSSTask,MaxVMSize,MaxVMSizeNode,MaxVMSizeTask,MinCPU,MinCPUNode," \
-               "MinCPUTask,NCPUS,NNodes,NodeList,NTasks,Priority,Partition,QOSRAW,ReqCPUS," \
-               "Reserved,ResvCPU,ResvCPURAW,Start,State,Submit,Suspended,SystemCPU,Timelimit," \
-               "TotalCPU,UID,User,UserCPU --parsable --jobs={}".format(jobid)
+        return self._get_detailed_jobinfo_many_command([jobid])
+
+    def _get_detailed_jobinfo_many_command(self, jobids):
+        """
+        Return the command to run to get the detailed information on many jobs with a single call to sacct.
+        """
+        return "sacct --format={} --parsable --jobs={}".format(','.join(self._detailed_jobinfo_fields),
+                                                               ','.join([str(jobid) for jobid in jobids]))
+
+    def _split_detailed_jobinfo_output(self, jobids, stdout):
+        """
+        Split the output of sacct per job, based on the JobID field.
+
+        Each job can have multiple lines, one for the allocation and one for each job step, whose JobID is the id of
+        the job followed by a dot and the name of the step. The header line is repeated for each job.
+        """
+        lines = stdout.splitlines()
+        if not lines:
+            return {}
+
+        header = lines[0]
+        index = self._detailed_jobinfo_fields.index('JobID')
+        job_lines = {str(jobid): [] for jobid in jobids}
+
+        for line in lines[1:]:
+            fields = line.split('|')
+            if len(fields) <= index:
+                continue
+            job_id = fields[index].split('.')[0]
+            if job_id in job_lines:
+                job_lines[job_id].append(line)
+
+        return {jobid: '\n'.join([header] + job_lines[str(jobid)]) + '\n' for jobid in jobids}
 
     def _get_submit_script_header(self, job_tmpl):
         """
@@ -320,5 +320,39 @@ class TestSubmitScript(unittest.TestCase):
                 num_machines=1, num_mpiprocs_per_machine=1, num_cores_per_machine=24, num_cores_per_mpiproc=23)
 
 
+class TestDetailedJobinfo(unittest.TestCase):
+    """
+    Tests for the retrieval of the detailed job information of many jobs with a single sacct call
+    """
+
+    def test_detailed_jobinfo_many_command(self):
+        """Test that all job ids are passed to a single sacct command."""
+        scheduler = SlurmScheduler()
+        command = scheduler._get_detailed_jobinfo_many_command(['123', 456])
+        self.assertTrue(command.startswith('sacct --format='))
+        self.assertTrue(command.endswith('--parsable --jobs=123,456'))
+        self.assertEqual(scheduler._get_detailed_jobinfo_command('123'),
+                         scheduler._get_detailed_jobinfo_many_command(['123']))
+
+    def test_split_detailed_jobinfo_output(self):
+        """Test that the sacct output is split per job, including the lines of the job steps."""
+        scheduler = SlurmScheduler()
+        fields = scheduler._detailed_jobinfo_fields
+        index = fields.index('JobID')
+
+        def line(job_id):
+            values = [''] * len(fields)
+            values[index] = job_id
+            return '|'.join(values) + '|'
+
+        header = '|'.join(fields) + '|'
+        stdout = '\n'.join([header, line('123'), line('123.batch'), line('456'), line('1234')]) + '\n'
+        outputs = scheduler._split_detailed_jobinfo_output(['123', '456', '789'], stdout)
+
+        self.assertEqual(outputs['123'], '\n'.join([header, line('123'), line('123.batch')]) + '\n')
+        self.assertEqual(outputs['456'], '\n'.join([header, line('456')]) + '\n')
+        self.assertEqual(outputs['789'], header + '\n')
+
+
 if __name__ == '__main__':
     unittest.main()
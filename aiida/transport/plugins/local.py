@@ -345,6 +345,68 @@ class LocalTransport(Transport):
 
         shutil.copyfile(localpath, the_destination)
 
+    def putarchive(self, entries, remotepath):
+        """
+        Put a list of local files and folders in a folder.
+
+        For the local transport there is no round trip to save by packing the entries in an archive, so they are
+        copied directly with `put`, in order, creating missing intermediate folders of the destination names.
+
+        :param entries: a list of tuples (localpath, name) where localpath is the absolute path of a local file or
+            folder and name its destination path, relative to remotepath
+        :param str remotepath: path to the folder in which to copy the entries
+        """
+        destination = os.path.join(self.curdir, remotepath)
+
+        for localpath, name in entries:
+            target = os.path.join(destination, os.path.normpath(name))
+            parent = os.path.dirname(target)
+            if not os.path.isdir(parent):
+                os.makedirs(parent)
+            if os.path.isdir(localpath) and os.path.isdir(target):
+                # Merge the folder into the existing one, like unpacking an archive would
+                for item in os.listdir(localpath):
+                    self.put(os.path.join(localpath, item), os.path.join(target, item))
+            else:
+                self.put(localpath, target)
+
+    def getarchive(self, remotepaths, localpath):
+        """
+        Get a list of files and folders, or glob patterns thereof.
+
+        For the local transport there is no round trip to save by packing the matching paths in an archive, so they
+        are copied directly in the local folder, keeping their path relative to the current directory. Paths that
+        do not exist, or patterns that do not match anything, are ignored.
+
+        :param remotepaths: a list of paths or glob patterns relative to the current directory
+        :param str localpath: absolute path to the local folder in which to copy the matching paths
+        """
+        if not os.path.isabs(localpath):
+            raise ValueError('The localpath must be an absolute path')
+
+        for remotepath in remotepaths:
+            if os.path.isabs(remotepath) or os.pardir in remotepath.split(os.path.sep):
+                raise ValueError('The remote paths must be relative and within the current directory')
+
+            if self.has_magic(remotepath):
+                names = self.glob(remotepath)
+            elif self.path_exists(remotepath):
+                names = [remotepath]
+            else:
+                names = []
+
+            for name in names:
+                source = os.path.join(self.curdir, name)
+                target = os.path.join(localpath, os.path.relpath(source, self.curdir))
+                parent = os.path.dirname(target)
+                if not os.path.isdir(parent):
+                    os.makedirs(parent)
+                if os.path.isdir(source):
+                    if not os.path.exists(target):
+                        shutil.copytree(source, target)
+                else:
+                    shutil.copyfile(source, target)
+
     def puttree(self, localpath, remotepath, *args, **kwargs):
         """
         Copies a folder recursively from localpath to remotepath.
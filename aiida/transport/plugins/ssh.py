@@ -366,6 +366,20 @@ class SshTransport(aiida.transport.Transport):
         self._client.close()
         self._is_open = False
 
+    def is_alive(self):
+        """
+        Check that the transport is open and that both the SSH connection and the SFTP channel are still active.
+        """
+        if not self._is_open:
+            return False
+
+        connection = self._client.get_transport()
+        if connection is None or not connection.is_active():
+            return False
+
+        channel = self._sftp.get_channel()
+        return channel is not None and not channel.closed
+
     @property
     def sshclient(self):
         if not self._is_open:
@@ -1256,6 +1256,82 @@ class TestPutGetTree(unittest.TestCase):
             t.rmdir(directory)
 
 
+    @run_for_all_plugins
+    def test_putarchive(self, custom_transport):
+        """Test that putarchive copies files and folders in order, overwriting earlier entries with the same name."""
+        import os
+        import shutil
+        import tempfile
+
+        local_dir = tempfile.mkdtemp()
+        remote_dir = tempfile.mkdtemp()
+
+        try:
+            os.mkdir(os.path.join(local_dir, 'subfolder'))
+            for filename, content in [('first.txt', u'first'), ('second.txt', u'second'),
+                                      (os.path.join('subfolder', 'nested.txt'), u'nested')]:
+                with io.open(os.path.join(local_dir, filename), 'w', encoding='utf8') as fhandle:
+                    fhandle.write(content)
+
+            entries = [
+                (os.path.join(local_dir, 'first.txt'), 'file.txt'),
+                (os.path.join(local_dir, 'subfolder'), 'folder'),
+                (os.path.join(local_dir, 'second.txt'), 'file.txt'),
+                (os.path.join(local_dir, 'first.txt'), os.path.join('deep', 'path', 'file.txt')),
+            ]
+
+            with custom_transport as t:
+                t.chdir(remote_dir)
+                t.putarchive(entries, remote_dir)
+
+                self.assertEqual(sorted(t.listdir('.')), ['deep', 'file.txt', 'folder'])
+                self.assertEqual(t.listdir('folder'), ['nested.txt'])
+                self.assertTrue(t.isfile(os.path.join('deep', 'path', 'file.txt')))
+
+            with io.open(os.path.join(remote_dir, 'file.txt'), encoding='utf8') as fhandle:
+                self.assertEqual(fhandle.read(), u'second')
+        finally:
+            shutil.rmtree(local_dir)
+            shutil.rmtree(remote_dir)
+
+
+    @run_for_all_plugins
+    def test_getarchive(self, custom_transport):
+        """Test that getarchive retrieves the paths matching the patterns, keeping their relative path."""
+        import os
+        import shutil
+        import tempfile
+
+        local_dir = tempfile.mkdtemp()
+        remote_dir = tempfile.mkdtemp()
+
+        try:
+            os.mkdir(os.path.join(remote_dir, 'out'))
+            for filename in ['a.out', 'b.out', 'c.txt', "with space's.out", os.path.join('out', 'nested.dat')]:
+                with io.open(os.path.join(remote_dir, filename), 'w', encoding='utf8') as fhandle:
+                    fhandle.write(u'content')
+            # A symbolic link is retrieved as the file it points to
+            os.symlink(os.path.join(remote_dir, 'c.txt'), os.path.join(remote_dir, 'link.out'))
+
+            with custom_transport as t:
+                t.chdir(remote_dir)
+                t.getarchive(['*.out', 'out/*.dat', 'non_existing.txt', 'non_matching*'], local_dir)
+                self.assertEqual(
+                    sorted(t.listdir('.')), ['a.out', 'b.out', 'c.txt', 'link.out', 'out', "with space's.out"])
+
+                with self.assertRaises(ValueError):
+                    t.getarchive([os.path.join('..', 'a.out')], local_dir)
+
+            self.assertEqual(sorted(os.listdir(local_dir)), ['a.out', 'b.out', 'link.out', 'out', "with space's.out"])
+            self.assertEqual(os.listdir(os.path.join(local_dir, 'out')), ['nested.dat'])
+            self.assertFalse(os.path.islink(os.path.join(local_dir, 'link.out')))
+            with io.open(os.path.join(local_dir, 'link.out'), encoding='utf8') as fhandle:
+                self.assertEqual(fhandle.read(), u'content')
+        finally:
+            shutil.rmtree(local_dir)
+            shutil.rmtree(remote_dir)
+
+
 class TestExecuteCommandWait(unittest.TestCase):
     """
     Test some simple command executions and stdin/stdout management.
@@ -36,6 +36,7 @@ class Transport(object):
     # See the ssh or local plugin to see the format
     _valid_auth_params = None
     _MAGIC_CHECK = re.compile('[*?[]')
+    _WILDCARD_SPLIT = re.compile(r'[*?]|\[!?[\w.-]+\]')
     _valid_auth_options = []
     _common_auth_options = [('safe_interval', {
         'type': int,
@@ -98,6 +99,17 @@ class Transport(object):
     def is_open(self):
         return self._is_open
 
+    def is_alive(self):
+        """
+        Check whether an open transport is still usable, e.g. before reusing a connection that was kept open.
+
+        The base implementation only checks the open flag; plugins that keep a connection to a remote machine
+        should override it to also check that the underlying connection was not dropped.
+
+        :return: True if the transport is open and can be used, False otherwise
+        """
+        return self.is_open
+
     def open(self):
         """
         Opens a local transport channel
@@ -577,6 +589,118 @@ class Transport(object):
         """
         raise NotImplementedError
 
+    def putarchive(self, entries, remotepath):
+        """
+        Put a list of local files and folders in a remote folder with a single transfer.
+
+        The entries are packed in a tar archive, that is copied with a single call to `putfile` and is then unpacked
+        in place on the remote with the `tar` command. Entries are added to the archive in the order in which they
+        are given, such that a later entry overwrites an earlier one with the same name, like consecutive calls to
+        `put` would do. Missing intermediate folders of the destination names are created.
+
+        :param entries: a list of tuples (localpath, name) where localpath is the absolute path of a local file or
+            folder and name its destination path, relative to remotepath
+        :param str remotepath: path to the remote folder in which to unpack the entries
+        :raise IOError: if the archive could not be unpacked on the remote
+        """
+        import tarfile
+        import tempfile
+        import uuid
+        from aiida.common.utils import escape_for_bash
+
+        remote_archive = os.path.join(remotepath, '.aiida_upload_{}.tar'.format(uuid.uuid4().hex))
+
+        with tempfile.NamedTemporaryFile(suffix='.tar') as handle:
+            with tarfile.open(fileobj=handle, mode='w', dereference=True) as archive:
+                for localpath, name in entries:
+                    if not os.path.isabs(localpath):
+                        raise ValueError('The localpath must be an absolute path')
+                    archive.add(localpath, arcname=os.path.normpath(name))
+            handle.flush()
+            self.putfile(handle.name, remote_archive)
+
+        try:
+            command = 'tar -xf {} -C {}'.format(escape_for_bash(remote_archive), escape_for_bash(remotepath))
+            retval, _, stderr = self.exec_command_wait(command)
+        finally:
+            self.remove(remote_archive)
+
+        if retval != 0:
+            raise IOError('Error while unpacking the archive in {}: {}'.format(remotepath, stderr))
+
+    def getarchive(self, remotepaths, localpath):
+        """
+        Get a list of remote files and folders, or glob patterns thereof, with a single transfer.
+
+        The patterns are resolved by the shell of the remote in a single command that packs all matching paths in a
+        compressed tar archive. The archive is copied with a single call to `getfile` and unpacked in the local
+        folder, where the retrieved paths keep their path relative to the current remote directory. Paths that do
+        not exist, or patterns that do not match anything, are ignored. Symbolic links are followed on the remote, as
+        `get` does, and any link, or other entry that is not a file or folder, is skipped when unpacking the archive.
+
+        :param remotepaths: a list of paths or glob patterns relative to the current remote directory
+        :param str localpath: absolute path to the local folder in which to unpack the archive
+        :raise IOError: if the archive could not be created on the remote
+        """
+        import tarfile
+        import tempfile
+        import uuid
+        from aiida.common.utils import escape_for_bash
+
+        if not os.path.isabs(localpath):
+            raise ValueError('The localpath must be an absolute path')
+
+        for remotepath in remotepaths:
+            if os.path.isabs(remotepath) or os.pardir in remotepath.split(os.path.sep):
+                raise ValueError('The remote paths must be relative and within the current directory')
+
+        if not remotepaths:
+            return
+
+        remote_archive = '.aiida_retrieve_{}.tar.gz'.format(uuid.uuid4().hex)
+        patterns = ' '.join([self._escape_pattern_for_bash(remotepath) for remotepath in remotepaths])
+        command = 'tar -chzf {} --ignore-failed-read -- {}'.format(escape_for_bash(remote_archive), patterns)
+
+        try:
+            retval, _, stderr = self.exec_command_wait(command)
+
+            if retval != 0:
+                raise IOError('Error while creating the archive in {}: {}'.format(self.getcwd(), stderr))
+
+            with tempfile.NamedTemporaryFile(suffix='.tar.gz') as handle:
+                self.getfile(remote_archive, handle.name)
+                with tarfile.open(handle.name, mode='r:gz') as archive:
+                    # Only extract files and folders within the local folder, links could point outside of it
+                    members = [
+                        member for member in archive.getmembers() if (member.isfile() or member.isdir()) and
+                        not os.path.isabs(member.name) and os.pardir not in member.name.split('/')
+                    ]
+                    archive.extractall(localpath, members=members)
+        finally:
+            if self.isfile(remote_archive):
+                self.remove(remote_archive)
+
+    def _escape_pattern_for_bash(self, pattern):
+        """
+        Escape a glob pattern for bash, quoting everything but the wildcards such that the shell expands them.
+
+        :param str pattern: a path that may contain the wildcards `*`, `?` and `[...]`
+        :return: the escaped pattern
+        """
+        from aiida.common.utils import escape_for_bash
+
+        parts = []
+        position = 0
+        for match in self._WILDCARD_SPLIT.finditer(pattern):
+            if match.start() > position:
+                parts.append(escape_for_bash(pattern[position:match.start()]))
+            parts.append(match.group())
+            position = match.end()
+        if position < len(pattern):
+            parts.append(escape_for_bash(pattern[position:]))
+
+        return ''.join(parts)
+
     def remove(self, path):
         """
         Remove the file at the given path. This only works on files;
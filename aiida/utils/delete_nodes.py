@@ -44,7 +44,9 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
     from aiida.orm.data import Data
     from aiida.orm import load_node
     from aiida.orm.backend import construct_backend
-    from aiida.backends.utils import delete_nodes_and_connections
+    from aiida.orm.utils.traversal import TraversalRule, traverse_graph
+    from aiida.backends.utils import delete_nodes_and_connections, increment_group_membership_version
+    from aiida.orm.utils.identity_map import get_identity_map
 
     backend = construct_backend()
     user_email = backend.users.get_automatic_user().email
@@ -56,32 +58,16 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
             print("Nothing to delete")
         return
 
-    # The following code is just for the querying of downwards provenance.
-    # Ideally, there should be a module to interface with, but this is the solution for now.
-    # By only dealing with ids, and keeping track of what has been already
-    # visited in the query, there's good performance and no infinite loops.
-    link_types_to_follow = [LinkType.CREATE.value, LinkType.INPUT.value]
+    # The nodes to delete are all the nodes reachable downwards in the provenance graph, through the links
+    # specified, which are found with a single traversal query.
+    link_types_to_follow = [LinkType.CREATE, LinkType.INPUT]
     if follow_calls:
-        link_types_to_follow.append(LinkType.CALL.value)
+        link_types_to_follow.append(LinkType.CALL)
     if follow_returns:
-        link_types_to_follow.append(LinkType.RETURN.value)
+        link_types_to_follow.append(LinkType.RETURN)
 
-    edge_filters = {'type': {'in': link_types_to_follow}}
-
-    # Operational set always includes the recently (in the last iteration added) nodes.
-    operational_set = set().union(set(pks))  # Union to copy the set!
-    pks_set_to_delete = set().union(set(pks))
-    while operational_set:
-        # new_pks_set are the the pks of all nodes that are connected to the operational node set
-        # with the links specified.
-        new_pks_set = set([i for i, in QueryBuilder().append(
-            Node, filters={'id': {'in': operational_set}}).append(
-            Node, project='id', edge_filters=edge_filters).iterall()])
-        # The operational set is only those pks that haven't been yet put into the pks_set_to_delete.
-        operational_set = new_pks_set.difference(pks_set_to_delete)
-
-        # I add these pks in the pks_set_to_delete with a union
-        pks_set_to_delete = pks_set_to_delete.union(new_pks_set)
+    pks_set_to_delete = traverse_graph(pks, [TraversalRule(link_type, forward=True)
+                                             for link_type in link_types_to_follow])
 
     if verbosity > 0:
         print("I {} delete {} node{}"
@@ -164,6 +150,13 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
     folders = [load_node(_).folder for _ in pks_set_to_delete]
 
     delete_nodes_and_connections(pks_set_to_delete)
+    # The deleted nodes are removed from their groups as well
+    increment_group_membership_version()
+
+    # The deleted nodes, and the links of their neighbours that may have been prefetched, should not be served anymore
+    mapping = get_identity_map()
+    if mapping is not None:
+        mapping.clear()
 
     if not disable_checks:
         # I pass now to the log the information for calculations losing created data or called instances
@@ -18,6 +18,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
 
+import io
 from functools import partial
 import yaml
 
@@ -246,3 +247,159 @@ def deserialize(serialized):
     :return: the deserialized data structure
     """
     return yaml.load(serialized, Loader=AiiDALoader)
+
+
+class CheckpointCodec(object):
+    """
+    Base class of the codecs with which the process checkpoints are encoded into, and decoded from, byte strings.
+
+    A codec is registered under its `name`, which is stored alongside every encoded checkpoint, such that checkpoints
+    can always be decoded with the codec that encoded them.
+
+    A codec whose decoding can execute arbitrary code sets `trusted_only`, in which case the persister only decodes the
+    checkpoints encoded with it if it was explicitly configured to use that codec.
+    """
+
+    name = None
+    trusted_only = False
+
+    def encode(self, data):
+        """
+        Encode a data structure into a byte string
+
+        :param data: the data structure to encode
+        :return: the encoded byte string
+        """
+        raise NotImplementedError
+
+    def decode(self, encoded):
+        """
+        Decode a byte string into the data structure that it represents
+
+        :param encoded: the encoded byte string
+        :return: the decoded data structure
+        """
+        raise NotImplementedError
+
+
+class YamlCodec(CheckpointCodec):
+    """Codec that encodes data structures with the YAML serialization of :py:func:`serialize`."""
+
+    name = 'yaml'
+
+    def encode(self, data):
+        return serialize(data, encoding='utf-8')
+
+    def decode(self, encoded):
+        return deserialize(encoded)
+
+
+class PickleCodec(CheckpointCodec):
+    """
+    Codec that encodes data structures with the binary pickle protocol.
+
+    AiiDA nodes, groups and computers are not pickled themselves but stored by reference, as their UUID, and they are
+    reloaded from the database when the data structure is decoded. The encoding is an order of magnitude faster and
+    more compact than the YAML one.
+
+    Unpickling can execute arbitrary code, so the checkpoints should only be decoded if the content of the database
+    is trusted, and a checkpoint pickled with one major version of python cannot reliably be loaded with the other.
+    """
+
+    name = 'pickle'
+    trusted_only = True
+    protocol = 2
+
+    _NODE_REFERENCE = 'aiida_node'
+    _GROUP_REFERENCE = 'aiida_group'
+    _COMPUTER_REFERENCE = 'aiida_computer'
+
+    @classmethod
+    def persistent_id(cls, obj):
+        """
+        Return the reference with which an AiiDA entity is pickled, or None for any other object.
+
+        :param obj: the object to pickle
+        :return: a tuple of the type of reference and the UUID of the entity, or None
+        :raises ValueError: if the entity is not stored
+        """
+        for orm_class, reference in ((orm.Node, cls._NODE_REFERENCE), (orm.Group, cls._GROUP_REFERENCE),
+                                     (orm.Computer, cls._COMPUTER_REFERENCE)):
+            if isinstance(obj, orm_class):
+                if not obj.is_stored:
+                    raise ValueError('The {} must be stored to be able to represent'.format(orm_class.__name__))
+                return reference, u'{}'.format(obj.uuid)
+
+        return None
+
+    @classmethod
+    def persistent_load(cls, pid):
+        """
+        Load the AiiDA entity from the reference with which it was pickled.
+
+        :param pid: a tuple of the type of reference and the UUID of the entity
+        :return: the AiiDA entity
+        :raises UnpicklingError: if the type of reference is unknown
+        """
+        from six.moves import cPickle as pickle
+        from aiida.orm.backend import construct_backend
+
+        reference, uuid = pid
+
+        if reference == cls._NODE_REFERENCE:
+            return orm.load_node(uuid=uuid)
+        if reference == cls._GROUP_REFERENCE:
+            return orm.load_group(uuid=uuid)
+        if reference == cls._COMPUTER_REFERENCE:
+            return construct_backend().computers.get(uuid=uuid)
+
+        raise pickle.UnpicklingError('unknown persistent reference {}'.format(reference))
+
+    def encode(self, data):
+        from six.moves import cPickle as pickle
+
+        stream = io.BytesIO()
+        pickler = pickle.Pickler(stream, self.protocol)
+        pickler.persistent_id = self.persistent_id
+        pickler.dump(data)
+
+        return stream.getvalue()
+
+    def decode(self, encoded):
+        from six.moves import cPickle as pickle
+
+        unpickler = pickle.Unpickler(io.BytesIO(encoded))
+        unpickler.persistent_load = self.persistent_load
+
+        return unpickler.load()
+
+
+CHECKPOINT_CODECS = {}
+
+
+def register_checkpoint_codec(codec):
+    """
+    Register a checkpoint codec under its name, replacing any codec previously registered under the same name
+
+    :param codec: an instance of :py:class:`CheckpointCodec`
+    """
+    CHECKPOINT_CODECS[codec.name] = codec
+
+
+def get_checkpoint_codec(name):
+    """
+    Return the registered checkpoint codec with the given name
+
+    :param name: the name of the codec
+    :return: an instance of :py:class:`CheckpointCodec`
+    :raises ValueError: if no codec is registered under the given name
+    """
+    try:
+        return CHECKPOINT_CODECS[name]
+    except KeyError:
+        raise ValueError("unknown checkpoint codec '{}', registered codecs are: {}".format(
+            name, ', '.join(sorted(CHECKPOINT_CODECS))))
+
+
+register_checkpoint_codec(YamlCodec())
+register_checkpoint_codec(PickleCodec())
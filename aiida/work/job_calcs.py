@@ -90,16 +90,20 @@ class JobsList(object):
             scheduler_response = scheduler.getJobs(**kwargs)
             jobs_cache = {}
 
+            # If jobs are done then get their detailed job information, with a single call if the scheduler supports it
+            done_job_ids = [
+                job_id for job_id, job_info in iteritems(scheduler_response)
+                if job_info.job_state == schedulers.JOB_STATES.DONE
+            ]
+            try:
+                detailed_job_infos = scheduler.get_detailed_jobinfo_many(done_job_ids)
+            except exceptions.FeatureNotAvailable:
+                detailed_job_infos = {
+                    job_id: 'This scheduler does not implement get_detailed_jobinfo' for job_id in done_job_ids
+                }
+
             for job_id, job_info in iteritems(scheduler_response):
-                # If the job is done then get detailed job information
-                detailed_job_info = None
-                if job_info.job_state == schedulers.JOB_STATES.DONE:
-                    try:
-                        detailed_job_info = scheduler.get_detailed_jobinfo(job_id)
-                    except exceptions.FeatureNotAvailable:
-                        detailed_job_info = 'This scheduler does not implement get_detailed_jobinfo'
-
-                job_info.detailedJobinfo = detailed_job_info
+                job_info.detailedJobinfo = detailed_job_infos.get(job_id, None)
                 jobs_cache[job_id] = job_info
 
             raise gen.Return(jobs_cache)
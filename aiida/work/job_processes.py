@@ -333,6 +333,7 @@ class Waiting(plumpy.Waiting):
 
         calculation = self.process.calc
         transport_queue = self.process.runner.transport
+        node_updates = self.process.runner.node_updates
 
         if isinstance(self.data, tuple):
             command = self.data[0]
@@ -340,7 +341,7 @@ class Waiting(plumpy.Waiting):
         else:
             command = self.data
 
-        calculation._set_process_status('Waiting for transport task: {}'.format(command))
+        node_updates.set_process_status(calculation, 'Waiting for transport task: {}'.format(command))
 
         try:
 
@@ -379,10 +380,10 @@ class Waiting(plumpy.Waiting):
             self._killing.set_result(True)
             six.reraise(*exc_info)
         except Return:
-            calculation._set_process_status(None)
+            node_updates.set_process_status(calculation, None)
             raise
         except (plumpy.Interruption, plumpy.CancelledError):
-            calculation._set_process_status('Transport task {} was interrupted'.format(command))
+            node_updates.set_process_status(calculation, 'Transport task {} was interrupted'.format(command))
             raise
         finally:
             # If we were trying to kill but we didn't deal with it, make sure it's set here
@@ -67,7 +67,8 @@ class AiiDAManager(object):
         :rtype: :class:`plumpy.Persister`
         """
         if cls._PERSISTER is None:
-            cls._PERSISTER = persistence.AiiDAPersister()
+            codec = cls.get_profile().get_option('runner.checkpoint.codec')
+            cls._PERSISTER = persistence.AiiDAPersister(codec=codec)
 
         return cls._PERSISTER
 
@@ -171,8 +172,16 @@ class AiiDAManager(object):
         """
         profile = cls.get_profile()
         poll_interval = 0.0 if profile.is_test_profile else profile.get_option('runner.poll.interval')
-
-        settings = {'rmq_submit': False, 'poll_interval': poll_interval}
+        idle_timeout = 0 if profile.is_test_profile else profile.get_option('runner.transport.idle_timeout')
+        node_update_max_delay = 0 if profile.is_test_profile else profile.get_option('runner.node_update.max_delay')
+
+        settings = {
+            'rmq_submit': False,
+            'poll_interval': poll_interval,
+            'transport_idle_timeout': idle_timeout,
+            'transport_max_connections': profile.get_option('runner.transport.max_connections'),
+            'node_update_max_delay': node_update_max_delay,
+        }
         settings.update(kwargs)
 
         if 'communicator' not in settings:
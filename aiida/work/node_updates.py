@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Write-behind buffer for the updates of the nodes of the processes of a runner."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import logging
+
+import six
+
+__all__ = ('NodeUpdateBuffer',)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class NodeUpdateBuffer(object):
+    """
+    Buffer that coalesces the updates of the attributes of stored nodes and writes them behind, in a single transaction.
+
+    The processes of a runner update the attributes of their calculation node, e.g. the process state and status, on
+    every state transition. Instead of a transaction for each of these updates, only the last value of every attribute
+    of every node is kept and all of them are written at once when the buffer is flushed. The buffer is flushed in the
+    next iteration of the event loop after the first pending update, or at most `max_delay` seconds after it.
+
+    Other deferred writes, e.g. the checkpoint of a process, are registered as callbacks under a key, where a callback
+    replaces any callback still pending under the same key, and they are called after the attributes are written.
+    When writing the updates fails, they are kept and the flush is retried after `_retry_delay` seconds.
+    """
+
+    _retry_delay = 5
+
+    def __init__(self, loop, max_delay=0):
+        """
+        Construct the buffer
+
+        :param loop: the event loop in which the buffer is flushed
+        :type loop: :class:`tornado.ioloop.IOLoop`
+        :param max_delay: the maximum time in seconds that an update is buffered, if 0 the buffer is flushed in the
+            next iteration of the event loop
+        """
+        self._loop = loop
+        self._max_delay = max_delay
+        self._attributes = {}
+        self._deleted_keys = {}
+        self._callbacks = {}
+        self._flush_handle = None
+
+    def __len__(self):
+        return len(set(self._attributes) | set(self._deleted_keys)) + len(self._callbacks)
+
+    def set_attribute(self, node, key, value):
+        """
+        Set an updatable attribute of a node, which is written when the buffer is flushed if the node is stored
+
+        :param node: the node
+        :type node: :class:`aiida.orm.mixins.Sealable`
+        :param key: the key of the attribute
+        :param value: the value of the attribute
+        :raise ModificationNotAllowed: if the node is stored and the attribute is not updatable
+        """
+        if not node.is_stored:
+            node._set_attr(key, value)  # pylint: disable=protected-access
+            return
+
+        self._validate_updatable(node, key)
+        self._deleted_keys.get(node.pk, set()).discard(key)
+        self._attributes.setdefault(node.pk, {})[key] = value
+        self._schedule_flush()
+
+    def delete_attribute(self, node, key):
+        """
+        Delete an updatable attribute of a node, if it exists, when the buffer is flushed if the node is stored
+
+        :param node: the node
+        :type node: :class:`aiida.orm.mixins.Sealable`
+        :param key: the key of the attribute
+        :raise ModificationNotAllowed: if the node is stored and the attribute is not updatable
+        """
+        if not node.is_stored:
+            try:
+                node._del_attr(key)  # pylint: disable=protected-access
+            except AttributeError:
+                pass
+            return
+
+        self._validate_updatable(node, key)
+        self._attributes.get(node.pk, {}).pop(key, None)
+        self._deleted_keys.setdefault(node.pk, set()).add(key)
+        self._schedule_flush()
+
+    def set_process_status(self, node, status):
+        """
+        Set the process status of a calculation node, or delete it if status is None
+
+        :param node: the calculation node
+        :type node: :class:`aiida.orm.calculation.Calculation`
+        :param status: the process status string or None
+        """
+        if status is None:
+            self.delete_attribute(node, node.PROCESS_STATUS_KEY)
+            return
+
+        if not isinstance(status, six.string_types):
+            raise TypeError('process status should be a string')
+
+        self.set_attribute(node, node.PROCESS_STATUS_KEY, status)
+
+    def defer(self, key, callback):
+        """
+        Call the callback when the buffer is flushed, replacing any callback still pending under the same key
+
+        :param key: a hashable key that identifies the write done by the callback
+        :param callback: a callable without arguments
+        """
+        self._callbacks[key] = callback
+        self._schedule_flush()
+
+    def discard(self, key):
+        """
+        Discard the callback pending under the given key, if any
+
+        :param key: the key under which the callback was deferred
+        """
+        self._callbacks.pop(key, None)
+
+    def flush(self):
+        """
+        Write all pending updates of the attributes in a single transaction and then call all pending callbacks
+
+        The updates and callbacks are only discarded once they are written, such that they are retried by the next flush
+        if writing them fails.
+        """
+        from aiida.backends.utils import update_attributes_many
+
+        if self._flush_handle is not None:
+            self._loop.remove_timeout(self._flush_handle)
+            self._flush_handle = None
+
+        pks = set(self._attributes) | set(self._deleted_keys)
+        updates = [(pk, self._attributes.get(pk, {}), self._deleted_keys.get(pk, ())) for pk in sorted(pks)]
+
+        update_attributes_many(updates)
+
+        self._attributes = {}
+        self._deleted_keys = {}
+
+        # A callback may defer a new callback under its own key, which should then not be discarded
+        for key, callback in list(self._callbacks.items()):
+            callback()
+            if self._callbacks.get(key, None) is callback:
+                del self._callbacks[key]
+
+    @staticmethod
+    def _validate_updatable(node, key):
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if key not in node._updatable_attributes:  # pylint: disable=protected-access
+            raise ModificationNotAllowed('Cannot change the immutable attributes of a stored node')
+
+    def _schedule_flush(self):
+        """Schedule a flush of the buffer, unless one is already scheduled."""
+        if self._flush_handle is not None:
+            return
+
+        if self._max_delay:
+            self._flush_handle = self._loop.call_later(self._max_delay, self._scheduled_flush)
+        else:
+            self._flush_handle = self._loop.add_timeout(self._loop.time(), self._scheduled_flush)
+
+    def _scheduled_flush(self):
+        self._flush_handle = None
+        try:
+            self.flush()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('Failed to write the buffered updates of the process nodes, retrying in %s seconds',
+                             self._retry_delay)
+            self._flush_handle = self._loop.call_later(self._retry_delay, self._scheduled_flush)
@@ -12,6 +12,7 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+import hashlib
 import logging
 import traceback
 
@@ -24,6 +25,9 @@ __all__ = 'AiiDAPersister', 'ObjectLoader', 'get_object_loader'
 LOGGER = logging.getLogger(__name__)
 OBJECT_LOADER = None
 
+# The name of the codec with which new checkpoints are encoded, see :py:func:`aiida.utils.serialize.get_checkpoint_codec`
+CHECKPOINT_CODEC = 'yaml'
+
 
 def get_object_loader():
     """
@@ -42,8 +46,43 @@ class AiiDAPersister(plumpy.Persister):
     """
     This node is responsible to taking saved process instance states and
     persisting them to the database.
+
+    The checkpoint of a process is stored in its own table, with one row per top-level key of the saved state, each
+    encoded separately with a :py:class:`aiida.utils.serialize.CheckpointCodec`. In delta mode, the persister remembers
+    a digest of the rows of the last checkpoint of each process, and a new checkpoint only writes the rows that changed,
+    e.g. the process state, while the inputs and an unchanged context are not rewritten.
+
+    Since the keys are encoded separately, objects that are shared between different top-level keys of the saved state,
+    other than AiiDA nodes, groups and computers, are loaded as distinct copies.
+
+    Checkpoints encoded with a codec that can execute arbitrary code when decoding, like 'pickle', are only loaded by
+    a persister that was configured to use that codec, which therefore assumes that the content of the database is
+    trusted.
     """
 
+    def __init__(self, codec=CHECKPOINT_CODEC, delta=True):
+        """
+        Construct the persister
+
+        :param codec: the name of the registered codec with which to encode the checkpoints, opting in to 'pickle'
+            means trusting every checkpoint in the database, see :py:class:`aiida.utils.serialize.PickleCodec`
+        :param delta: if True, only the rows of a checkpoint that changed since the previous one are written
+        """
+        super(AiiDAPersister, self).__init__()
+        self._codec = serialize.get_checkpoint_codec(codec)
+        self._delta = delta
+        self._digests = {}
+
+    @staticmethod
+    def _get_digests(rows):
+        """
+        Return the digests of the given checkpoint rows, used to detect which rows changed
+
+        :param rows: a list of tuples (key, codec, data)
+        :return: a dictionary of the digest of the codec and data of each row by key
+        """
+        return {key: hashlib.sha1(codec.encode('utf-8') + b':' + data).digest() for key, codec, data in rows}
+
     def save_checkpoint(self, process, tag=None):
         """
         Persist a Process instance
@@ -52,6 +91,8 @@ class AiiDAPersister(plumpy.Persister):
         :param tag: optional checkpoint identifier to allow distinguishing multiple checkpoints for the same process
         :raises: :class:`plumpy.PersistenceError` Raised if there was a problem saving the checkpoint
         """
+        from aiida.backends.utils import get_checkpoint_rows, set_checkpoint_rows
+
         LOGGER.debug('Persisting process<%d>', process.pid)
 
         if tag is not None:
@@ -64,9 +105,24 @@ class AiiDAPersister(plumpy.Persister):
             raise plumpy.PersistenceError("Failed to create a bundle for '{}': {}".format(
                 process, traceback.format_exc()))
 
+        pk = process.calc.pk
+
         try:
-            process.calc.set_checkpoint(serialize.serialize(bundle))
+            rows = [(key, self._codec.name, self._codec.encode(value)) for key, value in bundle.items()]
+            digests = self._get_digests(rows)
+
+            try:
+                previous = self._digests[pk]
+            except KeyError:
+                previous = self._get_digests(get_checkpoint_rows(pk))
+
+            if self._delta:
+                rows = [row for row in rows if previous.get(row[0], None) != digests[row[0]]]
+
+            set_checkpoint_rows(pk, rows, removed_keys=[key for key in previous if key not in digests])
+            self._digests[pk] = digests
         except Exception:
+            self._digests.pop(pk, None)
             raise plumpy.PersistenceError("Failed to store a checkpoint for '{}': {}".format(
                 process, traceback.format_exc()))
 
@@ -76,12 +132,15 @@ class AiiDAPersister(plumpy.Persister):
         """
         Load a process from a persisted checkpoint by its process id
 
+        Checkpoints stored by previous versions, as YAML in an attribute of the calculation node, can still be loaded.
+
         :param pid: the process id of the :class:`plumpy.Process`
         :param tag: optional checkpoint identifier to allow retrieving a specific sub checkpoint
         :return: a bundle with the process state
         :rtype: :class:`plumpy.Bundle`
         :raises: :class:`plumpy.PersistenceError` Raised if there was a problem loading the checkpoint
         """
+        from aiida.backends.utils import get_checkpoint_rows
         from aiida.common.exceptions import MultipleObjectsError, NotExistent
         from aiida.orm import load_node
 
@@ -94,17 +153,36 @@ class AiiDAPersister(plumpy.Persister):
             raise plumpy.PersistenceError("Failed to load the node for process<{}>: {}".format(
                 pid, traceback.format_exc()))
 
-        checkpoint = calculation.checkpoint
+        rows = get_checkpoint_rows(calculation.pk)
+
+        if not rows:
+            checkpoint = calculation.get_attr(calculation.CHECKPOINT_KEY, None)
+
+            if checkpoint is None:
+                raise plumpy.PersistenceError('Calculation<{}> does not have a saved checkpoint'.format(calculation.pk))
 
-        if checkpoint is None:
-            raise plumpy.PersistenceError('Calculation<{}> does not have a saved checkpoint'.format(calculation.pk))
+            try:
+                return serialize.deserialize(checkpoint)
+            except Exception:
+                raise plumpy.PersistenceError("Failed to load the checkpoint for process<{}>: {}".format(
+                    pid, traceback.format_exc()))
+
+        for _, codec, _ in rows:
+            if codec != self._codec.name and serialize.get_checkpoint_codec(codec).trusted_only:
+                raise plumpy.PersistenceError(
+                    "Refusing to load the checkpoint for process<{}> encoded with the '{}' codec, which is only "
+                    "decoded if the persister is configured to use it".format(pid, codec))
 
         try:
-            bundle = serialize.deserialize(checkpoint)
+            bundle = plumpy.Bundle.__new__(plumpy.Bundle)
+            for key, codec, data in rows:
+                bundle[key] = serialize.get_checkpoint_codec(codec).decode(data)
         except Exception:
             raise plumpy.PersistenceError("Failed to load the checkpoint for process<{}>: {}".format(
                 pid, traceback.format_exc()))
 
+        self._digests[calculation.pk] = self._get_digests(rows)
+
         return bundle
 
     def get_checkpoints(self):
@@ -134,10 +212,15 @@ class AiiDAPersister(plumpy.Persister):
         :param pid: the process id of the :class:`plumpy.Process`
         :param tag: optional checkpoint identifier to allow retrieving a specific sub checkpoint
         """
+        from aiida.backends.utils import delete_checkpoint_rows
         from aiida.orm import load_node
 
         calc = load_node(pid)
-        calc.del_checkpoint()
+        delete_checkpoint_rows(calc.pk)
+        self._digests.pop(calc.pk, None)
+
+        if calc.get_attr(calc.CHECKPOINT_KEY, None) is not None:
+            calc._del_attr(calc.CHECKPOINT_KEY)  # pylint: disable=protected-access
 
     def delete_process_checkpoints(self, pid):
         """
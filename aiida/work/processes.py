@@ -16,6 +16,7 @@ from __future__ import absolute_import
 import abc
 import collections
 import enum
+import functools
 import inspect
 import uuid
 import traceback
@@ -32,6 +33,7 @@ from aiida.common.lang import override, protected
 from aiida.common.links import LinkType
 from aiida.common.log import LOG_LEVEL_REPORT
 from aiida import orm
+from aiida.orm.backend import construct_backend
 from aiida.orm.calculation.function import FunctionCalculation
 from aiida.orm.calculation.work import WorkCalculation
 from aiida.utils import serialize
@@ -97,6 +99,10 @@ class Process(plumpy.Process):
 
     SINGLE_RETURN_LINKNAME = 'result'
 
+    # Keys of the writes of the process deferred to the node updates of the runner
+    CHECKPOINT_UPDATE = 'checkpoint'
+    STATE_CHANGE_UPDATE = 'process_state_change'
+
     class SaveKeys(enum.Enum):
         """
         Keys used to identify things in the saved instance state bundle.
@@ -144,6 +150,14 @@ class Process(plumpy.Process):
             self.logger.warning('Disabling persistence, runner does not have a persister')
             self._enable_persistence = False
 
+    @override
+    def close(self):
+        """
+        Write the pending updates of the node before the process is handed over to another interpreter, e.g. the daemon
+        """
+        self.runner.node_updates.flush()
+        super(Process, self).close()
+
     def on_create(self):
         super(Process, self).on_create()
         # If parent PID hasn't been supplied try to get it from the stack
@@ -166,6 +180,16 @@ class Process(plumpy.Process):
         """
         Save the current state in a chechpoint if persistence is enabled and the process state is not terminal
 
+        The checkpoint is saved when the node updates of the runner are flushed, such that only the last of the
+        checkpoints requested in the meantime is saved.
+        """
+        if self._enable_persistence and not self._state.is_terminal():
+            self.runner.node_updates.defer((self.CHECKPOINT_UPDATE, self.pid), self._write_checkpoint)
+
+    def _write_checkpoint(self):
+        """
+        Save the current state in a chechpoint if persistence is enabled and the process state is not terminal
+
         If the persistence call excepts with a PersistenceError, it will be caught and a warning will be logged.
         """
         if self._enable_persistence and not self._state.is_terminal():
@@ -268,7 +292,11 @@ class Process(plumpy.Process):
         self.update_node_state(self._state)
         self._save_checkpoint()
         # Update the latest process state change timestamp
-        utils.set_process_state_change_timestamp(self)
+        self.runner.node_updates.defer((self.STATE_CHANGE_UPDATE, self.calc.__class__),
+                                       functools.partial(utils.set_process_state_change_timestamp, self))
+        # The node has to reflect a terminal state before anyone is notified of it and before it is sealed
+        if self._state.is_terminal():
+            self.runner.node_updates.flush()
         super(Process, self).on_entered(from_state)
 
     @override
@@ -278,6 +306,7 @@ class Process(plumpy.Process):
         """
         super(Process, self).on_terminated()
         if self._enable_persistence:
+            self.runner.node_updates.discard((self.CHECKPOINT_UPDATE, self.pid))
             try:
                 self.runner.persister.delete_checkpoint(self.pid)
             except BaseException:
@@ -323,7 +352,8 @@ class Process(plumpy.Process):
         """
         super(Process, self).on_paused(msg)
         self._save_checkpoint()
-        self.calc.pause()
+        self.runner.node_updates.set_attribute(self.calc, self.calc.PROCESS_PAUSED_KEY, True)
+        self.runner.node_updates.flush()
 
     @override
     def on_playing(self):
@@ -331,7 +361,8 @@ class Process(plumpy.Process):
         The Process was unpaused so remove the paused attribute on the orm.Calculation node
         """
         super(Process, self).on_playing()
-        self.calc.unpause()
+        self.runner.node_updates.delete_attribute(self.calc, self.calc.PROCESS_PAUSED_KEY)
+        self.runner.node_updates.flush()
 
     @override
     def on_output_emitting(self, output_port, value):
@@ -356,7 +387,7 @@ class Process(plumpy.Process):
         :param status: the status message
         """
         super(Process, self).set_status(status)
-        self.calc._set_process_status(status)  # pylint: disable=protected-access
+        self.runner.node_updates.set_process_status(self.calc, status)
 
     def submit(self, process, *args, **kwargs):
         return self.runner.submit(process, *args, **kwargs)
@@ -440,7 +471,7 @@ class Process(plumpy.Process):
 
     def update_node_state(self, state):
         self.update_outputs()
-        self.calc._set_process_state(state.LABEL)  # pylint: disable=protected-access
+        self.runner.node_updates.set_attribute(self.calc, self.calc.PROCESS_STATE_KEY, state.LABEL.value)
 
     def update_outputs(self):
         """Attach any new outputs to the node since the last time this was called"""
@@ -505,19 +536,26 @@ class Process(plumpy.Process):
         Create the links that connect the inputs to the calculation node that represents this Process
         """
         parent_calc = self.get_parent_calc()
+        inputs = []
 
         for name, input_value in self._flat_inputs().items():
 
             if isinstance(input_value, orm.Calculation):
                 input_value = utils.get_or_create_output_group(input_value)
 
-            if not input_value.is_stored:
-                # If the input isn't stored then assume our parent created it
-                if parent_calc:
-                    input_value.add_link_from(parent_calc, 'CREATE', link_type=LinkType.CREATE)
-                if self.inputs.store_provenance:
-                    input_value.store()
+            # If the input isn't stored then assume our parent created it
+            if not input_value.is_stored and parent_calc:
+                input_value.add_link_from(parent_calc, 'CREATE', link_type=LinkType.CREATE)
+
+            inputs.append((name, input_value))
+
+        # Store all the unstored inputs at once, in a single transaction
+        if self.inputs.store_provenance:
+            unstored = utils.get_unstored_nodes([input_value for _, input_value in inputs])
+            if unstored:
+                construct_backend().store_many(unstored)
 
+        for name, input_value in inputs:
             self.calc.add_link_from(input_value, name)
 
     def _add_description_and_label(self):
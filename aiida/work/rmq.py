@@ -11,7 +11,6 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
-import collections
 import logging
 
 from tornado import gen
@@ -124,14 +123,12 @@ def get_task_exchange_name(prefix):
 
 def _store_inputs(inputs):
     """
-    Try to store the values in the input dictionary. For nested dictionaries, the values are stored by recursively.
+    Store the unstored nodes in the input dictionary, including those of nested dictionaries, in a single transaction.
     """
-    for node in inputs.values():
-        try:
-            node.store()
-        except AttributeError:
-            if isinstance(node, collections.Mapping):
-                _store_inputs(node)
+    from aiida.orm.backend import construct_backend
+    from aiida.work.utils import get_unstored_nodes
+
+    construct_backend().store_many(get_unstored_nodes(inputs))
 
 
 class ProcessLauncher(plumpy.ProcessLauncher):
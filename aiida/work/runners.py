@@ -17,10 +17,11 @@ import logging
 import plumpy
 import tornado.ioloop
 
-from aiida.orm import load_node, load_workflow
 from aiida.work.processes import instantiate_process
 from . import job_calcs
 from . import futures
+from . import node_updates
+from . import termination
 from . import transports
 from . import utils
 
@@ -40,7 +41,15 @@ class Runner(object):
     _controller = None
     _closed = False
 
-    def __init__(self, poll_interval=0, loop=None, communicator=None, rmq_submit=False, persister=None):
+    def __init__(self,
+                 poll_interval=0,
+                 loop=None,
+                 communicator=None,
+                 rmq_submit=False,
+                 persister=None,
+                 transport_idle_timeout=0,
+                 transport_max_connections=0,
+                 node_update_max_delay=0):
         """
         Construct a new runner
 
@@ -52,15 +61,22 @@ class Runner(object):
         :param rmq_submit: if True, processes will be submitted to RabbitMQ, otherwise they will be scheduled here
         :param persister: the persister to use to persist processes
         :type persister: :class:`plumpy.Persister`
+        :param transport_idle_timeout: time in seconds that unused transports are kept open to be reused
+        :param transport_max_connections: maximum number of open transports per computer, 0 means no limit
+        :param node_update_max_delay: maximum time in seconds that updates of the nodes of the processes are buffered,
+            0 means that they are written in the next iteration of the event loop
         """
+        # pylint: disable=too-many-arguments
         assert not (rmq_submit and persister is None), \
             'Must supply a persister if you want to submit using communicator'
 
         self._loop = loop if loop is not None else tornado.ioloop.IOLoop()
         self._poll_interval = poll_interval
         self._rmq_submit = rmq_submit
-        self._transport = transports.TransportQueue(self._loop)
+        self._transport = transports.TransportQueue(
+            self._loop, idle_timeout=transport_idle_timeout, max_connections=transport_max_connections)
         self._job_manager = job_calcs.JobManager(self._transport)
+        self._node_updates = node_updates.NodeUpdateBuffer(self._loop, max_delay=node_update_max_delay)
         self._persister = persister
 
         if communicator is not None:
@@ -70,6 +86,9 @@ class Runner(object):
             LOGGER.warning('Disabling RabbitMQ submission, no communicator provided')
             self._rmq_submit = False
 
+        self._termination_watcher = termination.TerminationWatcher(
+            self._loop, poll_interval=self._poll_interval, communicator=self._communicator)
+
     def __enter__(self):
         return self
 
@@ -108,6 +127,26 @@ class Runner(object):
     def job_manager(self):
         return self._job_manager
 
+    @property
+    def node_updates(self):
+        """
+        Get the buffer of the updates of the nodes of the processes of this runner
+
+        :return: the node update buffer
+        :rtype: :class:`aiida.work.node_updates.NodeUpdateBuffer`
+        """
+        return self._node_updates
+
+    @property
+    def termination_watcher(self):
+        """
+        Get the watcher of the calculations and legacy workflows awaited by the processes of this runner
+
+        :return: the termination watcher
+        :rtype: :class:`aiida.work.termination.TerminationWatcher`
+        """
+        return self._termination_watcher
+
     @property
     def controller(self):
         return self._controller
@@ -129,9 +168,12 @@ class Runner(object):
             return self._loop.run_sync(lambda: future)
 
     def close(self):
-        """Close the runner by stopping the loop."""
+        """Close the runner by stopping the loop, after writing the pending updates of the nodes."""
         assert not self._closed
+        self._node_updates.flush()
         self.stop()
+        self._termination_watcher.close()
+        self._transport.close()
         self._closed = True
 
     def submit(self, process, *args, **inputs):
@@ -234,9 +276,9 @@ class Runner(object):
 
         :param pk: the pk of the workflow
         :param callback: the function to be called upon workflow termination
+        :raise NotExistent: if there is no workflow with the given pk
         """
-        workflow = load_workflow(pk=pk)
-        self._poll_legacy_wf(workflow, callback)
+        self._termination_watcher.call_on_legacy_workflow_finish(pk, callback)
 
     def call_on_calculation_finish(self, pk, callback):
         """
@@ -244,9 +286,9 @@ class Runner(object):
 
         :param pk: the pk of the calculation
         :param callback: the function to be called upon calculation termination
+        :raise NotExistent: if there is no node with the given pk
         """
-        calculation = load_node(pk=pk)
-        self._poll_calculation(calculation, callback)
+        self._termination_watcher.call_on_calculation_finish(pk, callback)
 
     def get_calculation_future(self, pk):
         """
@@ -256,15 +298,3 @@ class Runner(object):
         :return: A future representing the completion of the calculation node
         """
         return futures.CalculationFuture(pk, self._loop, self._poll_interval, self._communicator)
-
-    def _poll_legacy_wf(self, workflow, callback):
-        if workflow.has_finished_ok() or workflow.has_failed():
-            self._loop.add_callback(callback, workflow.pk)
-        else:
-            self._loop.call_later(self._poll_interval, self._poll_legacy_wf, workflow, callback)
-
-    def _poll_calculation(self, calc_node, callback):
-        if calc_node.is_terminated:
-            self._loop.add_callback(callback, calc_node.pk)
-        else:
-            self._loop.call_later(self._poll_interval, self._poll_calculation, calc_node, callback)
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Watcher that calls back when the calculations and legacy workflows awaited by the processes of a runner terminate."""
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import logging
+
+__all__ = ('TerminationWatcher',)
+
+LOGGER = logging.getLogger(__name__)
+
+
+def get_terminated_calculation_pks(pks):
+    """
+    Return the pks of the calculations, among the given ones, that have terminated, with a single query
+
+    :param pks: a list of calculation pks
+    :return: list of the pks of the calculations that are finished, excepted or killed
+    """
+    from plumpy import ProcessState
+    from aiida.orm.calculation import Calculation
+    from aiida.orm.querybuilder import QueryBuilder
+
+    if not pks:
+        return []
+
+    states = [ProcessState.FINISHED.value, ProcessState.EXCEPTED.value, ProcessState.KILLED.value]
+    builder = QueryBuilder()
+    builder.append(
+        Calculation,
+        filters={
+            'id': {
+                'in': pks
+            },
+            'attributes.{}'.format(Calculation.PROCESS_STATE_KEY): {
+                'in': states
+            }
+        },
+        project=['id'])
+
+    return [pk for pk, in builder.iterall()]
+
+
+def get_terminated_legacy_workflow_pks(pks):
+    """
+    Return the pks of the legacy workflows, among the given ones, that have terminated, with a single query
+
+    :param pks: a list of legacy workflow pks
+    :return: list of the pks of the workflows that are finished or failed
+    """
+    from aiida.orm.backend import construct_backend
+
+    return construct_backend().query_manager.get_terminated_legacy_workflow_pks(pks)
+
+
+class TerminationWatcher(object):
+    """
+    Watcher of the calculations and legacy workflows awaited by the processes of a runner.
+
+    Instead of polling each awaited node separately, all the nodes that are awaited are checked at once, with a single
+    query per type of node, in the next iteration of the event loop after they are first awaited and then every
+    `poll_interval` seconds. If a communicator is given, the broadcasts of the processes that reach a terminal state
+    trigger an immediate check, so that the callbacks are not delayed by the polling interval.
+    """
+
+    CALCULATION = 'calculation'
+    LEGACY_WORKFLOW = 'legacy_workflow'
+
+    _terminated_pks_getters = {
+        CALCULATION: get_terminated_calculation_pks,
+        LEGACY_WORKFLOW: get_terminated_legacy_workflow_pks,
+    }
+
+    def __init__(self, loop, poll_interval=0, communicator=None):
+        """
+        Construct the watcher
+
+        :param loop: the event loop in which the nodes are checked and the callbacks are called
+        :type loop: :class:`tornado.ioloop.IOLoop`
+        :param poll_interval: the interval in seconds between two checks of the awaited nodes
+        :param communicator: the communicator whose broadcasts trigger a check, if None only polling is used
+        :type communicator: :class:`kiwipy.Communicator`
+        """
+        self._loop = loop
+        self._poll_interval = poll_interval
+        self._communicator = communicator
+        self._callbacks = {target: {} for target in self._terminated_pks_getters}
+        self._poll_handle = None
+        self._poll_immediate = False
+        self._broadcast_filter = None
+
+    def __len__(self):
+        return sum(len(callbacks) for callbacks in self._callbacks.values())
+
+    def call_on_calculation_finish(self, pk, callback):
+        """
+        Call the callback with the pk when the calculation has terminated
+
+        :param pk: the pk of the calculation
+        :param callback: the function to be called upon calculation termination
+        :raise NotExistent: if there is no node with the given pk
+        """
+        from aiida.orm import load_node
+
+        # Loaded once, such that a node that does not exist raises instead of being awaited forever
+        load_node(pk=pk)
+        self._subscribe(self.CALCULATION, pk, callback)
+
+    def call_on_legacy_workflow_finish(self, pk, callback):
+        """
+        Call the callback with the pk when the legacy workflow has terminated
+
+        :param pk: the pk of the workflow
+        :param callback: the function to be called upon workflow termination
+        :raise NotExistent: if there is no workflow with the given pk
+        """
+        from aiida.orm import load_workflow
+
+        load_workflow(pk=pk)
+        self._subscribe(self.LEGACY_WORKFLOW, pk, callback)
+
+    def close(self):
+        """Stop watching, dropping all pending callbacks."""
+        if self._poll_handle is not None:
+            self._loop.remove_timeout(self._poll_handle)
+            self._poll_handle = None
+
+        self._remove_broadcast_subscriber()
+
+        for callbacks in self._callbacks.values():
+            callbacks.clear()
+
+    def _subscribe(self, target, pk, callback):
+        """Register the callback for the node of the given type and check the node in the next loop iteration."""
+        self._callbacks[target].setdefault(pk, []).append(callback)
+
+        if target == self.CALCULATION:
+            self._add_broadcast_subscriber()
+
+        self._schedule_poll(immediate=True)
+
+    def _schedule_poll(self, immediate=False):
+        """Schedule a check of the awaited nodes, in the next loop iteration if immediate or else after the interval."""
+        if self._poll_handle is not None:
+            if not immediate or self._poll_immediate:
+                return
+            self._loop.remove_timeout(self._poll_handle)
+
+        self._poll_immediate = immediate
+        self._poll_handle = self._loop.call_later(0 if immediate else self._poll_interval, self._poll)
+
+    def _poll(self):
+        """Check all the awaited nodes, call the callbacks of those that terminated and schedule the next check."""
+        self._poll_handle = None
+
+        for target, callbacks in self._callbacks.items():
+            if not callbacks:
+                continue
+
+            try:
+                terminated_pks = self._terminated_pks_getters[target](list(callbacks))
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('failed to check the termination of the awaited %s nodes', target)
+                continue
+
+            for pk in terminated_pks:
+                for callback in callbacks.pop(pk, []):
+                    self._loop.add_callback(callback, pk)
+
+        if not self._callbacks[self.CALCULATION]:
+            self._remove_broadcast_subscriber()
+
+        if len(self):
+            self._schedule_poll()
+
+    def _on_broadcast(self, body, sender=None, subject=None, correlation_id=None):  # pylint: disable=unused-argument
+        """Check the awaited nodes as soon as possible when an awaited calculation broadcasts a terminal state."""
+        if sender in self._callbacks[self.CALCULATION]:
+            # The broadcast may be received in the thread of the communicator
+            self._loop.add_callback(self._schedule_poll, True)
+
+    def _add_broadcast_subscriber(self):
+        """Subscribe to the broadcasts of terminal states of processes, if there is a communicator."""
+        import kiwipy
+        from plumpy import ProcessState
+
+        if self._communicator is None or self._broadcast_filter is not None:
+            return
+
+        self._broadcast_filter = kiwipy.BroadcastFilter(self._on_broadcast)
+        for state in [ProcessState.FINISHED, ProcessState.KILLED, ProcessState.EXCEPTED]:
+            self._broadcast_filter.add_subject_filter('state_changed.*.{}'.format(state.value))
+
+        try:
+            self._communicator.add_broadcast_subscriber(self._broadcast_filter)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('failed to subscribe to the process state broadcasts, relying on polling only')
+            self._communicator = None
+            self._broadcast_filter = None
+
+    def _remove_broadcast_subscriber(self):
+        """Unsubscribe from the broadcasts, if subscribed."""
+        if self._broadcast_filter is not None:
+            try:
+                self._communicator.remove_broadcast_subscriber(self._broadcast_filter)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('failed to unsubscribe from the process state broadcasts')
+            self._broadcast_filter = None
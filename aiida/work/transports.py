@@ -14,6 +14,7 @@ from __future__ import absolute_import
 from collections import namedtuple
 import contextlib
 import logging
+import time
 import traceback
 from tornado import concurrent, gen, ioloop
 
@@ -30,6 +31,58 @@ class TransportRequest(object):
         self.count = 0
 
 
+class TransportPoolStats(object):
+    """
+    Counters kept by the :class:`TransportQueue` about the reuse of transports.
+
+    A request is a hit if it is served by a transport that is already open, either because it is being used by
+    other requests or because it was kept alive in the pool, and a miss if a new transport had to be opened.
+    """
+
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    def __init__(self):
+        super(TransportPoolStats, self).__init__()
+        self.hits = 0
+        self.misses = 0
+        self.opened = 0
+        self.closed = 0
+        self.open_failures = 0
+        self.reconnects = 0
+        self.evictions = 0
+        self.waits = 0
+        self.wait_time_total = 0.
+        self.wait_time_max = 0.
+
+    def record_wait(self, wait_time):
+        """Record the time a request had to wait before the transport was given to it."""
+        self.waits += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+    @property
+    def wait_time_average(self):
+        """The average time in seconds that requests waited for their transport."""
+        if not self.waits:
+            return 0.
+        return self.wait_time_total / self.waits
+
+    def as_dict(self):
+        """Return the current values of the counters as a dictionary."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'opened': self.opened,
+            'closed': self.closed,
+            'open_failures': self.open_failures,
+            'reconnects': self.reconnects,
+            'evictions': self.evictions,
+            'waits': self.waits,
+            'wait_time_total': self.wait_time_total,
+            'wait_time_max': self.wait_time_max,
+            'wait_time_average': self.wait_time_average,
+        }
+
+
 class TransportQueue(object):
     """
     A queue to get transport objects from authinfo.  This class allows clients
@@ -40,21 +93,48 @@ class TransportQueue(object):
     it will open the transport and give it to all the clients that asked for it
     up to that point.  This way opening of transports (a costly operation) can
     be minimised.
+
+    If an `idle_timeout` is set, a transport that is no longer requested by any client is not closed straight away
+    but kept in a pool, keyed on the authinfo, for that many seconds.  A new request arriving in the meantime will
+    reuse the open connection, after checking that it is still alive, instead of opening a new one.  The number of
+    transports that are open at the same time for a single computer can be limited with `max_connections`.
     """
     AuthInfoEntry = namedtuple('AuthInfoEntry', ['authinfo', 'transport', 'callbacks', 'callback_handle'])
+    IdleEntry = namedtuple('IdleEntry', ['computer_id', 'transport', 'close_handle', 'released'])
 
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, idle_timeout=0, max_connections=0):
         """
         :param loop: The event loop to use, will use `tornado.ioloop.IOLoop.current()` if not supplied
         :type loop: :class:`tornado.ioloop.IOLoop`
+        :param idle_timeout: time in seconds that an unused transport is kept open for reuse, 0 closes it directly
+        :param max_connections: maximum number of transports open at the same time per computer, 0 means no limit
         """
         self._loop = loop if loop is not None else ioloop.IOLoop.current()
+        self._idle_timeout = idle_timeout
+        self._max_connections = max_connections
         self._transport_requests = {}
+        self._request_computers = {}
+        self._idle_transports = {}
+        self._stats = TransportPoolStats()
 
     def loop(self):
         """ Get the loop being used by this transport queue """
         return self._loop
 
+    @property
+    def stats(self):
+        """
+        Get the counters on the reuse of transports and the time requests had to wait for them
+
+        :rtype: :class:`TransportPoolStats`
+        """
+        return self._stats
+
+    def close(self):
+        """Close all the transports that are kept open in the pool."""
+        for authinfo_id in list(self._idle_transports):
+            self._close_idle(authinfo_id)
+
     @contextlib.contextmanager
     def request_transport(self, authinfo):
         """
@@ -78,28 +158,21 @@ class TransportQueue(object):
             # There is no existing request for this transport (i.e. on this authinfo)
             transport_request = TransportRequest()
             self._transport_requests[authinfo.id] = transport_request
+            self._request_computers[authinfo.id] = authinfo.computer.pk
 
-            transport = authinfo.get_transport()
-            safe_open_interval = transport.get_safe_open_interval()
+            transport = self._get_idle_transport(authinfo)
 
-            def do_open():
-                """ Actually open the transport """
-                if transport_request.count > 0:
-                    # The user still wants the transport so open it
-                    _LOGGER.debug('Transport request opening transport for %s', authinfo)
-                    try:
-                        transport.open()
-                    except Exception as exception:  # pylint: disable=broad-except
-                        _LOGGER.error('exception occurred while trying to open transport:\n %s', exception)
-                        transport_request.future.set_exception(exception)
+            if transport is not None:
+                self._stats.hits += 1
+                transport_request.future.set_result(transport)
+            else:
+                self._stats.misses += 1
+                open_callback_handle = self._schedule_open(authinfo, transport_request)
+        else:
+            self._stats.hits += 1
 
-                        # Cleanup of the stale TransportRequest with the excepted transport future
-                        self._transport_requests.pop(authinfo.id, None)
-                    else:
-                        transport_request.future.set_result(transport)
-
-            # Save the handle so that we can cancel the callback if the user no longer wants it
-            open_callback_handle = self._loop.call_later(safe_open_interval, do_open)
+        requested = time.time()
+        transport_request.future.add_done_callback(lambda future: self._stats.record_wait(time.time() - requested))
 
         try:
             transport_request.count += 1
@@ -116,9 +189,132 @@ class TransportQueue(object):
             # Check if there are no longer any users that want the transport
             if transport_request.count == 0:
                 if transport_request.future.done():
-                    _LOGGER.debug('Transport request closing transport for %s', authinfo)
-                    transport_request.future.result().close()
+                    if transport_request.future.exception() is None:
+                        self._release(authinfo, transport_request.future.result())
                 elif open_callback_handle is not None:
                     self._loop.remove_timeout(open_callback_handle)
 
-                self._transport_requests.pop(authinfo.id, None)
+                if self._transport_requests.get(authinfo.id, None) is transport_request:
+                    self._transport_requests.pop(authinfo.id)
+                    self._request_computers.pop(authinfo.id, None)
+
+    def _schedule_open(self, authinfo, transport_request):
+        """
+        Schedule the opening of a new transport for the given request after the safe open interval
+
+        :return: the handle of the timeout, which can be used to cancel the opening
+        """
+        transport = authinfo.get_transport()
+        safe_open_interval = transport.get_safe_open_interval()
+
+        def do_open():
+            """ Actually open the transport """
+            if transport_request.count > 0:
+
+                if not self._make_room(authinfo):
+                    # The computer is at its maximum number of connections, try again after the safe interval
+                    _LOGGER.debug('Transport request for %s waiting for a free connection', authinfo)
+                    self._loop.call_later(safe_open_interval, do_open)
+                    return
+
+                # The user still wants the transport so open it
+                _LOGGER.debug('Transport request opening transport for %s', authinfo)
+                try:
+                    transport.open()
+                except Exception as exception:  # pylint: disable=broad-except
+                    _LOGGER.error('exception occurred while trying to open transport:\n %s', exception)
+                    self._stats.open_failures += 1
+                    transport_request.future.set_exception(exception)
+
+                    # Cleanup of the stale TransportRequest with the excepted transport future
+                    if self._transport_requests.get(authinfo.id, None) is transport_request:
+                        self._transport_requests.pop(authinfo.id)
+                        self._request_computers.pop(authinfo.id, None)
+                else:
+                    self._stats.opened += 1
+                    transport_request.future.set_result(transport)
+
+        # Save the handle so that we can cancel the callback if the user no longer wants it
+        return self._loop.call_later(safe_open_interval, do_open)
+
+    def _get_idle_transport(self, authinfo):
+        """
+        Take the transport for the given authinfo out of the pool, if it is there and still alive
+
+        :return: the open transport or None
+        """
+        entry = self._idle_transports.pop(authinfo.id, None)
+
+        if entry is None:
+            return None
+
+        self._loop.remove_timeout(entry.close_handle)
+
+        try:
+            alive = entry.transport.is_alive()
+        except Exception:  # pylint: disable=broad-except
+            alive = False
+
+        if not alive:
+            _LOGGER.debug('Pooled transport for %s is no longer alive, reconnecting', authinfo)
+            self._stats.reconnects += 1
+            self._close_transport(entry.transport)
+            return None
+
+        _LOGGER.debug('Reusing pooled transport for %s', authinfo)
+        return entry.transport
+
+    def _release(self, authinfo, transport):
+        """Close a transport that is no longer requested or, if the pool is enabled, keep it open for reuse."""
+        if self._idle_timeout <= 0 or not transport.is_open:
+            _LOGGER.debug('Transport request closing transport for %s', authinfo)
+            self._close_transport(transport)
+            return
+
+        _LOGGER.debug('Transport request keeping transport for %s open for %s seconds', authinfo, self._idle_timeout)
+        close_handle = self._loop.call_later(self._idle_timeout, lambda: self._close_idle(authinfo.id))
+        self._idle_transports[authinfo.id] = self.IdleEntry(authinfo.computer.pk, transport, close_handle, time.time())
+
+    def _make_room(self, authinfo):
+        """
+        Make sure that a new transport can be opened for the computer of the authinfo without exceeding the maximum
+        number of connections, closing the least recently used idle transports of that computer if necessary
+
+        :return: True if a new transport can be opened, False otherwise
+        """
+        if self._max_connections <= 0:
+            return True
+
+        computer_id = authinfo.computer.pk
+        idle = sorted([(entry.released, authinfo_id)
+                       for authinfo_id, entry in self._idle_transports.items()
+                       if entry.computer_id == computer_id])
+        active = [
+            authinfo_id for authinfo_id, request in self._transport_requests.items()
+            if self._request_computers.get(authinfo_id, None) == computer_id and request.future.done()
+        ]
+
+        while idle and len(idle) + len(active) >= self._max_connections:
+            _, authinfo_id = idle.pop(0)
+            self._stats.evictions += 1
+            self._close_idle(authinfo_id)
+
+        return len(idle) + len(active) < self._max_connections
+
+    def _close_idle(self, authinfo_id):
+        """Close the pooled transport of the given authinfo, if there is one."""
+        entry = self._idle_transports.pop(authinfo_id, None)
+
+        if entry is not None:
+            self._loop.remove_timeout(entry.close_handle)
+            self._close_transport(entry.transport)
+
+    def _close_transport(self, transport):
+        """Close a transport, logging but otherwise ignoring any exception, e.g. for an already dropped connection."""
+        try:
+            if transport.is_open:
+                transport.close()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.warning('Exception whilst closing transport:\n%s', traceback.format_exc())
+        finally:
+            self._stats.closed += 1
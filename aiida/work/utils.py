@@ -12,14 +12,17 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
+import collections
 import contextlib
 import logging
 
+import six
 from six.moves import range
 import tornado.ioloop
 from tornado import concurrent, gen
 
 from aiida.common.links import LinkType
+from aiida.orm import Node
 from aiida.orm.calculation import Calculation, WorkCalculation, FunctionCalculation
 from aiida.orm.data.frozendict import FrozenDict
 
@@ -210,6 +213,31 @@ def get_or_create_output_group(calculation):
     return FrozenDict(dict=outputs)
 
 
+def get_unstored_nodes(data):
+    """
+    Recurse through a data structure and return the unstored nodes that are found along the way
+
+    :param data: a data structure potentially containing unstored nodes
+    :return: list of the unstored nodes, in the order in which they were found and without duplicates
+    """
+    nodes = collections.OrderedDict()
+
+    def collect(value):
+        if isinstance(value, Node):
+            if not value.is_stored:
+                nodes.setdefault(id(value), value)
+        elif isinstance(value, collections.Mapping):
+            for item in value.values():
+                collect(item)
+        elif isinstance(value, collections.Sequence) and not isinstance(value, six.string_types):
+            for item in value:
+                collect(item)
+
+    collect(data)
+
+    return list(nodes.values())
+
+
 @contextlib.contextmanager
 def loop_scope(loop):
     """
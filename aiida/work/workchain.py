@@ -11,7 +11,6 @@
 from __future__ import division
 from __future__ import print_function
 from __future__ import absolute_import
-import collections
 import functools
 import six
 
@@ -21,9 +20,10 @@ from aiida.common.exceptions import MultipleObjectsError, NotExistent
 from aiida.common.extendeddicts import AttributeDict
 from aiida.common.lang import override
 from aiida.common.utils import classproperty
-from aiida.orm import Node
+from aiida.orm.backend import construct_backend
 from aiida.orm.utils import load_node, load_workflow
 
+from . import utils
 from .awaitable import AwaitableTarget, AwaitableAction, construct_awaitable
 from .context import ToContext, assign_, append_
 from .exit_code import ExitCode
@@ -186,14 +186,9 @@ class WorkChain(Process):
 
         :param data: a data structure potentially containing unstored nodes
         """
-        if isinstance(data, Node) and not data.is_stored:
-            data.store()
-        elif isinstance(data, collections.Mapping):
-            for _, value in data.items():
-                self._store_nodes(value)
-        elif isinstance(data, collections.Sequence) and not isinstance(data, six.string_types):
-            for value in data:
-                self._store_nodes(value)
+        nodes = utils.get_unstored_nodes(data)
+        if nodes:
+            construct_backend().store_many(nodes)
 
     @override
     def on_exiting(self):
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import time
+
+import click
+
+
+def create_positions(numsteps, numsites):
+    """Return the positions of a random walk of `numsites` atoms for `numsteps` steps, like a molecular dynamics."""
+    import numpy
+
+    random = numpy.random.RandomState(0)
+    start = random.rand(numsites, 3) * 10.
+    # Positions are typically written by codes with a limited number of significant digits
+    return numpy.round(start + numpy.cumsum(random.normal(scale=0.01, size=(numsteps, numsites, 3)), axis=0), 6)
+
+
+def best_of(function, repeat):
+    """Return the minimum time of `repeat` calls of `function`."""
+    timings = []
+    for _ in range(repeat):
+        time_start = time.time()
+        function()
+        timings.append(time.time() - time_start)
+
+    return min(timings)
+
+
+@click.command()
+@click.option('-p', '--profile', type=str, default=None, help='Profile to use, defaults to the default profile.')
+@click.option('-s', '--numsteps', type=int, default=1000, show_default=True, help='Number of steps.')
+@click.option('-n', '--numsites', type=int, default=1000, show_default=True, help='Number of sites.')
+@click.option('-r', '--repeat', type=int, default=5, show_default=True, help='Number of repetitions of each read.')
+def benchmark_arraydata(profile, numsteps, numsites, repeat):
+    """
+    Measure the size on disk and the read times of an array of trajectory positions, uncompressed and compressed
+
+    The reads are of the full array and of the positions of a single step, without the cache of the arrays.
+    """
+    from aiida.backends.utils import load_dbenv
+    load_dbenv(profile=profile)
+
+    from aiida.orm.data.array import ArrayData
+
+    positions = create_positions(numsteps, numsites)
+    click.echo('{:>12}: {} bytes'.format('array', positions.nbytes))
+
+    for compressed in (False, True):
+        node = ArrayData()
+
+        time_start = time.time()
+        node.set_array('positions', positions, compressed=compressed)
+        time_write = time.time() - time_start
+        node.store()
+
+        def read_array():
+            node.clear_internal_cache()  # pylint: disable=cell-var-from-loop
+            node.get_array('positions')  # pylint: disable=cell-var-from-loop
+
+        def read_step():
+            node.get_array_slice('positions', numsteps // 2)  # pylint: disable=cell-var-from-loop
+
+        node.clear_internal_cache()
+        size = os.path.getsize(node.get_abs_path('positions.{}'.format('npz' if compressed else 'npy')))
+        time_array = best_of(read_array, repeat)
+        node.clear_internal_cache()
+        time_step = best_of(read_step, repeat)
+
+        click.echo('{:>12}: {} bytes, write {:.4f} s, read array {:.4f} s, read step {:.6f} s (best of {})'.format(
+            'compressed' if compressed else 'npy', size, time_write, time_array, time_step, repeat))
+
+
+if __name__ == '__main__':
+    benchmark_arraydata()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import contextlib
+import os
+import sys
+import time
+
+import click
+
+PROJECTIONS = {'calculation': ['id', 'ctime', 'attributes.process_state'], 'computer': ['name'], 'user': ['email']}
+
+
+def execute(statement):
+    """Execute a raw SQL statement returning rows, commit it and return the rows."""
+    from aiida.backends import settings
+    from aiida.backends.profile import BACKEND_SQLA
+    from aiida.orm.backend import construct_backend
+
+    rows = construct_backend().query_manager.raw(statement)
+    if settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy import get_scoped_session
+        get_scoped_session().commit()
+
+    return rows
+
+
+def create_calculations(number, computer):
+    """
+    Create `number` copies of a job calculation, one per second in the past, one in ten of which is running.
+
+    A single calculation is stored through the ORM and copied with one INSERT statement, since storing a million
+    calculations one by one would take hours. Return the pks of the template calculation and of its copies.
+    """
+    from aiida.orm.calculation.job import JobCalculation
+
+    template = JobCalculation(computer=computer, resources={'num_machines': 1, 'num_mpiprocs_per_machine': 1})
+    template.store()
+
+    rows = execute("""
+        INSERT INTO db_dbnode (uuid, type, process_type, label, description, ctime, mtime, nodeversion, public,
+                               attributes, extras, user_id, dbcomputer_id)
+        SELECT md5(random()::text || g::text)::uuid, type, process_type, label, description,
+               now() - g * interval '1 second', now(), nodeversion, public,
+               jsonb_set(attributes, '{{process_state}}',
+                         to_jsonb(CASE WHEN g % 10 = 0 THEN 'running' ELSE 'finished' END)),
+               extras, user_id, dbcomputer_id
+        FROM db_dbnode, generate_series(1, {number}) AS g WHERE id = {pk}
+        RETURNING id""".format(number=number, pk=template.pk))
+
+    return [template.pk] + [row[0] for row in rows]
+
+
+def delete_calculations(pks):
+    """
+    Delete the template calculation, whose pk is the first of the given ones, and its copies.
+
+    Only the rows with the given pks are deleted, since other processes may create nodes with pks in the same range
+    while the benchmark runs. The template is deleted through the ORM, to also delete its repository folder.
+    """
+    from aiida.utils.delete_nodes import delete_nodes
+
+    template_pk, copy_pks = pks[0], pks[1:]
+    if copy_pks:
+        array = ','.join(str(pk) for pk in copy_pks)
+        execute('DELETE FROM db_dbnode WHERE id = ANY(ARRAY[{}]::integer[]) RETURNING id'.format(array))
+    delete_nodes([template_pk], force=True)
+
+
+def timed(function):
+    """Call `function` and return the elapsed time and its result."""
+    time_start = time.time()
+    result = function()
+    return time.time() - time_start, result
+
+
+@contextlib.contextmanager
+def silenced_stdout():
+    """Redirect the standard output to the null device."""
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as handle:
+        sys.stdout = handle
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+
+@click.command()
+@click.option('-p', '--profile', type=str, default=None, help='Profile to use, defaults to the default profile.')
+@click.option('-c', '--computer', type=str, required=True, help='Label of the computer of the calculations.')
+@click.option('-n', '--number', type=int, default=10**6, show_default=True, help='Number of calculations.')
+def benchmark_calculation_list(profile, computer, number):  # pylint: disable=protected-access
+    """
+    Measure the time to list the job calculations, with the keyset pagination, among a large number of calculations
+
+    The timings are of the first page of the calculations of the user, of those created in the past day, of the page
+    halfway through the list, compared to the same page fetched with an offset, and of all the pages. The created
+    calculations are deleted at the end.
+    """
+    from aiida.backends.utils import load_dbenv
+    load_dbenv(profile=profile)
+
+    import datetime
+    from aiida.orm.backend import construct_backend
+    from aiida.orm.calculation.job import JobCalculation
+    from aiida.orm.querybuilder import QueryBuilder
+    from aiida.orm.utils import load_computer
+    from aiida.utils import timezone
+
+    time_create, pks = timed(lambda: create_calculations(number, load_computer(label=computer)))
+    click.echo('{:>12}: {:.3f} s for {} calculations'.format('create', time_create, number))
+
+    try:
+        user_filters = {'user_id': {'==': construct_backend().users.get_automatic_user().id}}
+        page_size = JobCalculation._list_calculations_page_size
+
+        def first_page(filters):
+            pages = JobCalculation._iter_calculation_pages(filters, PROJECTIONS)
+            return next(pages)
+
+        time_page, page = timed(lambda: first_page(user_filters))
+        click.echo('{:>12}: {:.3f} s for {} rows'.format('first page', time_page, len(page)))
+
+        past_day = {'ctime': {'>': timezone.now() - datetime.timedelta(days=1)}}
+        time_page, page = timed(lambda: first_page(past_day))
+        click.echo('{:>12}: {:.3f} s for {} rows'.format('past day', time_page, len(page)))
+
+        running = {'attributes.process_state': {'==': 'running'}}
+        time_page, page = timed(lambda: first_page(running))
+        click.echo('{:>12}: {:.3f} s for {} rows'.format('running', time_page, len(page)))
+
+        # The page halfway through the list, with an offset and by seeking past its first row
+        builder = QueryBuilder()
+        builder.append(JobCalculation, project=['ctime', 'id'], tag='calculation')
+        builder.order_by({'calculation': ['ctime', 'id']})
+        builder.offset(number // 2)
+        builder.limit(page_size)
+        time_offset, rows = timed(builder.all)
+        click.echo('{:>12}: {:.3f} s for {} rows'.format('offset page', time_offset, len(rows)))
+
+        ctime, pk = rows[0]
+        seek = {'and': [{'ctime': {'>=': ctime}}, {'or': [{'ctime': {'>': ctime}}, {'id': {'>': pk}}]}]}
+        time_seek, page = timed(lambda: first_page(seek))
+        click.echo('{:>12}: {:.3f} s for {} rows'.format('seek page', time_seek, len(page)))
+
+        def all_pages():
+            return sum(len(page) for page in JobCalculation._iter_calculation_pages({}, PROJECTIONS))
+
+        time_all, count = timed(all_pages)
+        click.echo('{:>12}: {:.3f} s for {} rows, {:.0f} rows/s'.format('all pages', time_all, count, count / time_all))
+
+        def list_calculations():
+            with silenced_stdout():
+                JobCalculation._list_calculations(all_users=True, limit=10 * page_size)
+
+        time_list, _ = timed(list_calculations)
+        click.echo('{:>12}: {:.3f} s for {} rows'.format('list', time_list, 10 * page_size))
+    finally:
+        delete_calculations(pks)
+
+
+if __name__ == '__main__':
+    benchmark_calculation_list()  # pylint: disable=no-value-for-parameter
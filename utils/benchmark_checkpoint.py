@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import time
+
+import click
+
+
+def define_work_chain():
+    """
+    Define a work chain whose only purpose is to carry a context of the requested size.
+
+    It can only be defined once the database environment is loaded, but it has to be a module level class for the
+    object loader to identify it when the process is bundled.
+    """
+    from aiida.work.workchain import WorkChain
+
+    global ContextWorkChain  # pylint: disable=global-variable-undefined,invalid-name
+
+    class ContextWorkChain(WorkChain):  # pylint: disable=redefined-outer-name,unused-variable
+        """A work chain that does nothing."""
+
+        @classmethod
+        def define(cls, spec):
+            super(ContextWorkChain, cls).define(spec)
+            spec.outline(cls.step)
+
+        def step(self):
+            pass
+
+    return ContextWorkChain
+
+
+def create_process(number):
+    """Create a work chain process whose context holds `number` nodes and as many floats."""
+    from aiida.orm.data.int import Int
+    from aiida.work import manager
+    from aiida.work.processes import instantiate_process
+
+    process = instantiate_process(manager.AiiDAManager.get_runner(), define_work_chain())
+    process.ctx.nodes = [Int(index).store() for index in range(number)]
+    process.ctx.values = {'value_{}'.format(index): index / 3. for index in range(number)}
+    process.ctx.iteration = 0
+
+    return process
+
+
+def best_of(function, repeat):
+    """Return the minimum time of `repeat` calls of `function`."""
+    timings = []
+    for _ in range(repeat):
+        time_start = time.time()
+        function()
+        timings.append(time.time() - time_start)
+
+    return min(timings)
+
+
+@click.command()
+@click.option('-p', '--profile', type=str, default=None, help='Profile to use, defaults to the default profile.')
+@click.option('-n', '--number', type=int, default=1000, show_default=True, help='Number of nodes in the context.')
+@click.option('-r', '--repeat', type=int, default=10, show_default=True, help='Number of repetitions.')
+def benchmark_checkpoint(profile, number, repeat):
+    """
+    Measure the time to save and load the checkpoint of a work chain with a large context
+
+    A save is a checkpoint of a process of which only a counter in the context changed since the previous one. The
+    checkpoints of the persister, for each codec, are compared with the previous storage as YAML in an attribute.
+    """
+    from aiida.backends.utils import load_dbenv
+    load_dbenv(profile=profile)
+
+    import plumpy
+    from aiida.backends.utils import get_checkpoint_rows
+    from aiida.utils import serialize
+    from aiida.work.persistence import AiiDAPersister, get_object_loader
+
+    process = create_process(number)
+    calc = process.calc
+
+    def iterate():
+        process.ctx.iteration += 1
+
+    def save_attribute():
+        iterate()
+        bundle = plumpy.Bundle(process, plumpy.LoadSaveContext(loader=get_object_loader()))
+        calc._set_attr(calc.CHECKPOINT_KEY, serialize.serialize(bundle))  # pylint: disable=protected-access
+
+    def load_attribute():
+        serialize.deserialize(calc.get_attr(calc.CHECKPOINT_KEY))
+
+    save_attribute()
+    time_save = best_of(save_attribute, repeat)
+    time_load = best_of(load_attribute, repeat)
+    size = len(calc.get_attr(calc.CHECKPOINT_KEY))
+    click.echo('{:>12}: save {:.4f} s, load {:.4f} s (best of {}), {} bytes'.format('attribute', time_save, time_load,
+                                                                                    repeat, size))
+    calc._del_attr(calc.CHECKPOINT_KEY)  # pylint: disable=protected-access
+
+    for codec in sorted(serialize.CHECKPOINT_CODECS):
+        for delta in (False, True):
+            persister = AiiDAPersister(codec=codec, delta=delta)
+
+            def save_checkpoint():
+                iterate()
+                persister.save_checkpoint(process)  # pylint: disable=cell-var-from-loop
+
+            persister.save_checkpoint(process)
+            time_save = best_of(save_checkpoint, repeat)
+            time_load = best_of(lambda: persister.load_checkpoint(calc.pk), repeat)  # pylint: disable=cell-var-from-loop
+            size = sum(len(data) for _, _, data in get_checkpoint_rows(calc.pk))
+            persister.delete_checkpoint(calc.pk)
+
+            click.echo('{:>12}: save {:.4f} s, load {:.4f} s (best of {}), {} bytes'.format(
+                '{}{}'.format(codec, ' delta' if delta else ''), time_save, time_load, repeat, size))
+
+
+if __name__ == '__main__':
+    benchmark_checkpoint()  # pylint: disable=no-value-for-parameter
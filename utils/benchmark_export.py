@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+import click
+
+
+def create_graph(number):
+    """Create a chain of `number` calculations, each creating a data node that is the input of the next one."""
+    from aiida.common.links import LinkType
+    from aiida.orm.calculation import Calculation
+    from aiida.orm.data.parameter import ParameterData
+
+    data = ParameterData(dict={'index': 0}).store()
+    for index in range(number):
+        calc = Calculation()
+        calc.add_link_from(data, label='input', link_type=LinkType.INPUT)
+        calc.store()
+        data = ParameterData(dict={'index': index + 1})
+        data.add_link_from(calc, label='output', link_type=LinkType.CREATE)
+        data.store()
+
+    return data
+
+
+@click.command()
+@click.option('-p', '--profile', type=str, default=None, help='Profile to use, defaults to the default profile.')
+@click.option('-n', '--number', type=int, default=1000, show_default=True, help='Number of calculations to export.')
+@click.option('-r', '--repeat', type=int, default=3, show_default=True, help='Number of repetitions of the export.')
+def benchmark_export(profile, number, repeat):
+    """
+    Measure the time and the peak memory usage of exporting a provenance graph of the given size
+
+    The graph is a chain of calculations that is exported by following the reversed CREATE links from its last node.
+    """
+    from aiida.backends.utils import load_dbenv
+    load_dbenv(profile=profile)
+
+    from aiida.orm.importexport import export
+
+    last_node = create_graph(number)
+    output_folder = tempfile.mkdtemp()
+
+    try:
+        timings = []
+        for index in range(repeat):
+            outfile = os.path.join(output_folder, 'export_{}.aiida'.format(index))
+            time_start = time.time()
+            export([last_node], outfile=outfile, silent=True)
+            timings.append(time.time() - time_start)
+
+        # The maximum resident set size is in kilobytes on Linux and in bytes on Mac OS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        click.echo('{:>12}: {} nodes in {:.3f} s (best of {}), {} bytes, peak RSS {}'.format(
+            'export', 2 * number + 1, min(timings), repeat, os.path.getsize(outfile), max_rss))
+    finally:
+        shutil.rmtree(output_folder)
+
+
+if __name__ == '__main__':
+    benchmark_export()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import time
+
+import click
+
+
+def create_arrays(number):
+    """Return the kinds, positions and kind indices of a perovskite supercell with at least `number` atoms."""
+    import numpy as np
+    from aiida.orm.data.structure import Kind
+
+    kinds = [Kind(symbols='Ba'), Kind(symbols='Ti'), Kind(symbols='O')]
+    basis = np.array([[0., 0., 0.], [.5, .5, .5], [.5, .5, 0.], [.5, 0., .5], [0., .5, .5]])
+    basis_indices = np.array([0, 1, 2, 2, 2])
+
+    size = int(np.ceil((number / len(basis))**(1. / 3.)))
+    cells = np.array(np.meshgrid(range(size), range(size), range(size), indexing='ij')).reshape(3, -1).T
+    positions = 4. * (cells[:, np.newaxis, :] + basis[np.newaxis, :, :]).reshape(-1, 3)
+    kind_indices = np.tile(basis_indices, len(cells))
+
+    return kinds, 4. * size * np.eye(3), positions, kind_indices
+
+
+def timed(function):
+    """Call `function` and return the elapsed time."""
+    time_start = time.time()
+    function()
+    return time.time() - time_start
+
+
+@click.command()
+@click.option('-p', '--profile', type=str, default=None, help='Profile to use, defaults to the default profile.')
+@click.option('-n', '--number', type=int, default=10000, show_default=True, help='Minimum number of atoms.')
+def benchmark_structure(profile, number):
+    """
+    Measure the time to build, store and analyse a large structure
+
+    The structure is built once atom by atom with `append_atom` and once from arrays with `set_sites_from_arrays`.
+    """
+    from aiida.backends.utils import load_dbenv
+    load_dbenv(profile=profile)
+
+    from aiida.orm import load_node
+    from aiida.orm.data.structure import StructureData, has_ase
+
+    kinds, cell, positions, kind_indices = create_arrays(number)
+    names = [kind.name for kind in kinds]
+
+    structure = StructureData(cell=cell.tolist())
+
+    def append_atoms():
+        for position, index in zip(positions.tolist(), kind_indices.tolist()):
+            structure.append_atom(symbols=names[index], position=position)
+
+    click.echo('{:>12}: {:.3f} s for {} atoms'.format('append_atom', timed(append_atoms), len(positions)))
+
+    structure = StructureData(cell=cell.tolist())
+    time_arrays = timed(lambda: structure.set_sites_from_arrays(kinds, positions, kind_indices))
+    click.echo('{:>12}: {:.3f} s for {} atoms'.format('arrays', time_arrays, len(positions)))
+
+    click.echo('{:>12}: {:.3f} s'.format('store', timed(structure.store)))
+
+    structure = load_node(structure.pk)
+    click.echo('{:>12}: {:.3f} s'.format('sites', timed(lambda: structure.sites)))
+    click.echo('{:>12}: {:.3f} s'.format('positions', timed(structure.get_positions_array)))
+    click.echo('{:>12}: {:.3f} s'.format('formula', timed(structure.get_formula)))
+    click.echo('{:>12}: {:.3f} s'.format('composition', timed(structure.get_composition)))
+
+    if has_ase():
+        click.echo('{:>12}: {:.3f} s'.format('ase', timed(structure.get_ase)))
+
+
+if __name__ == '__main__':
+    benchmark_structure()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import division
+from __future__ import print_function
+from __future__ import absolute_import
+import io
+import os
+import shutil
+import tempfile
+import time
+
+import click
+
+
+def create_files(folder, number, size):
+    """Create a number of files with the given size in bytes in the folder and return the upload list."""
+    upload_list = []
+    for index in range(number):
+        filename = 'file_{}.dat'.format(index)
+        with io.open(os.path.join(folder, filename), 'wb') as handle:
+            handle.write(os.urandom(size))
+        upload_list.append((os.path.join(folder, filename), filename))
+    return upload_list
+
+
+@click.command()
+@click.option('-n', '--number', type=int, default=500, show_default=True, help='Number of files to upload.')
+@click.option('-s', '--size', type=int, default=1024, show_default=True, help='Size of each file in bytes.')
+@click.option('-m', '--machine', type=str, default=None, help='Upload through SSH to this machine instead of locally.')
+@click.option('-r', '--repeat', type=int, default=3, show_default=True, help='Number of repetitions of each upload.')
+def benchmark_upload(number, size, machine, repeat):
+    """
+    Compare the time to upload many small files with one `put` per file and with a single `putarchive` transfer
+    """
+    if machine is None:
+        from aiida.transport.plugins.local import LocalTransport
+        transport = LocalTransport()
+    else:
+        from aiida.transport.plugins.ssh import SshTransport
+        transport = SshTransport(machine=machine, load_system_host_keys=True, key_policy='AutoAddPolicy')
+
+    local_folder = tempfile.mkdtemp()
+
+    try:
+        upload_list = create_files(local_folder, number, size)
+
+        with transport:
+            remote_folder = os.path.join(transport.getcwd(), '.aiida_benchmark_upload')
+
+            for label, upload in [('put', lambda: [transport.put(src, dst) for src, dst in upload_list]),
+                                  ('putarchive', lambda: transport.putarchive(upload_list, remote_folder))]:
+                timings = []
+                for _ in range(repeat):
+                    transport.mkdir(remote_folder)
+                    transport.chdir(remote_folder)
+                    time_start = time.time()
+                    upload()
+                    timings.append(time.time() - time_start)
+                    transport.chdir('..')
+                    transport.rmtree(remote_folder)
+
+                click.echo('{:>12}: {} files of {} bytes in {:.3f} s (best of {})'.format(
+                    label, number, size, min(timings), repeat))
+    finally:
+        shutil.rmtree(local_folder)
+
+
+if __name__ == '__main__':
+    benchmark_upload()  # pylint: disable=no-value-for-parameter